@@ -0,0 +1,110 @@
+"""partition orders and order_items by month of created_at
+
+Revision ID: 3f6b2c1d9a7e
+Revises: 5c0d8e7a41f3
+Create Date: 2026-10-19 10:00:00.000000
+
+PostgreSQL only; other databases keep ordinary tables. Both tables are
+rebuilt as ``PARTITION BY RANGE (created_at)`` parents with one partition
+per month from the oldest row to PARTITION_MONTHS_AHEAD months ahead, and
+the rows are copied across. The copy rewrites both tables under an
+exclusive lock, so run it in a maintenance window.
+
+Primary keys become (id, created_at) and the order number unique index
+becomes (order_number, created_at), as PostgreSQL requires the partition
+key in unique constraints. The order_items -> orders foreign key is
+dropped because it can no longer reference orders.id alone.
+"""
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+from app.core.config import settings
+from app.services.partitions import MonthPartition, add_months, month_floor
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6b2c1d9a7e'
+down_revision = '5c0d8e7a41f3'
+branch_labels = None
+depends_on = None
+
+TABLES = ("orders", "order_items")
+ACTIVE_STATUSES = sa.text("status IN ('CONFIRMED', 'PROCESSING', 'SHIPPED')")
+
+
+def _relkind(bind, table: str):
+    """'r' for an ordinary table, 'p' for a partitioned one, None if missing"""
+    return bind.execute(
+        sa.text("SELECT relkind FROM pg_class WHERE relname = :table AND relkind IN ('r', 'p')"),
+        {"table": table},
+    ).scalar()
+
+
+def _rebuild(bind, table: str, partitioned: bool) -> None:
+    """Recreate ``table`` with the other layout and copy its rows"""
+    old = f"{table}_old"
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    sequence = bind.execute(sa.text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": old}).scalar()
+    # Free the index names for the new table; the copy does not need them
+    op.execute(f"ALTER TABLE {old} DROP CONSTRAINT IF EXISTS {table}_pkey")
+    for (index,) in bind.execute(sa.text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": old}):
+        op.execute(f'DROP INDEX IF EXISTS "{index}"')
+
+    layout = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS){layout}")
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({'id, created_at' if partitioned else 'id'})")
+    if partitioned:
+        op.execute(f"UPDATE {old} SET created_at = now() WHERE created_at IS NULL")
+        first = bind.execute(sa.text(f"SELECT min(created_at) FROM {old}")).scalar()
+        now = datetime.now(timezone.utc)
+        month = month_floor(first or now)
+        while month <= add_months(month_floor(now), settings.PARTITION_MONTHS_AHEAD):
+            op.execute(MonthPartition(table, month).create_sql())
+            month = add_months(month, 1)
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+    op.execute(f"DROP TABLE {old} CASCADE")
+
+
+def _create_indexes(partitioned: bool) -> None:
+    op.create_index("ix_orders_id", "orders", ["id"])
+    op.create_index("ix_orders_created_at", "orders", ["created_at"])
+    op.create_index(
+        "ix_orders_active_estimated_delivery", "orders", ["estimated_delivery_date", "id"],
+        postgresql_where=ACTIVE_STATUSES,
+    )
+    op.create_index("ix_orders_changed_at", "orders", [sa.text("coalesce(updated_at, created_at)")])
+    if partitioned:
+        op.create_index("ix_orders_order_number_created_at", "orders", ["order_number", "created_at"], unique=True)
+    else:
+        op.create_index("ix_orders_order_number", "orders", ["order_number"], unique=True)
+    op.create_index("ix_order_items_id", "order_items", ["id"])
+    op.create_index("ix_order_items_order_id", "order_items", ["order_id"])
+
+    op.create_foreign_key(None, "orders", "users", ["user_id"], ["id"])
+    op.create_foreign_key(None, "orders", "addresses", ["delivery_address_id"], ["id"])
+    op.create_foreign_key(None, "order_items", "products", ["product_id"], ["id"])
+    if not partitioned:
+        op.create_foreign_key(None, "order_items", "orders", ["order_id"], ["id"])
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Tables created from the models are partitioned already
+    if bind.dialect.name != "postgresql" or _relkind(bind, "orders") != "r":
+        return
+    op.execute("ALTER TABLE order_items DROP CONSTRAINT IF EXISTS order_items_order_id_fkey")
+    for table in TABLES:
+        _rebuild(bind, table, partitioned=True)
+    _create_indexes(partitioned=True)
+
+
+def downgrade() -> None:
+    # Rows in detached partitions are not copied back; re-attach them first
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or _relkind(bind, "orders") != "p":
+        return
+    for table in TABLES:
+        _rebuild(bind, table, partitioned=False)
+    _create_indexes(partitioned=False)
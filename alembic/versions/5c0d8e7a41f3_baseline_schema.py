@@ -0,0 +1,128 @@
+"""baseline schema
+
+Revision ID: 5c0d8e7a41f3
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+The schema as ``Base.metadata.create_all`` built it before migrations
+were introduced: users, addresses, products, orders and order_items, with
+ordinary (unpartitioned) orders tables. Later revisions partition them,
+add indexes and bring in the tables and columns added since. Tables that
+already exist are left alone, so a database created by ``create_all`` is
+adopted by running ``alembic upgrade head`` without stamping it first.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0d8e7a41f3'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ENUMS = ("businesstype", "orderstatus")
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'products' not in existing:
+        op.create_table('products',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('sku', sa.String(length=100), nullable=False),
+            sa.Column('retail_price', sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column('company_price', sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column('stock_quantity', sa.Integer(), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('weight_kg', sa.Numeric(precision=8, scale=3), nullable=True),
+            sa.Column('dimensions', sa.String(length=100), nullable=True),
+            sa.Column('category', sa.String(length=100), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_products_category', 'products', ['category'], unique=False)
+        op.create_index('ix_products_id', 'products', ['id'], unique=False)
+        op.create_index('ix_products_name', 'products', ['name'], unique=False)
+        op.create_index('ix_products_sku', 'products', ['sku'], unique=True)
+    if 'users' not in existing:
+        op.create_table('users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('email', sa.String(length=255), nullable=False),
+            sa.Column('phone', sa.String(length=20), nullable=True),
+            sa.Column('hashed_password', sa.String(length=255), nullable=False),
+            sa.Column('business_name', sa.String(length=255), nullable=False),
+            sa.Column('gstin', sa.String(length=15), nullable=False),
+            sa.Column('business_type', sa.Enum('RETAIL_STORE', 'COMPANY', name='businesstype'), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('is_verified', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+        op.create_index('ix_users_gstin', 'users', ['gstin'], unique=True)
+        op.create_index('ix_users_id', 'users', ['id'], unique=False)
+        op.create_index('ix_users_phone', 'users', ['phone'], unique=True)
+    if 'addresses' not in existing:
+        op.create_table('addresses',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('address_line_1', sa.String(length=255), nullable=False),
+            sa.Column('address_line_2', sa.String(length=255), nullable=True),
+            sa.Column('city', sa.String(length=100), nullable=False),
+            sa.Column('state', sa.String(length=100), nullable=False),
+            sa.Column('postal_code', sa.String(length=10), nullable=False),
+            sa.Column('country', sa.String(length=100), nullable=False),
+            sa.Column('is_default', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_addresses_id', 'addresses', ['id'], unique=False)
+    if 'orders' not in existing:
+        op.create_table('orders',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('order_number', sa.String(length=50), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('delivery_address_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.Enum('PENDING', 'CONFIRMED', 'PROCESSING', 'SHIPPED', 'DELIVERED', 'CANCELLED', name='orderstatus'), nullable=False),
+            sa.Column('total_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+            sa.Column('tax_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column('shipping_cost', sa.Numeric(precision=8, scale=2), nullable=False),
+            sa.Column('estimated_delivery_date', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('actual_delivery_date', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('notes', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['delivery_address_id'], ['addresses.id'], ),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_orders_id', 'orders', ['id'], unique=False)
+        op.create_index('ix_orders_order_number', 'orders', ['order_number'], unique=True)
+    if 'order_items' not in existing:
+        op.create_table('order_items',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('order_id', sa.Integer(), nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('quantity', sa.Integer(), nullable=False),
+            sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column('total_price', sa.Numeric(precision=12, scale=2), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+            sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_order_items_id', 'order_items', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    for table in ('order_items', 'orders', 'addresses', 'users', 'products'):
+        op.drop_table(table)
+    if op.get_bind().dialect.name == "postgresql":
+        for name in ENUMS:
+            op.execute(f"DROP TYPE IF EXISTS {name}")
@@ -0,0 +1,59 @@
+"""composite indexes for repository queries
+
+Revision ID: 8e2f4a6b9c15
+Revises: 3f6b2c1d9a7e
+Create Date: 2026-10-19 11:00:00.000000
+
+Each index matches the filter and sort of a repository query:
+
+- orders (user_id, created_at, id): OrderRepository.get_user_orders
+- orders (status, created_at, id): OrderRepository.get_by_status, get_pending_orders
+- order_items (product_id): product sales rollups and the products foreign key
+- addresses (user_id, is_default, created_at): AddressRepository.get_user_addresses,
+  get_default_address
+- addresses (postal_code): AddressRepository.get_addresses_by_postal_code
+- products (is_active, stock_quantity): ProductRepository.get_in_stock_products,
+  get_low_stock_products
+
+On PostgreSQL the addresses and products indexes are built CONCURRENTLY so
+the tables stay writable. The orders tables are partitioned there, and a
+partitioned parent cannot be indexed concurrently, so their indexes are
+built with a plain CREATE INDEX that blocks writes until it finishes; run
+it in a maintenance window on large tables.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2f4a6b9c15'
+down_revision = '3f6b2c1d9a7e'
+branch_labels = None
+depends_on = None
+
+PARTITIONED = (
+    ("ix_orders_user_id_created_at", "orders", ["user_id", "created_at", "id"]),
+    ("ix_orders_status_created_at", "orders", ["status", "created_at", "id"]),
+    ("ix_order_items_product_id", "order_items", ["product_id"]),
+)
+CONCURRENT = (
+    ("ix_addresses_user_id_is_default", "addresses", ["user_id", "is_default", "created_at"]),
+    ("ix_addresses_postal_code", "addresses", ["postal_code"]),
+    ("ix_products_is_active_stock_quantity", "products", ["is_active", "stock_quantity"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in PARTITIONED:
+        op.create_index(name, table, columns)
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in CONCURRENT:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(CONCURRENT):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    for name, table, columns in reversed(PARTITIONED):
+        op.drop_index(name, table_name=table)
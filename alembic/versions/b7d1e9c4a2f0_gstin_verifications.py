@@ -0,0 +1,36 @@
+"""gstin verification cache
+
+Revision ID: b7d1e9c4a2f0
+Revises: 8e2f4a6b9c15
+Create Date: 2026-10-19 12:00:00.000000
+
+Registrations returned by the GST API, reused by GstVerificationClient
+until ``expires_at`` so repeat verifications do not call the API.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d1e9c4a2f0'
+down_revision = '8e2f4a6b9c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('gstin_verifications',
+        sa.Column('gstin', sa.String(length=15), nullable=False),
+        sa.Column('legal_name', sa.String(length=255), nullable=True),
+        sa.Column('trade_name', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('state_code', sa.String(length=2), nullable=False),
+        sa.Column('details', sa.JSON(), nullable=False),
+        sa.Column('verified_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('gstin')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('gstin_verifications')
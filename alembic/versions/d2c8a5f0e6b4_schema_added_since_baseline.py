@@ -0,0 +1,131 @@
+"""schema added since the baseline
+
+Revision ID: d2c8a5f0e6b4
+Revises: b7d1e9c4a2f0
+Create Date: 2026-10-19 13:00:00.000000
+
+Tables, columns and indexes the models gained between the baseline and
+the first revisions: the outbox, job state and rollup tables,
+products.bin_location, orders.overdue_at and the orders/order_items
+indexes used by the overdue sweep, rollups and item loading. Databases
+adopted from ``create_all`` may have any subset of them, so each one is
+created only if the inspector does not find it; indexes use
+``IF NOT EXISTS`` because SQLite reflection skips expression indexes.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2c8a5f0e6b4'
+down_revision = 'b7d1e9c4a2f0'
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATUSES = sa.text("status IN ('CONFIRMED', 'PROCESSING', 'SHIPPED')")
+ENUMS = ("notificationchannel", "outboxstatus")
+# Created by the baseline; referenced here without creating them again
+BUSINESS_TYPE = postgresql.ENUM('RETAIL_STORE', 'COMPANY', name='businesstype', create_type=False)
+ORDER_STATUS = postgresql.ENUM(
+    'PENDING', 'CONFIRMED', 'PROCESSING', 'SHIPPED', 'DELIVERED', 'CANCELLED', name='orderstatus', create_type=False,
+)
+
+
+def _enum(existing: postgresql.ENUM) -> sa.types.TypeEngine:
+    return sa.Enum(*existing.enums, name=existing.name).with_variant(existing, 'postgresql')
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+    if 'inventory_rollups_daily' not in existing:
+        op.create_table('inventory_rollups_daily',
+            sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('active_products', sa.Integer(), nullable=False),
+            sa.Column('low_stock', sa.Integer(), nullable=False),
+            sa.Column('out_of_stock', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('bucket_start')
+        )
+    if 'job_states' not in existing:
+        op.create_table('job_states',
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('watermark', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('last_id', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.PrimaryKeyConstraint('name')
+        )
+    for table in ('order_rollups_daily', 'order_rollups_hourly'):
+        if table not in existing:
+            op.create_table(table,
+                sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+                sa.Column('business_type', _enum(BUSINESS_TYPE), nullable=False),
+                sa.Column('status', _enum(ORDER_STATUS), nullable=False),
+                sa.Column('order_count', sa.Integer(), nullable=False),
+                sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+                sa.PrimaryKeyConstraint('bucket_start', 'business_type', 'status')
+            )
+    if 'outbox_messages' not in existing:
+        op.create_table('outbox_messages',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('topic', sa.String(length=50), nullable=False),
+            sa.Column('channel', sa.Enum('EMAIL', 'SMS', name='notificationchannel'), nullable=False),
+            sa.Column('recipient', sa.String(length=255), nullable=False),
+            sa.Column('aggregate_type', sa.String(length=50), nullable=False),
+            sa.Column('aggregate_id', sa.Integer(), nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('status', sa.Enum('PENDING', 'SENT', 'FAILED', name='outboxstatus'), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_outbox_messages_id', 'outbox_messages', ['id'], unique=False)
+        op.create_index('ix_outbox_messages_status_available_at', 'outbox_messages', ['status', 'available_at'], unique=False)
+    if 'product_sales_daily' not in existing:
+        op.create_table('product_sales_daily',
+            sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('order_count', sa.Integer(), nullable=False),
+            sa.Column('units', sa.Integer(), nullable=False),
+            sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+            sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+            sa.PrimaryKeyConstraint('bucket_start', 'product_id')
+        )
+
+    if 'bin_location' not in {column['name'] for column in inspector.get_columns('products')}:
+        op.add_column('products', sa.Column('bin_location', sa.String(length=50), nullable=True))
+    if 'overdue_at' not in {column['name'] for column in inspector.get_columns('orders')}:
+        op.add_column('orders', sa.Column('overdue_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_orders_created_at', 'orders', ['created_at'], unique=False, if_not_exists=True)
+    op.create_index(
+        'ix_orders_active_estimated_delivery', 'orders', ['estimated_delivery_date', 'id'], unique=False,
+        postgresql_where=ACTIVE_STATUSES, sqlite_where=ACTIVE_STATUSES, if_not_exists=True,
+    )
+    op.create_index(
+        'ix_orders_changed_at', 'orders', [sa.text('coalesce(updated_at, created_at)')], unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_changed_at', table_name='orders')
+    op.drop_index('ix_orders_active_estimated_delivery', table_name='orders')
+    op.drop_index('ix_orders_created_at', table_name='orders')
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    with op.batch_alter_table('orders') as batch:
+        batch.drop_column('overdue_at')
+    with op.batch_alter_table('products') as batch:
+        batch.drop_column('bin_location')
+    for table in (
+        'product_sales_daily', 'outbox_messages', 'order_rollups_hourly', 'order_rollups_daily',
+        'job_states', 'inventory_rollups_daily',
+    ):
+        op.drop_table(table)
+    if op.get_bind().dialect.name == "postgresql":
+        for name in ENUMS:
+            op.execute(f"DROP TYPE IF EXISTS {name}")
@@ -12,6 +12,8 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Users allowed on staff endpoints (exports, dashboard, bulk GSTIN verification)
+    ADMIN_USER_IDS: List[int] = []
     
     # Environment
     ENVIRONMENT: str = "development"
@@ -24,6 +26,15 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "anon_b2b_db"
     DATABASE_USER: str
     DATABASE_PASSWORD: str
+    # Read replicas; repository reads go to a healthy one (empty: primary only)
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_CHECK_INTERVAL_SECONDS: float = 10.0
+    # After a user writes, their reads stay on the primary this long
+    READ_YOUR_WRITES_SECONDS: float = 10.0
+    # Listing totals: estimates below the threshold are counted exactly
+    COUNT_ESTIMATE_THRESHOLD: int = 10000
+    COUNT_CACHE_TTL_SECONDS: int = 60
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -40,6 +51,80 @@ class Settings(BaseSettings):
     SMS_API_URL: str = "https://api.twilio.com"
     EMAIL_API_URL: str = "https://api.sendgrid.com"
     
+    EMAIL_API_KEY: Optional[str] = None
+    SMS_API_KEY: Optional[str] = None
+    GST_API_KEY: Optional[str] = None
+    
+    # GSTIN verification
+    GST_API_CONCURRENCY: int = 10
+    GST_API_TIMEOUT_SECONDS: float = 10.0
+    GST_API_MAX_ATTEMPTS: int = 3
+    GST_API_BACKOFF_SECONDS: float = 0.5
+    GST_VERIFICATION_TTL_SECONDS: int = 86400
+    GST_VERIFICATION_NOT_FOUND_TTL_SECONDS: int = 3600
+    
+    # Notification outbox worker
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_LEASE_SECONDS: int = 120
+    NOTIFICATION_CONCURRENCY: int = 20
+    NOTIFICATION_TIMEOUT_SECONDS: float = 10.0
+    NOTIFICATION_MAX_ATTEMPTS: int = 8
+    NOTIFICATION_BACKOFF_SECONDS: float = 5.0
+    NOTIFICATION_MAX_BACKOFF_SECONDS: float = 3600.0
+    
+    # Overdue-order sweep
+    OVERDUE_SWEEP_INTERVAL_SECONDS: float = 300.0
+    OVERDUE_SWEEP_BATCH_SIZE: int = 500
+    
+    # Dashboard rollups
+    ROLLUP_INTERVAL_SECONDS: float = 60.0
+    ROLLUP_LAG_SECONDS: float = 300.0
+    LOW_STOCK_THRESHOLD: int = 10
+    
+    # Monthly partitions of orders and order_items (PostgreSQL)
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 6 * 3600
+    # Detach partitions older than this many months; 0 keeps them attached
+    PARTITION_RETENTION_MONTHS: int = 0
+    # Tablespace that detached partitions are moved to, e.g. on cheaper disks
+    PARTITION_ARCHIVE_TABLESPACE: Optional[str] = None
+    
+    # Pricing & Tax
+    DEFAULT_GST_RATE: float = 18.0
+    HOME_STATE_CODE: str = "37"  # Andhra Pradesh
+    SHIPPING_BASE_COST: float = 50.0
+    SHIPPING_COST_PER_KG: float = 10.0
+    FREE_SHIPPING_THRESHOLD: float = 5000.0
+    ROUND_TOTAL_TO_RUPEE: bool = False
+    
+    # Delivery
+    PINCODE_TABLE_PATH: str = "data/pincode_table.npy"
+    DELIVERY_CUTOFF_HOUR: int = 18
+    LOCAL_DELIVERY_RADIUS_KM: float = 50.0
+    
+    # Cart
+    CART_TTL_SECONDS: int = 7 * 24 * 3600
+    CART_MAX_LINES: int = 500
+    CART_MAX_QUANTITY: int = 10000
+    
+    # Idempotency
+    IDEMPOTENCY_PATHS: List[str] = ["/api/v1/cart/checkout", "/api/v1/orders", "/api/v1/payments"]
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 3600
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    IDEMPOTENCY_WAIT_SECONDS: float = 30.0
+    
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_USER: str = "300/minute"
+    RATE_LIMIT_EXPORTS_PER_USER: str = "10/minute"
+    
+    # Live order events
+    ORDER_EVENTS_CHANNEL: str = "order-events"
+    ORDER_EVENTS_QUEUE_SIZE: int = 16
+    ORDER_EVENTS_MAX_CONNECTIONS: int = 10000
+    ORDER_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     
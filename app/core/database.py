@@ -1,22 +1,24 @@
+from pathlib import Path
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.replicas import ROUTE_KEY, ReplicaPool, RoutingSession, WriteWindow
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Create SQLAlchemy engine with connection pooling
-# Note: Using postgresql+asyncpg for async support, fallback to sqlite for development
-try:
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _create_engine(url: str):
     # Convert postgresql:// to postgresql+asyncpg:// for asyncpg driver
-    database_url = settings.DATABASE_URL
-    if database_url.startswith("postgresql://"):
-        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-    
-    engine = create_engine(
-        database_url,
+    if url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return create_engine(
+        url,
         poolclass=QueuePool,
         pool_size=10,
         max_overflow=20,
@@ -24,6 +26,12 @@ try:
         pool_recycle=300,
         echo=settings.DEBUG
     )
+
+
+# Create SQLAlchemy engine with connection pooling
+# Note: Using postgresql+asyncpg for async support, fallback to sqlite for development
+try:
+    engine = _create_engine(settings.DATABASE_URL)
 except Exception as e:
     logger.warning(f"Failed to create PostgreSQL engine: {e}")
     logger.info("Falling back to SQLite for development")
@@ -33,18 +41,31 @@ except Exception as e:
         echo=settings.DEBUG
     )
 
+# Read replicas; without any, every query goes to the primary engine
+replica_pool = ReplicaPool(
+    [_create_engine(url) for url in settings.DATABASE_REPLICA_URLS],
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_CHECK_INTERVAL_SECONDS,
+)
+write_window = WriteWindow(settings.READ_YOUR_WRITES_SECONDS)
+
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine,
+    class_=RoutingSession, replicas=replica_pool, write_window=write_window,
+)
 
 # Create Base class for models
 Base = declarative_base()
 
 
-def get_db():
+def get_db(request: Request = None):
     """
     Dependency to get database session
     """
     db = SessionLocal()
+    if request is not None and replica_pool:
+        db.info[ROUTE_KEY] = _route_key(request)
     try:
         yield db
     except Exception as e:
@@ -55,15 +76,41 @@ def get_db():
         db.close()
 
 
+def _route_key(request: Request):
+    """The authenticated user, whose recent writes pin their reads to the primary"""
+    from app.core.security import verify_token
+
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    return verify_token(token) if scheme.lower() == "bearer" and token else None
+
+
+def run_migrations(bind=None, revision: str = "head"):
+    """
+    Upgrade the database to ``revision`` with the project's Alembic migrations
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    with (bind or engine).connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+
 def init_db():
     """
     Initialize database tables
     """
     try:
-        # Import models to ensure they're registered with Base
-        from app.models import User, Address, Product, Order, OrderItem
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
+        # Tables and indexes come from the migrations, not create_all, so a
+        # database built here matches one upgraded in production
+        run_migrations()
+        logger.info("Database migrated to the latest revision")
+
+        # Partitioned tables accept rows only once their month's partition exists
+        from app.services.partitions import PartitionManager
+        PartitionManager(engine).ensure()
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
\ No newline at end of file
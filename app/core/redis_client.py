@@ -2,7 +2,7 @@ import redis
 from app.core.config import settings
 import logging
 import json
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +90,42 @@ class RedisClient:
             logger.error(f"Error setting expiration for key {key}: {e}")
             return False
     
+    def hgetall(self, key: str) -> Dict[str, str]:
+        """
+        Get all fields of a hash
+        """
+        try:
+            return self.redis_client.hgetall(key)
+        except Exception as e:
+            logger.error(f"Error getting hash {key} from Redis: {e}")
+            return {}
+    
+    def hincrby(self, key: str, field: str, amount: int = 1) -> Optional[int]:
+        """
+        Increment an integer hash field
+        """
+        try:
+            return self.redis_client.hincrby(key, field, amount)
+        except Exception as e:
+            logger.error(f"Error incrementing field {field} of hash {key}: {e}")
+            return None
+    
+    def hdel(self, key: str, *fields: str) -> int:
+        """
+        Delete hash fields
+        """
+        try:
+            return self.redis_client.hdel(key, *fields)
+        except Exception as e:
+            logger.error(f"Error deleting fields from hash {key}: {e}")
+            return 0
+    
+    def register_script(self, script: str):
+        """
+        Register a Lua script for atomic multi-key operations
+        """
+        return self.redis_client.register_script(script)
+    
     def flushdb(self) -> bool:
         """
         Clear all keys in current database (use with caution)
@@ -0,0 +1,251 @@
+"""
+Read-replica routing for SQLAlchemy sessions.
+
+``RoutingSession`` sends plain SELECTs issued inside a ``replica_reads``
+scope to a healthy replica and everything else to the primary: writes,
+flushes, SELECT ... FOR UPDATE, reads nested in a ``primary_reads`` scope,
+every read of a session that has already written, and reads for a route
+key (the user) that wrote within the last ``READ_YOUR_WRITES_SECONDS``.
+Repositories open these scopes around their methods, see
+``app.repositories.base``.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+import functools
+import itertools
+import threading
+import time
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
+import logging
+
+logger = logging.getLogger(__name__)
+
+REPLICA = "replica"
+PRIMARY = "primary"
+
+# session.info keys
+_SCOPES = "route_scopes"
+_WROTE = "route_wrote"
+ROUTE_KEY = "route_key"
+
+# Replay delay on a PostgreSQL standby; 0 when it has replayed everything
+# it received, so an idle primary does not look like lag
+_POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def replication_lag(conn: Connection) -> float:
+    """Seconds the replica behind ``conn`` trails its primary"""
+    if conn.dialect.name == "postgresql":
+        return float(conn.execute(_POSTGRES_LAG_SQL).scalar() or 0.0)
+    conn.execute(text("SELECT 1"))
+    return 0.0
+
+
+@dataclass
+class ReplicaState:
+    engine: Engine
+    healthy: bool = False
+    lag: Optional[float] = None
+    error: Optional[str] = None
+    checked_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.engine.url.render_as_string(hide_password=True),
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "error": self.error,
+        }
+
+
+class ReplicaPool:
+    """
+    Replica engines with health and lag checks.
+
+    Each replica is probed at most once per ``check_interval`` seconds,
+    lazily on the request that needs it; a replica that cannot be reached
+    or trails by more than ``max_lag_seconds`` is skipped until a later
+    probe succeeds. Healthy replicas are used round-robin.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[Engine],
+        max_lag_seconds: float,
+        check_interval: float,
+        lag_probe: Callable[[Connection], float] = replication_lag,
+    ):
+        self.replicas = [ReplicaState(engine) for engine in engines]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self._next = itertools.count()
+        self._locks = [threading.Lock() for _ in self.replicas]
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def check(self, index: int) -> ReplicaState:
+        state = self.replicas[index]
+        # One probe at a time per replica; others use the last result
+        if not self._locks[index].acquire(blocking=False):
+            return state
+        try:
+            with state.engine.connect() as conn:
+                state.lag = self.lag_probe(conn)
+            state.healthy = state.lag <= self.max_lag_seconds
+            state.error = None if state.healthy else f"lag {state.lag:.1f}s over {self.max_lag_seconds:.1f}s"
+        except Exception as e:
+            state.healthy, state.lag, state.error = False, None, str(e)
+        finally:
+            state.checked_at = time.monotonic()
+            self._locks[index].release()
+        if not state.healthy:
+            logger.warning(f"Replica {state.engine.url.render_as_string(hide_password=True)} unavailable: {state.error}")
+        return state
+
+    def choose(self) -> Optional[Engine]:
+        """A healthy replica, or None to use the primary"""
+        if not self.replicas:
+            return None
+        now = time.monotonic()
+        start = next(self._next)
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            state = self.replicas[index]
+            if state.checked_at is None or now - state.checked_at >= self.check_interval:
+                state = self.check(index)
+            if state.healthy:
+                return state.engine
+        return None
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [state.as_dict() for state in self.replicas]
+
+
+class WriteWindow:
+    """
+    Route keys that wrote recently, so their reads stay on the primary
+    until the replicas have caught up.
+
+    Kept in Redis so the window holds across app processes, plus a local
+    copy. If Redis cannot be read every key counts as recent: reads fall
+    back to the primary rather than risk a stale read.
+    """
+
+    def __init__(self, seconds: float, redis_connection: Any = None):
+        self.seconds = seconds
+        self._redis = redis_connection
+        self._local: Dict[str, float] = {}
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            # Imported lazily: dependencies imports the database module
+            from app.utils.dependencies import get_redis_connection
+            return get_redis_connection()
+        return self._redis
+
+    def mark(self, key: str) -> None:
+        now = time.monotonic()
+        self._local[key] = now + self.seconds
+        if len(self._local) > 10000:
+            self._local = {k: until for k, until in self._local.items() if until > now}
+        try:
+            self.redis.set(f"recent-write:{key}", 1, px=int(self.seconds * 1000))
+        except Exception as e:
+            logger.warning(f"Could not record recent write for {key}: {e}")
+
+    def active(self, key: str) -> bool:
+        if self._local.get(key, 0.0) > time.monotonic():
+            return True
+        try:
+            return bool(self.redis.exists(f"recent-write:{key}"))
+        except Exception:
+            return True
+
+
+class RoutingSession(Session):
+    """Session that reads from replicas where it is safe to; see the module docstring"""
+
+    def __init__(self, *args, replicas: Optional[ReplicaPool] = None,
+                 write_window: Optional[WriteWindow] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.write_window = write_window
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[_WROTE] = True
+        elif self._reads_from_replica(clause):
+            engine = self.replicas.choose()
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def _reads_from_replica(self, clause) -> bool:
+        if not self.replicas or self.info.get(_WROTE):
+            return False
+        scopes = self.info.get(_SCOPES)
+        if not scopes or scopes[0] != REPLICA:
+            return False
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return False
+        key = self.info.get(ROUTE_KEY)
+        return key is None or self.write_window is None or not self.write_window.active(key)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session: RoutingSession) -> None:
+    key = session.info.get(ROUTE_KEY)
+    if session.info.get(_WROTE) and key is not None and session.write_window is not None:
+        session.write_window.mark(key)
+
+
+@contextmanager
+def _route(session: Session, route: str) -> Iterator[None]:
+    # The outermost scope decides: reads made while writing stay on the primary
+    scopes = session.info.setdefault(_SCOPES, [])
+    scopes.append(route)
+    try:
+        yield
+    finally:
+        scopes.pop()
+
+
+def replica_reads(session: Session):
+    """Let plain SELECTs in this block go to a replica"""
+    return _route(session, REPLICA)
+
+
+def primary_reads(session: Session):
+    """Keep every query in this block, including nested replica scopes, on the primary"""
+    return _route(session, PRIMARY)
+
+
+def reads_from_replica(method):
+    """Run a repository method (using ``self.db``) in a replica scope"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with replica_reads(self.db):
+            return method(self, *args, **kwargs)
+    wrapper.__route__ = REPLICA
+    return wrapper
+
+
+def reads_from_primary(method):
+    """Run a repository method (using ``self.db``) in a primary scope"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with primary_reads(self.db):
+            return method(self, *args, **kwargs)
+    wrapper.__route__ = PRIMARY
+    return wrapper
@@ -7,8 +7,16 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 import time
 import logging
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, replica_pool
+from app.utils.idempotency import IdempotencyMiddleware
 from app.utils.logging import setup_logging
+from app.routers.cart import router as cart_router
+from app.routers.dashboard import router as dashboard_router
+from app.routers.exports import router as exports_router
+from app.routers.gst import router as gst_router
+from app.routers.order_events import router as order_events_router
+from app.services.gst_verification import gst_verifier
+from app.services.order_events import order_event_hub
 
 # Setup logging
 logger = setup_logging()
@@ -37,6 +45,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Replay responses for retried order/payment POSTs carrying an Idempotency-Key
+app.add_middleware(IdempotencyMiddleware)
+
 
 # Custom middleware for request logging and security headers
 @app.middleware("http")
@@ -69,6 +80,7 @@ async def add_security_headers(request: Request, call_next):
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     return JSONResponse(
         status_code=exc.status_code,
+        headers=getattr(exc, "headers", None),
         content={
             "success": False,
             "error": {
@@ -135,18 +147,23 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down application")
+    await order_event_hub.stop()
+    await gst_verifier.aclose()
 
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    return {
+    body = {
         "success": True,
         "status": "healthy",
         "service": settings.PROJECT_NAME,
         "version": settings.VERSION,
         "environment": settings.ENVIRONMENT
     }
+    if replica_pool:
+        body["replicas"] = replica_pool.status()
+    return body
 
 
 # Root endpoint
@@ -164,4 +181,9 @@ async def root():
 # app.include_router(auth_router, prefix=f"{settings.API_V1_STR}/auth", tags=["authentication"])
 # app.include_router(users_router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
 # app.include_router(products_router, prefix=f"{settings.API_V1_STR}/products", tags=["products"])
-# app.include_router(orders_router, prefix=f"{settings.API_V1_STR}/orders", tags=["orders"])
\ No newline at end of file
+# app.include_router(orders_router, prefix=f"{settings.API_V1_STR}/orders", tags=["orders"])
+app.include_router(cart_router, prefix=f"{settings.API_V1_STR}/cart", tags=["cart"])
+app.include_router(dashboard_router, prefix=f"{settings.API_V1_STR}/dashboard", tags=["dashboard"])
+app.include_router(exports_router, prefix=f"{settings.API_V1_STR}/exports", tags=["exports"])
+app.include_router(order_events_router, prefix=f"{settings.API_V1_STR}/orders", tags=["orders"])
+app.include_router(gst_router, prefix=f"{settings.API_V1_STR}/gstin-verifications", tags=["gst"])
@@ -1,7 +1,11 @@
 from .user import User, BusinessType
 from .address import Address
 from .product import Product
-from .order import Order, OrderItem, OrderStatus
+from .order import Order, OrderItem, OrderStatus, ACTIVE_ORDER_STATUSES, ORDER_STATUS_TRANSITIONS
+from .outbox import OutboxMessage, OutboxStatus, NotificationChannel
+from .job_state import JobState
+from .gstin_verification import GstinVerification
+from .rollup import OrderRollupHourly, OrderRollupDaily, ProductSalesDaily, InventoryRollupDaily
 
 __all__ = [
     "User",
@@ -10,5 +14,16 @@ __all__ = [
     "Product",
     "Order",
     "OrderItem",
-    "OrderStatus"
+    "OrderStatus",
+    "ACTIVE_ORDER_STATUSES",
+    "ORDER_STATUS_TRANSITIONS",
+    "OutboxMessage",
+    "OutboxStatus",
+    "NotificationChannel",
+    "JobState",
+    "GstinVerification",
+    "OrderRollupHourly",
+    "OrderRollupDaily",
+    "ProductSalesDaily",
+    "InventoryRollupDaily"
 ]
\ No newline at end of file
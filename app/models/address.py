@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -13,7 +13,7 @@ class Address(Base):
     address_line_2 = Column(String(255), nullable=True)
     city = Column(String(100), nullable=False)
     state = Column(String(100), nullable=False)
-    postal_code = Column(String(10), nullable=False)
+    postal_code = Column(String(10), nullable=False, index=True)
     country = Column(String(100), default="India", nullable=False)
     is_default = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -21,4 +21,9 @@ class Address(Base):
 
     # Relationships
     user = relationship("User", back_populates="addresses")
-    orders = relationship("Order", back_populates="delivery_address")
\ No newline at end of file
+    orders = relationship("Order", back_populates="delivery_address")
+
+    __table_args__ = (
+        # A user's addresses, default first then newest; also finds the default
+        Index("ix_addresses_user_id_is_default", "user_id", "is_default", "created_at"),
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from app.core.database import Base
+
+
+class GstinVerification(Base):
+    """A GSTIN's registration as the GST API last returned it, reused until ``expires_at``"""
+    __tablename__ = "gstin_verifications"
+
+    gstin = Column(String(15), primary_key=True)
+    legal_name = Column(String(255), nullable=True)
+    trade_name = Column(String(255), nullable=True)
+    status = Column(String(50), nullable=True)  # e.g. "Active", "Cancelled", "Suspended"
+    state_code = Column(String(2), nullable=False)
+    # Taxpayer record as returned by the API
+    details = Column(JSON, nullable=False)
+    verified_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class JobState(Base):
+    """Progress of an incremental background job, e.g. the overdue-order sweep"""
+    __tablename__ = "job_states"
+
+    name = Column(String(100), primary_key=True)
+    # Keyset position of the last processed row
+    watermark = Column(DateTime(timezone=True), nullable=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Text, JSON, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+import enum
+
+
+class OutboxStatus(enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class NotificationChannel(enum.Enum):
+    EMAIL = "email"
+    SMS = "sms"
+
+
+class OutboxMessage(Base):
+    __tablename__ = "outbox_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    topic = Column(String(50), nullable=False)  # e.g. "order.placed", "order.status_changed"
+    channel = Column(Enum(NotificationChannel), nullable=False)
+    recipient = Column(String(255), nullable=False)
+    aggregate_type = Column(String(50), nullable=False)
+    aggregate_id = Column(Integer, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(Enum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    # Next time the message may be claimed: backoff after failures, lease while in flight
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_messages_status_available_at", "status", "available_at"),
+    )
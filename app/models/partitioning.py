@@ -0,0 +1,57 @@
+"""
+Declarative monthly range partitioning.
+
+Tables declared with ``monthly_partitioned(column)`` are created on
+PostgreSQL as ``PARTITION BY RANGE (column)`` parents; the per-month
+partitions themselves are created by ``app.services.partitions``. Other
+databases (SQLite in development and tests) get an ordinary table.
+"""
+from typing import Any, Dict, List, Optional
+from sqlalchemy import MetaData, PrimaryKeyConstraint, Table
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import HasConditionalDDL
+
+PARTITION_KEY = "partition_by_month"
+PARTITIONING_DIALECT = "postgresql"
+
+
+def monthly_partitioned(column: str) -> Dict[str, Any]:
+    """Table keyword arguments that range-partition the table by month of ``column``"""
+    return {"postgresql_partition_by": f"RANGE ({column})", "info": {PARTITION_KEY: column}}
+
+
+def partition_key(table: Table) -> Optional[str]:
+    return table.info.get(PARTITION_KEY)
+
+
+def partitioned_tables(metadata: MetaData) -> List[Table]:
+    """Partitioned tables in dependency order"""
+    return [table for table in metadata.sorted_tables if partition_key(table) is not None]
+
+
+def _unpartitioned_dialect(ddl, target, bind, dialect=None, **kw) -> bool:
+    return dialect.name != PARTITIONING_DIALECT
+
+
+def when_partitioned(item: HasConditionalDDL) -> HasConditionalDDL:
+    """Only create this index or constraint where tables are partitioned"""
+    return item.ddl_if(dialect=PARTITIONING_DIALECT)
+
+
+def when_unpartitioned(item: HasConditionalDDL) -> HasConditionalDDL:
+    """Only create this index or constraint where tables are not partitioned"""
+    return item.ddl_if(callable_=_unpartitioned_dialect)
+
+
+@compiles(PrimaryKeyConstraint, PARTITIONING_DIALECT)
+def _primary_key_with_partition_key(constraint, compiler, **kw):
+    # PostgreSQL requires the partition key in every unique constraint of a
+    # partitioned table. The ORM keeps the single-column identity.
+    key = partition_key(constraint.table)
+    if key is None or key in constraint.columns:
+        return compiler.visit_primary_key_constraint(constraint, **kw)
+    text = ""
+    if constraint.name is not None:
+        text += "CONSTRAINT %s " % compiler.preparer.format_constraint(constraint)
+    columns = [column.name for column in constraint.columns] + [key]
+    return text + "PRIMARY KEY (%s)" % ", ".join(compiler.preparer.quote(name) for name in columns)
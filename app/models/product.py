@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index
 from sqlalchemy.types import Numeric
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -21,6 +21,12 @@ class Product(Base):
     category = Column(String(100), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Added after the baseline schema, so last like in migrated tables
+    bin_location = Column(String(50), nullable=True)  # Warehouse bin, e.g. "A-03-12"
 
     # Relationships
-    order_items = relationship("OrderItem", back_populates="product")
\ No newline at end of file
+    order_items = relationship("OrderItem", back_populates="product")
+    __table_args__ = (
+        # Active catalogue filtered by stock level (in stock, low stock)
+        Index("ix_products_is_active_stock_quantity", "is_active", "stock_quantity"),
+    )
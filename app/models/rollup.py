@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, DateTime, Enum, ForeignKey
+from sqlalchemy.types import Numeric
+from app.core.database import Base
+from app.models.order import OrderStatus
+from app.models.user import BusinessType
+
+
+class OrderRollupHourly(Base):
+    """Orders and revenue per UTC hour of creation, business type and current status"""
+    __tablename__ = "order_rollups_hourly"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    business_type = Column(Enum(BusinessType), primary_key=True)
+    status = Column(Enum(OrderStatus), primary_key=True)
+    order_count = Column(Integer, nullable=False)
+    revenue = Column(Numeric(14, 2), nullable=False)
+
+
+class OrderRollupDaily(Base):
+    """Orders and revenue per UTC day of creation, business type and current status"""
+    __tablename__ = "order_rollups_daily"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    business_type = Column(Enum(BusinessType), primary_key=True)
+    status = Column(Enum(OrderStatus), primary_key=True)
+    order_count = Column(Integer, nullable=False)
+    revenue = Column(Numeric(14, 2), nullable=False)
+
+
+class ProductSalesDaily(Base):
+    """Units and revenue per product and UTC day, excluding cancelled orders"""
+    __tablename__ = "product_sales_daily"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    order_count = Column(Integer, nullable=False)
+    units = Column(Integer, nullable=False)
+    revenue = Column(Numeric(14, 2), nullable=False)
+
+
+class InventoryRollupDaily(Base):
+    """Stock level counts, refreshed through the day and kept as daily history"""
+    __tablename__ = "inventory_rollups_daily"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    active_products = Column(Integer, nullable=False)
+    low_stock = Column(Integer, nullable=False)
+    out_of_stock = Column(Integer, nullable=False)
@@ -2,7 +2,10 @@ from .base import BaseRepository
 from .user import UserRepository
 from .address import AddressRepository
 from .product import ProductRepository
-from .order import OrderRepository, OrderItemRepository
+from .order import OrderRepository, OrderItemRepository, OrderSummary, BulkStatusResult
+from .outbox import OutboxRepository
+from .job_state import JobStateRepository
+from .rollup import RollupRepository
 
 __all__ = [
     "BaseRepository",
@@ -10,5 +13,10 @@ __all__ = [
     "AddressRepository", 
     "ProductRepository",
     "OrderRepository",
-    "OrderItemRepository"
+    "OrderItemRepository",
+    "OrderSummary",
+    "BulkStatusResult",
+    "OutboxRepository",
+    "JobStateRepository",
+    "RollupRepository"
 ]
\ No newline at end of file
@@ -1,12 +1,29 @@
 from typing import Optional, List
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.address import Address
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, paged
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Statements are built once; each call only binds its values
+_BY_USER = (
+    select(Address)
+    .where(Address.user_id == bindparam("user_id"))
+    .order_by(Address.is_default.desc(), Address.created_at.desc())
+)
+_DEFAULT = select(Address).where(Address.user_id == bindparam("user_id"), Address.is_default == True).limit(1)
+_CLEAR_DEFAULT = (
+    update(Address)
+    .where(Address.user_id == bindparam("owner_id"), Address.is_default == True)
+    .values(is_default=False)
+)
+_BY_CITY = paged(select(Address).where(Address.city.ilike(bindparam("pattern"))))
+_BY_STATE = paged(select(Address).where(Address.state.ilike(bindparam("pattern"))))
+_BY_POSTAL_CODE = select(Address).where(Address.postal_code == bindparam("postal_code"))
+
 
 class AddressRepository(BaseRepository[Address]):
     """Address-specific repository with additional methods"""
@@ -17,12 +34,7 @@ class AddressRepository(BaseRepository[Address]):
     def get_user_addresses(self, user_id: int) -> List[Address]:
         """Get all addresses for a specific user"""
         try:
-            return (
-                self.db.query(Address)
-                .filter(Address.user_id == user_id)
-                .order_by(Address.is_default.desc(), Address.created_at.desc())
-                .all()
-            )
+            return self.db.execute(_BY_USER, {"user_id": user_id}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting addresses for user {user_id}: {e}")
             raise
@@ -30,12 +42,7 @@ class AddressRepository(BaseRepository[Address]):
     def get_default_address(self, user_id: int) -> Optional[Address]:
         """Get the default address for a user"""
         try:
-            return (
-                self.db.query(Address)
-                .filter(Address.user_id == user_id)
-                .filter(Address.is_default == True)
-                .first()
-            )
+            return self.db.execute(_DEFAULT, {"user_id": user_id}).scalars().first()
         except SQLAlchemyError as e:
             logger.error(f"Error getting default address for user {user_id}: {e}")
             raise
@@ -44,10 +51,7 @@ class AddressRepository(BaseRepository[Address]):
         """Set an address as default for a user"""
         try:
             # First, unset all default addresses for the user
-            self.db.query(Address).filter(
-                Address.user_id == user_id,
-                Address.is_default == True
-            ).update({"is_default": False})
+            self.db.execute(_CLEAR_DEFAULT, {"owner_id": user_id})
 
             # Then set the specified address as default
             address = self.get_by_id(address_id)
@@ -68,13 +72,7 @@ class AddressRepository(BaseRepository[Address]):
     def get_addresses_by_city(self, city: str, skip: int = 0, limit: int = 100) -> List[Address]:
         """Get addresses by city"""
         try:
-            return (
-                self.db.query(Address)
-                .filter(Address.city.ilike(f"%{city}%"))
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(_BY_CITY, {"pattern": f"%{city}%", "skip": skip, "limit": limit}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting addresses by city {city}: {e}")
             raise
@@ -82,13 +80,7 @@ class AddressRepository(BaseRepository[Address]):
     def get_addresses_by_state(self, state: str, skip: int = 0, limit: int = 100) -> List[Address]:
         """Get addresses by state"""
         try:
-            return (
-                self.db.query(Address)
-                .filter(Address.state.ilike(f"%{state}%"))
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(_BY_STATE, {"pattern": f"%{state}%", "skip": skip, "limit": limit}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting addresses by state {state}: {e}")
             raise
@@ -96,11 +88,7 @@ class AddressRepository(BaseRepository[Address]):
     def get_addresses_by_postal_code(self, postal_code: str) -> List[Address]:
         """Get addresses by postal code"""
         try:
-            return (
-                self.db.query(Address)
-                .filter(Address.postal_code == postal_code)
-                .all()
-            )
+            return self.db.execute(_BY_POSTAL_CODE, {"postal_code": postal_code}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting addresses by postal code {postal_code}: {e}")
             raise
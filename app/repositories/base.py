@@ -1,16 +1,85 @@
-from typing import Generic, TypeVar, Type, Optional, List, Dict, Any
+import functools
+import inspect
+from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, Iterable
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.database import Base
+from app.core.replicas import reads_from_primary, reads_from_replica
+from app.repositories.counting import CountMode, RowCount, RowCounter
 import logging
 
 logger = logging.getLogger(__name__)
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Ids per IN (...) query; stays under SQLite's bound parameter limit
+IN_BATCH_SIZE = 500
+
+# Read-only repository methods; these may be served by a read replica
+READ_METHOD_PREFIXES = ("get_", "search_")
+READ_METHODS = {"count", "exists"}
+
+
+def paged(stmt: Select) -> Select:
+    """``stmt`` with OFFSET :skip LIMIT :limit, bound per execution"""
+    return stmt.offset(bindparam("skip")).limit(bindparam("limit"))
+
+
+# Statements of the generic methods, built once per model (and field)
+@functools.lru_cache(maxsize=None)
+def _by_field(model: Any, field: str) -> Select:
+    return select(model).where(getattr(model, field) == bindparam("value")).limit(1)
+
+
+@functools.lru_cache(maxsize=None)
+def _many_by_field(model: Any, field: str) -> Select:
+    return paged(select(model).where(getattr(model, field) == bindparam("value")))
+
+
+@functools.lru_cache(maxsize=None)
+def _by_ids(model: Any) -> Select:
+    return select(model).where(model.id.in_(bindparam("ids", expanding=True)))
+
+
+@functools.lru_cache(maxsize=None)
+def _all(model: Any) -> Select:
+    return paged(select(model))
+
+
+@functools.lru_cache(maxsize=None)
+def _exists(model: Any) -> Select:
+    return select(model.id).where(model.id == bindparam("value")).limit(1)
+
+
+def _route_methods(cls: type) -> None:
+    """Wrap the public methods defined on ``cls`` in replica or primary scopes"""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(attr) or hasattr(attr, "__route__"):
+            continue
+        if name.startswith(READ_METHOD_PREFIXES) or name in READ_METHODS:
+            setattr(cls, name, reads_from_replica(attr))
+        else:
+            setattr(cls, name, reads_from_primary(attr))
+
 
 class BaseRepository(Generic[ModelType]):
-    """Base repository class with common CRUD operations"""
+    """
+    Base repository class with common CRUD operations.
+
+    Read methods (``get_*``, ``search_*``, ``count``, ``exists``) may read
+    from a replica; every other public method, including the reads it
+    makes itself, uses the primary. Subclasses are routed the same way.
+
+    Queries are built once and executed with bound values: subclasses keep
+    their statements at module level, the generic methods here build theirs
+    once per model.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _route_methods(cls)
 
     def __init__(self, model: Type[ModelType], db: Session):
         self.model = model
@@ -33,15 +102,28 @@ class BaseRepository(Generic[ModelType]):
     def get_by_id(self, id: int) -> Optional[ModelType]:
         """Get a record by ID"""
         try:
-            return self.db.query(self.model).filter(self.model.id == id).first()
+            return self.db.execute(_by_field(self.model, "id"), {"value": id}).scalars().first()
         except SQLAlchemyError as e:
             logger.error(f"Error getting {self.model.__name__} by id {id}: {e}")
             raise
 
+    def get_many_by_ids(self, ids: Iterable[int]) -> List[ModelType]:
+        """Get the records with these IDs, in no particular order; unknown IDs are skipped"""
+        ids = list(dict.fromkeys(ids))
+        try:
+            found = []
+            for start in range(0, len(ids), IN_BATCH_SIZE):
+                batch = ids[start:start + IN_BATCH_SIZE]
+                found.extend(self.db.execute(_by_ids(self.model), {"ids": batch}).scalars())
+            return found
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting {len(ids)} {self.model.__name__} records by id: {e}")
+            raise
+
     def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get all records with pagination"""
         try:
-            return self.db.query(self.model).offset(skip).limit(limit).all()
+            return self.db.execute(_all(self.model), {"skip": skip, "limit": limit}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting all {self.model.__name__}: {e}")
             raise
@@ -85,7 +167,7 @@ class BaseRepository(Generic[ModelType]):
     def get_by_field(self, field: str, value: Any) -> Optional[ModelType]:
         """Get a record by a specific field"""
         try:
-            return self.db.query(self.model).filter(getattr(self.model, field) == value).first()
+            return self.db.execute(_by_field(self.model, field), {"value": value}).scalars().first()
         except SQLAlchemyError as e:
             logger.error(f"Error getting {self.model.__name__} by {field}: {e}")
             raise
@@ -93,21 +175,17 @@ class BaseRepository(Generic[ModelType]):
     def get_many_by_field(self, field: str, value: Any, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get multiple records by a specific field"""
         try:
-            return (
-                self.db.query(self.model)
-                .filter(getattr(self.model, field) == value)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(
+                _many_by_field(self.model, field), {"value": value, "skip": skip, "limit": limit}
+            ).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting {self.model.__name__} by {field}: {e}")
             raise
 
-    def count(self) -> int:
-        """Count total records"""
+    def count(self, *criteria: Any, mode: CountMode = CountMode.EXACT) -> RowCount:
+        """Count records matching ``criteria``; see ``app.repositories.counting`` for the modes"""
         try:
-            return self.db.query(self.model).count()
+            return RowCounter(self.db).count(self.model, *criteria, mode=mode)
         except SQLAlchemyError as e:
             logger.error(f"Error counting {self.model.__name__}: {e}")
             raise
@@ -115,7 +193,10 @@ class BaseRepository(Generic[ModelType]):
     def exists(self, id: int) -> bool:
         """Check if a record exists by ID"""
         try:
-            return self.db.query(self.model).filter(self.model.id == id).first() is not None
+            return self.db.execute(_exists(self.model), {"value": id}).first() is not None
         except SQLAlchemyError as e:
             logger.error(f"Error checking existence of {self.model.__name__} with id {id}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+
+_route_methods(BaseRepository)
@@ -0,0 +1,144 @@
+"""
+Row counts for paginated listings.
+
+An exact ``COUNT(*)`` reads every matching row, which on large tables
+costs more than the page itself. ``RowCounter`` offers three modes:
+
+- ``EXACT``: ``SELECT count(*)`` with the filter, without the subquery
+  ``Query.count()`` wraps around it.
+- ``ESTIMATED``: the planner's estimate on PostgreSQL, from
+  ``pg_class.reltuples`` (summed over partitions) for a whole table or from
+  ``EXPLAIN`` for a filter. Estimates below ``COUNT_ESTIMATE_THRESHOLD``
+  are cheap to replace with an exact count, and so is every count on
+  other databases.
+- ``CACHED``: an exact count kept in Redis for ``COUNT_CACHE_TTL_SECONDS``,
+  keyed by table and filter. If Redis is unavailable it counts exactly.
+
+Counts are returned as ``RowCount``, an ``int`` that records whether it
+is exact; ``APIResponse.paginated`` reports approximate totals as such.
+"""
+from typing import Any, Optional, Sequence
+import enum
+import hashlib
+import json
+from sqlalchemy import func, literal_column, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rows across a table's partitions (or the table itself when unpartitioned);
+# NULL while none has been analyzed yet
+_RELTUPLES_SQL = text(
+    "SELECT CASE WHEN max(reltuples) < 0 THEN NULL ELSE sum(greatest(reltuples, 0)) END FROM pg_class "
+    "WHERE (oid = to_regclass(:table) AND relkind = 'r') "
+    "OR oid IN (SELECT relid FROM pg_partition_tree(to_regclass(:table)) WHERE isleaf)"
+)
+
+
+def _rows(model: Any, criteria: Sequence[Any]) -> Select:
+    return select(literal_column("1")).select_from(model.__table__).where(*criteria)
+
+
+class CountMode(str, enum.Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+
+class RowCount(int):
+    """A row count; ``exact`` is False for estimates and cached values"""
+
+    def __new__(cls, value: int, exact: bool = True):
+        count = super().__new__(cls, value)
+        count.exact = exact
+        return count
+
+    def __repr__(self) -> str:
+        return f"RowCount({int(self)}, exact={self.exact})"
+
+
+class RowCounter:
+    """Counts rows of one model's table in a session, see the module docstring"""
+
+    def __init__(
+        self,
+        db: Session,
+        redis_connection: Any = None,
+        estimate_threshold: Optional[int] = None,
+        cache_ttl_seconds: Optional[int] = None,
+    ):
+        self.db = db
+        self._redis = redis_connection
+        self.estimate_threshold = (
+            estimate_threshold if estimate_threshold is not None else settings.COUNT_ESTIMATE_THRESHOLD
+        )
+        self.cache_ttl_seconds = cache_ttl_seconds or settings.COUNT_CACHE_TTL_SECONDS
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            # Imported lazily: dependencies imports the database module
+            from app.utils.dependencies import get_redis_connection
+            return get_redis_connection()
+        return self._redis
+
+    def count(self, model: Any, *criteria: Any, mode: CountMode = CountMode.EXACT) -> RowCount:
+        """Rows of ``model`` matching ``criteria`` (columns of the model's table)"""
+        mode = CountMode(mode)
+        rows = _rows(model, criteria)
+        if mode is CountMode.ESTIMATED:
+            return self._estimated(model.__table__.name, rows, filtered=bool(criteria))
+        if mode is CountMode.CACHED:
+            return self._cached(model.__table__.name, rows)
+        return self.exact(rows)
+
+    def exact(self, rows: Select) -> RowCount:
+        return RowCount(self.db.execute(rows.with_only_columns(func.count())).scalar() or 0)
+
+    def estimate(self, table: str, rows: Select, filtered: bool) -> Optional[float]:
+        """The planner's row estimate, or None where there is none"""
+        bind = self.db.get_bind()
+        if bind.dialect.name != "postgresql":
+            return None
+        conn = self.db.connection()
+        if not filtered:
+            return conn.execute(_RELTUPLES_SQL, {"table": table}).scalar()
+        plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + self._sql(rows)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]["Plan Rows"]
+
+    def _estimated(self, table: str, rows: Select, filtered: bool) -> RowCount:
+        estimate = self.estimate(table, rows, filtered)
+        if estimate is None or estimate < self.estimate_threshold:
+            return self.exact(rows)
+        return RowCount(round(estimate), exact=False)
+
+    def _sql(self, rows: Select) -> str:
+        # Values inline: EXPLAIN needs them and they distinguish cache keys
+        return str(rows.compile(dialect=self.db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+
+    def cache_key(self, model: Any, *criteria: Any) -> str:
+        return self._cache_key(model.__table__.name, _rows(model, criteria))
+
+    def _cache_key(self, table: str, rows: Select) -> str:
+        return f"count:{table}:{hashlib.sha256(self._sql(rows).encode()).hexdigest()[:32]}"
+
+    def _cached(self, table: str, rows: Select) -> RowCount:
+        key = self._cache_key(table, rows)
+        try:
+            cached = self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"Count cache unavailable, counting {table} exactly: {e}")
+            return self.exact(rows)
+        if cached is not None:
+            return RowCount(int(cached), exact=False)
+        total = self.exact(rows)
+        try:
+            self.redis.set(key, int(total), ex=self.cache_ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Could not cache count for {table}: {e}")
+        return total
@@ -0,0 +1,63 @@
+from typing import Any, Dict, List, Sequence
+from datetime import datetime
+import functools
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.replicas import reads_from_replica
+from app.models.gstin_verification import GstinVerification
+from app.repositories.base import IN_BATCH_SIZE
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Statements are built once; each call only binds its values
+_FRESH = select(GstinVerification).where(
+    GstinVerification.gstin.in_(bindparam("gstins", expanding=True)),
+    GstinVerification.expires_at > bindparam("now"),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _upsert(dialect: str):
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(GstinVerification)
+    columns = [column.name for column in GstinVerification.__table__.columns if column.name != "gstin"]
+    return stmt.on_conflict_do_update(
+        index_elements=[GstinVerification.gstin],
+        set_={name: stmt.excluded[name] for name in columns},
+    )
+
+
+class GstinVerificationRepository:
+    """Cached GSTIN registrations from the GST API"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @reads_from_replica
+    def get_fresh(self, gstins: Sequence[str], now: datetime) -> List[GstinVerification]:
+        """Verifications of ``gstins`` that have not expired by ``now``"""
+        gstins = list(gstins)
+        try:
+            found = []
+            for start in range(0, len(gstins), IN_BATCH_SIZE):
+                batch = gstins[start:start + IN_BATCH_SIZE]
+                found.extend(self.db.execute(_FRESH, {"gstins": batch, "now": now}).scalars())
+            return found
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting {len(gstins)} GSTIN verifications: {e}")
+            raise
+
+    def save_many(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Insert or refresh verifications (column dicts) in one statement and commit"""
+        if not rows:
+            return
+        try:
+            self.db.execute(_upsert(self.db.get_bind().dialect.name), list(rows))
+            self.db.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Error saving {len(rows)} GSTIN verifications: {e}")
+            self.db.rollback()
+            raise
@@ -0,0 +1,47 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.job_state import JobState
+import logging
+
+logger = logging.getLogger(__name__)
+
+_FOR_UPDATE = select(JobState).where(JobState.name == bindparam("name")).with_for_update()
+
+
+class JobStateRepository:
+    """Watermarks of incremental background jobs"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_for_update(self, name: str) -> JobState:
+        """
+        Load a job's state, creating it if needed, and lock the row until
+        the caller commits so two runs of the same job cannot overlap.
+        """
+        try:
+            state = self.db.execute(_FOR_UPDATE, {"name": name}).scalar_one_or_none()
+            if state is None:
+                state = JobState(name=name, watermark=None, last_id=0)
+                self.db.add(state)
+                self.db.flush()
+            return state
+        except SQLAlchemyError as e:
+            logger.error(f"Error loading job state {name}: {e}")
+            self.db.rollback()
+            raise
+
+    def get(self, name: str) -> Optional[JobState]:
+        try:
+            return self.db.get(JobState, name)
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting job state {name}: {e}")
+            raise
+
+    def advance(self, state: JobState, watermark: Optional[datetime], last_id: int) -> None:
+        """Move a job's watermark forward without committing"""
+        state.watermark = watermark
+        state.last_id = last_id
@@ -0,0 +1,93 @@
+"""
+Request-scoped loaders that batch relationship lookups.
+
+Serializing a list of orders reads ``order.user``, ``order.delivery_address``
+and each ``item.product``; left to lazy loading that is one query per row.
+``Loaders`` holds one ``DataLoader`` per model for the lifetime of a
+request, so the ids a response needs are fetched with one ``IN (...)``
+query per model and each record is fetched at most once::
+
+    loaders.prime(orders, Order.user, Order.delivery_address)
+    loaders.prime([item for order in orders for item in order.order_items], OrderItem.product)
+
+Records already in the session's identity map are not fetched again, and
+relationships that are already loaded are left alone.
+"""
+from typing import Any, Dict, Iterable, List, Type
+from fastapi import Depends
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.interfaces import MANYTOONE
+from app.core.database import get_db
+from app.models.address import Address
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.user import User
+from app.repositories.address import AddressRepository
+from app.repositories.base import IN_BATCH_SIZE, BaseRepository
+from app.repositories.order import OrderItemRepository, OrderRepository
+from app.repositories.product import ProductRepository
+from app.repositories.user import UserRepository
+from app.utils.dataloader import DataLoader
+
+REPOSITORIES: Dict[Any, Type[BaseRepository]] = {
+    User: UserRepository,
+    Address: AddressRepository,
+    Product: ProductRepository,
+    Order: OrderRepository,
+    OrderItem: OrderItemRepository,
+}
+
+
+class Loaders:
+    """One ``DataLoader`` per model, keyed by id, for one session"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._loaders: Dict[Any, DataLoader] = {}
+
+    def for_model(self, model: Any) -> DataLoader:
+        loader = self._loaders.get(model)
+        if loader is None:
+            repository_class = REPOSITORIES.get(model)
+            repository = repository_class(self.db) if repository_class else BaseRepository(model, self.db)
+            loader = self._loaders[model] = DataLoader(repository.get_many_by_ids, max_batch_size=IN_BATCH_SIZE)
+        return loader
+
+    def prime(self, objects: Iterable[Any], *relationships: Any) -> List[Any]:
+        """
+        Load many-to-one ``relationships`` (e.g. ``Order.user``) of ``objects``
+        with one query per related model; returns ``objects`` as a list.
+        """
+        objects = list(objects)
+        for relationship in relationships:
+            prop = relationship.property
+            if prop.direction is not MANYTOONE:
+                raise ValueError(f"{relationship} is not a many-to-one relationship")
+            (local, remote), = prop.local_remote_pairs
+            if remote.name != "id":
+                raise ValueError(f"{relationship} does not reference an id")
+            model = prop.mapper.class_
+            loader = self.for_model(model)
+            pending = [obj for obj in objects if prop.key in inspect(obj).unloaded]
+            foreign_keys = [getattr(obj, prop.parent.get_property_by_column(local).key) for obj in pending]
+            for key in foreign_keys:
+                if key is not None and self._cached(loader, model, key) is None:
+                    loader.load(key)
+            loader.dispatch()
+            for obj, key in zip(pending, foreign_keys):
+                set_committed_value(obj, prop.key, loader.get(key) if key is not None else None)
+        return objects
+
+    def _cached(self, loader: DataLoader, model: Any, key: Any) -> Any:
+        # Reuse a record the session already holds rather than fetching it
+        found = self.db.identity_map.get(inspect(model).identity_key_from_primary_key((key,)))
+        if found is not None:
+            loader.prime(key, found)
+        return found
+
+
+def get_loaders(db: Session = Depends(get_db)) -> Loaders:
+    """Dependency: loaders shared by everything serving one request"""
+    return Loaders(db)
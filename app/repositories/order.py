@@ -1,14 +1,158 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session, joinedload
+from typing import Iterable, Optional, List, Tuple
+from dataclasses import dataclass
+from decimal import Decimal
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql import Select
 from datetime import datetime, timezone
-from app.models.order import Order, OrderItem, OrderStatus
-from app.repositories.base import BaseRepository
+from app.models.order import ORDER_IS_ACTIVE, ORDER_STATUS_TRANSITIONS, Order, OrderItem, OrderStatus
+from app.models.address import Address
+from app.models.product import Product
+from app.models.user import User
+from app.repositories.base import BaseRepository, paged
+from app.repositories.outbox import OutboxRepository
+from app.repositories.projections import Projection
+from app.schemas.order import OrderItemResponse, OrderResponse
+from app.services.order_events import order_status_event, publish_order_event, publish_order_events
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class OrderSummary:
+    """Order header with item aggregates, for history listings"""
+    id: int
+    order_number: str
+    user_id: int
+    status: OrderStatus
+    total_amount: Decimal
+    tax_amount: Decimal
+    shipping_cost: Decimal
+    estimated_delivery_date: Optional[datetime]
+    created_at: Optional[datetime]
+    item_count: int
+    unit_count: int
+    items_total: Decimal
+
+
+@dataclass(slots=True)
+class BulkStatusResult:
+    updated_ids: List[int]
+    skipped_ids: List[int]  # Unknown, or no longer in the expected status
+
+
+def _newest_first(c) -> list:
+    return [c.created_at.desc(), c.id.desc()]
+
+
+def _due_first(c) -> list:
+    return [c.estimated_delivery_date.asc(), c.id.asc()]
+
+
+def _summaries_statement(*criteria, order_by) -> Select:
+    """
+    Page orders first, then aggregate only that page's items.
+
+    LIMIT/OFFSET apply to orders rather than joined item rows, and no
+    ORM objects are created. ``order_by`` maps a column namespace
+    (``Order`` or the page subquery's columns) to sort clauses.
+    """
+    page = paged(
+        select(
+            Order.id,
+            Order.order_number,
+            Order.user_id,
+            Order.status,
+            Order.total_amount,
+            Order.tax_amount,
+            Order.shipping_cost,
+            Order.estimated_delivery_date,
+            Order.created_at,
+        )
+        .where(*criteria)
+        .order_by(*order_by(Order))
+    ).subquery()
+    return (
+        select(
+            *page.c,
+            func.count(OrderItem.id),
+            func.coalesce(func.sum(OrderItem.quantity), 0),
+            func.coalesce(func.sum(OrderItem.total_price), 0),
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == page.c.id)
+        .group_by(*page.c)
+        .order_by(*order_by(page.c))
+    )
+
+
+# Statements are built once; each call only binds its values
+_WITH_ITEMS = select(Order).options(selectinload(Order.order_items))
+_BY_NUMBER = (
+    select(Order)
+    .options(joinedload(Order.order_items))
+    .where(Order.order_number == bindparam("order_number"))
+    .limit(1)
+)
+_BY_USER = paged(_WITH_ITEMS.where(Order.user_id == bindparam("user_id")).order_by(Order.created_at.desc()))
+_BY_STATUS = paged(_WITH_ITEMS.where(Order.status == bindparam("status")).order_by(Order.created_at.desc()))
+_BY_DATE_RANGE = paged(
+    _WITH_ITEMS
+    .where(Order.created_at >= bindparam("start_date"), Order.created_at <= bindparam("end_date"))
+    .order_by(Order.created_at.desc())
+)
+_OVERDUE = paged(
+    _WITH_ITEMS
+    .where(Order.estimated_delivery_date < bindparam("now"), ORDER_IS_ACTIVE)
+    .order_by(Order.estimated_delivery_date.asc())
+)
+_BY_IDS = _WITH_ITEMS.where(Order.id.in_(bindparam("order_ids", expanding=True))).order_by(Order.id)
+_WEIGHT = func.coalesce(func.sum(OrderItem.quantity * func.coalesce(Product.weight_kg, 0)), 0)
+_WEIGHTS_BY_STATUS = (
+    select(Order.id, Address.postal_code, _WEIGHT)
+    .join(Address, Order.delivery_address_id == Address.id)
+    .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+    .outerjoin(Product, Product.id == OrderItem.product_id)
+    .where(Order.status == bindparam("status"), Order.estimated_delivery_date < bindparam("due_before"))
+    .group_by(Order.id, Address.postal_code)
+    .order_by(Order.id)
+)
+_USER_SUMMARIES = _summaries_statement(Order.user_id == bindparam("user_id"), order_by=_newest_first)
+_STATUS_SUMMARIES = _summaries_statement(Order.status == bindparam("status"), order_by=_newest_first)
+_DATE_RANGE_SUMMARIES = _summaries_statement(
+    Order.created_at >= bindparam("start_date"), Order.created_at <= bindparam("end_date"),
+    order_by=_newest_first,
+)
+_OVERDUE_SUMMARIES = _summaries_statement(
+    Order.estimated_delivery_date < bindparam("now"), ORDER_IS_ACTIVE, order_by=_due_first,
+)
+
+ORDER_RESPONSE = Projection(OrderResponse, Order, exclude=("order_items",))
+ORDER_ITEM_RESPONSE = Projection(OrderItemResponse, OrderItem)
+_USER_ORDER_ROWS = paged(
+    select(*ORDER_RESPONSE.columns).where(Order.user_id == bindparam("user_id")).order_by(Order.created_at.desc())
+)
+_ITEM_ROWS = (
+    select(*ORDER_ITEM_RESPONSE.columns)
+    .where(OrderItem.order_id.in_(bindparam("order_ids", expanding=True)))
+    .order_by(OrderItem.order_id, OrderItem.id)
+)
+
+_ITEMS_BY_ORDER = select(OrderItem).where(OrderItem.order_id == bindparam("order_id"))
+_ITEMS_BY_PRODUCT = paged(select(OrderItem).where(OrderItem.product_id == bindparam("product_id")))
+_PICK_COLUMNS = (OrderItem.order_id, OrderItem.product_id, Product.sku, Product.name, Product.bin_location)
+_PICK_ROWS = (
+    select(*_PICK_COLUMNS, func.sum(OrderItem.quantity))
+    .join(Order, Order.id == OrderItem.order_id)
+    .join(Product, Product.id == OrderItem.product_id)
+    .where(Order.status == bindparam("status"))
+    .group_by(*_PICK_COLUMNS)
+    .order_by(OrderItem.order_id)
+)
+_PICK_ROWS_FOR_ORDERS = _PICK_ROWS.where(OrderItem.order_id.in_(bindparam("order_ids", expanding=True)))
+
+
 class OrderRepository(BaseRepository[Order]):
     """Order-specific repository with additional methods"""
 
@@ -18,12 +162,7 @@ class OrderRepository(BaseRepository[Order]):
     def get_by_order_number(self, order_number: str) -> Optional[Order]:
         """Get order by order number"""
         try:
-            return (
-                self.db.query(Order)
-                .options(joinedload(Order.order_items))
-                .filter(Order.order_number == order_number)
-                .first()
-            )
+            return self.db.execute(_BY_NUMBER, {"order_number": order_number}).unique().scalars().first()
         except SQLAlchemyError as e:
             logger.error(f"Error getting order by number {order_number}: {e}")
             raise
@@ -31,31 +170,35 @@ class OrderRepository(BaseRepository[Order]):
     def get_user_orders(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Order]:
         """Get orders for a specific user"""
         try:
-            return (
-                self.db.query(Order)
-                .options(joinedload(Order.order_items))
-                .filter(Order.user_id == user_id)
-                .order_by(Order.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(_BY_USER, {"user_id": user_id, "skip": skip, "limit": limit}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting orders for user {user_id}: {e}")
             raise
 
+    def get_user_order_responses(self, user_id: int, skip: int = 0, limit: int = 100) -> List[OrderResponse]:
+        """
+        Get a user's orders with their items as responses, like
+        ``get_user_orders`` but built from column tuples: one query for the
+        page of orders and one for their items, no ORM objects.
+        """
+        try:
+            orders = self.db.execute(_USER_ORDER_ROWS, {"user_id": user_id, "skip": skip, "limit": limit}).all()
+            if not orders:
+                return []
+            items = {}
+            for item in ORDER_ITEM_RESPONSE.build_all(
+                self.db.execute(_ITEM_ROWS, {"order_ids": [order.id for order in orders]})
+            ):
+                items.setdefault(item.order_id, []).append(item)
+            return [ORDER_RESPONSE.build(order, order_items=items.get(order.id, [])) for order in orders]
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting order responses for user {user_id}: {e}")
+            raise
+
     def get_by_status(self, status: OrderStatus, skip: int = 0, limit: int = 100) -> List[Order]:
         """Get orders by status"""
         try:
-            return (
-                self.db.query(Order)
-                .options(joinedload(Order.order_items))
-                .filter(Order.status == status)
-                .order_by(Order.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(_BY_STATUS, {"status": status, "skip": skip, "limit": limit}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting orders by status {status}: {e}")
             raise
@@ -63,16 +206,9 @@ class OrderRepository(BaseRepository[Order]):
     def get_orders_by_date_range(self, start_date: datetime, end_date: datetime, skip: int = 0, limit: int = 100) -> List[Order]:
         """Get orders within a date range"""
         try:
-            return (
-                self.db.query(Order)
-                .options(joinedload(Order.order_items))
-                .filter(Order.created_at >= start_date)
-                .filter(Order.created_at <= end_date)
-                .order_by(Order.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(
+                _BY_DATE_RANGE, {"start_date": start_date, "end_date": end_date, "skip": skip, "limit": limit}
+            ).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting orders by date range: {e}")
             raise
@@ -82,19 +218,82 @@ class OrderRepository(BaseRepository[Order]):
         try:
             order = self.get_by_id(order_id)
             if order:
+                previous_status = order.status
                 order.status = status
                 if status == OrderStatus.DELIVERED:
                     order.actual_delivery_date = datetime.now(timezone.utc)
+                if status != previous_status:
+                    # Notifications commit with the status change and are sent by the outbox worker
+                    OutboxRepository(self.db).add_order_notifications(
+                        order, "order.status_changed", previous_status=previous_status.value
+                    )
                 
                 self.db.commit()
                 self.db.refresh(order)
                 logger.info(f"Updated order {order_id} status to {status}")
+                if status != previous_status:
+                    # Live push to connected clients; only after the change is durable
+                    publish_order_event(order_status_event(order, previous_status))
             return order
         except SQLAlchemyError as e:
             logger.error(f"Error updating order {order_id} status: {e}")
             self.db.rollback()
             raise
 
+    def bulk_update_status(
+        self, order_ids: Iterable[int], from_status: OrderStatus, to_status: OrderStatus
+    ) -> BulkStatusResult:
+        """
+        Move many orders from ``from_status`` to ``to_status`` in one UPDATE.
+
+        Only orders still in ``from_status`` change, so concurrent updates
+        and repeated requests are safe; the rest are reported as skipped.
+        Notifications for all changed orders are queued with one INSERT in
+        the same transaction, and live events are published in one batch
+        after the commit.
+        """
+        if to_status not in ORDER_STATUS_TRANSITIONS[from_status]:
+            raise ValueError(f"Cannot change order status from {from_status.value} to {to_status.value}")
+        ids = list(dict.fromkeys(order_ids))
+        if not ids:
+            return BulkStatusResult(updated_ids=[], skipped_ids=[])
+        try:
+            values = {"status": to_status}
+            if to_status == OrderStatus.DELIVERED:
+                values["actual_delivery_date"] = datetime.now(timezone.utc)
+            rows = self.db.execute(
+                update(Order)
+                .where(Order.id.in_(ids), Order.status == from_status)
+                .values(**values)
+                .returning(
+                    Order.id, Order.order_number, Order.user_id, Order.status,
+                    Order.total_amount, Order.estimated_delivery_date,
+                )
+            ).all()
+            if rows:
+                users = {
+                    user.id: user
+                    for user in self.db.execute(
+                        select(User).where(User.id.in_({row.user_id for row in rows}))
+                    ).scalars()
+                }
+                OutboxRepository(self.db).add_bulk_order_notifications(
+                    rows, users, "order.status_changed", previous_status=from_status.value
+                )
+            self.db.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk updating {len(ids)} orders to {to_status}: {e}")
+            self.db.rollback()
+            raise
+
+        publish_order_events([order_status_event(row, from_status) for row in rows])
+        updated = {row.id for row in rows}
+        logger.info(f"Moved {len(updated)}/{len(ids)} orders from {from_status.value} to {to_status.value}")
+        return BulkStatusResult(
+            updated_ids=[order_id for order_id in ids if order_id in updated],
+            skipped_ids=[order_id for order_id in ids if order_id not in updated],
+        )
+
     def get_pending_orders(self, skip: int = 0, limit: int = 100) -> List[Order]:
         """Get pending orders"""
         return self.get_by_status(OrderStatus.PENDING, skip, limit)
@@ -102,21 +301,66 @@ class OrderRepository(BaseRepository[Order]):
     def get_overdue_orders(self, skip: int = 0, limit: int = 100) -> List[Order]:
         """Get orders that are overdue for delivery"""
         try:
-            current_time = datetime.now(timezone.utc)
-            return (
-                self.db.query(Order)
-                .options(joinedload(Order.order_items))
-                .filter(Order.estimated_delivery_date < current_time)
-                .filter(Order.status.in_([OrderStatus.CONFIRMED, OrderStatus.PROCESSING, OrderStatus.SHIPPED]))
-                .order_by(Order.estimated_delivery_date.asc())
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(
+                _OVERDUE, {"now": datetime.now(timezone.utc), "skip": skip, "limit": limit}
+            ).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting overdue orders: {e}")
             raise
 
+    def get_order_weights_by_status(self, status: OrderStatus, due_before: datetime) -> List[Tuple[int, str, Decimal]]:
+        """Get (order_id, postal_code, total_weight_kg) for orders in a status due before ``due_before``"""
+        try:
+            return self.db.execute(_WEIGHTS_BY_STATUS, {"status": status, "due_before": due_before}).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting order weights by status {status}: {e}")
+            raise
+
+    def _summaries(self, stmt: Select, **params) -> List[OrderSummary]:
+        return [OrderSummary(*row) for row in self.db.execute(stmt, params)]
+
+    def get_user_order_summaries(self, user_id: int, skip: int = 0, limit: int = 100) -> List[OrderSummary]:
+        """Get order summaries for a specific user"""
+        try:
+            return self._summaries(_USER_SUMMARIES, user_id=user_id, skip=skip, limit=limit)
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting order summaries for user {user_id}: {e}")
+            raise
+
+    def get_order_summaries_by_status(self, status: OrderStatus, skip: int = 0, limit: int = 100) -> List[OrderSummary]:
+        """Get order summaries by status"""
+        try:
+            return self._summaries(_STATUS_SUMMARIES, status=status, skip=skip, limit=limit)
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting order summaries by status {status}: {e}")
+            raise
+
+    def get_order_summaries_by_date_range(self, start_date: datetime, end_date: datetime, skip: int = 0, limit: int = 100) -> List[OrderSummary]:
+        """Get order summaries within a date range"""
+        try:
+            return self._summaries(
+                _DATE_RANGE_SUMMARIES, start_date=start_date, end_date=end_date, skip=skip, limit=limit
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting order summaries by date range: {e}")
+            raise
+
+    def get_overdue_order_summaries(self, skip: int = 0, limit: int = 100) -> List[OrderSummary]:
+        """Get summaries of orders that are overdue for delivery"""
+        try:
+            return self._summaries(_OVERDUE_SUMMARIES, now=datetime.now(timezone.utc), skip=skip, limit=limit)
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting overdue order summaries: {e}")
+            raise
+
+    def get_with_items(self, order_ids: List[int]) -> List[Order]:
+        """Load full orders with their items on demand"""
+        try:
+            return self.db.execute(_BY_IDS, {"order_ids": order_ids}).scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting orders with items: {e}")
+            raise
+
 
 class OrderItemRepository(BaseRepository[OrderItem]):
     """OrderItem-specific repository with additional methods"""
@@ -127,11 +371,7 @@ class OrderItemRepository(BaseRepository[OrderItem]):
     def get_by_order_id(self, order_id: int) -> List[OrderItem]:
         """Get all items for a specific order"""
         try:
-            return (
-                self.db.query(OrderItem)
-                .filter(OrderItem.order_id == order_id)
-                .all()
-            )
+            return self.db.execute(_ITEMS_BY_ORDER, {"order_id": order_id}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting order items for order {order_id}: {e}")
             raise
@@ -139,13 +379,24 @@ class OrderItemRepository(BaseRepository[OrderItem]):
     def get_by_product_id(self, product_id: int, skip: int = 0, limit: int = 100) -> List[OrderItem]:
         """Get all order items for a specific product"""
         try:
-            return (
-                self.db.query(OrderItem)
-                .filter(OrderItem.product_id == product_id)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(
+                _ITEMS_BY_PRODUCT, {"product_id": product_id, "skip": skip, "limit": limit}
+            ).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting order items for product {product_id}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def get_pick_rows(self, status: OrderStatus, order_ids: Optional[List[int]] = None) -> List[Tuple]:
+        """
+        Get per-order, per-product quantities for orders in a status.
+
+        Returns (order_id, product_id, sku, name, bin_location, quantity)
+        rows aggregated in SQL, without loading ``Order.order_items``.
+        """
+        try:
+            if order_ids is None:
+                return self.db.execute(_PICK_ROWS, {"status": status}).all()
+            return self.db.execute(_PICK_ROWS_FOR_ORDERS, {"status": status, "order_ids": order_ids}).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting pick rows for status {status}: {e}")
+            raise
@@ -0,0 +1,171 @@
+from typing import Any, Dict, List, Optional, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.order import Order
+from app.models.outbox import NotificationChannel, OutboxMessage, OutboxStatus
+from app.models.user import User
+from app.repositories.base import BaseRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+_DUE = (
+    select(
+        OutboxMessage.id,
+        OutboxMessage.topic,
+        OutboxMessage.channel,
+        OutboxMessage.recipient,
+        OutboxMessage.payload,
+        OutboxMessage.attempts,
+    )
+    .where(OutboxMessage.status == OutboxStatus.PENDING, OutboxMessage.available_at <= bindparam("now"))
+    .order_by(OutboxMessage.available_at, OutboxMessage.id)
+    .limit(bindparam("limit"))
+    .with_for_update(skip_locked=True)
+)
+_LEASE = (
+    update(OutboxMessage)
+    .where(OutboxMessage.id.in_(bindparam("ids", expanding=True)))
+    .values(available_at=bindparam("lease_until"))
+)
+
+
+def _notification_rows(order: Any, user: User, topic: str, now: datetime, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    payload = {
+        "order_id": order.id,
+        "order_number": order.order_number,
+        "status": order.status.value if order.status is not None else None,
+        "total_amount": str(order.total_amount) if order.total_amount is not None else None,
+        "business_name": user.business_name,
+        **data,
+    }
+    recipients = [(NotificationChannel.EMAIL, user.email), (NotificationChannel.SMS, user.phone)]
+    return [
+        {
+            "topic": topic,
+            "channel": channel,
+            "recipient": recipient,
+            "aggregate_type": "order",
+            "aggregate_id": order.id,
+            "payload": payload,
+            "available_at": now,
+        }
+        for channel, recipient in recipients
+        if recipient
+    ]
+
+
+@dataclass(slots=True)
+class ClaimedMessage:
+    """Outbox message leased to a worker for delivery"""
+    id: int
+    topic: str
+    channel: NotificationChannel
+    recipient: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+@dataclass(slots=True)
+class DeliveryResult:
+    message_id: int
+    attempts: int
+    error: Optional[str] = None
+    retry_at: Optional[datetime] = None  # None with an error means give up
+
+    @property
+    def sent(self) -> bool:
+        return self.error is None
+
+
+class OutboxRepository(BaseRepository[OutboxMessage]):
+    """
+    Transactional outbox for notifications.
+
+    Messages are added to the caller's session and committed together with
+    the change that caused them; workers then claim and deliver them.
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(OutboxMessage, db)
+
+    def add_order_notifications(self, order: Order, topic: str, **data: Any) -> List[OutboxMessage]:
+        """Queue email and SMS messages for an order event without committing"""
+        messages = [
+            OutboxMessage(**row)
+            for row in _notification_rows(order, order.user, topic, datetime.now(timezone.utc), data)
+        ]
+        self.db.add_all(messages)
+        return messages
+
+    def add_bulk_order_notifications(
+        self, orders: Sequence[Any], users: Dict[int, User], topic: str, **data: Any
+    ) -> int:
+        """
+        Queue messages for many orders with one multi-row INSERT, without
+        committing. ``orders`` are rows with id, order_number, user_id,
+        status and total_amount; ``users`` maps their user ids to users.
+        """
+        now = datetime.now(timezone.utc)
+        rows = [
+            row
+            for order in orders
+            for row in _notification_rows(order, users[order.user_id], topic, now, data)
+        ]
+        if rows:
+            self.db.execute(insert(OutboxMessage), rows)
+        return len(rows)
+
+    def claim_batch(self, limit: int, lease_seconds: float) -> List[ClaimedMessage]:
+        """
+        Lease up to ``limit`` due messages.
+
+        Claimed rows are pushed ``lease_seconds`` into the future so other
+        workers skip them; a worker that dies mid-batch simply lets the
+        lease expire and the messages are retried.
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            rows = self.db.execute(_DUE, {"now": now, "limit": limit}).all()
+            if rows:
+                self.db.execute(_LEASE, {
+                    "ids": [row.id for row in rows],
+                    "lease_until": now + timedelta(seconds=lease_seconds),
+                })
+            self.db.commit()
+            return [ClaimedMessage(*row) for row in rows]
+        except SQLAlchemyError as e:
+            logger.error(f"Error claiming outbox messages: {e}")
+            self.db.rollback()
+            raise
+
+    def record_results(self, results: Sequence[DeliveryResult]) -> None:
+        """Store delivery outcomes for a batch in one executemany"""
+        if not results:
+            return
+        try:
+            now = datetime.now(timezone.utc)
+            rows = []
+            for result in results:
+                row = {"id": result.message_id, "attempts": result.attempts, "last_error": result.error}
+                if result.sent:
+                    row.update(status=OutboxStatus.SENT, sent_at=now)
+                elif result.retry_at is not None:
+                    row.update(status=OutboxStatus.PENDING, available_at=result.retry_at)
+                else:
+                    row.update(status=OutboxStatus.FAILED)
+                rows.append(row)
+            # Bulk UPDATE by primary key needs every row to carry the same keys
+            for keys in {tuple(sorted(row)) for row in rows}:
+                self.db.execute(update(OutboxMessage), [row for row in rows if tuple(sorted(row)) == keys])
+            self.db.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Error recording outbox delivery results: {e}")
+            self.db.rollback()
+            raise
+
+    def count_by_status(self, status: OutboxStatus) -> int:
+        return self.count(OutboxMessage.status == status)
@@ -1,12 +1,36 @@
 from typing import Optional, List
+from sqlalchemy import bindparam, or_, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.product import Product
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, paged
+from app.repositories.projections import Projection
+from app.schemas.product import ProductResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Statements are built once; each call only binds its values
+_BY_SKU = select(Product).where(Product.sku == bindparam("sku")).limit(1)
+_BY_CATEGORY = paged(select(Product).where(Product.category == bindparam("category")))
+_ACTIVE = paged(select(Product).where(Product.is_active == True))
+_IN_STOCK = paged(select(Product).where(Product.stock_quantity > 0, Product.is_active == True))
+_LOW_STOCK = paged(select(Product).where(
+    Product.stock_quantity <= bindparam("threshold"), Product.stock_quantity > 0, Product.is_active == True,
+))
+_SEARCH = paged(select(Product).where(
+    or_(
+        Product.name.ilike(bindparam("pattern")),
+        Product.description.ilike(bindparam("pattern")),
+        Product.sku.ilike(bindparam("pattern")),
+    ),
+    Product.is_active == True,
+))
+_CATEGORIES = select(Product.category).where(Product.category.isnot(None)).distinct()
+
+PRODUCT_RESPONSE = Projection(ProductResponse, Product)
+_ACTIVE_ROWS = paged(select(*PRODUCT_RESPONSE.columns).where(Product.is_active == True))
+
 
 class ProductRepository(BaseRepository[Product]):
     """Product-specific repository with additional methods"""
@@ -17,7 +41,7 @@ class ProductRepository(BaseRepository[Product]):
     def get_by_sku(self, sku: str) -> Optional[Product]:
         """Get product by SKU"""
         try:
-            return self.db.query(Product).filter(Product.sku == sku).first()
+            return self.db.execute(_BY_SKU, {"sku": sku}).scalars().first()
         except SQLAlchemyError as e:
             logger.error(f"Error getting product by SKU {sku}: {e}")
             raise
@@ -25,13 +49,9 @@ class ProductRepository(BaseRepository[Product]):
     def get_by_category(self, category: str, skip: int = 0, limit: int = 100) -> List[Product]:
         """Get products by category"""
         try:
-            return (
-                self.db.query(Product)
-                .filter(Product.category == category)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(
+                _BY_CATEGORY, {"category": category, "skip": skip, "limit": limit}
+            ).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting products by category {category}: {e}")
             raise
@@ -39,28 +59,23 @@ class ProductRepository(BaseRepository[Product]):
     def get_active_products(self, skip: int = 0, limit: int = 100) -> List[Product]:
         """Get active products"""
         try:
-            return (
-                self.db.query(Product)
-                .filter(Product.is_active == True)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(_ACTIVE, {"skip": skip, "limit": limit}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting active products: {e}")
             raise
 
+    def get_active_product_responses(self, skip: int = 0, limit: int = 100) -> List[ProductResponse]:
+        """Get active products as responses, built from column tuples without ORM objects"""
+        try:
+            return PRODUCT_RESPONSE.build_all(self.db.execute(_ACTIVE_ROWS, {"skip": skip, "limit": limit}))
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting active product responses: {e}")
+            raise
+
     def get_in_stock_products(self, skip: int = 0, limit: int = 100) -> List[Product]:
         """Get products that are in stock"""
         try:
-            return (
-                self.db.query(Product)
-                .filter(Product.stock_quantity > 0)
-                .filter(Product.is_active == True)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(_IN_STOCK, {"skip": skip, "limit": limit}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting in-stock products: {e}")
             raise
@@ -68,15 +83,9 @@ class ProductRepository(BaseRepository[Product]):
     def get_low_stock_products(self, threshold: int = 10, skip: int = 0, limit: int = 100) -> List[Product]:
         """Get products with low stock"""
         try:
-            return (
-                self.db.query(Product)
-                .filter(Product.stock_quantity <= threshold)
-                .filter(Product.stock_quantity > 0)
-                .filter(Product.is_active == True)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(
+                _LOW_STOCK, {"threshold": threshold, "skip": skip, "limit": limit}
+            ).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting low stock products: {e}")
             raise
@@ -84,18 +93,9 @@ class ProductRepository(BaseRepository[Product]):
     def search_products(self, search_term: str, skip: int = 0, limit: int = 100) -> List[Product]:
         """Search products by name, description, or SKU"""
         try:
-            return (
-                self.db.query(Product)
-                .filter(
-                    (Product.name.ilike(f"%{search_term}%")) |
-                    (Product.description.ilike(f"%{search_term}%")) |
-                    (Product.sku.ilike(f"%{search_term}%"))
-                )
-                .filter(Product.is_active == True)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(
+                _SEARCH, {"pattern": f"%{search_term}%", "skip": skip, "limit": limit}
+            ).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error searching products with term {search_term}: {e}")
             raise
@@ -122,8 +122,7 @@ class ProductRepository(BaseRepository[Product]):
     def get_categories(self) -> List[str]:
         """Get all unique product categories"""
         try:
-            result = self.db.query(Product.category).filter(Product.category.isnot(None)).distinct().all()
-            return [category[0] for category in result if category[0]]
+            return [category for category in self.db.execute(_CATEGORIES).scalars() if category]
         except SQLAlchemyError as e:
             logger.error(f"Error getting product categories: {e}")
             raise
\ No newline at end of file
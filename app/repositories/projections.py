@@ -0,0 +1,41 @@
+"""
+Response schemas built straight from column tuples.
+
+Listing full ORM objects and then ``Schema.model_validate(obj)`` pays for
+two object layers per row: identity-map bookkeeping and attribute
+instrumentation, then validation of values the database already holds.
+A ``Projection`` selects just the columns a response schema declares and
+builds the schema with ``model_construct``, which skips validation; the
+values were validated on the way in. The schemas stay the contract:
+the columns are derived from their fields, and serializing through
+``dump``/``dump_json`` uses pydantic's own serializer.
+"""
+from typing import Any, Generic, Iterable, List, Sequence, Type, TypeVar
+from pydantic import BaseModel, TypeAdapter
+
+S = TypeVar("S", bound=BaseModel)
+
+
+class Projection(Generic[S]):
+    """The columns of ``model`` named by the fields of ``schema``, minus ``exclude``"""
+
+    def __init__(self, schema: Type[S], model: Any, exclude: Sequence[str] = ()):
+        self.schema = schema
+        self.fields = tuple(name for name in schema.model_fields if name not in exclude)
+        self.columns = tuple(getattr(model, name) for name in self.fields)
+        self._adapter = TypeAdapter(List[schema])
+
+    def build(self, row: Sequence[Any], **extra: Any) -> S:
+        """A schema instance from one row of ``columns``, without validation"""
+        return self.schema.model_construct(**dict(zip(self.fields, row)), **extra)
+
+    def build_all(self, rows: Iterable[Sequence[Any]]) -> List[S]:
+        construct, fields = self.schema.model_construct, self.fields
+        return [construct(**dict(zip(fields, row))) for row in rows]
+
+    def dump(self, items: List[S]) -> List[Any]:
+        """JSON-ready dicts, e.g. for ``APIResponse``"""
+        return self._adapter.dump_python(items, mode="json")
+
+    def dump_json(self, items: List[S]) -> bytes:
+        return self._adapter.dump_json(items)
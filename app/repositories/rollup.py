@@ -0,0 +1,104 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.replicas import reads_from_replica
+from app.models.order import OrderStatus
+from app.models.product import Product
+from app.models.rollup import InventoryRollupDaily, OrderRollupDaily, OrderRollupHourly, ProductSalesDaily
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _revenue_statement(table):
+    return (
+        select(table.bucket_start, table.business_type, func.sum(table.order_count), func.sum(table.revenue))
+        .where(
+            table.bucket_start >= bindparam("start"),
+            table.bucket_start < bindparam("end"),
+            table.status != OrderStatus.CANCELLED,
+        )
+        .group_by(table.bucket_start, table.business_type)
+        .order_by(table.bucket_start, table.business_type)
+    )
+
+
+# Statements are built once; each call only binds its values
+_REVENUE = {table: _revenue_statement(table) for table in (OrderRollupDaily, OrderRollupHourly)}
+_STATUS_COUNTS = (
+    select(OrderRollupDaily.status, func.sum(OrderRollupDaily.order_count)).group_by(OrderRollupDaily.status)
+)
+_PRODUCT_REVENUE = func.sum(ProductSalesDaily.revenue).label("revenue")
+_TOP_PRODUCTS = (
+    select(
+        ProductSalesDaily.product_id, Product.sku, Product.name,
+        func.sum(ProductSalesDaily.units), _PRODUCT_REVENUE,
+    )
+    .join(Product, Product.id == ProductSalesDaily.product_id)
+    .where(ProductSalesDaily.bucket_start >= bindparam("start"), ProductSalesDaily.bucket_start < bindparam("end"))
+    .group_by(ProductSalesDaily.product_id, Product.sku, Product.name)
+    .order_by(_PRODUCT_REVENUE.desc(), ProductSalesDaily.product_id)
+    .limit(bindparam("limit"))
+)
+_LATEST_INVENTORY = select(InventoryRollupDaily).order_by(InventoryRollupDaily.bucket_start.desc()).limit(1)
+
+
+class RollupRepository:
+    """Dashboard reads; every query touches only the rollup tables and may use a replica"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @reads_from_replica
+    def revenue_by_day(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """Non-cancelled orders and revenue per day and business type"""
+        return self._revenue(OrderRollupDaily, start, end)
+
+    @reads_from_replica
+    def revenue_by_hour(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """Non-cancelled orders and revenue per hour and business type"""
+        return self._revenue(OrderRollupHourly, start, end)
+
+    def _revenue(self, table, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        try:
+            rows = self.db.execute(_REVENUE[table], {"start": start, "end": end}).all()
+            return [
+                {"bucket_start": bucket, "business_type": business_type.value, "orders": orders, "revenue": revenue}
+                for bucket, business_type, orders, revenue in rows
+            ]
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading revenue rollups: {e}")
+            raise
+
+    @reads_from_replica
+    def order_counts_by_status(self) -> Dict[str, int]:
+        """Current number of orders in each status"""
+        try:
+            rows = self.db.execute(_STATUS_COUNTS).all()
+            return {status.value: int(count) for status, count in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading order status rollups: {e}")
+            raise
+
+    @reads_from_replica
+    def top_products(self, start: datetime, end: datetime, limit: int = 10) -> List[Dict[str, Any]]:
+        """Best-selling products by revenue"""
+        try:
+            rows = self.db.execute(_TOP_PRODUCTS, {"start": start, "end": end, "limit": limit}).all()
+            return [
+                {"product_id": product_id, "sku": sku, "name": name, "units": int(units), "revenue": revenue}
+                for product_id, sku, name, units, revenue in rows
+            ]
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading product sales rollups: {e}")
+            raise
+
+    @reads_from_replica
+    def latest_inventory(self) -> Optional[InventoryRollupDaily]:
+        try:
+            return self.db.execute(_LATEST_INVENTORY).scalar_one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading inventory rollups: {e}")
+            raise
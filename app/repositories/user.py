@@ -1,12 +1,25 @@
 from typing import Optional, List
+from sqlalchemy import bindparam, or_, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.user import User, BusinessType
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, paged
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Statements are built once; each call only binds its values
+_BY_EMAIL = select(User).where(User.email == bindparam("email")).limit(1)
+_BY_GSTIN = select(User).where(User.gstin == bindparam("gstin")).limit(1)
+_BY_PHONE = select(User).where(User.phone == bindparam("phone")).limit(1)
+_BY_BUSINESS_TYPE = paged(select(User).where(User.business_type == bindparam("business_type")))
+_ACTIVE = paged(select(User).where(User.is_active == True))
+_VERIFIED = paged(select(User).where(User.is_verified == True))
+_SEARCH = paged(select(User).where(or_(
+    User.business_name.ilike(bindparam("pattern")),
+    User.email.ilike(bindparam("pattern")),
+)))
+
 
 class UserRepository(BaseRepository[User]):
     """User-specific repository with additional methods"""
@@ -17,7 +30,7 @@ class UserRepository(BaseRepository[User]):
     def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         try:
-            return self.db.query(User).filter(User.email == email).first()
+            return self.db.execute(_BY_EMAIL, {"email": email}).scalars().first()
         except SQLAlchemyError as e:
             logger.error(f"Error getting user by email {email}: {e}")
             raise
@@ -25,7 +38,7 @@ class UserRepository(BaseRepository[User]):
     def get_by_gstin(self, gstin: str) -> Optional[User]:
         """Get user by GSTIN"""
         try:
-            return self.db.query(User).filter(User.gstin == gstin).first()
+            return self.db.execute(_BY_GSTIN, {"gstin": gstin}).scalars().first()
         except SQLAlchemyError as e:
             logger.error(f"Error getting user by GSTIN {gstin}: {e}")
             raise
@@ -33,7 +46,7 @@ class UserRepository(BaseRepository[User]):
     def get_by_phone(self, phone: str) -> Optional[User]:
         """Get user by phone number"""
         try:
-            return self.db.query(User).filter(User.phone == phone).first()
+            return self.db.execute(_BY_PHONE, {"phone": phone}).scalars().first()
         except SQLAlchemyError as e:
             logger.error(f"Error getting user by phone {phone}: {e}")
             raise
@@ -41,13 +54,9 @@ class UserRepository(BaseRepository[User]):
     def get_by_business_type(self, business_type: BusinessType, skip: int = 0, limit: int = 100) -> List[User]:
         """Get users by business type"""
         try:
-            return (
-                self.db.query(User)
-                .filter(User.business_type == business_type)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(
+                _BY_BUSINESS_TYPE, {"business_type": business_type, "skip": skip, "limit": limit}
+            ).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting users by business type {business_type}: {e}")
             raise
@@ -55,13 +64,7 @@ class UserRepository(BaseRepository[User]):
     def get_active_users(self, skip: int = 0, limit: int = 100) -> List[User]:
         """Get active users"""
         try:
-            return (
-                self.db.query(User)
-                .filter(User.is_active == True)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(_ACTIVE, {"skip": skip, "limit": limit}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting active users: {e}")
             raise
@@ -69,13 +72,7 @@ class UserRepository(BaseRepository[User]):
     def get_verified_users(self, skip: int = 0, limit: int = 100) -> List[User]:
         """Get verified users"""
         try:
-            return (
-                self.db.query(User)
-                .filter(User.is_verified == True)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(_VERIFIED, {"skip": skip, "limit": limit}).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error getting verified users: {e}")
             raise
@@ -113,16 +110,9 @@ class UserRepository(BaseRepository[User]):
     def search_users(self, search_term: str, skip: int = 0, limit: int = 100) -> List[User]:
         """Search users by business name or email"""
         try:
-            return (
-                self.db.query(User)
-                .filter(
-                    (User.business_name.ilike(f"%{search_term}%")) |
-                    (User.email.ilike(f"%{search_term}%"))
-                )
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            return self.db.execute(
+                _SEARCH, {"pattern": f"%{search_term}%", "skip": skip, "limit": limit}
+            ).scalars().all()
         except SQLAlchemyError as e:
             logger.error(f"Error searching users with term {search_term}: {e}")
             raise
\ No newline at end of file
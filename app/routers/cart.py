@@ -0,0 +1,128 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.models.user import User
+from app.schemas.cart import CartItemAdd, CartItemUpdate, CartMergeRequest, CheckoutRequest
+from app.services.cart import CartService
+from app.utils.dependencies import get_current_user_id, get_optional_current_user_id, get_redis
+from app.utils.exceptions import AuthenticationException, NotFoundException
+from app.utils.rate_limit import RateLimited
+from app.utils.response import APIResponse
+
+router = APIRouter(dependencies=[Depends(RateLimited())])
+
+
+def get_cart_service(redis=Depends(get_redis)) -> CartService:
+    """
+    Dependency to get the cart service
+    """
+    return CartService(redis)
+
+
+def get_cart_key(
+    current_user_id: Optional[str] = Depends(get_optional_current_user_id),
+    cart_token: Optional[str] = Header(None, alias="X-Cart-Token"),
+) -> str:
+    """
+    Dependency resolving the user's cart, or a guest cart from ``X-Cart-Token``
+    """
+    if current_user_id is not None:
+        return CartService.user_key(int(current_user_id))
+    if cart_token:
+        return CartService.guest_key(cart_token)
+    raise AuthenticationException("Sign in or provide an X-Cart-Token header")
+
+
+def get_current_user(
+    current_user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> User:
+    user = db.query(User).filter(User.id == int(current_user_id)).first()
+    if user is None:
+        raise NotFoundException(resource="User")
+    return user
+
+
+@router.get("")
+def get_cart(
+    cart_key: str = Depends(get_cart_key),
+    carts: CartService = Depends(get_cart_service),
+):
+    """Return the raw cart lines"""
+    items = carts.get_items(cart_key)
+    return APIResponse.success(data=[{"product_id": p, "quantity": q} for p, q in items.items()])
+
+
+@router.get("/quote")
+def quote_cart(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    carts: CartService = Depends(get_cart_service),
+):
+    """Price the user's cart with tier pricing, GST and shipping"""
+    return APIResponse.success(data=jsonable_encoder(carts.quote(db, user).as_dict()))
+
+
+@router.post("/items")
+def add_cart_item(
+    item: CartItemAdd,
+    cart_key: str = Depends(get_cart_key),
+    carts: CartService = Depends(get_cart_service),
+):
+    quantity = carts.add_item(cart_key, item.product_id, item.quantity)
+    return APIResponse.success(data={"product_id": item.product_id, "quantity": quantity})
+
+
+@router.put("/items/{product_id}")
+def update_cart_item(
+    product_id: int,
+    item: CartItemUpdate,
+    cart_key: str = Depends(get_cart_key),
+    carts: CartService = Depends(get_cart_service),
+):
+    quantity = carts.set_item(cart_key, product_id, item.quantity)
+    return APIResponse.success(data={"product_id": product_id, "quantity": quantity})
+
+
+@router.delete("/items/{product_id}")
+def remove_cart_item(
+    product_id: int,
+    cart_key: str = Depends(get_cart_key),
+    carts: CartService = Depends(get_cart_service),
+):
+    if not carts.remove_item(cart_key, product_id):
+        raise NotFoundException(resource="Cart item")
+    return APIResponse.success(message="Item removed")
+
+
+@router.post("/merge")
+def merge_guest_cart(
+    request: CartMergeRequest,
+    current_user_id: str = Depends(get_current_user_id),
+    carts: CartService = Depends(get_cart_service),
+):
+    """Merge a guest cart into the signed-in user's cart"""
+    merged = carts.merge_guest_cart(request.guest_token, int(current_user_id))
+    return APIResponse.success(data={"merged_lines": merged})
+
+
+@router.post("/checkout")
+def checkout(
+    request: CheckoutRequest,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    carts: CartService = Depends(get_cart_service),
+):
+    """Turn the cart into a pending order"""
+    order = carts.checkout(db, user, request.delivery_address_id, request.notes)
+    return APIResponse.success(
+        data={
+            "order_id": order.id,
+            "order_number": order.order_number,
+            "total_amount": str(order.total_amount),
+        },
+        message="Order created",
+        status_code=status.HTTP_201_CREATED,
+    )
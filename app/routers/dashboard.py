@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, Query
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import get_db
+from app.repositories.job_state import JobStateRepository
+from app.repositories.rollup import RollupRepository
+from app.services.rollups import ROLLUP_JOB
+from app.utils.dependencies import get_current_admin_id
+from app.utils.rate_limit import RateLimited
+from app.utils.response import APIResponse
+
+router = APIRouter(dependencies=[Depends(get_current_admin_id), Depends(RateLimited())])
+
+
+def _as_of(db: Session):
+    state = JobStateRepository(db).get(ROLLUP_JOB)
+    return state.watermark if state is not None else None
+
+
+@router.get("")
+def dashboard(
+    days: int = Query(30, ge=1, le=366),
+    top: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Revenue by day and business type, order status counts, top products and stock levels"""
+    rollups = RollupRepository(db)
+    end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    start = end - timedelta(days=days)
+    inventory = rollups.latest_inventory()
+    data = {
+        "revenue_by_day": rollups.revenue_by_day(start, end),
+        "orders_by_status": rollups.order_counts_by_status(),
+        "top_products": rollups.top_products(start, end, top),
+        "inventory": {
+            "active_products": inventory.active_products,
+            "low_stock": inventory.low_stock,
+            "out_of_stock": inventory.out_of_stock,
+        } if inventory is not None else None,
+    }
+    meta = {"as_of": _as_of(db), "low_stock_threshold": settings.LOW_STOCK_THRESHOLD}
+    return APIResponse.success(data=jsonable_encoder(data), meta=jsonable_encoder(meta))
+
+
+@router.get("/hourly")
+def dashboard_hourly(
+    hours: int = Query(48, ge=1, le=24 * 14),
+    db: Session = Depends(get_db),
+):
+    """Revenue by hour and business type"""
+    end = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    data = RollupRepository(db).revenue_by_hour(end - timedelta(hours=hours), end)
+    return APIResponse.success(data=jsonable_encoder(data), meta=jsonable_encoder({"as_of": _as_of(db)}))
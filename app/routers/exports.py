@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Callable, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.export import DATASETS, MEDIA_TYPES, ExportFormat, stream_export
+from app.utils.dependencies import get_current_admin_id
+from app.utils.exceptions import NotFoundException
+from app.utils.rate_limit import RateLimit, RateLimited
+
+router = APIRouter(dependencies=[Depends(get_current_admin_id)])
+
+
+def get_session_factory() -> Callable[[], Session]:
+    """
+    Dependency returning the session factory used by streaming exports
+    """
+    return SessionLocal
+
+
+@router.get("/{dataset}", dependencies=[Depends(RateLimited(per_user=RateLimit.parse(settings.RATE_LIMIT_EXPORTS_PER_USER)))])
+def export_dataset(
+    dataset: str,
+    format: ExportFormat = Query(ExportFormat.CSV),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
+):
+    """Stream a full export of orders, order items or products"""
+    if dataset not in DATASETS:
+        raise NotFoundException(resource=f"Export dataset '{dataset}'")
+    filters = {}
+    if dataset != "products":
+        filters = {"created_from": created_from, "created_to": created_to}
+    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    return StreamingResponse(
+        stream_export(session_factory, dataset, format, **filters),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{dataset}-{timestamp}.{format.value}"'
+        },
+    )
@@ -0,0 +1,47 @@
+from dataclasses import asdict
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+from fastapi.encoders import jsonable_encoder
+from app.schemas.gst import GstinVerificationRequest
+from app.services.gst_verification import GstinDetails, GstVerificationClient, gst_verifier
+from app.utils.dependencies import get_current_admin_id, get_current_user_id
+from app.utils.exceptions import NotFoundException
+from app.utils.rate_limit import RateLimited
+from app.utils.response import APIResponse
+
+router = APIRouter(dependencies=[Depends(get_current_user_id), Depends(RateLimited())])
+
+
+def get_gst_verifier() -> GstVerificationClient:
+    """
+    Dependency to get the worker's GST verification client
+    """
+    return gst_verifier
+
+
+def _registration(details: GstinDetails) -> Dict[str, Any]:
+    return jsonable_encoder({**asdict(details), "active": details.active})
+
+
+@router.get("/{gstin}")
+async def verify_gstin(gstin: str, verifier: GstVerificationClient = Depends(get_gst_verifier)):
+    """The GST registration of one GSTIN"""
+    details = await verifier.verify(gstin)
+    if details is None:
+        raise NotFoundException(resource=f"GSTIN {gstin.strip().upper()}")
+    return APIResponse.success(data=_registration(details))
+
+
+@router.post("", dependencies=[Depends(get_current_admin_id)])
+async def verify_gstins(
+    request: GstinVerificationRequest,
+    verifier: GstVerificationClient = Depends(get_gst_verifier),
+):
+    """Verify up to 1,000 GSTINs at once, e.g. for onboarding a list of businesses (admins only)"""
+    result = await verifier.verify_many(request.gstins)
+    data = {
+        "verified": {gstin: _registration(details) for gstin, details in result.verified.items()},
+        "errors": result.errors,
+    }
+    meta = {"verified": len(result.verified), "failed": len(result.errors)}
+    return APIResponse.success(data=data, meta=meta)
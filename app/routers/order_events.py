@@ -0,0 +1,84 @@
+from typing import List, Optional
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.core.security import verify_token
+from app.services.order_events import OrderEventHub, order_event_hub, sse_stream
+from app.utils.exceptions import AuthenticationException, ExternalServiceException
+
+router = APIRouter()
+
+
+def get_order_event_hub() -> OrderEventHub:
+    """
+    Dependency to get the worker's order event hub
+    """
+    return order_event_hub
+
+
+def get_stream_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    token: Optional[str] = Query(None, description="Access token, for clients that cannot set headers"),
+) -> int:
+    """
+    Dependency authenticating a stream by bearer header or ``token`` query parameter
+    """
+    user_id = verify_token(credentials.credentials if credentials else token) if (credentials or token) else None
+    if user_id is None:
+        raise AuthenticationException("Invalid authentication credentials")
+    return int(user_id)
+
+
+@router.get("/events")
+async def order_events(
+    order_number: Optional[List[str]] = Query(None, description="Only stream these orders"),
+    user_id: int = Depends(get_stream_user_id),
+    hub: OrderEventHub = Depends(get_order_event_hub),
+):
+    """Stream the caller's order status changes as server-sent events"""
+    # Fail with 503 while we still can; the stream subscribes once it starts
+    hub.check_capacity()
+    return StreamingResponse(
+        sse_stream(hub, user_id, order_number),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def order_events_ws(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    order_number: Optional[List[str]] = Query(None),
+    hub: OrderEventHub = Depends(get_order_event_hub),
+):
+    """Push the caller's order status changes over a WebSocket"""
+    user_id = verify_token(token) if token else None
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    try:
+        subscription = hub.subscribe(int(user_id), order_number)
+    except ExternalServiceException:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    await websocket.accept()
+
+    async def pump() -> None:
+        while True:
+            event = await subscription.get()
+            await websocket.send_text(json.dumps({"type": "order_status", "data": event}))
+
+    sender = asyncio.create_task(pump())
+    try:
+        # Clients only listen; reading detects the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        hub.unsubscribe(subscription)
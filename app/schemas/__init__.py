@@ -2,6 +2,8 @@ from .user import UserCreate, UserUpdate, UserResponse, UserLogin
 from .address import AddressCreate, AddressUpdate, AddressResponse
 from .product import ProductCreate, ProductUpdate, ProductResponse
 from .order import OrderCreate, OrderUpdate, OrderResponse, OrderItemCreate, OrderItemResponse
+from .cart import CartItemAdd, CartItemUpdate, CartMergeRequest, CheckoutRequest
+from .gst import GstinVerificationRequest
 
 __all__ = [
     "UserCreate",
@@ -18,5 +20,10 @@ __all__ = [
     "OrderUpdate",
     "OrderResponse",
     "OrderItemCreate",
-    "OrderItemResponse"
+    "OrderItemResponse",
+    "CartItemAdd",
+    "CartItemUpdate",
+    "CartMergeRequest",
+    "CheckoutRequest",
+    "GstinVerificationRequest"
 ]
\ No newline at end of file
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from app.core.config import settings
+
+
+class CartItemAdd(BaseModel):
+    product_id: int = Field(..., gt=0)
+    # Negative quantities remove units
+    quantity: int = Field(default=1, ge=-settings.CART_MAX_QUANTITY, le=settings.CART_MAX_QUANTITY)
+
+
+class CartItemUpdate(BaseModel):
+    quantity: int = Field(..., ge=0, le=settings.CART_MAX_QUANTITY)
+
+
+class CartMergeRequest(BaseModel):
+    guest_token: str = Field(..., min_length=8, max_length=64)
+
+
+class CheckoutRequest(BaseModel):
+    delivery_address_id: int = Field(..., gt=0)
+    notes: Optional[str] = None
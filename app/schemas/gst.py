@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class GstinVerificationRequest(BaseModel):
+    gstins: List[str] = Field(..., min_length=1, max_length=1000)
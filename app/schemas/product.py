@@ -15,6 +15,7 @@ class ProductBase(BaseModel):
     weight_kg: Optional[Decimal] = Field(None, gt=0, decimal_places=3)
     dimensions: Optional[str] = Field(None, max_length=100)
     category: Optional[str] = Field(None, max_length=100)
+    bin_location: Optional[str] = Field(None, max_length=50)
 
     @field_validator('sku')
     @classmethod
@@ -51,6 +52,7 @@ class ProductUpdate(BaseModel):
     weight_kg: Optional[Decimal] = Field(None, gt=0, decimal_places=3)
     dimensions: Optional[str] = Field(None, max_length=100)
     category: Optional[str] = Field(None, max_length=100)
+    bin_location: Optional[str] = Field(None, max_length=50)
 
 
 class ProductResponse(ProductBase):
@@ -0,0 +1,334 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
+import secrets
+import numpy as np
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.address import Address
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.repositories.outbox import OutboxRepository
+from app.services.delivery import DeliveryEstimator, delivery_estimator
+from app.services.order_totals import OrderTotals, OrderTotalsCalculator
+from app.services.pricing import PriceBookService, PriceQuote, price_book_service
+from app.utils.exceptions import BusinessLogicException, CacheException, NotFoundException
+from app.utils.money import to_paise
+import logging
+
+logger = logging.getLogger(__name__)
+
+# How long a cart snapshot is held while an order is being created
+CHECKOUT_HOLD_SECONDS = 600
+
+# Returned by the add and set scripts when a new line would exceed max_lines
+CART_FULL = -1
+
+# KEYS[1]=cart ARGV: product_id, delta, ttl, max_lines
+# Returns the new quantity (0 if the line was removed) or CART_FULL
+_ADD_ITEM_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 and redis.call('HLEN', KEYS[1]) >= tonumber(ARGV[4]) then
+    return -1
+end
+local qty = redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+if qty <= 0 then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    qty = 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return qty
+"""
+
+# KEYS[1]=cart ARGV: product_id, quantity, ttl, max_lines
+_SET_ITEM_SCRIPT = """
+local qty = tonumber(ARGV[2])
+if qty <= 0 then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    return 0
+end
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 and redis.call('HLEN', KEYS[1]) >= tonumber(ARGV[4]) then
+    return -1
+end
+redis.call('HSET', KEYS[1], ARGV[1], qty)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return qty
+"""
+
+# KEYS[1]=source KEYS[2]=destination ARGV: ttl, max_lines
+# Adds the lines of the source cart into the destination and deletes the source.
+# New lines that would take the destination past max_lines are dropped.
+# Returns {lines merged, lines dropped}
+_MERGE_SCRIPT = """
+local items = redis.call('HGETALL', KEYS[1])
+local max_lines = tonumber(ARGV[2])
+local merged, dropped = 0, 0
+for i = 1, #items, 2 do
+    if redis.call('HEXISTS', KEYS[2], items[i]) == 0 and redis.call('HLEN', KEYS[2]) >= max_lines then
+        dropped = dropped + 1
+    else
+        redis.call('HINCRBY', KEYS[2], items[i], items[i + 1])
+        merged = merged + 1
+    end
+end
+redis.call('DEL', KEYS[1])
+if merged > 0 then
+    redis.call('EXPIRE', KEYS[2], ARGV[1])
+end
+return {merged, dropped}
+"""
+
+# KEYS[1]=cart KEYS[2]=snapshot ARGV: hold seconds
+# Moves the cart aside so edits made during checkout start a new cart
+_SNAPSHOT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {}
+end
+redis.call('RENAME', KEYS[1], KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return redis.call('HGETALL', KEYS[2])
+"""
+
+
+@dataclass
+class CartQuote:
+    """Priced cart; lines that cannot be ordered are listed separately"""
+    items: Dict[int, int]
+    quote: Optional[PriceQuote] = None
+    totals: Optional[OrderTotals] = None
+    unavailable: List[int] = field(default_factory=list)
+    insufficient_stock: Dict[int, int] = field(default_factory=dict)
+    stock: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def is_orderable(self) -> bool:
+        return self.quote is not None and not self.unavailable and not self.insufficient_stock
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "lines": self.quote.to_lines() if self.quote is not None else [],
+            "totals": self.totals.as_order_fields() if self.totals is not None else None,
+            "unavailable": self.unavailable,
+            "insufficient_stock": self.insufficient_stock,
+        }
+
+
+def generate_order_number() -> str:
+    return f"ORD-{datetime.utcnow():%Y%m%d}-{secrets.token_hex(4).upper()}"
+
+
+def price_cart(
+    db: Session,
+    user,
+    items: Mapping[int, int],
+    for_update: bool = False,
+    pricing: Optional[PriceBookService] = None,
+    calculator: Optional[OrderTotalsCalculator] = None,
+) -> CartQuote:
+    """
+    Price every cart line with a single batched product query.
+
+    Prices, stock and weights for all lines are fetched together; with
+    ``for_update`` the product rows stay locked until the transaction ends
+    so stock can be decremented safely during checkout.
+    """
+    pricing = pricing or price_book_service
+    calculator = calculator or OrderTotalsCalculator()
+    cart = CartQuote(items=dict(items))
+    if not items:
+        return cart
+
+    stmt = select(
+        Product.id,
+        Product.retail_price,
+        Product.company_price,
+        Product.stock_quantity,
+        Product.weight_kg,
+    ).where(Product.id.in_(list(items)), Product.is_active == True)
+    if for_update:
+        stmt = stmt.with_for_update()
+    rows = {row.id: row for row in db.execute(stmt)}
+
+    cart.stock = {product_id: row.stock_quantity for product_id, row in rows.items()}
+    cart.unavailable = [product_id for product_id in items if product_id not in rows]
+    cart.insufficient_stock = {
+        product_id: row.stock_quantity
+        for product_id, row in rows.items()
+        if row.stock_quantity < items[product_id]
+    }
+    priced = [product_id for product_id in items if product_id in rows]
+    if not priced:
+        return cart
+
+    n = len(priced)
+    ids = np.fromiter(priced, dtype=np.int64, count=n)
+    quantities = np.fromiter((items[p] for p in priced), dtype=np.int64, count=n)
+    retail = np.fromiter((to_paise(rows[p].retail_price) for p in priced), dtype=np.int64, count=n)
+    company = np.fromiter((to_paise(rows[p].company_price) for p in priced), dtype=np.int64, count=n)
+    weight_grams = np.fromiter(
+        (int(rows[p].weight_kg * 1000) if rows[p].weight_kg is not None else 0 for p in priced),
+        dtype=np.int64,
+        count=n,
+    )
+
+    book = pricing.build_book(user.business_type, ids, retail, company)
+    cart.quote = book.quote(ids, quantities)
+    cart.totals = calculator.calculate_from_quote(cart.quote, user.gstin, weight_grams=weight_grams)
+    return cart
+
+
+class CartService:
+    """
+    Shopping carts stored as Redis hashes of ``product_id -> quantity``.
+
+    Every mutation is a single Lua script so quantity updates, line limits
+    and TTL refreshes are atomic. Checkout renames the cart to a snapshot
+    key, creates the order in one database transaction and restores the
+    snapshot into the cart if anything fails.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        ttl_seconds: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        pricing: Optional[PriceBookService] = None,
+        calculator: Optional[OrderTotalsCalculator] = None,
+        estimator: Optional[DeliveryEstimator] = None,
+    ):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds or settings.CART_TTL_SECONDS
+        self.max_lines = max_lines or settings.CART_MAX_LINES
+        self.pricing = pricing
+        self.calculator = calculator
+        self.estimator = estimator or delivery_estimator
+        self._add_item = redis_client.register_script(_ADD_ITEM_SCRIPT)
+        self._set_item = redis_client.register_script(_SET_ITEM_SCRIPT)
+        self._merge = redis_client.register_script(_MERGE_SCRIPT)
+        self._snapshot = redis_client.register_script(_SNAPSHOT_SCRIPT)
+
+    @staticmethod
+    def user_key(user_id: int) -> str:
+        return f"cart:user:{user_id}"
+
+    @staticmethod
+    def guest_key(token: str) -> str:
+        return f"cart:guest:{token}"
+
+    def _run(self, script, keys: List[str], args: List[Any]) -> Any:
+        try:
+            return script(keys=keys, args=args)
+        except Exception as e:
+            logger.error(f"Error running cart script on {keys}: {e}")
+            raise CacheException("Cart service unavailable")
+
+    def _check_quantity(self, quantity: int) -> int:
+        if quantity == CART_FULL:
+            raise BusinessLogicException(f"Cart cannot hold more than {self.max_lines} lines")
+        return quantity
+
+    def get_items(self, cart_key: str) -> Dict[int, int]:
+        return {int(product_id): int(qty) for product_id, qty in self.redis.hgetall(cart_key).items()}
+
+    def add_item(self, cart_key: str, product_id: int, quantity: int = 1) -> int:
+        """Add (or with a negative quantity, remove) units; returns the new line quantity"""
+        return self._check_quantity(
+            self._run(self._add_item, [cart_key], [product_id, quantity, self.ttl_seconds, self.max_lines])
+        )
+
+    def set_item(self, cart_key: str, product_id: int, quantity: int) -> int:
+        return self._check_quantity(
+            self._run(self._set_item, [cart_key], [product_id, quantity, self.ttl_seconds, self.max_lines])
+        )
+
+    def remove_item(self, cart_key: str, product_id: int) -> bool:
+        return bool(self.redis.hdel(cart_key, str(product_id)))
+
+    def clear(self, cart_key: str) -> bool:
+        return self.redis.delete(cart_key)
+
+    def merge_carts(self, source_key: str, destination_key: str) -> int:
+        """Add the lines of ``source_key`` into ``destination_key`` up to the line limit; returns lines merged"""
+        merged, dropped = self._run(self._merge, [source_key, destination_key], [self.ttl_seconds, self.max_lines])
+        if dropped:
+            logger.warning(f"Dropped {dropped} lines merging {source_key} into full cart {destination_key}")
+        return int(merged)
+
+    def merge_guest_cart(self, guest_token: str, user_id: int) -> int:
+        """Fold a guest cart into the user's cart on login"""
+        merged = self.merge_carts(self.guest_key(guest_token), self.user_key(user_id))
+        logger.info(f"Merged {merged} guest cart lines into cart of user {user_id}")
+        return merged
+
+    def quote(self, db: Session, user) -> CartQuote:
+        return price_cart(db, user, self.get_items(self.user_key(user.id)), pricing=self.pricing, calculator=self.calculator)
+
+    def checkout(self, db: Session, user, delivery_address_id: int, notes: Optional[str] = None) -> Order:
+        """Hand the user's cart off to order creation atomically"""
+        address = (
+            db.query(Address)
+            .filter(Address.id == delivery_address_id, Address.user_id == user.id)
+            .first()
+        )
+        if address is None:
+            raise NotFoundException(resource="Delivery address")
+
+        cart_key = self.user_key(user.id)
+        snapshot_key = f"cart:checkout:{user.id}:{secrets.token_hex(8)}"
+        raw = self._run(self._snapshot, [cart_key, snapshot_key], [CHECKOUT_HOLD_SECONDS])
+        items = {int(raw[i]): int(raw[i + 1]) for i in range(0, len(raw), 2)}
+        if not items:
+            raise BusinessLogicException("Cart is empty")
+
+        try:
+            cart = price_cart(
+                db, user, items, for_update=True, pricing=self.pricing, calculator=self.calculator
+            )
+            if not cart.is_orderable:
+                raise BusinessLogicException(
+                    "Some cart items cannot be ordered",
+                    details={"unavailable": cart.unavailable, "insufficient_stock": cart.insufficient_stock},
+                )
+            order = self._create_order(db, user, address, cart, notes)
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Put the lines back so the user can fix the cart and retry
+            self.merge_carts(snapshot_key, cart_key)
+            raise
+
+        self.redis.delete(snapshot_key)
+        logger.info(f"Created order {order.order_number} from a {len(items)}-line cart")
+        return order
+
+    def _create_order(self, db: Session, user, address: Address, cart: CartQuote, notes: Optional[str]) -> Order:
+        order = Order(
+            order_number=generate_order_number(),
+            user_id=user.id,
+            delivery_address_id=address.id,
+            status=OrderStatus.PENDING,
+            estimated_delivery_date=self.estimator.estimate_for_address(address).estimated_delivery,
+            notes=notes,
+            **cart.totals.as_order_fields(),
+        )
+        db.add(order)
+        db.flush()
+        OutboxRepository(db).add_order_notifications(order, "order.placed")
+
+        lines = cart.quote.to_lines()
+        db.execute(insert(OrderItem), [
+            {
+                "order_id": order.id,
+                "product_id": line["product_id"],
+                "quantity": line["quantity"],
+                "unit_price": line["unit_price"],
+                "total_price": line["total_price"],
+            }
+            for line in lines
+        ])
+        # Product rows are locked by price_cart(for_update=True)
+        db.execute(update(Product), [
+            {"id": product_id, "stock_quantity": stock - cart.items[product_id]}
+            for product_id, stock in cart.stock.items()
+        ])
+        return order
@@ -0,0 +1,255 @@
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, TextIO, Tuple
+import csv
+import io
+import time
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import (
+    Boolean, Column, Integer, MetaData, Numeric, String, Table, Text, insert, text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.schemas.product import ProductCreate
+import logging
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 5000
+STAGING_TABLE = "product_import_staging"
+
+# Columns loaded from a catalog file, in staging-table order
+IMPORT_COLUMNS = [
+    "name",
+    "description",
+    "sku",
+    "retail_price",
+    "company_price",
+    "stock_quantity",
+    "is_active",
+    "weight_kg",
+    "dimensions",
+    "category",
+    "bin_location",
+]
+
+# Session-local staging table mirroring the importable product columns
+staging_table = Table(
+    STAGING_TABLE,
+    MetaData(),
+    Column("name", String(255), nullable=False),
+    Column("description", Text),
+    Column("sku", String(100), nullable=False),
+    Column("retail_price", Numeric(10, 2), nullable=False),
+    Column("company_price", Numeric(10, 2), nullable=False),
+    Column("stock_quantity", Integer, nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("weight_kg", Numeric(8, 3)),
+    Column("dimensions", String(100)),
+    Column("category", String(100)),
+    Column("bin_location", String(50)),
+    prefixes=["TEMPORARY"],
+)
+
+# Set-based upsert keyed on the unique SKU ("WHERE true" disambiguates the
+# ON CONFLICT clause for SQLite's parser and is a no-op on Postgres)
+_MERGE_SQL = f"""
+INSERT INTO products ({", ".join(IMPORT_COLUMNS)}, created_at)
+SELECT {", ".join(IMPORT_COLUMNS)}, CURRENT_TIMESTAMP FROM {STAGING_TABLE} WHERE true
+ON CONFLICT (sku) DO UPDATE SET
+    {", ".join(f"{c} = excluded.{c}" for c in IMPORT_COLUMNS if c != "sku")},
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+_product_list_adapter = TypeAdapter(List[ProductCreate])
+
+
+@dataclass
+class RowError:
+    row_number: int
+    sku: Optional[str]
+    errors: List[Dict[str, Any]]
+
+
+@dataclass
+class ImportReport:
+    total_rows: int = 0
+    loaded_rows: int = 0
+    duplicate_rows: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_minute(self) -> float:
+        return self.total_rows / self.elapsed_seconds * 60 if self.elapsed_seconds else 0.0
+
+
+def iter_csv_rows(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Incrementally read CSV rows as dicts"""
+    yield from csv.DictReader(stream)
+
+
+def iter_xlsx_rows(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Incrementally read the first worksheet of an XLSX file"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("XLSX import requires openpyxl (pip install openpyxl)")
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+        for values in rows:
+            if values is None or all(v is None for v in values):
+                continue
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def _clean(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop unknown columns and blank cells so schema defaults apply"""
+    row = {}
+    for key in IMPORT_COLUMNS:
+        value = raw.get(key)
+        if isinstance(value, str):
+            value = value.strip()
+            if value == "":
+                continue
+        if value is not None:
+            row[key] = value
+    return row
+
+
+def validate_batch(rows: List[Dict[str, Any]]) -> Tuple[List[ProductCreate], List[int], Dict[int, List[Dict]]]:
+    """
+    Validate a batch with one ``TypeAdapter`` call.
+
+    Returns (valid products, their positions in ``rows``, errors by
+    position). If any row fails, the failing rows are removed and the
+    remainder is validated once more.
+    """
+    try:
+        return _product_list_adapter.validate_python(rows), list(range(len(rows))), {}
+    except ValidationError as exc:
+        errors: Dict[int, List[Dict]] = {}
+        for error in exc.errors(include_url=False, include_input=False):
+            position = error["loc"][0]
+            errors.setdefault(position, []).append({
+                "field": ".".join(str(part) for part in error["loc"][1:]),
+                "message": error["msg"],
+            })
+    positions = [i for i in range(len(rows)) if i not in errors]
+    products = _product_list_adapter.validate_python([rows[i] for i in positions])
+    return products, positions, errors
+
+
+class CatalogImporter:
+    """
+    Streaming bulk catalog import.
+
+    Rows are read incrementally, validated in batches, bulk-loaded into a
+    temporary staging table (``COPY`` on Postgres) and merged into
+    ``products`` on ``sku`` with a single set-based upsert per batch.
+    Invalid rows are reported and skipped; they never abort a batch.
+    """
+
+    def __init__(self, db: Session, batch_size: int = IMPORT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+
+    def import_csv(self, stream: TextIO) -> ImportReport:
+        return self.import_rows(iter_csv_rows(stream))
+
+    def import_xlsx(self, stream: BinaryIO) -> ImportReport:
+        return self.import_rows(iter_xlsx_rows(stream))
+
+    def import_rows(self, rows: Iterator[Dict[str, Any]]) -> ImportReport:
+        report = ImportReport()
+        start = time.perf_counter()
+        # The staging table is TEMPORARY and so exists on one connection only:
+        # hold that connection for the whole import and commit each batch on it
+        with self.db.get_bind().connect() as conn:
+            with conn.begin():
+                staging_table.create(conn, checkfirst=True)
+            try:
+                batch: List[Dict[str, Any]] = []
+                first_row_number = 2  # row 1 is the header
+                for raw in rows:
+                    batch.append(_clean(raw))
+                    if len(batch) >= self.batch_size:
+                        self._process_batch(conn, batch, first_row_number, report)
+                        first_row_number += len(batch)
+                        batch = []
+                if batch:
+                    self._process_batch(conn, batch, first_row_number, report)
+            finally:
+                with conn.begin():
+                    staging_table.drop(conn, checkfirst=True)
+
+        report.elapsed_seconds = time.perf_counter() - start
+        logger.info(
+            f"Catalog import: {report.loaded_rows}/{report.total_rows} rows loaded, "
+            f"{len(report.errors)} errors, {report.rows_per_minute:,.0f} rows/min"
+        )
+        return report
+
+    def _process_batch(
+        self, conn: Connection, batch: List[Dict[str, Any]], first_row_number: int, report: ImportReport
+    ) -> None:
+        report.total_rows += len(batch)
+        products, positions, errors = validate_batch(batch)
+        for position, row_errors in sorted(errors.items()):
+            report.errors.append(RowError(
+                row_number=first_row_number + position,
+                sku=batch[position].get("sku"),
+                errors=row_errors,
+            ))
+
+        # ON CONFLICT cannot touch the same SKU twice in one statement; last row wins
+        by_sku: Dict[str, ProductCreate] = {}
+        for product in products:
+            by_sku[product.sku] = product
+        report.duplicate_rows += len(products) - len(by_sku)
+        if not by_sku:
+            return
+
+        try:
+            with conn.begin():
+                self._load_staging(conn, list(by_sku.values()))
+                conn.execute(text(_MERGE_SQL))
+                conn.execute(staging_table.delete())
+            report.loaded_rows += len(by_sku)
+        except Exception as e:
+            logger.error(f"Error loading catalog batch starting at row {first_row_number}: {e}")
+            report.errors.append(RowError(
+                row_number=first_row_number,
+                sku=None,
+                errors=[{"field": "", "message": f"Batch of {len(batch)} rows failed to load: {e}"}],
+            ))
+
+    def _load_staging(self, conn: Connection, products: List[ProductCreate]) -> None:
+        records = [tuple(getattr(p, c) for c in IMPORT_COLUMNS) for p in products]
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            if hasattr(cursor, "copy_expert"):  # psycopg2
+                cursor.copy_expert(
+                    f"COPY {STAGING_TABLE} ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                    _csv_buffer(records),
+                )
+            elif hasattr(cursor, "copy"):  # psycopg 3
+                with cursor.copy(f"COPY {STAGING_TABLE} ({', '.join(IMPORT_COLUMNS)}) FROM STDIN") as copy:
+                    for record in records:
+                        copy.write_row(record)
+            else:
+                conn.execute(insert(staging_table), [dict(zip(IMPORT_COLUMNS, r)) for r in records])
+        finally:
+            cursor.close()
+
+
+def _csv_buffer(records: List[tuple]) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow(["" if v is None else v for v in record])
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,327 @@
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import List, Optional, Sequence
+import argparse
+import csv
+import enum
+import os
+import threading
+import numpy as np
+from app.core.config import settings
+from app.utils.exceptions import ValidationException
+import logging
+
+logger = logging.getLogger(__name__)
+
+# India Standard Time has no DST, so a fixed offset is exact
+IST = timezone(timedelta(hours=5, minutes=30), name="IST")
+
+NELLORE_LATITUDE = 14.4426
+NELLORE_LONGITUDE = 79.9865
+EARTH_RADIUS_KM = 6371.0
+
+MIN_PINCODE = 100000
+MAX_PINCODE = 999999
+TABLE_SIZE = MAX_PINCODE - MIN_PINCODE + 1
+UNKNOWN_DISTANCE = np.iinfo(np.uint16).max
+MAX_DELIVERY_DAYS = 10
+
+PINCODE_DTYPE = np.dtype([
+    ("latitude", "<f4"),
+    ("longitude", "<f4"),
+    ("distance_km", "<u2"),
+    ("zone", "u1"),
+    ("transit_days", "u1"),
+])
+
+
+class DeliveryZone(enum.IntEnum):
+    LOCAL = 1
+    REGIONAL = 2
+    NATIONAL = 3
+    REMOTE = 4
+
+
+class DeliveryType(enum.Enum):
+    EXPRESS = "express"
+    STANDARD = "standard"
+    EXTENDED = "extended"
+
+
+_ZONES = {zone.value: zone for zone in DeliveryZone}
+
+# Transit days from dispatch for each zone (Requirement 3.3 caps at 10)
+ZONE_TRANSIT_DAYS = {
+    DeliveryZone.LOCAL: 1,
+    DeliveryZone.REGIONAL: 3,
+    DeliveryZone.NATIONAL: 6,
+    DeliveryZone.REMOTE: 9,
+}
+
+# Pincode prefixes used when no coordinate data is available
+LOCAL_PREFIXES = ("524",)  # Nellore district
+REGIONAL_PREFIXES = ("50", "51", "52", "53", "60")  # Andhra Pradesh, Telangana, Chennai
+REMOTE_PREFIXES = ("18", "19", "78", "79", "737", "744")  # J&K, North East, Sikkim, Andaman
+
+
+@dataclass(frozen=True)
+class DeliveryEstimate:
+    postal_code: str
+    zone: DeliveryZone
+    delivery_type: DeliveryType
+    distance_km: Optional[int]
+    estimated_delivery: datetime
+
+
+def haversine_km(lat: np.ndarray, lon: np.ndarray, lat0: float = NELLORE_LATITUDE, lon0: float = NELLORE_LONGITUDE) -> np.ndarray:
+    """Vectorized great-circle distance in km from (lat0, lon0)"""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat0r, lon0r = np.radians(lat0), np.radians(lon0)
+    a = np.sin((lat1 - lat0r) / 2) ** 2 + np.cos(lat0r) * np.cos(lat1) * np.sin((lon1 - lon0r) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _prefix_mask(prefixes: Sequence[str]) -> np.ndarray:
+    """Boolean mask over the table for pincodes starting with any prefix"""
+    mask = np.zeros(TABLE_SIZE, dtype=bool)
+    for prefix in prefixes:
+        scale = 10 ** (6 - len(prefix))
+        start = int(prefix) * scale - MIN_PINCODE
+        mask[max(start, 0):start + scale] = True
+    return mask
+
+
+def build_prefix_table() -> np.ndarray:
+    """Build a zone table from pincode prefixes alone (no distances)"""
+    table = np.zeros(TABLE_SIZE, dtype=PINCODE_DTYPE)
+    table["latitude"] = np.nan
+    table["longitude"] = np.nan
+    table["distance_km"] = UNKNOWN_DISTANCE
+    table["zone"] = DeliveryZone.NATIONAL
+    table["zone"][_prefix_mask(REGIONAL_PREFIXES)] = DeliveryZone.REGIONAL
+    table["zone"][_prefix_mask(LOCAL_PREFIXES)] = DeliveryZone.LOCAL
+    table["zone"][_prefix_mask(REMOTE_PREFIXES)] = DeliveryZone.REMOTE
+    _fill_transit_days(table)
+    return table
+
+
+def _fill_transit_days(table: np.ndarray) -> None:
+    lookup = np.zeros(max(DeliveryZone) + 1, dtype=np.uint8)
+    for zone, days in ZONE_TRANSIT_DAYS.items():
+        lookup[zone] = days
+    table["transit_days"] = lookup[table["zone"]]
+
+
+def build_pincode_table(
+    pincodes: np.ndarray,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    local_radius_km: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Build the direct-indexed pincode table from coordinates.
+
+    Pincodes absent from the input keep their prefix-based zone. Several
+    post offices may share a pincode; their coordinates are averaged.
+    """
+    radius = local_radius_km if local_radius_km is not None else settings.LOCAL_DELIVERY_RADIUS_KM
+    table = build_prefix_table()
+
+    index = np.asarray(pincodes, dtype=np.int64) - MIN_PINCODE
+    valid = (index >= 0) & (index < TABLE_SIZE)
+    index = index[valid]
+    counts = np.bincount(index, minlength=TABLE_SIZE)
+    lat_sum = np.bincount(index, weights=np.asarray(latitudes, dtype=np.float64)[valid], minlength=TABLE_SIZE)
+    lon_sum = np.bincount(index, weights=np.asarray(longitudes, dtype=np.float64)[valid], minlength=TABLE_SIZE)
+    known = np.nonzero(counts)[0]
+
+    latitude = lat_sum[known] / counts[known]
+    longitude = lon_sum[known] / counts[known]
+    distance = haversine_km(latitude, longitude)
+    zone = np.where(
+        distance <= radius,
+        DeliveryZone.LOCAL,
+        np.where(distance <= 500, DeliveryZone.REGIONAL, DeliveryZone.NATIONAL),
+    ).astype(np.uint8)
+    # Remote regions stay remote regardless of straight-line distance
+    zone[table["zone"][known] == DeliveryZone.REMOTE] = DeliveryZone.REMOTE
+
+    table["latitude"][known] = latitude
+    table["longitude"][known] = longitude
+    table["distance_km"][known] = np.minimum(np.rint(distance), UNKNOWN_DISTANCE - 1).astype(np.uint16)
+    table["zone"][known] = zone
+    _fill_transit_days(table)
+    return table
+
+
+def build_pincode_table_from_csv(csv_path: str, out_path: str) -> int:
+    """Build and save the table from a CSV with pincode, latitude, longitude columns"""
+    pincodes, lats, lons = [], [], []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                pincodes.append(int(row["pincode"]))
+                lats.append(float(row["latitude"]))
+                lons.append(float(row["longitude"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+    table = build_pincode_table(np.array(pincodes), np.array(lats), np.array(lons))
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    np.save(out_path, table)
+    logger.info(f"Wrote pincode table with {len(set(pincodes))} pincodes to {out_path}")
+    return len(set(pincodes))
+
+
+class DeliveryEstimator:
+    """
+    Location-based delivery estimates (Requirement 3).
+
+    Lookups index a direct-addressed table of every 6-digit pincode, so a
+    single estimate is O(1) and a batch is one fancy-indexing operation.
+    The table is memory-mapped from ``PINCODE_TABLE_PATH`` when present and
+    otherwise derived from pincode prefixes.
+    """
+
+    def __init__(self, table: Optional[np.ndarray] = None, cutoff_hour: Optional[int] = None):
+        self._table = table
+        self._lock = threading.Lock()
+        self.cutoff_hour = settings.DELIVERY_CUTOFF_HOUR if cutoff_hour is None else cutoff_hour
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "DeliveryEstimator":
+        return cls(table=np.load(path, mmap_mode="r"), **kwargs)
+
+    @property
+    def table(self) -> np.ndarray:
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    path = settings.PINCODE_TABLE_PATH
+                    if os.path.exists(path):
+                        self._table = np.load(path, mmap_mode="r")
+                        logger.info(f"Loaded pincode table from {path}")
+                    else:
+                        logger.warning(f"Pincode table {path} not found, using prefix-based zones")
+                        self._table = build_prefix_table()
+        return self._table
+
+    @staticmethod
+    def _parse_pincodes(postal_codes: Sequence[str]) -> np.ndarray:
+        try:
+            codes = np.array([int(code) for code in postal_codes], dtype=np.int64)
+        except (TypeError, ValueError):
+            raise ValidationException("Postal codes must be 6-digit numbers")
+        if ((codes < MIN_PINCODE) | (codes > MAX_PINCODE)).any():
+            raise ValidationException("Postal codes must be 6-digit numbers")
+        return codes
+
+    def _dispatch(self, order_time: Optional[datetime]) -> tuple:
+        """Return (IST order date, whether the order missed the cut-off)"""
+        order_time = order_time or datetime.now(timezone.utc)
+        if order_time.tzinfo is None:
+            order_time = order_time.replace(tzinfo=timezone.utc)
+        local = order_time.astimezone(IST)
+        return local.date(), local.hour >= self.cutoff_hour
+
+    def delivery_days(self, zones: np.ndarray, transit_days: np.ndarray, after_cutoff: bool) -> np.ndarray:
+        """Days after the order date by which delivery is promised"""
+        days = transit_days.astype(np.int64) + int(after_cutoff)
+        # Nellore area: next day before cut-off, within 2 days after it
+        days = np.where(zones == DeliveryZone.LOCAL, 2 if after_cutoff else 1, days)
+        return np.minimum(days, MAX_DELIVERY_DAYS)
+
+    def estimate_many(
+        self,
+        postal_codes: Sequence[str],
+        order_time: Optional[datetime] = None,
+    ) -> List[DeliveryEstimate]:
+        """Estimate delivery for many postal codes placed at ``order_time``"""
+        codes = self._parse_pincodes(postal_codes)
+        rows = self.table[codes - MIN_PINCODE]
+        zones = rows["zone"]
+        order_date, after_cutoff = self._dispatch(order_time)
+        days = self.delivery_days(zones, rows["transit_days"], after_cutoff)
+        cutoff = time(self.cutoff_hour, tzinfo=IST)
+
+        # Only a handful of distinct (zone, days) pairs exist; build each result part once
+        delivery_at = {
+            n: datetime.combine(order_date + timedelta(days=n), cutoff) for n in np.unique(days).tolist()
+        }
+        estimates = []
+        for code, zone, distance, n_days in zip(
+            postal_codes, zones.tolist(), rows["distance_km"].tolist(), days.tolist()
+        ):
+            zone = _ZONES[zone]
+            estimates.append(DeliveryEstimate(
+                postal_code=str(code),
+                zone=zone,
+                delivery_type=self._delivery_type(zone, n_days),
+                distance_km=None if distance == UNKNOWN_DISTANCE else distance,
+                estimated_delivery=delivery_at[n_days],
+            ))
+        return estimates
+
+    def estimate(self, postal_code: str, order_time: Optional[datetime] = None) -> DeliveryEstimate:
+        """Estimate delivery for a single postal code (scalar fast path)"""
+        try:
+            code = int(postal_code)
+        except (TypeError, ValueError):
+            raise ValidationException("Postal codes must be 6-digit numbers")
+        if not MIN_PINCODE <= code <= MAX_PINCODE:
+            raise ValidationException("Postal codes must be 6-digit numbers")
+
+        _, _, distance, zone, transit_days = self.table[code - MIN_PINCODE].tolist()
+        zone = _ZONES[zone]
+        order_date, after_cutoff = self._dispatch(order_time)
+        if zone == DeliveryZone.LOCAL:
+            days = 2 if after_cutoff else 1
+        else:
+            days = min(transit_days + int(after_cutoff), MAX_DELIVERY_DAYS)
+        return DeliveryEstimate(
+            postal_code=str(postal_code),
+            zone=zone,
+            delivery_type=self._delivery_type(zone, days),
+            distance_km=None if distance == UNKNOWN_DISTANCE else distance,
+            estimated_delivery=datetime.combine(
+                order_date + timedelta(days=days), time(self.cutoff_hour, tzinfo=IST)
+            ),
+        )
+
+    def coordinates(self, postal_codes: Sequence[str]) -> np.ndarray:
+        """Return an ``(n, 2)`` array of pincode centroid lat/lon (NaN if unknown)"""
+        rows = self.table[self._parse_pincodes(postal_codes) - MIN_PINCODE]
+        return np.column_stack([rows["latitude"], rows["longitude"]]).astype(np.float64)
+
+    def zones(self, postal_codes: Sequence[str]) -> np.ndarray:
+        """Return the delivery zone of each postal code"""
+        return self.table[self._parse_pincodes(postal_codes) - MIN_PINCODE]["zone"]
+
+    def estimate_for_address(self, address, order_time: Optional[datetime] = None) -> DeliveryEstimate:
+        return self.estimate(address.postal_code, order_time)
+
+    def assign_estimated_delivery(self, order) -> datetime:
+        """Set ``order.estimated_delivery_date`` from its delivery address"""
+        estimate = self.estimate(order.delivery_address.postal_code, order.created_at)
+        order.estimated_delivery_date = estimate.estimated_delivery
+        return estimate.estimated_delivery
+
+    @staticmethod
+    def _delivery_type(zone: DeliveryZone, days: int) -> DeliveryType:
+        if zone == DeliveryZone.LOCAL and days == 1:
+            return DeliveryType.EXPRESS
+        if zone == DeliveryZone.REMOTE:
+            return DeliveryType.EXTENDED
+        return DeliveryType.STANDARD
+
+
+# Global delivery estimator instance (table is loaded lazily)
+delivery_estimator = DeliveryEstimator()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the memory-mapped pincode table")
+    parser.add_argument("csv_path", help="CSV with pincode, latitude, longitude columns")
+    parser.add_argument("--out", default=settings.PINCODE_TABLE_PATH)
+    args = parser.parse_args()
+    count = build_pincode_table_from_csv(args.csv_path, args.out)
+    print(f"Built pincode table for {count} pincodes at {args.out}")
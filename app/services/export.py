@@ -0,0 +1,211 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import csv
+import enum
+import io
+import json
+from sqlalchemy import Date, DateTime, Enum, Numeric, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.models.address import Address
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.user import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per server-side cursor round trip
+EXPORT_BATCH_SIZE = 2000
+
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.JSONL: "application/x-ndjson",
+}
+
+
+def orders_query(created_from: Optional[datetime] = None, created_to: Optional[datetime] = None) -> Select:
+    """Order headers with buyer GSTIN and place of supply, for GST filing"""
+    stmt = (
+        select(
+            Order.id,
+            Order.order_number,
+            Order.user_id,
+            User.business_name,
+            User.gstin,
+            Address.state.label("place_of_supply"),
+            Address.postal_code,
+            Order.status,
+            Order.total_amount,
+            Order.tax_amount,
+            Order.shipping_cost,
+            Order.estimated_delivery_date,
+            Order.actual_delivery_date,
+            Order.created_at,
+        )
+        .join(User, User.id == Order.user_id)
+        .join(Address, Address.id == Order.delivery_address_id)
+        .order_by(Order.id)
+    )
+    if created_from is not None:
+        stmt = stmt.where(Order.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Order.created_at <= created_to)
+    return stmt
+
+
+def order_items_query(created_from: Optional[datetime] = None, created_to: Optional[datetime] = None) -> Select:
+    stmt = (
+        select(
+            OrderItem.id,
+            OrderItem.order_id,
+            Order.order_number,
+            OrderItem.product_id,
+            Product.sku,
+            OrderItem.quantity,
+            OrderItem.unit_price,
+            OrderItem.total_price,
+            OrderItem.created_at,
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .join(Product, Product.id == OrderItem.product_id)
+        .order_by(OrderItem.id)
+    )
+    if created_from is not None:
+        stmt = stmt.where(Order.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Order.created_at <= created_to)
+    return stmt
+
+
+def products_query(**_) -> Select:
+    return select(
+        Product.id,
+        Product.sku,
+        Product.name,
+        Product.category,
+        Product.retail_price,
+        Product.company_price,
+        Product.stock_quantity,
+        Product.is_active,
+        Product.weight_kg,
+        Product.dimensions,
+        Product.bin_location,
+        Product.created_at,
+        Product.updated_at,
+    ).order_by(Product.id)
+
+
+DATASETS: Dict[str, Callable[..., Select]] = {
+    "orders": orders_query,
+    "order_items": order_items_query,
+    "products": products_query,
+}
+
+
+def _column_converters(stmt: Select, decimals_as_str: bool) -> List[Tuple[int, Callable[[Any], Any]]]:
+    """
+    Per-column converters derived once from the SQL types.
+
+    Only enum, date/time and (for JSON) numeric columns need converting;
+    everything else is passed to the encoder untouched.
+    """
+    converters = []
+    for index, column in enumerate(stmt.selected_columns):
+        column_type = column.type
+        if isinstance(column_type, Enum):
+            converters.append((index, lambda v: v.value if isinstance(v, enum.Enum) else v))
+        elif isinstance(column_type, (DateTime, Date)):
+            converters.append((index, lambda v: v.isoformat() if isinstance(v, (datetime, date)) else v))
+        elif decimals_as_str and isinstance(column_type, Numeric):
+            converters.append((index, lambda v: str(v) if isinstance(v, Decimal) else v))
+    return converters
+
+
+def _encode_rows(rows: List, converters: List[Tuple[int, Callable[[Any], Any]]]) -> Iterator:
+    if not converters:
+        yield from rows
+        return
+    for row in rows:
+        values = list(row)
+        for index, convert in converters:
+            value = values[index]
+            if value is not None:
+                values[index] = convert(value)
+        yield values
+
+
+def iter_rows(db: Session, stmt: Select, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List]:
+    """
+    Yield result partitions using a server-side cursor.
+
+    ``yield_per`` implies ``stream_results`` on drivers that support it, so
+    only ``batch_size`` rows are buffered client-side at a time.
+    """
+    result = db.execute(stmt.execution_options(yield_per=batch_size, stream_results=True))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def encode_csv(columns: List[str], partitions: Iterator[List], converters: List) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in partitions:
+        writer.writerows(_encode_rows(rows, converters))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def encode_jsonl(columns: List[str], partitions: Iterator[List], converters: List) -> Iterator[str]:
+    dumps = json.dumps
+    for rows in partitions:
+        yield "".join(
+            dumps(dict(zip(columns, values)), separators=(",", ":")) + "\n"
+            for values in _encode_rows(rows, converters)
+        )
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    dataset: str,
+    fmt: ExportFormat = ExportFormat.CSV,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    **filters,
+) -> Iterator[str]:
+    """
+    Generate an export as text chunks with constant memory.
+
+    The generator owns its session so it can outlive the request's
+    dependency scope while the response is being streamed.
+    """
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown export dataset: {dataset}")
+    stmt = DATASETS[dataset](**filters)
+    columns = [c.name for c in stmt.selected_columns]
+    is_csv = fmt == ExportFormat.CSV
+    encoder = encode_csv if is_csv else encode_jsonl
+    converters = _column_converters(stmt, decimals_as_str=not is_csv)
+
+    db = session_factory()
+    try:
+        chunks = 0
+        for chunk in encoder(columns, iter_rows(db, stmt, batch_size), converters):
+            chunks += 1
+            yield chunk
+        logger.info(f"Exported {dataset} as {fmt.value} in {chunks} chunks")
+    finally:
+        db.close()
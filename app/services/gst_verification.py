@@ -0,0 +1,350 @@
+"""
+GSTIN verification against the GST API (``GST_API_BASE_URL``).
+
+Registrations are looked up in three tiers, each asked only for the
+GSTINs the one before it missed:
+
+1. Redis, one ``MGET`` per lookup. Keys expire after
+   ``GST_VERIFICATION_TTL_SECONDS``; GSTINs the API does not know are
+   remembered for ``GST_VERIFICATION_NOT_FOUND_TTL_SECONDS`` (only on the
+   API's "no records found" answer, never on other 404s).
+2. The ``gstin_verifications`` table, one query per 500 GSTINs, for rows
+   that have not reached ``expires_at``. Hits are copied back to Redis.
+3. The GST API, over one pooled HTTP client with at most
+   ``GST_API_CONCURRENCY`` requests in flight. Concurrent lookups of the
+   same GSTIN share one request, and rate-limited (429), server and
+   transport errors are retried with backoff up to ``GST_API_MAX_ATTEMPTS``.
+
+New registrations are saved with one upsert and one Redis pipeline. If
+Redis is unavailable lookups carry on against the database and the API.
+GSTINs are checked locally (format and check character) before any of this.
+"""
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import functools
+import json
+import random
+import httpx
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.gstin_verification import GstinVerification
+from app.repositories.gstin_verification import GstinVerificationRepository
+from app.utils.dependencies import get_redis_connection
+from app.utils.exceptions import ExternalServiceException, ValidationException
+from app.utils.validators import FIELD_VALIDATORS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Public taxpayer search: GET {GST_API_BASE_URL}/commonapi/v1.1/search?action=TP&gstin=...
+TAXPAYER_SEARCH_PATH = "/commonapi/v1.1/search"
+CACHE_KEY_PREFIX = "gstin:"
+# Error the taxpayer search answers with a 404 for GSTINs that are not registered
+TAXPAYER_NOT_FOUND = "No records found for the provided GSTIN"
+NOT_REGISTERED = "GSTIN not registered"
+
+
+class GstApiError(Exception):
+    """Failed GST API call; ``retryable`` is False for errors a retry cannot fix"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def _error_message(response: httpx.Response) -> Optional[str]:
+    """``error`` of a JSON error body, None for any other body"""
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    return body.get("error") if isinstance(body, dict) else None
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+@dataclass(slots=True)
+class GstinDetails:
+    """A GSTIN's registration; ``details`` is the taxpayer record returned by the API"""
+    gstin: str
+    legal_name: Optional[str]
+    trade_name: Optional[str]
+    status: Optional[str]
+    state_code: str
+    details: Dict[str, Any]
+    verified_at: datetime
+
+    @property
+    def active(self) -> bool:
+        return (self.status or "").lower() == "active"
+
+    @classmethod
+    def from_taxpayer(cls, gstin: str, record: Dict[str, Any], verified_at: datetime) -> "GstinDetails":
+        return cls(
+            gstin=gstin,
+            legal_name=record.get("lgnm"),
+            trade_name=record.get("tradeNam"),
+            status=record.get("sts"),
+            state_code=gstin[:2],
+            details=record,
+            verified_at=verified_at,
+        )
+
+    @classmethod
+    def from_row(cls, row: GstinVerification) -> "GstinDetails":
+        return cls(row.gstin, row.legal_name, row.trade_name, row.status, row.state_code, row.details,
+                   _utc(row.verified_at))
+
+    @classmethod
+    def from_cache(cls, data: Dict[str, Any]) -> "GstinDetails":
+        return cls(**{**data, "verified_at": datetime.fromisoformat(data["verified_at"])})
+
+    def to_cache(self) -> str:
+        return json.dumps({**asdict(self), "verified_at": self.verified_at.isoformat()})
+
+
+@dataclass(slots=True)
+class BulkVerification:
+    """Registrations by GSTIN and, for the rest, why they could not be verified"""
+    verified: Dict[str, GstinDetails] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class GstVerificationClient:
+    """
+    Verifies GSTINs with caching, request coalescing and bounded
+    concurrency, see the module docstring. One instance serves a whole
+    event loop; close it with ``aclose``.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+        redis_connection: Any = None,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        ttl_seconds: Optional[int] = None,
+        not_found_ttl_seconds: Optional[int] = None,
+    ):
+        self._client = client
+        self._owns_client = client is None
+        self.session_factory = session_factory or SessionLocal
+        self._redis = redis_connection
+        self.base_url = (base_url or settings.GST_API_BASE_URL).rstrip("/")
+        api_key = api_key or settings.GST_API_KEY
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.concurrency = concurrency or settings.GST_API_CONCURRENCY
+        self.timeout_seconds = timeout_seconds or settings.GST_API_TIMEOUT_SECONDS
+        self.max_attempts = max_attempts or settings.GST_API_MAX_ATTEMPTS
+        self.backoff_seconds = backoff_seconds if backoff_seconds is not None else settings.GST_API_BACKOFF_SECONDS
+        self.ttl_seconds = ttl_seconds or settings.GST_VERIFICATION_TTL_SECONDS
+        self.not_found_ttl_seconds = not_found_ttl_seconds or settings.GST_VERIFICATION_NOT_FOUND_TTL_SECONDS
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # GSTIN -> API request in flight, shared by every lookup that needs it
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+            self._client = httpx.AsyncClient(timeout=self.timeout_seconds, limits=limits)
+        return self._client
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            return get_redis_connection()
+        return self._redis
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def verify(self, gstin: str) -> Optional[GstinDetails]:
+        """
+        The registration of ``gstin``, or None if the GST API does not know it.
+        Raises ValidationException for a malformed GSTIN and
+        ExternalServiceException when the API cannot be reached.
+        """
+        try:
+            gstin = FIELD_VALIDATORS["gstin"](gstin)
+        except ValueError as e:
+            raise ValidationException(str(e))
+        outcome = (await self._lookup([gstin]))[gstin]
+        if isinstance(outcome, GstApiError):
+            raise ExternalServiceException(str(outcome), service="GST")
+        return outcome
+
+    async def verify_many(self, gstins: Iterable[str]) -> BulkVerification:
+        """
+        Verify a batch, e.g. the GSTINs of businesses being onboarded.
+        Duplicates are looked up once; results and errors are keyed by the
+        normalized GSTIN (the stripped input for malformed ones).
+        """
+        result = BulkVerification()
+        valid: Dict[str, None] = {}
+        for value in gstins:
+            try:
+                valid[FIELD_VALIDATORS["gstin"](value)] = None
+            except ValueError as e:
+                result.errors[value.strip()] = str(e)
+        for gstin, outcome in (await self._lookup(list(valid))).items():
+            if isinstance(outcome, GstinDetails):
+                result.verified[gstin] = outcome
+            else:
+                result.errors[gstin] = str(outcome) if outcome is not None else NOT_REGISTERED
+        return result
+
+    async def _lookup(self, gstins: List[str]) -> Dict[str, Any]:
+        """GSTIN -> GstinDetails, None (not registered) or GstApiError"""
+        if not gstins:
+            return {}
+        found = await asyncio.to_thread(self._from_redis, gstins)
+        missing = [gstin for gstin in gstins if gstin not in found]
+        if missing:
+            stored = await asyncio.to_thread(self._from_database, missing)
+            if stored:
+                await asyncio.to_thread(self._cache, stored)
+            found.update((gstin, details) for gstin, (details, _) in stored.items())
+            missing = [gstin for gstin in missing if gstin not in stored]
+        if missing:
+            found.update(await self._from_api(missing))
+        return {gstin: found[gstin] for gstin in gstins}
+
+    def _from_redis(self, gstins: List[str]) -> Dict[str, Optional[GstinDetails]]:
+        try:
+            values = self.redis.mget([CACHE_KEY_PREFIX + gstin for gstin in gstins])
+        except Exception as e:
+            logger.warning(f"GSTIN cache unavailable, reading {len(gstins)} verifications from the database: {e}")
+            return {}
+        found = {}
+        for gstin, value in zip(gstins, values):
+            if value is not None:
+                data = json.loads(value)
+                found[gstin] = GstinDetails.from_cache(data) if data is not None else None
+        return found
+
+    def _from_database(self, gstins: List[str]) -> Dict[str, Tuple[GstinDetails, datetime]]:
+        db = self.session_factory()
+        try:
+            rows = GstinVerificationRepository(db).get_fresh(gstins, datetime.now(timezone.utc))
+            return {row.gstin: (GstinDetails.from_row(row), _utc(row.expires_at)) for row in rows}
+        finally:
+            db.close()
+
+    def _cache(self, entries: Dict[str, Tuple[Optional[GstinDetails], datetime]]) -> None:
+        """Store GSTIN -> (registration or None, expiry) in Redis in one round trip"""
+        now = datetime.now(timezone.utc)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for gstin, (details, expires_at) in entries.items():
+                ttl = max(1, int((expires_at - now).total_seconds()))
+                pipe.set(CACHE_KEY_PREFIX + gstin, details.to_cache() if details else "null", ex=ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not cache {len(entries)} GSTIN verifications: {e}")
+
+    def _save(self, fetched: Dict[str, Optional[GstinDetails]], expires_at: datetime) -> None:
+        rows = [
+            {**asdict(details), "expires_at": expires_at}
+            for details in fetched.values() if details is not None
+        ]
+        db = self.session_factory()
+        try:
+            GstinVerificationRepository(db).save_many(rows)
+        except Exception as e:
+            logger.warning(f"Could not save {len(rows)} GSTIN verifications: {e}")
+        finally:
+            db.close()
+        not_found_until = datetime.now(timezone.utc) + timedelta(seconds=self.not_found_ttl_seconds)
+        self._cache({
+            gstin: (details, expires_at if details is not None else not_found_until)
+            for gstin, details in fetched.items()
+        })
+
+    async def _from_api(self, gstins: List[str]) -> Dict[str, Any]:
+        owned, tasks = [], []
+        for gstin in gstins:
+            task = self._in_flight.get(gstin)
+            if task is None:
+                task = asyncio.create_task(self._fetch(gstin))
+                self._in_flight[gstin] = task
+                task.add_done_callback(functools.partial(self._finished, gstin))
+                owned.append(gstin)
+            tasks.append(task)
+        # Shielded: a cancelled caller must not cancel a request others share
+        outcomes = await asyncio.gather(*(asyncio.shield(task) for task in tasks), return_exceptions=True)
+        results = dict(zip(gstins, outcomes))
+        fetched = {gstin: results[gstin] for gstin in owned if not isinstance(results[gstin], BaseException)}
+        if fetched:
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+            await asyncio.to_thread(self._save, fetched, expires_at)
+        for gstin, outcome in results.items():
+            if isinstance(outcome, BaseException) and not isinstance(outcome, GstApiError):
+                logger.error(f"Unexpected error verifying GSTIN {gstin}: {outcome}")
+                results[gstin] = GstApiError(f"{type(outcome).__name__}: {outcome}")
+        return results
+
+    def _finished(self, gstin: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(gstin) is task:
+            del self._in_flight[gstin]
+
+    async def _fetch(self, gstin: str) -> Optional[GstinDetails]:
+        attempts = 1
+        while True:
+            try:
+                return await self._request(gstin)
+            except GstApiError as e:
+                if not e.retryable or attempts >= self.max_attempts:
+                    logger.error(f"GST API lookup of {gstin} failed after {attempts} attempts: {e}")
+                    raise
+                delay = self.backoff_seconds * 2 ** (attempts - 1) * random.uniform(0.5, 1.0)
+                logger.warning(f"GST API lookup of {gstin} failed ({e}); retry {attempts} in {delay:.2f}s")
+            # Sleeps outside the semaphore so waiting retries do not hold a slot
+            await asyncio.sleep(delay)
+            attempts += 1
+
+    async def _request(self, gstin: str) -> Optional[GstinDetails]:
+        async with self._semaphore:
+            try:
+                response = await self.client.get(
+                    self.base_url + TAXPAYER_SEARCH_PATH,
+                    params={"action": "TP", "gstin": gstin},
+                    headers=self.headers,
+                )
+            except httpx.HTTPError as e:
+                raise GstApiError(f"{type(e).__name__}: {e}")
+        if response.status_code == 404:
+            # Only a search that found no taxpayer means "not registered"; any
+            # other 404 (wrong base URL, gateway error page) must not be cached
+            if _error_message(response) == TAXPAYER_NOT_FOUND:
+                return None
+            raise GstApiError(f"HTTP 404: {response.text[:200]}", retryable=False)
+        if response.status_code == 429 or response.status_code >= 500:
+            raise GstApiError(f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            raise GstApiError(f"HTTP {response.status_code}: {response.text[:200]}", retryable=False)
+        try:
+            record = response.json()
+        except ValueError:
+            raise GstApiError("Invalid JSON response", retryable=False)
+        return GstinDetails.from_taxpayer(gstin, record, datetime.now(timezone.utc))
+
+
+# Shared by the API worker's requests; closed on shutdown
+gst_verifier = GstVerificationClient()
@@ -0,0 +1,249 @@
+from datetime import datetime, timezone
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterable, Optional, Sequence, Set
+import asyncio
+import json
+from app.core.config import settings
+from app.utils.dependencies import get_redis_connection
+from app.utils.exceptions import ExternalServiceException
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Maximum seconds between reconnect attempts of the pub/sub listener
+MAX_RECONNECT_DELAY = 30.0
+
+
+def order_status_event(order, previous_status=None) -> Dict[str, Any]:
+    """Build the public status event for ``order``"""
+    return {
+        "order_id": order.id,
+        "order_number": order.order_number,
+        "user_id": order.user_id,
+        "status": order.status.value,
+        "previous_status": previous_status.value if previous_status is not None else None,
+        "estimated_delivery_date": (
+            order.estimated_delivery_date.isoformat() if order.estimated_delivery_date else None
+        ),
+        "occurred_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def publish_order_event(event: Dict[str, Any], connection: Any = None) -> bool:
+    """
+    Publish an order event to every API worker; best effort.
+
+    Events are published after the change is committed. A lost event only
+    delays the client until its next refresh, so failures are logged and
+    never raised into the caller.
+    """
+    return publish_order_events([event], connection) == 1
+
+
+def publish_order_events(events: Sequence[Dict[str, Any]], connection: Any = None) -> int:
+    """Publish many order events in one pipelined round trip; returns how many were sent"""
+    if not events:
+        return 0
+    try:
+        connection = connection or get_redis_connection()
+        pipe = connection.pipeline(transaction=False)
+        for event in events:
+            pipe.publish(settings.ORDER_EVENTS_CHANNEL, json.dumps(event))
+        pipe.execute()
+        return len(events)
+    except Exception as e:
+        logger.warning(f"Could not publish {len(events)} order events: {e}")
+        return 0
+
+
+class Subscription:
+    """
+    One connected client's view of the event stream.
+
+    Keeps at most ``queue_size`` undelivered events; when a slow client
+    falls behind the oldest are dropped, since only the latest status
+    matters. A waiter future exists only while the client is waiting, so
+    an idle subscription is a few hundred bytes.
+    """
+
+    __slots__ = ("user_id", "order_numbers", "pending", "dropped", "_waiter")
+
+    def __init__(self, user_id: int, order_numbers: Optional[Iterable[str]] = None, queue_size: int = 16):
+        self.user_id = user_id
+        self.order_numbers = frozenset(order_numbers) if order_numbers else None
+        self.pending: Deque[Dict[str, Any]] = deque(maxlen=queue_size)
+        self.dropped = 0
+        self._waiter: Optional[asyncio.Future] = None
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return self.order_numbers is None or event.get("order_number") in self.order_numbers
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(event)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def get(self) -> Dict[str, Any]:
+        """Next undelivered event, waiting for one if necessary"""
+        while not self.pending:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self.pending.popleft()
+
+
+class OrderEventHub:
+    """
+    Per-worker fan-out of order events to connected clients.
+
+    Each worker holds one Redis pub/sub subscription regardless of how many
+    clients are connected, and routes events to subscriptions by user id.
+    Idle clients cost one small buffer each; the number of clients is capped
+    by ``max_connections``.
+    """
+
+    def __init__(
+        self,
+        channel: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        connection_factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.channel = channel or settings.ORDER_EVENTS_CHANNEL
+        self.queue_size = queue_size or settings.ORDER_EVENTS_QUEUE_SIZE
+        self.max_connections = max_connections or settings.ORDER_EVENTS_MAX_CONNECTIONS
+        self.connection_factory = connection_factory or self._default_connection
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._count = 0
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def connection_count(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _default_connection():
+        import redis.asyncio as aioredis
+        return aioredis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True,
+            socket_connect_timeout=5,
+            health_check_interval=30,
+        )
+
+    def check_capacity(self) -> None:
+        """Raise if another subscription would exceed ``max_connections``"""
+        if self._count >= self.max_connections:
+            raise ExternalServiceException("Too many live order connections, retry later")
+
+    def subscribe(self, user_id: int, order_numbers: Optional[Iterable[str]] = None) -> Subscription:
+        self.check_capacity()
+        subscription = Subscription(user_id, order_numbers, self.queue_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        self._count += 1
+        self.ensure_listening()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        self._count -= 1
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+
+    def dispatch(self, event: Dict[str, Any]) -> int:
+        """Deliver an event to the matching local subscriptions; returns how many"""
+        delivered = 0
+        for subscription in self._subscriptions.get(event.get("user_id"), ()):
+            if subscription.matches(event):
+                subscription.offer(event)
+                delivered += 1
+        return delivered
+
+    def ensure_listening(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        delay = 1.0
+        while True:
+            connection = None
+            try:
+                connection = self.connection_factory()
+                pubsub = connection.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+                logger.info(f"Listening for order events on {self.channel}")
+                delay = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        self.dispatch(json.loads(message["data"]))
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"Ignoring malformed order event: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Order event listener disconnected, retrying in {delay:.0f}s: {e}")
+            finally:
+                if connection is not None:
+                    try:
+                        await connection.aclose()
+                    except Exception:
+                        pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+async def sse_stream(
+    hub: OrderEventHub,
+    user_id: int,
+    order_numbers: Optional[Iterable[str]] = None,
+    heartbeat: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    Server-sent events for a user's orders, with keep-alive comments while idle.
+
+    The subscription is taken on the first iteration, so a client that goes
+    away before the body is streamed never holds a connection slot.
+    """
+    heartbeat = heartbeat or settings.ORDER_EVENTS_HEARTBEAT_SECONDS
+    try:
+        subscription = hub.subscribe(user_id, order_numbers)
+    except ExternalServiceException as e:
+        # Filled up since the endpoint checked; the client reconnects later
+        logger.warning(f"Closing order event stream for user {user_id}: {e.detail}")
+        return
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                async with asyncio.timeout(heartbeat):
+                    event = await subscription.get()
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: order_status\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+    finally:
+        hub.unsubscribe(subscription)
+
+
+# Global hub instance (starts listening on the first subscription)
+order_event_hub = OrderEventHub()
@@ -0,0 +1,236 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Optional, Sequence
+import numpy as np
+from app.core.config import settings
+from app.services.pricing import PriceQuote
+from app.utils.exceptions import ValidationException
+from app.utils.money import apply_bps, from_paise, rate_to_bps, to_paise
+from app.utils.validators import GST
+import logging
+
+logger = logging.getLogger(__name__)
+
+GRAMS_PER_KG = 1000
+
+
+@dataclass
+class OrderTotals:
+    """Computed order totals; all amounts in integer paise"""
+    subtotal: int
+    cgst: int
+    sgst: int
+    igst: int
+    shipping_cost: int
+    round_off: int
+    is_interstate: bool
+
+    @property
+    def tax_amount(self) -> int:
+        return self.cgst + self.sgst + self.igst
+
+    @property
+    def total_amount(self) -> int:
+        return self.subtotal + self.tax_amount + self.shipping_cost + self.round_off
+
+    def as_order_fields(self) -> Dict[str, Decimal]:
+        """Return the ``OrderBase`` money fields as Decimals"""
+        return {
+            "total_amount": from_paise(self.total_amount),
+            "tax_amount": from_paise(self.tax_amount),
+            "shipping_cost": from_paise(self.shipping_cost),
+        }
+
+
+@dataclass
+class LineTotals:
+    """Per-line amounts from a batched calculation (int64 paise arrays)"""
+    line_total: np.ndarray
+    cgst: np.ndarray
+    sgst: np.ndarray
+    igst: np.ndarray
+
+
+def _sum_by(index: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Exact int64 group sum (``np.bincount`` would go through float64)"""
+    out = np.zeros(size, dtype=np.int64)
+    np.add.at(out, index, values)
+    return out
+
+
+class OrderTotalsCalculator:
+    """
+    Batched order-total engine working in integer paise.
+
+    Tax is rounded half-up per line. Intra-state supplies split the GST
+    rate into CGST and SGST (each rounded separately on the line value);
+    inter-state supplies charge IGST at the full rate. Shipping is a base
+    charge plus a per-kg charge on the rounded-up order weight, waived
+    above the free-shipping threshold.
+    """
+
+    def __init__(
+        self,
+        home_state_code: Optional[str] = None,
+        shipping_base_cost: Optional[Decimal] = None,
+        shipping_cost_per_kg: Optional[Decimal] = None,
+        free_shipping_threshold: Optional[Decimal] = None,
+        round_to_rupee: Optional[bool] = None,
+    ):
+        self.home_state_code = home_state_code or settings.HOME_STATE_CODE
+        self.shipping_base = to_paise(
+            shipping_base_cost if shipping_base_cost is not None else settings.SHIPPING_BASE_COST
+        )
+        self.shipping_per_kg = to_paise(
+            shipping_cost_per_kg if shipping_cost_per_kg is not None else settings.SHIPPING_COST_PER_KG
+        )
+        self.free_shipping_threshold = to_paise(
+            free_shipping_threshold if free_shipping_threshold is not None else settings.FREE_SHIPPING_THRESHOLD
+        )
+        self.round_to_rupee = settings.ROUND_TOTAL_TO_RUPEE if round_to_rupee is None else round_to_rupee
+
+    def is_interstate(self, buyer_gstin: Optional[str], place_of_supply: Optional[str] = None) -> bool:
+        """Decide IGST vs CGST/SGST from the buyer's GSTIN state code"""
+        state_code = place_of_supply or (GST.extract_state_code(buyer_gstin) if buyer_gstin else None)
+        if state_code is None:
+            raise ValidationException("Cannot determine place of supply: invalid buyer GSTIN")
+        return state_code != self.home_state_code
+
+    def line_totals(
+        self,
+        unit_price: np.ndarray,
+        quantities: np.ndarray,
+        gst_bps: np.ndarray,
+        interstate: bool,
+    ) -> LineTotals:
+        """Compute per-line value and tax split"""
+        line_total = np.asarray(unit_price, dtype=np.int64) * np.asarray(quantities, dtype=np.int64)
+        bps = np.broadcast_to(np.asarray(gst_bps, dtype=np.int64), line_total.shape)
+        zeros = np.zeros_like(line_total)
+        if interstate:
+            return LineTotals(line_total, zeros, zeros, apply_bps(line_total, bps))
+        # Half rate each: round_half_up(line * bps / 20000)
+        half = (line_total * bps + 10000) // 20000
+        return LineTotals(line_total, half, half.copy(), zeros)
+
+    def shipping_for(self, subtotal: int, weight_grams: int) -> int:
+        """Shipping charge in paise for an order subtotal and weight"""
+        if subtotal >= self.free_shipping_threshold:
+            return 0
+        weight_kg = -(-int(weight_grams) // GRAMS_PER_KG)
+        return self.shipping_base + self.shipping_per_kg * weight_kg
+
+    def calculate(
+        self,
+        unit_price: Sequence[int],
+        quantities: Sequence[int],
+        buyer_gstin: Optional[str],
+        gst_bps: Optional[Sequence[int]] = None,
+        weight_grams: Optional[Sequence[int]] = None,
+        place_of_supply: Optional[str] = None,
+    ) -> OrderTotals:
+        """Compute totals for a single order in one batched pass"""
+        unit = np.asarray(unit_price, dtype=np.int64)
+        qty = np.asarray(quantities, dtype=np.int64)
+        if unit.shape != qty.shape or unit.ndim != 1:
+            raise ValidationException("unit_price and quantities must be equal-length sequences")
+        if gst_bps is None:
+            gst_bps = rate_to_bps(settings.DEFAULT_GST_RATE)
+        interstate = self.is_interstate(buyer_gstin, place_of_supply)
+
+        lines = self.line_totals(unit, qty, gst_bps, interstate)
+        subtotal = int(lines.line_total.sum())
+        weight = int((np.asarray(weight_grams, dtype=np.int64) * qty).sum()) if weight_grams is not None else 0
+
+        totals = OrderTotals(
+            subtotal=subtotal,
+            cgst=int(lines.cgst.sum()),
+            sgst=int(lines.sgst.sum()),
+            igst=int(lines.igst.sum()),
+            shipping_cost=self.shipping_for(subtotal, weight),
+            round_off=0,
+            is_interstate=interstate,
+        )
+        if self.round_to_rupee:
+            totals.round_off = self._round_off(totals.total_amount)
+        return totals
+
+    def calculate_from_quote(
+        self,
+        quote: PriceQuote,
+        buyer_gstin: Optional[str],
+        gst_bps: Optional[Sequence[int]] = None,
+        weight_grams: Optional[Sequence[int]] = None,
+        place_of_supply: Optional[str] = None,
+    ) -> OrderTotals:
+        """Compute totals for lines already priced by the price book service"""
+        return self.calculate(
+            quote.unit_price, quote.quantities, buyer_gstin, gst_bps, weight_grams, place_of_supply
+        )
+
+    def calculate_many(
+        self,
+        order_index: Sequence[int],
+        unit_price: Sequence[int],
+        quantities: Sequence[int],
+        interstate: Sequence[bool],
+        gst_bps: Optional[Sequence[int]] = None,
+        weight_grams: Optional[Sequence[int]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute totals for many orders at once.
+
+        ``order_index`` maps each line to a dense order position
+        ``0..n_orders-1``; ``interstate`` is given per order. Returns
+        per-order int64 paise arrays.
+        """
+        idx = np.asarray(order_index, dtype=np.int64)
+        unit = np.asarray(unit_price, dtype=np.int64)
+        qty = np.asarray(quantities, dtype=np.int64)
+        inter = np.asarray(interstate, dtype=bool)
+        n_orders = inter.shape[0]
+        bps = np.broadcast_to(
+            np.asarray(gst_bps if gst_bps is not None else rate_to_bps(settings.DEFAULT_GST_RATE), dtype=np.int64),
+            unit.shape,
+        )
+
+        line_total = unit * qty
+        line_inter = inter[idx]
+        igst_lines = np.where(line_inter, apply_bps(line_total, bps), 0)
+        half_lines = np.where(line_inter, 0, (line_total * bps + 10000) // 20000)
+
+        subtotal = _sum_by(idx, line_total, n_orders)
+        igst = _sum_by(idx, igst_lines, n_orders)
+        half = _sum_by(idx, half_lines, n_orders)
+
+        if weight_grams is not None:
+            line_weight = np.asarray(weight_grams, dtype=np.int64) * qty
+            weight = _sum_by(idx, line_weight, n_orders)
+        else:
+            weight = np.zeros(n_orders, dtype=np.int64)
+        weight_kg = -(-weight // GRAMS_PER_KG)
+        shipping = np.where(
+            subtotal >= self.free_shipping_threshold,
+            0,
+            self.shipping_base + self.shipping_per_kg * weight_kg,
+        )
+
+        total = subtotal + igst + 2 * half + shipping
+        round_off = np.zeros(n_orders, dtype=np.int64)
+        if self.round_to_rupee:
+            round_off = ((total + 50) // 100) * 100 - total
+            total = total + round_off
+        return {
+            "subtotal": subtotal,
+            "cgst": half,
+            "sgst": half.copy(),
+            "igst": igst,
+            "shipping_cost": shipping,
+            "round_off": round_off,
+            "total_amount": total,
+        }
+
+    @staticmethod
+    def _round_off(total_paise: int) -> int:
+        """Adjustment that rounds a total to the nearest rupee (half-up)"""
+        return ((total_paise + 50) // 100) * 100 - total_paise
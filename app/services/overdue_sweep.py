@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+from app.models.order import ORDER_IS_ACTIVE, Order
+from app.repositories.job_state import JobStateRepository
+from app.repositories.outbox import OutboxRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+SWEEP_JOB = "overdue_orders"
+
+
+@dataclass
+class SweepReport:
+    flagged: int = 0
+    batches: int = 0
+    watermark: Optional[datetime] = None
+    last_id: int = 0
+
+
+class OverdueSweeper:
+    """
+    Flags active orders that passed their estimated delivery date.
+
+    Each run scans active orders due by ``now`` with no ``overdue_at``
+    through the partial index on active orders, in ``(estimated_delivery_date,
+    id)`` order. ``overdue_at`` is what makes runs incremental: the
+    position reached is only the restart point of the next batch within
+    the same run. A stored watermark would skip orders that become active
+    after their date has passed (a late confirmation) or whose date is
+    moved back. Each batch marks its orders, queues "order.overdue" alerts
+    in the outbox and records its position in one transaction; the job
+    state row is locked meanwhile, so overlapping runs cannot flag an
+    order twice.
+    """
+
+    def __init__(self, db: Session, batch_size: Optional[int] = None, max_batches: Optional[int] = None):
+        self.db = db
+        self.batch_size = batch_size or settings.OVERDUE_SWEEP_BATCH_SIZE
+        self.max_batches = max_batches
+
+    def sweep(self, now: Optional[datetime] = None, on_batch: Optional[Callable[[], bool]] = None) -> SweepReport:
+        """
+        Flag everything overdue as of ``now``. ``on_batch`` runs after each
+        committed batch; returning False stops the sweep early.
+        """
+        now = now or datetime.now(timezone.utc)
+        report = SweepReport()
+        while self.max_batches is None or report.batches < self.max_batches:
+            flagged = self._sweep_batch(now, report)
+            if flagged == 0:
+                break
+            report.flagged += flagged
+            report.batches += 1
+            if flagged < self.batch_size or (on_batch is not None and not on_batch()):
+                break
+        if report.flagged:
+            logger.info(f"Overdue sweep flagged {report.flagged} orders in {report.batches} batches")
+        return report
+
+    def _sweep_batch(self, now: datetime, report: SweepReport) -> int:
+        jobs = JobStateRepository(self.db)
+        try:
+            state = jobs.get_for_update(SWEEP_JOB)
+            stmt = (
+                select(Order)
+                .options(joinedload(Order.user))
+                .where(
+                    ORDER_IS_ACTIVE,
+                    Order.estimated_delivery_date <= now,
+                    Order.overdue_at.is_(None),
+                )
+                .order_by(Order.estimated_delivery_date, Order.id)
+                .limit(self.batch_size)
+            )
+            if report.watermark is not None:
+                stmt = stmt.where(
+                    tuple_(Order.estimated_delivery_date, Order.id) > tuple_(report.watermark, report.last_id)
+                )
+            orders = self.db.execute(stmt).scalars().all()
+            if not orders:
+                self.db.commit()
+                return 0
+
+            outbox = OutboxRepository(self.db)
+            for order in orders:
+                order.overdue_at = now
+                outbox.add_order_notifications(
+                    order, "order.overdue",
+                    estimated_delivery_date=order.estimated_delivery_date.isoformat(),
+                )
+            report.watermark, report.last_id = orders[-1].estimated_delivery_date, orders[-1].id
+            numbers = [order.order_number for order in orders]
+            jobs.advance(state, report.watermark, report.last_id)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Error sweeping overdue orders: {e}")
+            self.db.rollback()
+            raise
+
+        logger.warning(
+            f"{len(numbers)} orders overdue: " + ", ".join(numbers[:20]) + (" ..." if len(numbers) > 20 else "")
+        )
+        return len(numbers)
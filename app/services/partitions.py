@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import List, Optional, Union
+from sqlalchemy import MetaData, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+from app.core.database import Base
+from app.models.partitioning import PARTITIONING_DIALECT, partitioned_tables
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def month_floor(value: Union[date, datetime]) -> date:
+    """First day of the UTC month containing ``value``"""
+    if isinstance(value, datetime):
+        value = value.astimezone(timezone.utc) if value.tzinfo is not None else value
+        value = value.date()
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+@dataclass(frozen=True)
+class MonthPartition:
+    """One month of a partitioned table, covering [start, end) in UTC"""
+    table: str
+    month: date
+
+    @property
+    def name(self) -> str:
+        return f"{self.table}_p{self.month:%Y%m}"
+
+    @property
+    def start(self) -> datetime:
+        return datetime(self.month.year, self.month.month, 1, tzinfo=timezone.utc)
+
+    @property
+    def end(self) -> datetime:
+        following = add_months(self.month, 1)
+        return datetime(following.year, following.month, 1, tzinfo=timezone.utc)
+
+    def create_sql(self) -> str:
+        return (
+            f'CREATE TABLE IF NOT EXISTS "{self.name}" PARTITION OF "{self.table}" '
+            f"FOR VALUES FROM ('{self.start.isoformat()}') TO ('{self.end.isoformat()}')"
+        )
+
+    @classmethod
+    def from_name(cls, table: str, name: str) -> Optional["MonthPartition"]:
+        suffix = name[len(table) + 2:]
+        if not name.startswith(f"{table}_p") or len(suffix) != 6 or not suffix.isdigit():
+            return None
+        return cls(table, date(int(suffix[:4]), int(suffix[4:]), 1))
+
+
+class PartitionManager:
+    """
+    Creates and detaches the monthly partitions of partitioned tables.
+
+    ``ensure`` keeps partitions ready for ``months_ahead`` future months so
+    inserts never hit a missing range. ``detach`` removes a month from every
+    partitioned table at once (orders and their items stay together) and,
+    when an archive tablespace is configured, moves the detached tables
+    there. Detached tables keep their data and can be re-attached or
+    dumped and dropped. On databases without partitioning this is a no-op.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        metadata: MetaData = Base.metadata,
+        months_ahead: Optional[int] = None,
+        archive_tablespace: Optional[str] = None,
+    ):
+        self.engine = engine
+        self.tables = [table.name for table in partitioned_tables(metadata)]
+        self.months_ahead = months_ahead if months_ahead is not None else settings.PARTITION_MONTHS_AHEAD
+        self.archive_tablespace = archive_tablespace or settings.PARTITION_ARCHIVE_TABLESPACE
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine.dialect.name == PARTITIONING_DIALECT
+
+    def planned(self, now: Optional[datetime] = None, since: Optional[date] = None) -> List[MonthPartition]:
+        """Partitions that should exist: from ``since`` (default this month) to ``months_ahead`` ahead"""
+        current = month_floor(now or datetime.now(timezone.utc))
+        month = month_floor(since) if since is not None else current
+        last = add_months(current, self.months_ahead)
+        partitions = []
+        while month <= last:
+            partitions.extend(MonthPartition(table, month) for table in self.tables)
+            month = add_months(month, 1)
+        return partitions
+
+    def attached(self, conn: Connection, table: str) -> List[MonthPartition]:
+        rows = conn.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :table ORDER BY child.relname"
+            ),
+            {"table": table},
+        ).scalars()
+        return [p for p in (MonthPartition.from_name(table, name) for name in rows) if p is not None]
+
+    def ensure(self, now: Optional[datetime] = None, since: Optional[date] = None) -> List[str]:
+        """Create any missing partitions; returns the names created"""
+        if not self.enabled:
+            return []
+        created = []
+        try:
+            with self.engine.begin() as conn:
+                existing = {p.name for table in self.tables for p in self.attached(conn, table)}
+                for partition in self.planned(now, since):
+                    if partition.name not in existing:
+                        conn.execute(text(partition.create_sql()))
+                        created.append(partition.name)
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating partitions: {e}")
+            raise
+        if created:
+            logger.info(f"Created partitions {', '.join(created)}")
+        return created
+
+    def detach(self, month: date, concurrently: bool = True) -> List[str]:
+        """Detach one month from every partitioned table; returns the detached table names"""
+        if not self.enabled:
+            return []
+        month = month_floor(month)
+        detached = []
+        # DETACH ... CONCURRENTLY cannot run inside a transaction block
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            try:
+                for table in reversed(self.tables):
+                    partition = MonthPartition(table, month)
+                    if partition not in self.attached(conn, table):
+                        continue
+                    mode = " CONCURRENTLY" if concurrently else ""
+                    conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition.name}"{mode}'))
+                    # The id default would tie the archive to the parent's sequence
+                    conn.execute(text(f'ALTER TABLE "{partition.name}" ALTER COLUMN id DROP DEFAULT'))
+                    if self.archive_tablespace:
+                        conn.execute(text(
+                            f'ALTER TABLE "{partition.name}" SET TABLESPACE "{self.archive_tablespace}"'
+                        ))
+                    detached.append(partition.name)
+            except SQLAlchemyError as e:
+                logger.error(f"Error detaching partitions for {month:%Y-%m}: {e}")
+                raise
+        if detached:
+            logger.info(f"Detached partitions {', '.join(detached)}")
+        return detached
+
+    def detach_older_than(self, months: int, now: Optional[datetime] = None) -> List[str]:
+        """Detach every month that ended more than ``months`` months ago"""
+        if not self.enabled or months <= 0:
+            return []
+        cutoff = add_months(month_floor(now or datetime.now(timezone.utc)), -months)
+        with self.engine.connect() as conn:
+            old = sorted({p.month for table in self.tables for p in self.attached(conn, table) if p.month < cutoff})
+        detached = []
+        for month in old:
+            detached.extend(self.detach(month))
+        return detached
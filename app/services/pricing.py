@@ -0,0 +1,262 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+import threading
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.product import Product
+from app.models.user import BusinessType
+from app.utils.exceptions import NotFoundException, ValidationException
+from app.utils.money import apply_bps, from_paise, rate_to_bps, to_paise
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class VolumeDiscount:
+    """Discount applied once a line reaches ``min_quantity`` units"""
+    min_quantity: int
+    discount_percentage: Decimal
+
+
+# Default volume-break tiers per business type (Requirement 6.4)
+DEFAULT_VOLUME_DISCOUNTS: Dict[BusinessType, List[VolumeDiscount]] = {
+    BusinessType.RETAIL_STORE: [],
+    BusinessType.COMPANY: [
+        VolumeDiscount(min_quantity=50, discount_percentage=Decimal("2")),
+        VolumeDiscount(min_quantity=100, discount_percentage=Decimal("5")),
+        VolumeDiscount(min_quantity=500, discount_percentage=Decimal("8")),
+    ],
+}
+
+
+@dataclass
+class PriceQuote:
+    """Vectorized price resolution result; all amounts are int64 paise arrays"""
+    product_ids: np.ndarray
+    quantities: np.ndarray
+    unit_price: np.ndarray
+    line_subtotal: np.ndarray
+    line_tax: np.ndarray
+    line_total: np.ndarray
+    tier_index: np.ndarray
+
+    @property
+    def subtotal(self) -> Decimal:
+        return from_paise(int(self.line_subtotal.sum()))
+
+    @property
+    def tax(self) -> Decimal:
+        return from_paise(int(self.line_tax.sum()))
+
+    @property
+    def total(self) -> Decimal:
+        return from_paise(int(self.line_total.sum()))
+
+    def to_lines(self) -> List[Dict]:
+        """Materialize per-line Decimal amounts (for API responses)"""
+        return [
+            {
+                "product_id": int(pid),
+                "quantity": int(qty),
+                "unit_price": from_paise(unit),
+                "total_price": from_paise(sub),
+                "tax_amount": from_paise(tax),
+                "total_with_tax": from_paise(total),
+            }
+            for pid, qty, unit, sub, tax, total in zip(
+                self.product_ids.tolist(),
+                self.quantities.tolist(),
+                self.unit_price.tolist(),
+                self.line_subtotal.tolist(),
+                self.line_tax.tolist(),
+                self.line_total.tolist(),
+            )
+        ]
+
+
+class PriceBook:
+    """
+    Precomputed price list for a single business type.
+
+    Products are stored as parallel arrays sorted by product id so that a
+    batch of ids is resolved with one ``np.searchsorted`` call. Unit prices
+    for every volume tier are precomputed into a ``(n_products, n_tiers)``
+    matrix; GST is applied to each line subtotal in ``quote``.
+    """
+
+    def __init__(
+        self,
+        business_type: BusinessType,
+        product_ids: np.ndarray,
+        base_price: np.ndarray,
+        gst_bps: np.ndarray,
+        volume_discounts: Sequence[VolumeDiscount] = (),
+    ):
+        order = np.argsort(product_ids, kind="stable")
+        self.business_type = business_type
+        self.product_ids = np.ascontiguousarray(product_ids[order], dtype=np.int64)
+        self.gst_bps = np.ascontiguousarray(gst_bps[order], dtype=np.int64)
+
+        tiers = sorted(volume_discounts, key=lambda d: d.min_quantity)
+        # Tier 0 is always the undiscounted price from quantity 1
+        self.tier_thresholds = np.array(
+            [1] + [d.min_quantity for d in tiers], dtype=np.int64
+        )
+        discount_bps = np.array(
+            [0] + [rate_to_bps(d.discount_percentage) for d in tiers], dtype=np.int64
+        )
+
+        base = np.asarray(base_price[order], dtype=np.int64)
+        # unit_price[i, t] = round_half_up(base[i] * (1 - discount[t]))
+        self.unit_price = apply_bps(base[:, None], 10000 - discount_bps[None, :])
+
+    def __len__(self) -> int:
+        return int(self.product_ids.shape[0])
+
+    def lookup(self, product_ids: np.ndarray) -> np.ndarray:
+        """Return row indices for ``product_ids``; raises if any id is unknown"""
+        rows = np.searchsorted(self.product_ids, product_ids)
+        rows = np.minimum(rows, max(len(self) - 1, 0))
+        if len(self) == 0:
+            missing = np.ones(product_ids.shape, dtype=bool)
+        else:
+            missing = self.product_ids[rows] != product_ids
+        if missing.any():
+            unknown = sorted(set(product_ids[missing].tolist()))
+            raise NotFoundException(
+                message=f"Products not available for pricing: {unknown[:20]}"
+            )
+        return rows
+
+    def tier_for(self, quantities: np.ndarray) -> np.ndarray:
+        """Return the volume tier index for each quantity"""
+        return np.searchsorted(self.tier_thresholds, quantities, side="right") - 1
+
+    def quote(self, product_ids: Sequence[int], quantities: Sequence[int]) -> PriceQuote:
+        """Price a batch of lines in one vectorized pass"""
+        ids = np.asarray(product_ids, dtype=np.int64)
+        qty = np.asarray(quantities, dtype=np.int64)
+        if ids.shape != qty.shape or ids.ndim != 1:
+            raise ValidationException("product_ids and quantities must be equal-length sequences")
+        if (qty <= 0).any():
+            raise ValidationException("Quantities must be positive")
+
+        rows = self.lookup(ids)
+        tiers = self.tier_for(qty)
+        unit = self.unit_price[rows, tiers]
+        subtotal = unit * qty
+        # Tax is charged on the line value, not rounded per unit
+        tax = apply_bps(subtotal, self.gst_bps[rows])
+        return PriceQuote(
+            product_ids=ids,
+            quantities=qty,
+            unit_price=unit,
+            line_subtotal=subtotal,
+            line_tax=tax,
+            line_total=subtotal + tax,
+            tier_index=tiers,
+        )
+
+
+class PriceBookService:
+    """
+    Builds and serves per-business-type price books.
+
+    Price books are immutable snapshots; ``refresh`` rebuilds them from the
+    ``products`` table and swaps them in atomically.
+    """
+
+    def __init__(
+        self,
+        volume_discounts: Optional[Dict[BusinessType, List[VolumeDiscount]]] = None,
+        gst_rate: Optional[Decimal] = None,
+    ):
+        self.volume_discounts = volume_discounts or DEFAULT_VOLUME_DISCOUNTS
+        self.gst_bps = rate_to_bps(gst_rate if gst_rate is not None else settings.DEFAULT_GST_RATE)
+        self._books: Dict[BusinessType, PriceBook] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._books)
+
+    def load_arrays(
+        self,
+        product_ids: np.ndarray,
+        retail_price: np.ndarray,
+        company_price: np.ndarray,
+        gst_bps: Optional[np.ndarray] = None,
+    ) -> None:
+        """Build price books from paise arrays"""
+        books = {
+            business_type: self.build_book(business_type, product_ids, retail_price, company_price, gst_bps)
+            for business_type in (BusinessType.RETAIL_STORE, BusinessType.COMPANY)
+        }
+        with self._lock:
+            self._books = books
+        logger.info(f"Loaded price books for {len(product_ids)} products")
+
+    def build_book(
+        self,
+        business_type: BusinessType,
+        product_ids: np.ndarray,
+        retail_price: np.ndarray,
+        company_price: np.ndarray,
+        gst_bps: Optional[np.ndarray] = None,
+    ) -> PriceBook:
+        """Build a standalone price book for one business type (not cached)"""
+        product_ids = np.asarray(product_ids, dtype=np.int64)
+        if gst_bps is None:
+            gst_bps = np.full(product_ids.shape, self.gst_bps, dtype=np.int64)
+        base = company_price if business_type == BusinessType.COMPANY else retail_price
+        return PriceBook(
+            business_type,
+            product_ids,
+            np.asarray(base, dtype=np.int64),
+            np.asarray(gst_bps, dtype=np.int64),
+            self.volume_discounts.get(business_type, []),
+        )
+
+    def refresh(self, db: Session) -> None:
+        """Rebuild price books from active products"""
+        rows: List[Tuple[int, Decimal, Decimal]] = (
+            db.query(Product.id, Product.retail_price, Product.company_price)
+            .filter(Product.is_active == True)
+            .all()
+        )
+        n = len(rows)
+        ids = np.empty(n, dtype=np.int64)
+        retail = np.empty(n, dtype=np.int64)
+        company = np.empty(n, dtype=np.int64)
+        for i, (product_id, retail_price, company_price) in enumerate(rows):
+            ids[i] = product_id
+            retail[i] = to_paise(retail_price)
+            company[i] = to_paise(company_price)
+        self.load_arrays(ids, retail, company)
+
+    def get_book(self, business_type: BusinessType) -> PriceBook:
+        book = self._books.get(business_type)
+        if book is None:
+            raise NotFoundException(resource=f"Price book for {business_type.value}")
+        return book
+
+    def resolve_prices(
+        self,
+        user,
+        product_ids: Sequence[int],
+        quantities: Sequence[int],
+    ) -> PriceQuote:
+        """Resolve tier-aware prices for ``user`` across a batch of lines"""
+        return self.get_book(user.business_type).quote(product_ids, quantities)
+
+
+# Global price book service instance
+price_book_service = PriceBookService()
+
+
+def resolve_prices(user, product_ids: Sequence[int], quantities: Sequence[int]) -> PriceQuote:
+    """Resolve prices against the global price book service"""
+    return price_book_service.resolve_prices(user, product_ids, quantities)
@@ -0,0 +1,163 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import DateTime, delete, distinct, func, insert, literal, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql.functions import FunctionElement
+from app.core.config import settings
+from app.models.order import ORDER_CHANGED_AT, Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.rollup import InventoryRollupDaily, OrderRollupDaily, OrderRollupHourly, ProductSalesDaily
+from app.models.user import User
+from app.repositories.job_state import JobStateRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_JOB = "dashboard_rollups"
+
+
+class hour_floor(FunctionElement):
+    """Timestamp truncated to its UTC hour"""
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+class day_floor(FunctionElement):
+    """Timestamp truncated to its UTC day"""
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(hour_floor)
+def _hour_floor(element, compiler, **kw):
+    return "date_trunc('hour', %s, 'UTC')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(day_floor)
+def _day_floor(element, compiler, **kw):
+    return "date_trunc('day', %s, 'UTC')" % compiler.process(element.clauses, **kw)
+
+
+# SQLite keeps timestamps as text; match SQLAlchemy's storage format so the
+# buckets compare correctly against bound datetimes.
+@compiles(hour_floor, "sqlite")
+def _hour_floor_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m-%%d %%H:00:00.000000', %s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(day_floor, "sqlite")
+def _day_floor_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m-%%d 00:00:00.000000', %s)" % compiler.process(element.clauses, **kw)
+
+
+@dataclass
+class RollupReport:
+    days: List[datetime] = field(default_factory=list)
+    watermark: Optional[datetime] = None
+
+
+class RollupService:
+    """
+    Incrementally maintains the dashboard rollup tables.
+
+    Each refresh finds the days whose orders were created or changed since
+    the watermark (through the ``ix_orders_changed_at`` index) and rebuilds
+    only those days: hourly and daily order rollups, and per-product sales.
+    Rebuilding a whole day is idempotent, so the scan overlaps the previous
+    watermark by ``lag_seconds`` to pick up transactions that committed
+    late. Inventory counts are re-snapshotted for the current day.
+    """
+
+    def __init__(self, db: Session, lag_seconds: Optional[float] = None, low_stock_threshold: Optional[int] = None):
+        self.db = db
+        self.lag_seconds = lag_seconds if lag_seconds is not None else settings.ROLLUP_LAG_SECONDS
+        self.low_stock_threshold = (
+            low_stock_threshold if low_stock_threshold is not None else settings.LOW_STOCK_THRESHOLD
+        )
+
+    def refresh(self, now: Optional[datetime] = None) -> RollupReport:
+        now = now or datetime.now(timezone.utc)
+        jobs = JobStateRepository(self.db)
+        try:
+            state = jobs.get_for_update(ROLLUP_JOB)
+            stmt = select(day_floor(Order.created_at)).distinct()
+            if state.watermark is not None:
+                watermark = state.watermark.replace(tzinfo=state.watermark.tzinfo or timezone.utc)
+                stmt = stmt.where(ORDER_CHANGED_AT > watermark - timedelta(seconds=self.lag_seconds))
+            days = sorted(_utc(day) for day in self.db.execute(stmt).scalars() if day is not None)
+            for day in days:
+                self._rebuild_day(day)
+            self._snapshot_inventory(now)
+            jobs.advance(state, now, 0)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Error refreshing dashboard rollups: {e}")
+            self.db.rollback()
+            raise
+        if days:
+            logger.info(f"Rebuilt dashboard rollups for {len(days)} days")
+        return RollupReport(days=days, watermark=now)
+
+    def _rebuild_day(self, day: datetime) -> None:
+        start, end = day, day + timedelta(days=1)
+        in_day = (Order.created_at >= start, Order.created_at < end)
+        bucket = literal(start, DateTime(timezone=True))
+        columns = ["bucket_start", "business_type", "status", "order_count", "revenue"]
+
+        self.db.execute(
+            delete(OrderRollupHourly)
+            .where(OrderRollupHourly.bucket_start >= start, OrderRollupHourly.bucket_start < end)
+        )
+        self.db.execute(insert(OrderRollupHourly).from_select(
+            columns,
+            select(
+                hour_floor(Order.created_at), User.business_type, Order.status,
+                func.count(), func.sum(Order.total_amount),
+            )
+            .join(User, User.id == Order.user_id)
+            .where(*in_day)
+            .group_by(hour_floor(Order.created_at), User.business_type, Order.status),
+        ))
+
+        self.db.execute(delete(OrderRollupDaily).where(OrderRollupDaily.bucket_start == start))
+        self.db.execute(insert(OrderRollupDaily).from_select(
+            columns,
+            select(
+                bucket, OrderRollupHourly.business_type, OrderRollupHourly.status,
+                func.sum(OrderRollupHourly.order_count), func.sum(OrderRollupHourly.revenue),
+            )
+            .where(OrderRollupHourly.bucket_start >= start, OrderRollupHourly.bucket_start < end)
+            .group_by(OrderRollupHourly.business_type, OrderRollupHourly.status),
+        ))
+
+        self.db.execute(delete(ProductSalesDaily).where(ProductSalesDaily.bucket_start == start))
+        self.db.execute(insert(ProductSalesDaily).from_select(
+            ["bucket_start", "product_id", "order_count", "units", "revenue"],
+            select(
+                bucket, OrderItem.product_id, func.count(distinct(OrderItem.order_id)),
+                func.sum(OrderItem.quantity), func.sum(OrderItem.total_price),
+            )
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(*in_day, Order.status != OrderStatus.CANCELLED)
+            .group_by(OrderItem.product_id),
+        ))
+
+    def _snapshot_inventory(self, now: datetime) -> None:
+        today = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.db.execute(delete(InventoryRollupDaily).where(InventoryRollupDaily.bucket_start == today))
+        self.db.execute(insert(InventoryRollupDaily).from_select(
+            ["bucket_start", "active_products", "low_stock", "out_of_stock"],
+            select(
+                literal(today, DateTime(timezone=True)),
+                func.count(),
+                func.count().filter(Product.stock_quantity <= self.low_stock_threshold),
+                func.count().filter(Product.stock_quantity <= 0),
+            ).where(Product.is_active.is_(True)),
+        ))
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
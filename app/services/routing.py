@@ -0,0 +1,250 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.order import OrderStatus
+from app.repositories.order import OrderRepository
+from app.services.delivery import (
+    EARTH_RADIUS_KM,
+    IST,
+    NELLORE_LATITUDE,
+    NELLORE_LONGITUDE,
+    DeliveryEstimator,
+    DeliveryZone,
+    delivery_estimator,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Drop:
+    """A single delivery stop"""
+    order_id: int
+    postal_code: str
+    latitude: float
+    longitude: float
+    weight_kg: float
+
+
+@dataclass
+class VehicleSpec:
+    capacity_kg: float = 1000.0
+    max_stops: int = 60
+
+
+@dataclass
+class Route:
+    vehicle_index: int
+    drops: List[Drop]
+    weight_kg: float
+    distance_km: float
+
+    @property
+    def order_ids(self) -> List[int]:
+        return [drop.order_id for drop in self.drops]
+
+
+@dataclass
+class RoutePlan:
+    routes: List[Route] = field(default_factory=list)
+    unassigned: List[Drop] = field(default_factory=list)
+    # Drops outside the local zone; these go by courier, not the fleet
+    out_of_zone: List[Drop] = field(default_factory=list)
+
+    @property
+    def total_distance_km(self) -> float:
+        return sum(route.distance_km for route in self.routes)
+
+
+def distance_matrix(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Pairwise haversine distances (km) for points given in degrees"""
+    lat = np.radians(lat)[:, None]
+    lon = np.radians(lon)[:, None]
+    dlat = lat - lat.T
+    dlon = lon - lon.T
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def nearest_neighbour_tour(dist: np.ndarray) -> np.ndarray:
+    """Greedy tour over ``dist`` starting and ending at node 0 (the depot)"""
+    n = dist.shape[0]
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+    tour = np.empty(n, dtype=np.int64)
+    tour[0] = 0
+    current = 0
+    for i in range(1, n):
+        row = np.where(visited, np.inf, dist[current])
+        current = int(np.argmin(row))
+        visited[current] = True
+        tour[i] = current
+    return tour
+
+
+def two_opt(tour: np.ndarray, dist: np.ndarray, max_passes: int = 50) -> np.ndarray:
+    """
+    Improve a closed tour with 2-opt moves.
+
+    For each edge ``(a, b)`` the gain of reversing against every later edge
+    ``(c, d)`` is computed as one vectorized expression, and the best
+    improving move is applied.
+    """
+    tour = tour.copy()
+    n = len(tour)
+    if n < 4:
+        return tour
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n - 2):
+            a, b = tour[i], tour[i + 1]
+            c = tour[i + 2:]
+            d = np.append(tour[i + 3:], tour[0])
+            gain = dist[a, b] + dist[c, d] - dist[a, c] - dist[b, d]
+            j = int(np.argmax(gain))
+            if gain[j] > 1e-9:
+                # Reverse tour[i+1 .. i+2+j]
+                tour[i + 1:i + 3 + j] = tour[i + 1:i + 3 + j][::-1]
+                improved = True
+        if not improved:
+            break
+    return tour
+
+
+def tour_length(tour: np.ndarray, dist: np.ndarray) -> float:
+    return float(dist[tour, np.roll(tour, -1)].sum())
+
+
+class RoutePlanner:
+    """
+    Capacitated vehicle routing for the Nellore local fleet.
+
+    Only drops in the local delivery zone are planned. Cluster-first,
+    route-second: drops are grouped by pincode, groups are
+    swept by polar angle around the depot and packed into vehicles up to
+    weight and stop limits, then each vehicle's stops are ordered with a
+    nearest-neighbour tour improved by 2-opt.
+    """
+
+    def __init__(
+        self,
+        vehicle: Optional[VehicleSpec] = None,
+        max_vehicles: Optional[int] = None,
+        depot: Sequence[float] = (NELLORE_LATITUDE, NELLORE_LONGITUDE),
+        estimator: Optional[DeliveryEstimator] = None,
+    ):
+        self.vehicle = vehicle or VehicleSpec()
+        self.max_vehicles = max_vehicles
+        self.depot = (float(depot[0]), float(depot[1]))
+        self.estimator = estimator or delivery_estimator
+
+    def load_drops(
+        self,
+        db: Session,
+        delivery_date: date,
+        status: OrderStatus = OrderStatus.CONFIRMED,
+    ) -> List[Drop]:
+        """Load drops for orders in ``status`` due by the end of ``delivery_date`` (IST) with one aggregated query"""
+        due_before = datetime.combine(delivery_date + timedelta(days=1), time(0, tzinfo=IST)).astimezone(timezone.utc)
+        rows = OrderRepository(db).get_order_weights_by_status(status, due_before)
+        if not rows:
+            return []
+        coords = self.estimator.coordinates([postal_code for _, postal_code, _ in rows])
+        return [
+            Drop(
+                order_id=order_id,
+                postal_code=postal_code,
+                latitude=float(lat),
+                longitude=float(lon),
+                weight_kg=float(Decimal(weight)),
+            )
+            for (order_id, postal_code, weight), (lat, lon) in zip(rows, coords)
+        ]
+
+    def cluster(self, drops: List[Drop]) -> List[List[int]]:
+        """Pack drop indices into vehicle-sized clusters"""
+        lat = np.array([d.latitude for d in drops])
+        lon = np.array([d.longitude for d in drops])
+        weight = np.array([d.weight_kg for d in drops])
+
+        # Sweep by polar angle, keeping drops of one pincode adjacent
+        angle = np.arctan2(lat - self.depot[0], lon - self.depot[1])
+        codes = np.array([int(d.postal_code) for d in drops])
+        group_angle: Dict[int, float] = {}
+        for code, a in zip(codes.tolist(), angle.tolist()):
+            group_angle.setdefault(code, a)
+        key_angle = np.array([group_angle[c] for c in codes.tolist()])
+        order = np.lexsort((angle, codes, key_angle))
+
+        clusters: List[List[int]] = []
+        current: List[int] = []
+        load = 0.0
+        for idx in order.tolist():
+            w = weight[idx]
+            if current and (load + w > self.vehicle.capacity_kg or len(current) >= self.vehicle.max_stops):
+                clusters.append(current)
+                current, load = [], 0.0
+            current.append(idx)
+            load += w
+        if current:
+            clusters.append(current)
+        return clusters
+
+    def route(self, drops: List[Drop], cluster: List[int]) -> tuple:
+        """Order one cluster's drops; returns (ordered indices, distance_km)"""
+        lat = np.array([self.depot[0]] + [drops[i].latitude for i in cluster])
+        lon = np.array([self.depot[1]] + [drops[i].longitude for i in cluster])
+        dist = distance_matrix(lat, lon)
+        tour = two_opt(nearest_neighbour_tour(dist), dist)
+        return [cluster[node - 1] for node in tour[1:].tolist()], tour_length(tour, dist)
+
+    def plan(self, drops: List[Drop]) -> RoutePlan:
+        """Plan vehicle routes for ``drops``"""
+        plan = RoutePlan()
+        if not drops:
+            return plan
+        routable = []
+        local = self.estimator.zones([drop.postal_code for drop in drops]) == DeliveryZone.LOCAL
+        for drop, is_local in zip(drops, local.tolist()):
+            if not is_local:
+                plan.out_of_zone.append(drop)
+            elif np.isnan(drop.latitude) or np.isnan(drop.longitude) or drop.weight_kg > self.vehicle.capacity_kg:
+                plan.unassigned.append(drop)
+            else:
+                routable.append(drop)
+        if not routable:
+            return plan
+
+        for cluster in self.cluster(routable):
+            if self.max_vehicles is not None and len(plan.routes) >= self.max_vehicles:
+                plan.unassigned.extend(routable[i] for i in cluster)
+                continue
+            ordered, distance = self.route(routable, cluster)
+            route_drops = [routable[i] for i in ordered]
+            plan.routes.append(Route(
+                vehicle_index=len(plan.routes),
+                drops=route_drops,
+                weight_kg=sum(d.weight_kg for d in route_drops),
+                distance_km=distance,
+            ))
+        logger.info(
+            f"Planned {len(plan.routes)} routes for {len(routable)} drops "
+            f"({len(plan.unassigned)} unassigned, {len(plan.out_of_zone)} out of zone, "
+            f"{plan.total_distance_km:.1f} km)"
+        )
+        return plan
+
+    def plan_for_status(
+        self,
+        db: Session,
+        status: OrderStatus = OrderStatus.CONFIRMED,
+        delivery_date: Optional[date] = None,
+    ) -> RoutePlan:
+        """Plan routes for orders in ``status`` due by ``delivery_date`` (tomorrow in IST by default)"""
+        if delivery_date is None:
+            delivery_date = datetime.now(IST).date() + timedelta(days=1)
+        return self.plan(self.load_drops(db, delivery_date, status))
@@ -0,0 +1,91 @@
+"""
+Batched, cached loading of records by key.
+
+``load`` only queues a key and returns a ``Deferred``; the first time any
+deferred value is read, every key queued so far is fetched with one call
+to the batch function. Results, including misses, are cached for the
+loader's lifetime, so create one loader per request (see
+``app.repositories.loaders``).
+"""
+from operator import attrgetter
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class Deferred(Generic[K, V]):
+    """A value a ``DataLoader`` will fetch with the next batch"""
+
+    __slots__ = ("loader", "key")
+
+    def __init__(self, loader: "DataLoader[K, V]", key: K):
+        self.loader = loader
+        self.key = key
+
+    @property
+    def value(self) -> Optional[V]:
+        return self.loader.get(self.key)
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Coalesces lookups by key into batched calls of ``batch_load``.
+
+    ``batch_load`` receives a list of distinct keys and returns the records
+    it found, in any order; ``key`` maps a record back to its key. Keys with
+    no record resolve to None. Batches hold at most ``max_batch_size`` keys.
+    """
+
+    def __init__(
+        self,
+        batch_load: Callable[[List[K]], Iterable[V]],
+        key: Callable[[V], K] = attrgetter("id"),
+        max_batch_size: int = 500,
+    ):
+        self.batch_load = batch_load
+        self.key = key
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self._cache: Dict[K, Optional[V]] = {}
+        self._queue: Dict[K, None] = {}
+
+    def load(self, key: K) -> Deferred[K, V]:
+        if key not in self._cache:
+            self._queue[key] = None
+        return Deferred(self, key)
+
+    def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        keys = list(keys)
+        for key in keys:
+            self.load(key)
+        self.dispatch()
+        return [self._cache[key] for key in keys]
+
+    def get(self, key: K) -> Optional[V]:
+        if key not in self._cache:
+            self.load(key)
+            self.dispatch()
+        return self._cache[key]
+
+    def prime(self, key: K, value: Optional[V]) -> None:
+        """Cache a record fetched some other way"""
+        self._cache[key] = value
+        self._queue.pop(key, None)
+
+    def clear(self, key: Optional[K] = None) -> None:
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def dispatch(self) -> None:
+        """Fetch every queued key"""
+        while self._queue:
+            batch = list(self._queue)[:self.max_batch_size]
+            for key in batch:
+                del self._queue[key]
+            self.batches += 1
+            found = {self.key(value): value for value in self.batch_load(batch)}
+            for key in batch:
+                self._cache[key] = found.get(key)
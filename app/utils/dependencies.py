@@ -1,14 +1,20 @@
-from typing import Generator, Optional
+from typing import Any, Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import verify_token
-from app.core.redis_client import redis_client
+from app.utils.exceptions import AuthorizationException
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait before reconnecting after Redis was unreachable
+REDIS_RECONNECT_INTERVAL = 30.0
+_redis_retry_at = 0.0
+
 # Security dependencies
 security = HTTPBearer()
 
@@ -30,6 +36,15 @@ def get_current_user_id(
     return user_id
 
 
+def get_current_admin_id(current_user_id: str = Depends(get_current_user_id)) -> str:
+    """
+    Dependency to get the current user ID, for users in ``ADMIN_USER_IDS`` only
+    """
+    if not str(current_user_id).isdigit() or int(current_user_id) not in settings.ADMIN_USER_IDS:
+        raise AuthorizationException("Admin access required")
+    return current_user_id
+
+
 def get_optional_current_user_id(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
 ) -> Optional[str]:
@@ -49,6 +64,8 @@ def get_redis() -> Generator:
     Dependency to get Redis client
     """
     try:
+        # Imported lazily: the client connects on import
+        from app.core.redis_client import redis_client
         yield redis_client
     except Exception as e:
         logger.error(f"Redis connection error: {e}")
@@ -58,6 +75,25 @@ def get_redis() -> Generator:
         )
 
 
+def get_redis_connection() -> Any:
+    """
+    Raw connection of the shared Redis client, for pipelines, scripts and pub/sub.
+
+    Raises while Redis is known to be down, without retrying the connection
+    more than once per ``REDIS_RECONNECT_INTERVAL``.
+    """
+    global _redis_retry_at
+    if time.monotonic() < _redis_retry_at:
+        raise ConnectionError("Redis unavailable")
+    try:
+        # Imported lazily: the client connects on import
+        from app.core.redis_client import redis_client
+    except Exception:
+        _redis_retry_at = time.monotonic() + REDIS_RECONNECT_INTERVAL
+        raise
+    return redis_client.redis_client
+
+
 def get_db_session() -> Generator[Session, None, None]:
     """
     Dependency to get database session
@@ -1,4 +1,5 @@
-from typing import Any, Optional
+from typing import Any, Dict, Optional
+import math
 from fastapi import HTTPException, status
 
 
@@ -10,12 +11,13 @@ class BaseAPIException(HTTPException):
         message: str,
         status_code: int = status.HTTP_400_BAD_REQUEST,
         error_code: Optional[str] = None,
-        details: Optional[Any] = None
+        details: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         self.message = message
         self.error_code = error_code
         self.details = details
-        super().__init__(status_code=status_code, detail=message)
+        super().__init__(status_code=status_code, detail=message, headers=headers)
 
 
 class ValidationException(BaseAPIException):
@@ -103,11 +105,12 @@ class ExternalServiceException(BaseAPIException):
 class RateLimitException(BaseAPIException):
     """Exception for rate limiting errors"""
     
-    def __init__(self, message: str = "Rate limit exceeded"):
+    def __init__(self, message: str = "Rate limit exceeded", retry_after: Optional[float] = None):
         super().__init__(
             message=message,
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            error_code="RATE_LIMIT_EXCEEDED"
+            error_code="RATE_LIMIT_EXCEEDED",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))} if retry_after is not None else None
         )
 
 
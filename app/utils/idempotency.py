@@ -0,0 +1,236 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.utils.dependencies import get_redis_connection
+import logging
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+STATE_IN_PROGRESS = "in_progress"
+STATE_DONE = "done"
+
+# Response headers that must not be replayed verbatim
+_SKIPPED_HEADERS = {"content-length", "date", "server", "set-cookie"}
+
+
+def request_fingerprint(method: str, path: str, body: bytes) -> str:
+    """Hash of what the request asks for; a reused key must send the same request"""
+    digest = hashlib.sha256()
+    digest.update(method.encode())
+    digest.update(b"\0")
+    digest.update(path.encode())
+    digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def record_key(idempotency_key: str, authorization: Optional[str]) -> str:
+    """Redis key for an idempotency key, scoped to the caller's credentials"""
+    caller = hashlib.sha256(authorization.encode()).hexdigest()[:16] if authorization else "anonymous"
+    return f"idempotency:{caller}:{idempotency_key}"
+
+
+def _error(status_code: int, code: str, message: str, path: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "success": False,
+            "error": {"code": code, "message": message, "timestamp": time.time(), "path": path},
+        },
+    )
+
+
+class IdempotencyMiddleware:
+    """
+    Replays responses for POSTs retried with the same ``Idempotency-Key``.
+
+    The first request takes an atomic ``SET NX`` lock on the key and runs
+    normally; its response is then stored in Redis. Concurrent duplicates
+    poll until the response is stored and replay it without running the
+    endpoint again. A key reused with a different body is rejected with
+    422. Server errors release the key so the client can retry. If Redis
+    is unreachable, requests pass through without idempotency.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        redis_client: Any = None,
+        paths: Optional[Sequence[str]] = None,
+        ttl_seconds: Optional[int] = None,
+        lock_seconds: Optional[int] = None,
+        wait_seconds: Optional[float] = None,
+        poll_interval: float = 0.05,
+    ):
+        self.app = app
+        self._redis = redis_client
+        self.paths = tuple(paths if paths is not None else settings.IDEMPOTENCY_PATHS)
+        self.ttl_seconds = ttl_seconds or settings.IDEMPOTENCY_TTL_SECONDS
+        self.lock_seconds = lock_seconds or settings.IDEMPOTENCY_LOCK_SECONDS
+        self.wait_seconds = wait_seconds if wait_seconds is not None else settings.IDEMPOTENCY_WAIT_SECONDS
+        self.poll_interval = poll_interval
+
+    @property
+    def redis(self):
+        """Raw Redis connection; errors propagate so outages are detectable"""
+        if self._redis is None:
+            self._redis = get_redis_connection()
+        return self._redis
+
+    def _set(self, key: str, record: Dict[str, Any], expire: int, nx: bool = False) -> bool:
+        return bool(self.redis.set(key, json.dumps(record), ex=expire, nx=nx))
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.redis.get(key)
+        return json.loads(value) if value else None
+
+    def _release(self, key: str) -> None:
+        try:
+            self.redis.delete(key)
+        except Exception as e:
+            logger.error(f"Failed to release idempotency key {key}: {e}")
+
+    def applies_to(self, method: str, path: str) -> bool:
+        return method == "POST" and any(
+            path == prefix or path.startswith(prefix.rstrip("/") + "/") for prefix in self.paths
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.applies_to(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            await _error(400, "INVALID_IDEMPOTENCY_KEY", "Idempotency-Key is too long", path)(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        key = record_key(idempotency_key, headers.get("authorization"))
+        fingerprint = request_fingerprint(scope["method"], path, body)
+
+        try:
+            acquired = await run_in_threadpool(
+                self._set, key, {"state": STATE_IN_PROGRESS, "fingerprint": fingerprint},
+                self.lock_seconds, True,
+            )
+        except Exception as e:
+            logger.error(f"Idempotency store unavailable, passing request through: {e}")
+            await self.app(scope, _replay_body(body, receive), send)
+            return
+
+        if acquired:
+            await self._execute(scope, _replay_body(body, receive), send, key, fingerprint)
+        else:
+            response = await self._wait_for_response(key, fingerprint, path)
+            await response(scope, receive, send)
+
+    async def _execute(self, scope: Scope, receive: Receive, send: Send, key: str, fingerprint: str) -> None:
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture)
+        except Exception:
+            await run_in_threadpool(self._release, key)
+            raise
+
+        status_code = start.get("status", 500)
+        if status_code >= 500:
+            # Let the client retry requests that failed on our side
+            await run_in_threadpool(self._release, key)
+            return
+        record = {
+            "state": STATE_DONE,
+            "fingerprint": fingerprint,
+            "status": status_code,
+            "headers": [
+                [name.decode("latin-1"), value.decode("latin-1")]
+                for name, value in start.get("headers", [])
+                if name.decode("latin-1").lower() not in _SKIPPED_HEADERS
+            ],
+            "body": base64.b64encode(b"".join(chunks)).decode("ascii"),
+        }
+        try:
+            await run_in_threadpool(self._set, key, record, self.ttl_seconds)
+        except Exception as e:
+            logger.error(f"Failed to store idempotent response for {key}: {e}")
+
+    async def _wait_for_response(self, key: str, fingerprint: str, path: str) -> Response:
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            try:
+                record = await run_in_threadpool(self._get, key)
+            except Exception as e:
+                logger.error(f"Idempotency store unavailable while waiting on {key}: {e}")
+                return _error(503, "HTTP_503", "Idempotency store unavailable", path)
+            if record is None:
+                # The first request failed and released the key
+                return _error(409, "IDEMPOTENCY_CONFLICT", "Original request failed; retry with the same key", path)
+            if record.get("fingerprint") != fingerprint:
+                return _error(
+                    422, "IDEMPOTENCY_KEY_REUSED",
+                    "Idempotency-Key was already used for a different request", path,
+                )
+            if record.get("state") == STATE_DONE:
+                return _replay(record)
+            if time.monotonic() >= deadline:
+                return _error(409, "IDEMPOTENCY_CONFLICT", "Original request is still being processed", path)
+            await asyncio.sleep(self.poll_interval)
+
+
+def _replay(record: Dict[str, Any]) -> Response:
+    response = Response(content=base64.b64decode(record["body"]), status_code=record["status"])
+    response.raw_headers = [
+        (name.encode("latin-1"), value.encode("latin-1")) for name, value in record["headers"]
+    ] + [(b"content-length", str(len(response.body)).encode()), (REPLAYED_HEADER.encode(), b"true")]
+    return response
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Callable:
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
@@ -0,0 +1,63 @@
+from typing import Any, Optional
+import uuid
+from app.utils.dependencies import get_redis_connection
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Extend or delete the lock only while this holder still owns it
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaderLock:
+    """
+    Redis lease electing one leader among workers for a scheduled job.
+
+    The lease expires after ``ttl_seconds`` unless renewed, so a crashed
+    leader is replaced automatically. Each holder uses a random token, so
+    a process whose lease expired cannot renew or release a lease taken
+    over by another process.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, redis_connection: Any = None):
+        self.key = f"leader:{name}"
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.token = uuid.uuid4().hex
+        self._redis = redis_connection
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            self._redis = get_redis_connection()
+        return self._redis
+
+    def acquire(self) -> bool:
+        """Take the lease, or extend it if already held; False if another process leads"""
+        if self.redis.set(self.key, self.token, nx=True, px=self.ttl_ms):
+            logger.info(f"Acquired leadership of {self.key}")
+            return True
+        return self.renew()
+
+    def renew(self) -> bool:
+        return bool(self.redis.eval(_RENEW_SCRIPT, 1, self.key, self.token, self.ttl_ms))
+
+    def release(self) -> None:
+        try:
+            self.redis.eval(_RELEASE_SCRIPT, 1, self.key, self.token)
+        except Exception as e:
+            logger.warning(f"Failed to release {self.key}: {e}")
+
+    def holder(self) -> Optional[str]:
+        return self.redis.get(self.key)
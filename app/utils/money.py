@@ -0,0 +1,36 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Union
+import numpy as np
+
+PAISE_PER_RUPEE = 100
+BASIS_POINTS = 10000
+
+
+def to_paise(amount: Union[Decimal, int, float, str]) -> int:
+    """
+    Convert a rupee amount to integer paise (rounded half-up)
+    """
+    value = Decimal(str(amount)) * PAISE_PER_RUPEE
+    return int(value.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def from_paise(paise: int) -> Decimal:
+    """
+    Convert integer paise back to a 2-decimal rupee amount
+    """
+    return (Decimal(int(paise)) / PAISE_PER_RUPEE).quantize(Decimal("0.01"))
+
+
+def rate_to_bps(rate_percent: Union[Decimal, int, float, str]) -> int:
+    """
+    Convert a percentage rate (e.g. 18 or "2.5") to basis points
+    """
+    value = Decimal(str(rate_percent)) * 100
+    return int(value.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def apply_bps(paise: np.ndarray, bps: Union[np.ndarray, int]) -> np.ndarray:
+    """
+    Vectorized ``round_half_up(paise * bps / 10000)`` on non-negative int64 arrays
+    """
+    return (np.asarray(paise, dtype=np.int64) * bps + BASIS_POINTS // 2) // BASIS_POINTS
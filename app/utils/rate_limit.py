@@ -0,0 +1,255 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple, Union
+import threading
+import time
+from fastapi import Depends, Request
+from app.core.config import settings
+from app.utils.dependencies import get_optional_current_user_id, get_redis_connection
+from app.utils.exceptions import RateLimitException
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before retrying Redis after a failed call
+RECONNECT_INTERVAL = 30.0
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# GCRA over several keys in one round trip. For key i, ARGV holds the
+# emission interval, the burst tolerance (both in whole microseconds) and
+# the cost. Keys store the theoretical arrival time (TAT). Times stay whole
+# microseconds, well inside a double's exact integer range, so the request
+# at exactly the burst limit is not decided by float rounding. Nothing is
+# written unless every limit allows the request. Returns
+# {allowed, retry_after_us, remaining}.
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local new_tats = {}
+local retry_after = 0
+local remaining = -1
+for i = 1, #KEYS do
+    local interval = tonumber(ARGV[i * 3 - 2])
+    local tolerance = tonumber(ARGV[i * 3 - 1])
+    local cost = tonumber(ARGV[i * 3])
+    local tat = tonumber(redis.call('GET', KEYS[i])) or now
+    if tat < now then
+        tat = now
+    end
+    local new_tat = tat + interval * cost
+    local wait = new_tat - tolerance - now
+    if wait > 0 then
+        if wait > retry_after then
+            retry_after = wait
+        end
+    else
+        new_tats[i] = new_tat
+        local left = math.floor((tolerance - (new_tat - now)) / interval)
+        if remaining < 0 or left < remaining then
+            remaining = left
+        end
+    end
+end
+if retry_after > 0 then
+    return {0, retry_after, 0}
+end
+for i = 1, #KEYS do
+    redis.call('SET', KEYS[i], string.format('%.0f', new_tats[i]), 'PX', math.ceil((new_tats[i] - now) / 1000))
+end
+return {1, 0, remaining}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``rate`` requests per ``period`` seconds, allowing ``burst`` back-to-back"""
+    rate: int
+    period: float
+    burst: Optional[int] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """Parse ``"<rate>/<second|minute|hour|day>"``, e.g. ``"300/minute"``"""
+        try:
+            rate, period = spec.split("/")
+            return cls(rate=int(rate), period=_PERIODS[period.strip().rstrip("s")])
+        except (ValueError, KeyError):
+            raise ValueError(f"Invalid rate limit: {spec!r}")
+
+    @property
+    def emission_interval_us(self) -> int:
+        return max(1, round(self.period * 1_000_000 / self.rate))
+
+    @property
+    def tolerance_us(self) -> int:
+        return self.emission_interval_us * (self.burst or self.rate)
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    retry_after: float = 0.0
+    remaining: int = 0
+
+
+class LocalLimiter:
+    """
+    In-process GCRA with the same limits as the Redis script.
+
+    Every request this process lets through is also charged in Redis, so
+    a request rejected here would be rejected there too. Floods from one
+    client are shed without a round trip. Memory is bounded by evicting
+    the least recently used keys.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._tats: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, limits: Sequence[Tuple[str, RateLimit]], cost: int = 1) -> RateLimitResult:
+        now = int(time.monotonic() * 1_000_000)
+        with self._lock:
+            new_tats = []
+            retry_after = 0
+            for key, limit in limits:
+                tat = max(self._tats.get(key, now), now)
+                new_tat = tat + limit.emission_interval_us * cost
+                wait = new_tat - limit.tolerance_us - now
+                if wait > 0:
+                    retry_after = max(retry_after, wait)
+                new_tats.append((key, new_tat))
+            if retry_after > 0:
+                return RateLimitResult(allowed=False, retry_after=retry_after / 1_000_000)
+            for key, new_tat in new_tats:
+                self._tats[key] = new_tat
+                self._tats.move_to_end(key)
+            while len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+        return RateLimitResult(allowed=True)
+
+    def refund(self, limits: Sequence[Tuple[str, RateLimit]], cost: int = 1) -> None:
+        """Undo a local charge for a request that Redis rejected"""
+        with self._lock:
+            for key, limit in limits:
+                if key in self._tats:
+                    self._tats[key] -= limit.emission_interval_us * cost
+
+
+class RateLimiter:
+    """
+    GCRA token-bucket limiter backed by a single Redis Lua script.
+
+    All limits that apply to a request (route, user, GSTIN) are checked
+    and charged atomically in one round trip. Redis server time is used,
+    so app servers with skewed clocks share one budget. If Redis is
+    unreachable, only the local check applies until it is retried
+    ``RECONNECT_INTERVAL`` seconds later.
+    """
+
+    def __init__(
+        self,
+        redis_connection: Any = None,
+        local: Union[LocalLimiter, bool] = True,
+        prefix: str = "ratelimit",
+    ):
+        self._redis = redis_connection
+        self._script = None
+        self._retry_at = 0.0
+        if local is True:
+            local = LocalLimiter()
+        self.local: Optional[LocalLimiter] = local or None
+        self.prefix = prefix
+
+    @property
+    def script(self):
+        if time.monotonic() < self._retry_at:
+            raise ConnectionError("Redis unavailable")
+        if self._script is None:
+            if self._redis is None:
+                self._redis = get_redis_connection()
+            self._script = self._redis.register_script(_GCRA_SCRIPT)
+        return self._script
+
+    def key(self, scope: str, identifier: Any) -> str:
+        return f"{self.prefix}:{scope}:{identifier}"
+
+    def check(self, limits: Sequence[Tuple[str, RateLimit]], cost: int = 1) -> RateLimitResult:
+        """Charge ``cost`` against every ``(key, limit)`` pair, or none of them"""
+        if not limits:
+            return RateLimitResult(allowed=True, remaining=-1)
+        if self.local is not None:
+            local = self.local.check(limits, cost)
+            if not local.allowed:
+                return local
+
+        args: List[Any] = []
+        for _, limit in limits:
+            args.extend((limit.emission_interval_us, limit.tolerance_us, cost))
+        try:
+            allowed, retry_after_us, remaining = self.script(keys=[key for key, _ in limits], args=args)
+        except Exception as e:
+            if time.monotonic() >= self._retry_at:
+                logger.error(f"Rate limiter unavailable, allowing requests for {RECONNECT_INTERVAL:.0f}s: {e}")
+                self._retry_at = time.monotonic() + RECONNECT_INTERVAL
+            return RateLimitResult(allowed=True, remaining=-1)
+        if not allowed and self.local is not None:
+            self.local.refund(limits, cost)
+        return RateLimitResult(allowed=bool(allowed), retry_after=retry_after_us / 1_000_000, remaining=int(remaining))
+
+    def hit(self, limits: Sequence[Tuple[str, RateLimit]], cost: int = 1) -> RateLimitResult:
+        """Like ``check`` but raises ``RateLimitException`` when over the limit"""
+        result = self.check(limits, cost)
+        if not result.allowed:
+            raise RateLimitException(retry_after=result.retry_after)
+        return result
+
+
+# Global rate limiter instance (connects to Redis on first use)
+rate_limiter = RateLimiter()
+
+
+class RateLimited:
+    """
+    Route dependency applying per-route, per-user and per-GSTIN limits.
+
+    The per-route limit is shared by all callers of the route; the
+    per-user limit is counted separately for each route. Anonymous
+    callers are limited per client IP in place of a user. The per-GSTIN
+    limit applies to routes with a ``gstin`` path or query parameter.
+    """
+
+    def __init__(
+        self,
+        route: Optional[RateLimit] = None,
+        per_user: Optional[RateLimit] = None,
+        per_gstin: Optional[RateLimit] = None,
+        cost: int = 1,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.route = route
+        self.per_user = per_user if per_user is not None else RateLimit.parse(settings.RATE_LIMIT_PER_USER)
+        self.per_gstin = per_gstin
+        self.cost = cost
+        self.limiter = limiter
+
+    def limits_for(self, request: Request, user_id: Optional[str]) -> List[Tuple[str, RateLimit]]:
+        limiter = self.limiter or rate_limiter
+        route = request.scope.get("route")
+        route_name = f"{request.method}:{getattr(route, 'path', request.url.path)}"
+        limits = []
+        if self.route is not None:
+            limits.append((limiter.key("route", route_name), self.route))
+        if self.per_user is not None:
+            caller = f"user:{user_id}" if user_id else f"ip:{request.client.host if request.client else 'unknown'}"
+            limits.append((limiter.key(caller, route_name), self.per_user))
+        gstin = request.path_params.get("gstin") or request.query_params.get("gstin")
+        if self.per_gstin is not None and gstin:
+            limits.append((limiter.key("gstin", gstin.upper()), self.per_gstin))
+        return limits
+
+    def __call__(self, request: Request, user_id: Optional[str] = Depends(get_optional_current_user_id)) -> RateLimitResult:
+        if not settings.RATE_LIMIT_ENABLED:
+            return RateLimitResult(allowed=True, remaining=-1)
+        return (self.limiter or rate_limiter).hit(self.limits_for(request, user_id), self.cost)
@@ -122,18 +122,31 @@ class APIResponse:
         total: int,
         page: int = 1,
         per_page: int = 10,
-        message: str = "Success"
+        message: str = "Success",
+        total_exact: Optional[bool] = None,
+        has_next: Optional[bool] = None
     ) -> JSONResponse:
-        """Create a paginated response"""
+        """
+        Create a paginated response
+
+        ``total`` may be an estimate: a ``RowCount`` from the repositories
+        says itself whether it is exact, or pass ``total_exact``. Page
+        counts derived from an estimate are approximate too, so callers that
+        fetched one row past the page should pass ``has_next`` themselves.
+        """
+        if total_exact is None:
+            total_exact = getattr(total, "exact", True)
+        total = int(total)
         total_pages = (total + per_page - 1) // per_page
         
         meta = {
             "pagination": {
                 "total": total,
+                "total_exact": total_exact,
                 "page": page,
                 "per_page": per_page,
                 "total_pages": total_pages,
-                "has_next": page < total_pages,
+                "has_next": has_next if has_next is not None else page < total_pages,
                 "has_prev": page > 1
             }
         }
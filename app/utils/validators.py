@@ -1,21 +1,66 @@
+"""
+Validation of Indian business identifiers and contact details.
+
+Patterns are compiled once at import. Phone numbers go through
+``phonenumbers.parse``, which is slow, so parsing and normalization are
+cached per (number, region); so are GSTIN checks, which run for every
+cart total. ``validate_many`` validates and normalizes whole batches,
+e.g. rows of a bulk user import.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+import functools
 import re
-from typing import Optional
-from pydantic import validator
 import phonenumbers
 from phonenumbers import NumberParseException
 
+# Cached distinct values per function
+CACHE_SIZE = 4096
 
-def validate_gstin(gstin: str) -> bool:
+# 2 digits (state code) + 10 alphanumeric (PAN) + 1 digit (entity number) + Z + 1 alphanumeric (checksum)
+GSTIN_PATTERN = re.compile(r"[0-9]{2}[A-Z0-9]{10}[0-9]Z[A-Z0-9]")
+# 5 letters + 4 digits + 1 letter
+PAN_PATTERN = re.compile(r"[A-Z]{5}[0-9]{4}[A-Z]")
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+PASSWORD_RULES = (
+    (re.compile(r"[A-Z]"), "Password must contain at least one uppercase letter"),
+    (re.compile(r"[a-z]"), "Password must contain at least one lowercase letter"),
+    (re.compile(r"\d"), "Password must contain at least one digit"),
+    (re.compile(r'[!@#$%^&*(),.?":{}|<>]'), "Password must contain at least one special character"),
+)
+
+GSTIN_CHARSET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_GSTIN_VALUES = {char: value for value, char in enumerate(GSTIN_CHARSET)}
+
+
+def gstin_check_character(gstin: str) -> str:
     """
-    Validate GSTIN format
+    Check character for the first 14 characters of a GSTIN (mod 36).
+
+    Character values are weighted 1, 2, 1, 2, ...; each product adds its
+    base-36 digits (product // 36 + product % 36), and the check character
+    brings the sum up to a multiple of 36.
+    """
+    total = 0
+    for position, char in enumerate(gstin[:14]):
+        product = _GSTIN_VALUES[char] * (2 if position % 2 else 1)
+        total += product // 36 + product % 36
+    return GSTIN_CHARSET[-total % 36]
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def validate_gstin(gstin: str, checksum: bool = False) -> bool:
+    """
+    Validate GSTIN format, and with ``checksum`` its check character
     Format: 15 characters - 2 digits (state code) + 10 alphanumeric (PAN) + 1 digit (entity number) + 1 alphabet (Z) + 1 alphanumeric (checksum)
     """
     if not gstin or len(gstin) != 15:
         return False
-    
-    # GSTIN pattern: 2 digits + 10 alphanumeric + 1 digit + Z + 1 alphanumeric
-    pattern = r'^[0-9]{2}[A-Z0-9]{10}[0-9]{1}[Z]{1}[A-Z0-9]{1}$'
-    return bool(re.match(pattern, gstin.upper()))
+    gstin = gstin.upper()
+    if not GSTIN_PATTERN.fullmatch(gstin):
+        return False
+    return not checksum or gstin[14] == gstin_check_character(gstin)
 
 
 def validate_pan(pan: str) -> bool:
@@ -25,20 +70,26 @@ def validate_pan(pan: str) -> bool:
     """
     if not pan or len(pan) != 10:
         return False
-    
-    pattern = r'^[A-Z]{5}[0-9]{4}[A-Z]{1}$'
-    return bool(re.match(pattern, pan.upper()))
+    return PAN_PATTERN.fullmatch(pan.upper()) is not None
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def normalize_phone_number(phone: str, country_code: str = "IN") -> Optional[str]:
+    """The number in E.164 format, or None if it is not a valid number"""
+    try:
+        parsed_number = phonenumbers.parse(phone, country_code)
+    except NumberParseException:
+        return None
+    if not phonenumbers.is_valid_number(parsed_number):
+        return None
+    return phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164)
 
 
 def validate_phone_number(phone: str, country_code: str = "IN") -> bool:
     """
     Validate phone number using phonenumbers library
     """
-    try:
-        parsed_number = phonenumbers.parse(phone, country_code)
-        return phonenumbers.is_valid_number(parsed_number)
-    except NumberParseException:
-        return False
+    return normalize_phone_number(phone, country_code) is not None
 
 
 def validate_pincode(pincode: str) -> bool:
@@ -47,7 +98,7 @@ def validate_pincode(pincode: str) -> bool:
     """
     if not pincode or len(pincode) != 6:
         return False
-    
+
     return pincode.isdigit()
 
 
@@ -55,8 +106,7 @@ def validate_email(email: str) -> bool:
     """
     Validate email format
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return EMAIL_PATTERN.match(email) is not None
 
 
 def validate_password_strength(password: str) -> tuple[bool, list[str]]:
@@ -65,39 +115,29 @@ def validate_password_strength(password: str) -> tuple[bool, list[str]]:
     Returns (is_valid, list_of_errors)
     """
     errors = []
-    
+
     if len(password) < 8:
         errors.append("Password must be at least 8 characters long")
-    
-    if not re.search(r'[A-Z]', password):
-        errors.append("Password must contain at least one uppercase letter")
-    
-    if not re.search(r'[a-z]', password):
-        errors.append("Password must contain at least one lowercase letter")
-    
-    if not re.search(r'\d', password):
-        errors.append("Password must contain at least one digit")
-    
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-        errors.append("Password must contain at least one special character")
-    
+
+    errors.extend(message for pattern, message in PASSWORD_RULES if not pattern.search(password))
+
     return len(errors) == 0, errors
 
 
 class GST:
     """GSTIN validation utilities"""
-    
+
     @staticmethod
-    def validate(gstin: str) -> bool:
-        return validate_gstin(gstin)
-    
+    def validate(gstin: str, checksum: bool = False) -> bool:
+        return validate_gstin(gstin, checksum)
+
     @staticmethod
     def extract_pan(gstin: str) -> Optional[str]:
         """Extract PAN from GSTIN"""
         if validate_gstin(gstin):
             return gstin[2:12]
         return None
-    
+
     @staticmethod
     def extract_state_code(gstin: str) -> Optional[str]:
         """Extract state code from GSTIN"""
@@ -108,18 +148,105 @@ class GST:
 
 class Phone:
     """Phone number validation utilities"""
-    
+
     @staticmethod
     def validate(phone: str, country_code: str = "IN") -> bool:
         return validate_phone_number(phone, country_code)
-    
+
     @staticmethod
     def format(phone: str, country_code: str = "IN") -> Optional[str]:
         """Format phone number to international format"""
-        try:
-            parsed_number = phonenumbers.parse(phone, country_code)
-            if phonenumbers.is_valid_number(parsed_number):
-                return phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164)
-        except NumberParseException:
-            pass
-        return None
\ No newline at end of file
+        return normalize_phone_number(phone, country_code)
+
+
+def _gstin(value: str) -> str:
+    gstin = value.strip().upper()
+    if not validate_gstin(gstin):
+        raise ValueError("Invalid GSTIN format")
+    return gstin
+
+
+def _gstin_with_checksum(value: str) -> str:
+    gstin = _gstin(value)
+    if not validate_gstin(gstin, checksum=True):
+        raise ValueError("Invalid GSTIN check character")
+    return gstin
+
+
+def _pan(value: str) -> str:
+    pan = value.strip().upper()
+    if not validate_pan(pan):
+        raise ValueError("Invalid PAN format")
+    return pan
+
+
+def _phone(value: str) -> str:
+    phone = normalize_phone_number(value.strip())
+    if phone is None:
+        raise ValueError("Invalid phone number")
+    return phone
+
+
+def _email(value: str) -> str:
+    email = value.strip()
+    if not validate_email(email):
+        raise ValueError("Invalid email address")
+    return email
+
+
+def _pincode(value: str) -> str:
+    pincode = value.strip()
+    if not validate_pincode(pincode):
+        raise ValueError("Invalid pincode")
+    return pincode
+
+
+# Field name -> validator returning the normalized value or raising ValueError
+FIELD_VALIDATORS: Dict[str, Callable[[str], str]] = {
+    "gstin": _gstin_with_checksum,
+    "pan": _pan,
+    "phone": _phone,
+    "email": _email,
+    "postal_code": _pincode,
+    "pincode": _pincode,
+}
+
+
+@dataclass(slots=True)
+class BatchValidation:
+    """Normalized copies of the valid records and, by record index, the errors of the rest"""
+    valid: List[Dict[str, Any]] = field(default_factory=list)
+    errors: Dict[int, Dict[str, str]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def validate_many(records: Iterable[Mapping[str, Any]], checksum: bool = True) -> BatchValidation:
+    """
+    Validate and normalize the fields in ``FIELD_VALIDATORS`` of many records.
+
+    Values are stripped, GSTINs and PANs upper-cased and phone numbers
+    converted to E.164; other fields are copied as they are, and empty
+    fields are left to the caller's required-field checks. GSTIN check
+    characters are verified unless ``checksum`` is False.
+    """
+    validators = FIELD_VALIDATORS if checksum else {**FIELD_VALIDATORS, "gstin": _gstin}
+    result = BatchValidation()
+    for index, record in enumerate(records):
+        normalized = dict(record)
+        errors = {}
+        for name, value in record.items():
+            validator = validators.get(name)
+            if validator is None or value is None or value == "":
+                continue
+            try:
+                normalized[name] = validator(str(value))
+            except ValueError as e:
+                errors[name] = str(e)
+        if errors:
+            result.errors[index] = errors
+        else:
+            result.valid.append(normalized)
+    return result
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Notification outbox worker: delivers queued email/SMS messages
+Run this with: python -m app.workers.notifications
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+import asyncio
+import random
+import signal
+import httpx
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.outbox import NotificationChannel
+from app.repositories.outbox import ClaimedMessage, DeliveryResult, OutboxRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryError(Exception):
+    """Failed delivery; ``retryable`` is False for errors a retry cannot fix"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class HttpSender:
+    """Posts a message to a provider endpoint over a shared, pooled client"""
+
+    def __init__(self, client: httpx.AsyncClient, url: str, api_key: Optional[str] = None):
+        self.client = client
+        self.url = url
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    async def send(self, message: ClaimedMessage) -> None:
+        try:
+            response = await self.client.post(
+                self.url,
+                json={"to": message.recipient, "topic": message.topic, "data": message.payload},
+                # Lets providers drop duplicates when a lease expires mid-delivery
+                headers={**self.headers, "Idempotency-Key": f"outbox-{message.id}"},
+            )
+        except httpx.HTTPError as e:
+            raise DeliveryError(f"{type(e).__name__}: {e}")
+        if response.status_code == 429 or response.status_code >= 500:
+            raise DeliveryError(f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            raise DeliveryError(f"HTTP {response.status_code}: {response.text[:200]}", retryable=False)
+
+
+class NotificationWorker:
+    """
+    Drains the notification outbox.
+
+    Each cycle claims a leased batch, delivers it with at most
+    ``concurrency`` requests in flight and records every outcome in one
+    write. Failed messages are retried with exponential backoff and
+    jitter until ``max_attempts``, then marked failed. Database calls run
+    in threads so they never block deliveries in flight.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        senders: Dict[NotificationChannel, HttpSender],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        max_backoff_seconds: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.senders = senders
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.concurrency = concurrency or settings.NOTIFICATION_CONCURRENCY
+        self.max_attempts = max_attempts or settings.NOTIFICATION_MAX_ATTEMPTS
+        self.backoff_seconds = backoff_seconds if backoff_seconds is not None else settings.NOTIFICATION_BACKOFF_SECONDS
+        self.max_backoff_seconds = max_backoff_seconds or settings.NOTIFICATION_MAX_BACKOFF_SECONDS
+        self.lease_seconds = lease_seconds or settings.OUTBOX_LEASE_SECONDS
+        self.poll_interval = poll_interval if poll_interval is not None else settings.OUTBOX_POLL_INTERVAL_SECONDS
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds to wait before retry number ``attempts`` (1-based), with jitter"""
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _claim(self) -> List[ClaimedMessage]:
+        db = self.session_factory()
+        try:
+            return OutboxRepository(db).claim_batch(self.batch_size, self.lease_seconds)
+        finally:
+            db.close()
+
+    def _record(self, results: List[DeliveryResult]) -> None:
+        db = self.session_factory()
+        try:
+            OutboxRepository(db).record_results(results)
+        finally:
+            db.close()
+
+    async def _deliver(self, message: ClaimedMessage) -> DeliveryResult:
+        attempts = message.attempts + 1
+        sender = self.senders.get(message.channel)
+        try:
+            if sender is None:
+                raise DeliveryError(f"No sender configured for {message.channel.value}", retryable=False)
+            async with self._semaphore:
+                await sender.send(message)
+            return DeliveryResult(message.id, attempts)
+        except DeliveryError as e:
+            error, retryable = str(e), e.retryable
+        except Exception as e:
+            logger.error(f"Unexpected error delivering outbox message {message.id}: {e}")
+            error, retryable = f"{type(e).__name__}: {e}", True
+
+        if retryable and attempts < self.max_attempts:
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=self.backoff(attempts))
+            logger.warning(f"Outbox message {message.id} failed ({error}); retry {attempts} at {retry_at}")
+            return DeliveryResult(message.id, attempts, error, retry_at)
+        logger.error(f"Outbox message {message.id} failed permanently after {attempts} attempts: {error}")
+        return DeliveryResult(message.id, attempts, error)
+
+    async def run_once(self) -> int:
+        """Claim and deliver one batch; returns the number of messages processed"""
+        messages = await asyncio.to_thread(self._claim)
+        if not messages:
+            return 0
+        results = await asyncio.gather(*(self._deliver(message) for message in messages))
+        await asyncio.to_thread(self._record, list(results))
+        sent = sum(result.sent for result in results)
+        logger.info(f"Delivered {sent}/{len(results)} outbox messages")
+        return len(results)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Drain the outbox until ``stop`` is set, sleeping when it is empty"""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                logger.error(f"Outbox worker cycle failed: {e}")
+                processed = 0
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+def build_senders(client: httpx.AsyncClient) -> Dict[NotificationChannel, HttpSender]:
+    return {
+        NotificationChannel.EMAIL: HttpSender(client, settings.EMAIL_API_URL, settings.EMAIL_API_KEY),
+        NotificationChannel.SMS: HttpSender(client, settings.SMS_API_URL, settings.SMS_API_KEY),
+    }
+
+
+async def main() -> None:
+    from app.core.database import SessionLocal
+    from app.utils.logging import setup_logging
+
+    setup_logging()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    limits = httpx.Limits(max_connections=settings.NOTIFICATION_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=settings.NOTIFICATION_TIMEOUT_SECONDS, limits=limits) as client:
+        worker = NotificationWorker(SessionLocal, build_senders(client))
+        logger.info("Notification outbox worker started")
+        await worker.run(stop)
+    logger.info("Notification outbox worker stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Overdue-order sweep scheduler: flags late orders and queues alerts
+Run this with: python -m app.workers.overdue_sweep
+
+Any number of copies may run; a Redis leader lock lets one of them sweep.
+"""
+from typing import Callable, Optional
+import signal
+import threading
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.services.overdue_sweep import OverdueSweeper, SweepReport
+from app.utils.leader_lock import LeaderLock
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class OverdueSweepScheduler:
+    """
+    Runs the overdue sweep every ``interval`` seconds while holding the lock.
+
+    The lease outlives an interval, so the leader keeps it between runs and
+    renews it after every batch; followers simply retry each interval. If
+    Redis is unreachable the run is skipped rather than risking every
+    worker sweeping at once.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        lock: Optional[LeaderLock] = None,
+        interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval or settings.OVERDUE_SWEEP_INTERVAL_SECONDS
+        self.lock = lock or LeaderLock("overdue-sweep", ttl_seconds=self.interval * 3)
+        self.batch_size = batch_size
+
+    def run_once(self) -> Optional[SweepReport]:
+        """Sweep if this process is the leader; returns None otherwise"""
+        try:
+            if not self.lock.acquire():
+                return None
+        except Exception as e:
+            logger.warning(f"Leader lock unavailable, skipping overdue sweep: {e}")
+            return None
+        db = self.session_factory()
+        try:
+            return OverdueSweeper(db, self.batch_size).sweep(on_batch=self.lock.renew)
+        finally:
+            db.close()
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logger.error(f"Overdue sweep failed: {e}")
+                stop.wait(self.interval)
+        finally:
+            self.lock.release()
+
+
+def main() -> None:
+    from app.core.database import SessionLocal
+    from app.utils.logging import setup_logging
+
+    setup_logging()
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    logger.info("Overdue sweep scheduler started")
+    OverdueSweepScheduler(SessionLocal).run(stop)
+    logger.info("Overdue sweep scheduler stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Partition maintenance: creates upcoming monthly partitions of orders and
+order_items and, if PARTITION_RETENTION_MONTHS is set, detaches old ones
+Run this with: python -m app.workers.partitions
+Detach one month by hand with: python -m app.workers.partitions detach 2024-01
+
+Any number of copies may run; a Redis leader lock lets one of them work.
+"""
+from typing import List, Optional
+from datetime import datetime
+import argparse
+import signal
+import threading
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.services.partitions import PartitionManager
+from app.utils.leader_lock import LeaderLock
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionScheduler:
+    """Runs partition maintenance every ``interval`` seconds while holding the lock"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        lock: Optional[LeaderLock] = None,
+        interval: Optional[float] = None,
+        retention_months: Optional[int] = None,
+    ):
+        self.manager = PartitionManager(engine)
+        self.interval = interval or settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS
+        self.lock = lock or LeaderLock("partitions", ttl_seconds=self.interval * 3)
+        self.retention_months = (
+            retention_months if retention_months is not None else settings.PARTITION_RETENTION_MONTHS
+        )
+
+    def run_once(self) -> Optional[List[str]]:
+        """Create and detach partitions if this process is the leader; returns None otherwise"""
+        try:
+            if not self.lock.acquire():
+                return None
+        except Exception as e:
+            logger.warning(f"Leader lock unavailable, skipping partition maintenance: {e}")
+            return None
+        changed = self.manager.ensure()
+        changed += self.manager.detach_older_than(self.retention_months)
+        return changed
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logger.error(f"Partition maintenance failed: {e}")
+                stop.wait(self.interval)
+        finally:
+            self.lock.release()
+
+
+def main() -> None:
+    from app.core.database import engine
+    from app.utils.logging import setup_logging
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("ensure", help="create missing partitions once and exit")
+    detach = commands.add_parser("detach", help="detach one month of orders and order items")
+    detach.add_argument("month", type=lambda value: datetime.strptime(value, "%Y-%m").date(), help="YYYY-MM")
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.command == "ensure":
+        print("\n".join(PartitionManager(engine).ensure()) or "Nothing to create")
+        return
+    if args.command == "detach":
+        print("\n".join(PartitionManager(engine).detach(args.month)) or "Nothing to detach")
+        return
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    logger.info("Partition maintenance started")
+    PartitionScheduler(engine).run(stop)
+    logger.info("Partition maintenance stopped")
+
+
+if __name__ == "__main__":
+    main()
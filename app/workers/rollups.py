@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Dashboard rollup refresher: keeps the rollup tables current
+Run this with: python -m app.workers.rollups
+
+Any number of copies may run; a Redis leader lock lets one of them refresh.
+"""
+from typing import Callable, Optional
+import signal
+import threading
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.services.rollups import RollupReport, RollupService
+from app.utils.leader_lock import LeaderLock
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RollupScheduler:
+    """Refreshes the rollups every ``interval`` seconds while holding the lock"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        lock: Optional[LeaderLock] = None,
+        interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval or settings.ROLLUP_INTERVAL_SECONDS
+        self.lock = lock or LeaderLock("dashboard-rollups", ttl_seconds=self.interval * 3)
+
+    def run_once(self) -> Optional[RollupReport]:
+        """Refresh if this process is the leader; returns None otherwise"""
+        try:
+            if not self.lock.acquire():
+                return None
+        except Exception as e:
+            logger.warning(f"Leader lock unavailable, skipping rollup refresh: {e}")
+            return None
+        db = self.session_factory()
+        try:
+            return RollupService(db).refresh()
+        finally:
+            db.close()
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logger.error(f"Rollup refresh failed: {e}")
+                stop.wait(self.interval)
+        finally:
+            self.lock.release()
+
+
+def main() -> None:
+    from app.core.database import SessionLocal
+    from app.utils.logging import setup_logging
+
+    setup_logging()
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    logger.info("Dashboard rollup refresher started")
+    RollupScheduler(SessionLocal).run(stop)
+    logger.info("Dashboard rollup refresher stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stub for external services (email, SMS, GST) in development and tests
+Run this with: python -m app.workers.stub_server --port 8025
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import json
+import threading
+import time
+
+# Handler returning (status, JSON body) for a request
+Responder = Callable[[str, str, Any], Tuple[int, Any]]
+
+
+class StubServer:
+    """
+    Threaded HTTP server recording every request it receives.
+
+    By default every request gets ``200 {"ok": true}``. ``fail_first``
+    answers the first N requests with ``fail_status``, ``delay`` slows
+    every response down, and ``responder`` computes responses per request.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        fail_first: int = 0,
+        fail_status: int = 503,
+        delay: float = 0.0,
+        responder: Optional[Responder] = None,
+    ):
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.delay = delay
+        self.responder = responder
+        self.requests: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = raw.decode("utf-8", "replace")
+                with stub._lock:
+                    stub.requests.append({
+                        "method": self.command,
+                        "path": self.path,
+                        "headers": dict(self.headers),
+                        "body": body,
+                    })
+                    count = len(stub.requests)
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if count <= stub.fail_first:
+                    status, payload = stub.fail_status, {"error": "stub failure"}
+                elif stub.responder is not None:
+                    status, payload = stub.responder(self.command, self.path, body)
+                else:
+                    status, payload = 200, {"ok": True}
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def gst_responder(taxpayers: Optional[Dict[str, Dict[str, Any]]] = None) -> Responder:
+    """
+    Responder for the GST API taxpayer search (GET /commonapi/v1.1/search?action=TP&gstin=...).
+
+    Returns the record in ``taxpayers`` for the GSTIN, or 404 when it is
+    missing. Without ``taxpayers`` every GSTIN with a valid check
+    character is an active registration with generated names.
+    """
+    from app.utils.validators import validate_gstin
+
+    def respond(method: str, path: str, body: Any) -> Tuple[int, Any]:
+        url = urlsplit(path)
+        query = parse_qs(url.query)
+        if method != "GET" or url.path != "/commonapi/v1.1/search" or query.get("action") != ["TP"]:
+            return 404, {"error": "unknown endpoint"}
+        gstin = (query.get("gstin") or [""])[0]
+        if taxpayers is not None:
+            record = taxpayers.get(gstin)
+        elif validate_gstin(gstin, checksum=True):
+            record = {"gstin": gstin, "lgnm": f"Business {gstin[2:12]}", "tradeNam": f"Trader {gstin[2:12]}",
+                      "sts": "Active", "rgdt": "01/07/2017", "ctb": "Proprietorship"}
+        else:
+            record = None
+        if record is None:
+            return 404, {"error": "No records found for the provided GSTIN"}
+        return 200, record
+
+    return respond
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local HTTP stub for external services")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--fail-first", type=int, default=0, help="fail the first N requests")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before responding")
+    parser.add_argument("--gst", action="store_true", help="answer GST taxpayer searches (see gst_responder)")
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, fail_first=args.fail_first, delay=args.delay,
+                        responder=gst_responder() if args.gst else None)
+    print(f"Stub server listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
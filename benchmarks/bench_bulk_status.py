@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark moving 10,000 orders CONFIRMED -> PROCESSING one by one vs in bulk
+Run this with: python -m benchmarks.bench_bulk_status
+
+Both paths queue outbox notifications. Live events are published to Redis
+when it is reachable and skipped quickly when it is not.
+"""
+import logging
+import time
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models.address import Address
+from app.models.order import Order, OrderStatus
+from app.models.outbox import OutboxMessage
+from app.models.user import User, BusinessType
+from app.repositories.order import OrderRepository
+
+N_ORDERS = 10_000
+N_USERS = 500
+
+
+def seed():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.execute(insert(User), [{
+        "id": i, "email": f"buyer{i}@example.com", "phone": f"+9198765{i:05d}", "hashed_password": "x",
+        "business_name": f"Shop {i}", "gstin": f"37ABCDE{i:04d}F1Z5", "business_type": BusinessType.RETAIL_STORE,
+    } for i in range(1, N_USERS + 1)])
+    db.execute(insert(Address), [{
+        "id": 1, "user_id": 1, "address_line_1": "1 Main Road", "city": "Nellore",
+        "state": "Andhra Pradesh", "postal_code": "524001",
+    }])
+    db.execute(insert(Order), [{
+        "id": i, "order_number": f"ORD{i}", "user_id": i % N_USERS + 1, "delivery_address_id": 1,
+        "status": OrderStatus.CONFIRMED, "total_amount": 100,
+    } for i in range(1, N_ORDERS + 1)])
+    db.commit()
+    return db
+
+
+def main():
+    # One warning per failed publish would dominate the per-order timing
+    logging.getLogger("app").setLevel(logging.ERROR)
+    ids = list(range(1, N_ORDERS + 1))
+
+    db = seed()
+    repo = OrderRepository(db)
+    start = time.perf_counter()
+    for order_id in ids:
+        repo.update_status(order_id, OrderStatus.PROCESSING)
+    per_order = time.perf_counter() - start
+    assert db.query(Order).filter(Order.status == OrderStatus.PROCESSING).count() == N_ORDERS
+    db.close()
+
+    db = seed()
+    repo = OrderRepository(db)
+    start = time.perf_counter()
+    result = repo.bulk_update_status(ids, OrderStatus.CONFIRMED, OrderStatus.PROCESSING)
+    bulk = time.perf_counter() - start
+    assert len(result.updated_ids) == N_ORDERS
+    assert db.query(OutboxMessage).count() == 2 * N_ORDERS
+
+    print(f"update_status x {N_ORDERS}: {per_order * 1e3:9.0f} ms")
+    print(f"bulk_update_status:      {bulk * 1e3:9.0f} ms  ({per_order / bulk:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
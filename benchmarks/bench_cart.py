@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark cart operations/sec (Redis) and quote latency for 200-line carts
+Run this with: python -m benchmarks.bench_cart
+"""
+import random
+import statistics
+import time
+from decimal import Decimal
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models.product import Product
+from app.models.user import User, BusinessType
+from app.services.cart import CartService, price_cart
+
+N_PRODUCTS = 20_000
+CART_LINES = 200
+N_OPS = 20_000
+N_QUOTES = 200
+
+
+def seed(db):
+    db.execute(insert(User), [{
+        "id": 1, "email": "bench@example.com", "hashed_password": "x", "business_name": "Bench",
+        "gstin": "37ABCDE1234F1Z5", "business_type": BusinessType.COMPANY,
+    }])
+    db.execute(insert(Product), [{
+        "id": i, "name": f"Product {i}", "sku": f"SKU{i:06d}",
+        "retail_price": Decimal(100 + i % 900), "company_price": Decimal(90 + i % 900),
+        "stock_quantity": 10_000, "weight_kg": Decimal("1.250"),
+    } for i in range(1, N_PRODUCTS + 1)])
+    db.commit()
+
+
+def bench_redis_ops():
+    try:
+        from app.core.redis_client import RedisClient
+        client = RedisClient()
+    except Exception as e:
+        print(f"cart ops: skipped, Redis not available ({e})")
+        return
+    carts = CartService(client)
+    keys = [CartService.guest_key(f"bench-{i}") for i in range(100)]
+    start = time.perf_counter()
+    for i in range(N_OPS):
+        carts.add_item(keys[i % len(keys)], random.randint(1, N_PRODUCTS), 1)
+    elapsed = time.perf_counter() - start
+    print(f"cart add_item:  {N_OPS / elapsed:,.0f} ops/sec")
+
+    start = time.perf_counter()
+    for i in range(N_OPS):
+        carts.get_items(keys[i % len(keys)])
+    elapsed = time.perf_counter() - start
+    print(f"cart get_items: {N_OPS / elapsed:,.0f} ops/sec")
+    for key in keys:
+        carts.clear(key)
+
+
+def bench_quotes():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db)
+    user = db.get(User, 1)
+
+    samples = []
+    for _ in range(N_QUOTES):
+        items = {p: random.randint(1, 200) for p in random.sample(range(1, N_PRODUCTS + 1), CART_LINES)}
+        start = time.perf_counter()
+        price_cart(db, user, items)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    print(f"{CART_LINES}-line quote: p50 {statistics.median(samples) * 1e3:.2f} ms, "
+          f"p95 {samples[int(len(samples) * 0.95)] * 1e3:.2f} ms")
+
+
+def main():
+    bench_redis_ops()
+    bench_quotes()
+
+
+if __name__ == "__main__":
+    main()
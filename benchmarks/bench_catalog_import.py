@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bulk catalog import against per-row ProductRepository.create
+Run this with: python -m benchmarks.bench_catalog_import
+"""
+import csv
+import io
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.repositories.product import ProductRepository
+from app.schemas.product import ProductCreate
+from app.services.catalog_import import CatalogImporter
+
+N_ROWS = 100_000
+N_ROWS_PER_ROW = 5_000
+
+
+def make_csv(n_rows, error_every=1000):
+    lines = ["sku,name,description,retail_price,company_price,stock_quantity,category,bin_location"]
+    for i in range(n_rows):
+        company = "abc" if error_every and i % error_every == 0 else f"{90 + i % 50}.00"
+        lines.append(f"SKU{i:07d},Product {i},Bulk item {i},{100 + i % 50}.00,{company},{i % 500},"
+                     f"Category {i % 40},A-{i % 20:02d}-{i % 30:02d}")
+    return "\n".join(lines) + "\n"
+
+
+def new_session():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def main():
+    data = make_csv(N_ROWS)
+    db = new_session()
+    start = time.perf_counter()
+    report = CatalogImporter(db).import_csv(io.StringIO(data))
+    elapsed = time.perf_counter() - start
+    print(f"bulk import:   {report.loaded_rows:,} loaded, {len(report.errors):,} errors "
+          f"in {elapsed:.2f}s -> {report.total_rows / elapsed * 60:,.0f} rows/min")
+
+    # Re-import the same file: every row now merges into an existing SKU
+    start = time.perf_counter()
+    report = CatalogImporter(db).import_csv(io.StringIO(data))
+    elapsed = time.perf_counter() - start
+    print(f"bulk re-merge: {report.loaded_rows:,} loaded in {elapsed:.2f}s "
+          f"-> {report.total_rows / elapsed * 60:,.0f} rows/min")
+
+    db = new_session()
+    repo = ProductRepository(db)
+    rows = list(csv.DictReader(io.StringIO(make_csv(N_ROWS_PER_ROW, error_every=0))))
+    start = time.perf_counter()
+    for row in rows:
+        repo.create(ProductCreate(**row).model_dump())
+    elapsed = time.perf_counter() - start
+    print(f"per-row create: {len(rows):,} rows in {elapsed:.2f}s "
+          f"-> {len(rows) / elapsed * 60:,.0f} rows/min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call and batch latency of delivery estimates
+Run this with: python -m benchmarks.bench_delivery
+"""
+from datetime import datetime
+import os
+import random
+import tempfile
+import timeit
+import numpy as np
+from app.services.delivery import IST, DeliveryEstimator, build_prefix_table
+
+N_BATCH = 10_000
+
+
+def main():
+    rng = random.Random(5)
+    codes = [str(rng.randint(110001, 855117)) for _ in range(N_BATCH)]
+    order_time = datetime(2024, 3, 4, 16, 0, tzinfo=IST)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pincodes.npy")
+        np.save(path, build_prefix_table())
+        load = timeit.timeit(lambda: DeliveryEstimator.from_file(path).table, number=20) / 20
+        estimator = DeliveryEstimator.from_file(path)
+
+        n = 50_000
+        single = timeit.timeit(lambda: estimator.estimate(codes[0], order_time), number=n) / n
+        batch = timeit.timeit(lambda: estimator.estimate_many(codes, order_time), number=10) / 10
+
+    print(f"Table open (mmap):            {load * 1e6:8.1f} us")
+    print(f"Single estimate:              {single * 1e6:8.2f} us/call")
+    print(f"Batch estimate ({N_BATCH}):      {batch * 1e3:8.2f} ms ({batch / N_BATCH * 1e6:.2f} us/address)")
+
+
+if __name__ == "__main__":
+    main()
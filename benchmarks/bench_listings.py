@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark 1,000-row product and order listings, from query to JSON-ready
+output: ORM objects validated into response schemas versus column tuples
+built with model_construct (see app.repositories.projections).
+Reports the best latency over several runs and the peak memory traced
+while building one listing.
+Run this with: python -m benchmarks.bench_listings
+"""
+import gc
+import time
+import tracemalloc
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models.address import Address
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import User, BusinessType
+from app.repositories.order import ORDER_RESPONSE, OrderRepository
+from app.repositories.product import PRODUCT_RESPONSE, ProductRepository
+from app.schemas.order import OrderResponse
+from app.schemas.product import ProductResponse
+
+ROWS = 1_000
+ITEMS_PER_ORDER = 3
+
+
+def seed(db):
+    db.execute(insert(User), [{
+        "id": 1, "email": "bench@example.com", "hashed_password": "x", "business_name": "Bench",
+        "gstin": "37ABCDE1234F1Z5", "business_type": BusinessType.COMPANY,
+    }])
+    db.execute(insert(Address), [{
+        "id": 1, "user_id": 1, "address_line_1": "1 Main Road", "city": "Nellore",
+        "state": "Andhra Pradesh", "postal_code": "524001",
+    }])
+    db.execute(insert(Product), [{
+        "id": i, "name": f"Product {i}", "description": "Bench product", "sku": f"SKU{i:05d}",
+        "retail_price": 10, "company_price": 9, "stock_quantity": 5, "weight_kg": 1.5, "category": "Rice",
+    } for i in range(1, ROWS + 1)])
+    db.execute(insert(Order), [{
+        "id": i, "order_number": f"ORD{i}", "user_id": 1, "delivery_address_id": 1,
+        "status": OrderStatus.CONFIRMED, "total_amount": 27,
+    } for i in range(1, ROWS + 1)])
+    db.execute(insert(OrderItem), [{
+        "order_id": o, "product_id": p, "quantity": 1, "unit_price": 9, "total_price": 9,
+    } for o in range(1, ROWS + 1) for p in range(1, ITEMS_PER_ORDER + 1)])
+    db.commit()
+
+
+def listings(db):
+    products, orders = ProductRepository(db), OrderRepository(db)
+    return {
+        "products": {
+            "ORM + model_validate": lambda: PRODUCT_RESPONSE.dump(
+                [ProductResponse.model_validate(p) for p in products.get_active_products(limit=ROWS)]
+            ),
+            "tuples + model_construct": lambda: PRODUCT_RESPONSE.dump(
+                products.get_active_product_responses(limit=ROWS)
+            ),
+            "tuples + dump_json": lambda: PRODUCT_RESPONSE.dump_json(
+                products.get_active_product_responses(limit=ROWS)
+            ),
+        },
+        "orders": {
+            "ORM + model_validate": lambda: ORDER_RESPONSE.dump(
+                [OrderResponse.model_validate(o) for o in orders.get_user_orders(1, limit=ROWS)]
+            ),
+            "tuples + model_construct": lambda: ORDER_RESPONSE.dump(
+                orders.get_user_order_responses(1, limit=ROWS)
+            ),
+            "tuples + dump_json": lambda: ORDER_RESPONSE.dump_json(
+                orders.get_user_order_responses(1, limit=ROWS)
+            ),
+        },
+    }
+
+
+def measure(db, fn, repeat=5):
+    """(best seconds, peak traced bytes) for one listing"""
+    best = float("inf")
+    for _ in range(repeat):
+        db.expunge_all()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    db.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db)
+
+    for listing, paths in listings(db).items():
+        print(f"--- {ROWS} {listing} ---")
+        for name, fn in paths.items():
+            seconds, peak = measure(db, fn)
+            print(f"{name:<26} {seconds * 1e3:8.1f} ms   peak {peak / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Load test live order events: idle SSE/WebSocket connections and fan-out
+Run this with: python -m benchmarks.bench_order_events
+
+Starts one uvicorn worker in a subprocess, opens CONNECTIONS idle streams
+(half SSE, half WebSocket) and reports the worker's memory per connection
+and the time to fan an event out to every stream. Events are injected with
+a bench-only endpoint that dispatches on the worker's hub, so no Redis
+server is needed.
+"""
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+from app.core.security import create_access_token
+
+CONNECTIONS = int(os.environ.get("BENCH_CONNECTIONS", 10_000))
+USERS = 1_000
+CONNECT_BATCH = 500
+ROUNDS = 5
+
+
+def serve(port: int) -> None:
+    import uvicorn
+    from fastapi import Body, FastAPI
+    from app.routers.order_events import router
+    from app.services.order_events import order_event_hub
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/orders")
+
+    @app.post("/bench/publish")
+    async def publish(events: List[dict] = Body(...)):
+        return {"delivered": sum(order_event_hub.dispatch(event) for event in events)}
+
+    @app.get("/bench/connections")
+    async def connections():
+        return {"connections": order_event_hub.connection_count}
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", ws="websockets-sansio",
+                ws_per_message_deflate=False, backlog=4096)
+
+
+def rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+async def http(port: int, method: str, path: str, body: bytes = b"") -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    response = await reader.read()
+    writer.close()
+    return response.split(b"\r\n\r\n", 1)[1]
+
+
+class SseClient:
+    def __init__(self, port: int, token: str):
+        self.port = port
+        self.token = token
+        self.received = asyncio.Queue()
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self.writer.write(
+            f"GET /api/v1/orders/events?token={self.token} HTTP/1.1\r\nHost: bench\r\n"
+            "Accept: text/event-stream\r\n\r\n".encode()
+        )
+        await self.reader.readuntil(b"retry:")
+        self.task = asyncio.create_task(self.read())
+
+    async def read(self) -> None:
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                return
+            if line.startswith(b"data: "):
+                self.received.put_nowait(time.perf_counter())
+
+    async def close(self) -> None:
+        self.task.cancel()
+        self.writer.close()
+
+
+class WsClient:
+    def __init__(self, port: int, token: str):
+        self.port = port
+        self.token = token
+        self.received = asyncio.Queue()
+
+    async def connect(self) -> None:
+        from websockets.asyncio.client import connect
+        self.ws = await connect(f"ws://127.0.0.1:{self.port}/api/v1/orders/ws?token={self.token}")
+        self.task = asyncio.create_task(self.read())
+
+    async def read(self) -> None:
+        async for _ in self.ws:
+            self.received.put_nowait(time.perf_counter())
+
+    async def close(self) -> None:
+        self.task.cancel()
+        await self.ws.close()
+
+
+async def run(port: int, pid: int) -> None:
+    tokens = [create_access_token(subject=user_id) for user_id in range(1, USERS + 1)]
+    clients = [
+        (SseClient if i % 2 == 0 else WsClient)(port, tokens[i % USERS]) for i in range(CONNECTIONS)
+    ]
+    # Warm up both code paths so lazy imports are not counted per connection
+    for warmup in (SseClient(port, tokens[0]), WsClient(port, tokens[0])):
+        await warmup.connect()
+        await warmup.close()
+    await asyncio.sleep(0.5)
+    baseline = rss_kb(pid)
+
+    start = time.perf_counter()
+    for offset in range(0, CONNECTIONS, CONNECT_BATCH):
+        await asyncio.gather(*(client.connect() for client in clients[offset:offset + CONNECT_BATCH]))
+    connect_seconds = time.perf_counter() - start
+    await asyncio.sleep(1)
+    connected = rss_kb(pid)
+    print(f"Connected {CONNECTIONS} streams ({CONNECTIONS // 2} SSE, {CONNECTIONS - CONNECTIONS // 2} WebSocket) "
+          f"to {USERS} users in {connect_seconds:.1f}s")
+    hub_connections = json.loads(await http(port, "GET", "/bench/connections"))["connections"]
+    print(f"Hub subscriptions:       {hub_connections:8d}")
+    print(f"Worker RSS:              {baseline / 1024:8.1f} MB idle -> {connected / 1024:.1f} MB connected")
+    print(f"Memory per connection:   {(connected - baseline) / CONNECTIONS:8.1f} KB")
+
+    # One status change per user reaches every stream of that user
+    latencies = []
+    for round_number in range(ROUNDS):
+        events = [
+            {"order_id": user_id, "order_number": f"ORD{user_id}", "user_id": user_id,
+             "status": "shipped", "round": round_number}
+            for user_id in range(1, USERS + 1)
+        ]
+        sent = time.perf_counter()
+        await http(port, "POST", "/bench/publish", json.dumps(events).encode())
+        arrivals = await asyncio.gather(*(client.received.get() for client in clients))
+        latencies.append(max(arrivals) - sent)
+    print(f"Fan-out of {USERS} events to {CONNECTIONS} streams: "
+          f"median {statistics.median(latencies) * 1000:.0f} ms to the last stream")
+    print(f"Worker RSS after fan-out: {rss_kb(pid) / 1024:7.1f} MB")
+
+    await asyncio.gather(*(client.close() for client in clients))
+
+
+def main() -> None:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_order_events", "--serve", str(port)])
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        asyncio.run(run(port, server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--serve":
+        serve(int(sys.argv[2]))
+    else:
+        main()
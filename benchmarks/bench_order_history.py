@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark order-history listings for a user with 5,000 orders of 50 items
+Run this with: python -m benchmarks.bench_order_history
+"""
+import time
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker, joinedload
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models.address import Address
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import User, BusinessType
+from app.repositories.order import OrderRepository
+
+N_ORDERS = 5_000
+ITEMS_PER_ORDER = 50
+
+
+def seed(db):
+    db.execute(insert(User), [{
+        "id": 1, "email": "bench@example.com", "hashed_password": "x", "business_name": "Bench",
+        "gstin": "37ABCDE1234F1Z5", "business_type": BusinessType.COMPANY,
+    }])
+    db.execute(insert(Address), [{
+        "id": 1, "user_id": 1, "address_line_1": "1 Main Road", "city": "Nellore",
+        "state": "Andhra Pradesh", "postal_code": "524001",
+    }])
+    db.execute(insert(Product), [{
+        "id": i, "name": f"Product {i}", "sku": f"SKU{i:05d}", "retail_price": 10, "company_price": 9,
+    } for i in range(1, ITEMS_PER_ORDER + 1)])
+    db.execute(insert(Order), [{
+        "id": i, "order_number": f"ORD{i}", "user_id": 1, "delivery_address_id": 1,
+        "status": OrderStatus.CONFIRMED, "total_amount": 100,
+    } for i in range(1, N_ORDERS + 1)])
+    db.execute(insert(OrderItem), [{
+        "order_id": o, "product_id": p, "quantity": 2, "unit_price": 9, "total_price": 18,
+    } for o in range(1, N_ORDERS + 1) for p in range(1, ITEMS_PER_ORDER + 1)])
+    db.commit()
+
+
+def joined_orders(db, limit):
+    """The previous implementation: joinedload + LIMIT"""
+    return (
+        db.query(Order)
+        .options(joinedload(Order.order_items))
+        .filter(Order.user_id == 1)
+        .order_by(Order.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def timed(db, fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        db.expunge_all()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db)
+    repo = OrderRepository(db)
+
+    for limit in (100, N_ORDERS):
+        print(f"--- page size {limit} ---")
+        print(f"joinedload + LIMIT:  {timed(db, lambda: joined_orders(db, limit)) * 1e3:9.1f} ms")
+        print(f"selectinload:        {timed(db, lambda: repo.get_user_orders(1, limit=limit)) * 1e3:9.1f} ms")
+        print(f"summary projection:  {timed(db, lambda: repo.get_user_order_summaries(1, limit=limit)) * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
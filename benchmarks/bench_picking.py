@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark wave generation for 10,000 PROCESSING orders
+Run this with: python -m benchmarks.bench_picking [n_orders]
+"""
+import random
+import sys
+import time
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker, selectinload
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models.address import Address
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import User, BusinessType
+from app.services.picking import WavePlanner
+
+N_PRODUCTS = 2_000
+ITEMS_PER_ORDER = 8
+
+
+def seed(db, n_orders: int):
+    rng = random.Random(1)
+    db.execute(insert(User), [{
+        "id": 1, "email": "bench@example.com", "hashed_password": "x", "business_name": "Bench",
+        "gstin": "37ABCDE1234F1Z5", "business_type": BusinessType.COMPANY,
+    }])
+    db.execute(insert(Address), [{
+        "id": 1, "user_id": 1, "address_line_1": "1 Main Road", "city": "Nellore",
+        "state": "Andhra Pradesh", "postal_code": "524001",
+    }])
+    db.execute(insert(Product), [{
+        "id": i, "name": f"Product {i}", "sku": f"SKU{i:05d}", "retail_price": 10, "company_price": 9,
+        "bin_location": f"{chr(65 + i % 20)}-{i % 50:02d}-{i % 7:02d}",
+    } for i in range(1, N_PRODUCTS + 1)])
+    db.execute(insert(Order), [{
+        "id": i, "order_number": f"ORD{i}", "user_id": 1, "delivery_address_id": 1,
+        "status": OrderStatus.PROCESSING, "total_amount": 100,
+    } for i in range(1, n_orders + 1)])
+    db.execute(insert(OrderItem), [{
+        "order_id": o, "product_id": p, "quantity": rng.randint(1, 20), "unit_price": 9, "total_price": 90,
+    } for o in range(1, n_orders + 1) for p in rng.sample(range(1, N_PRODUCTS + 1), ITEMS_PER_ORDER)])
+    db.commit()
+
+
+def naive_waves(db):
+    """Order-by-order loading through the ORM relationship"""
+    totals = {}
+    orders = db.query(Order).options(selectinload(Order.order_items).selectinload(OrderItem.product)).filter(
+        Order.status == OrderStatus.PROCESSING).all()
+    for order in orders:
+        for item in order.order_items:
+            totals[item.product_id] = totals.get(item.product_id, 0) + item.quantity
+    return totals
+
+
+def main():
+    n_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db, n_orders)
+
+    start = time.perf_counter()
+    waves = WavePlanner(db, wave_size=n_orders).generate_waves()
+    aggregated = time.perf_counter() - start
+
+    db.expunge_all()
+    start = time.perf_counter()
+    naive_waves(db)
+    naive = time.perf_counter() - start
+
+    print(f"Orders: {n_orders}, lines: {n_orders * ITEMS_PER_ORDER}, pick lines: {len(waves[0].pick_list)}")
+    print(f"Aggregated query wave: {aggregated:.3f} s")
+    print(f"ORM relationship wave: {naive:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark price book resolution for a 500-line bulk order quote
+Run this with: python -m benchmarks.bench_pricing
+"""
+from decimal import Decimal, ROUND_HALF_UP
+import random
+import timeit
+import numpy as np
+from app.models.user import BusinessType
+from app.services.pricing import DEFAULT_VOLUME_DISCOUNTS, PriceBookService
+
+N_PRODUCTS = 20_000
+N_LINES = 500
+REPEAT = 200
+
+
+class _User:
+    business_type = BusinessType.COMPANY
+
+
+def build_catalog(rng: random.Random):
+    ids = np.arange(1, N_PRODUCTS + 1, dtype=np.int64)
+    retail = np.array([rng.randint(1_000, 500_000) for _ in ids], dtype=np.int64)
+    company = (retail * 85) // 100
+    return ids, retail, company
+
+
+def decimal_quote(company, product_ids, quantities):
+    """Naive per-item Decimal loop, as callers would write it today"""
+    tiers = sorted(DEFAULT_VOLUME_DISCOUNTS[BusinessType.COMPANY], key=lambda d: d.min_quantity)
+    total = Decimal("0")
+    for pid, qty in zip(product_ids, quantities):
+        discount = Decimal("0")
+        for tier in tiers:
+            if qty >= tier.min_quantity:
+                discount = tier.discount_percentage
+        unit = (company[pid] * (100 - discount) / 100).quantize(Decimal("0.01"), ROUND_HALF_UP)
+        line = unit * qty
+        tax = (line * Decimal("0.18")).quantize(Decimal("0.01"), ROUND_HALF_UP)
+        total += line + tax
+    return total
+
+
+def main():
+    rng = random.Random(42)
+    catalog = build_catalog(rng)
+    service = PriceBookService()
+    service.load_arrays(*catalog)
+
+    product_ids = rng.sample(range(1, N_PRODUCTS + 1), N_LINES)
+    quantities = [rng.choice([1, 5, 20, 60, 150, 600]) for _ in range(N_LINES)]
+    user = _User()
+    company = {int(pid): Decimal(int(p)) / 100 for pid, p in zip(catalog[0], catalog[2])}
+
+    assert service.resolve_prices(user, product_ids, quantities).total == decimal_quote(
+        company, product_ids, quantities
+    )
+
+    build = timeit.timeit(lambda: service.load_arrays(*catalog), number=5) / 5
+    vectorized = timeit.timeit(
+        lambda: service.resolve_prices(user, product_ids, quantities), number=REPEAT
+    ) / REPEAT
+    naive = timeit.timeit(
+        lambda: decimal_quote(company, product_ids, quantities), number=10
+    ) / 10
+
+    print(f"Price book build ({N_PRODUCTS} products): {build * 1e3:8.2f} ms")
+    print(f"Vectorized quote ({N_LINES} lines):       {vectorized * 1e6:8.1f} us")
+    print(f"Decimal loop quote ({N_LINES} lines):     {naive * 1e6:8.1f} us")
+    print(f"Speedup: {naive / vectorized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
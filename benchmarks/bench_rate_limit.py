@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark rate limiter overhead per request
+Run this with: python -m benchmarks.bench_rate_limit
+"""
+import time
+import redis
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from app.core.config import settings
+from app.utils.rate_limit import LocalLimiter, RateLimit, RateLimited, RateLimiter
+
+N = 50_000
+N_HTTP = 5_000
+LIMITS = [
+    ("ratelimit:route:GET:/x", RateLimit(rate=10**9, period=1)),
+    ("ratelimit:user:1:GET:/x", RateLimit(rate=10**9, period=1)),
+]
+
+
+def per_call_us(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def bench_http(limiter):
+    generous = RateLimit(rate=10**9, period=1)
+    app = FastAPI()
+
+    @app.get("/plain")
+    def plain():
+        return {}
+
+    @app.get("/limited", dependencies=[Depends(RateLimited(route=generous, per_user=generous, limiter=limiter))])
+    def limited():
+        return {}
+
+    client = TestClient(app)
+    plain_us = per_call_us(lambda: client.get("/plain"), N_HTTP)
+    limited_us = per_call_us(lambda: client.get("/limited"), N_HTTP)
+    print(f"HTTP overhead:           {limited_us - plain_us:8.1f} us/request "
+          f"({plain_us:.0f} -> {limited_us:.0f} us)")
+
+
+def main():
+    local = LocalLimiter()
+    print(f"local GCRA (2 limits):   {per_call_us(lambda: local.check(LIMITS), N):8.2f} us/check")
+
+    connection = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB,
+                             socket_connect_timeout=1, retry=Retry(NoBackoff(), 0))
+    try:
+        connection.ping()
+    except redis.RedisError as e:
+        print(f"Redis GCRA: skipped, Redis not available ({e})")
+        bench_http(RateLimiter(redis_connection=connection))
+        return
+
+    remote = RateLimiter(redis_connection=connection, local=False)
+    print(f"Redis GCRA (2 limits):   {per_call_us(lambda: remote.check(LIMITS), N // 5):8.2f} us/check")
+    both = RateLimiter(redis_connection=connection)
+    print(f"local + Redis:           {per_call_us(lambda: both.check(LIMITS), N // 5):8.2f} us/check")
+
+    flood = RateLimiter(redis_connection=connection)
+    tight = [("ratelimit:bench:flood", RateLimit(rate=10, period=60))]
+    print(f"flood shed locally:      {per_call_us(lambda: flood.check(tight), N):8.2f} us/check")
+    connection.delete(*[key for key, _ in LIMITS + tight])
+    bench_http(both)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark dashboard queries: live GROUP BY over 10M order items vs rollups
+Run this with: python -m benchmarks.bench_rollups
+
+Seeds a temporary SQLite file with a year of orders (10 items each), then
+times the dashboard computed live from orders/order_items against the same
+figures read from the rollup tables, plus a full and an incremental refresh.
+Set BENCH_ORDER_ITEMS to change the size.
+"""
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, distinct, func, select
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import User
+from app.repositories.order import OrderRepository
+from app.repositories.rollup import RollupRepository
+from app.services.rollups import RollupService, day_floor
+
+N_ITEMS = int(os.environ.get("BENCH_ORDER_ITEMS", 10_000_000))
+ITEMS_PER_ORDER = 10
+N_ORDERS = N_ITEMS // ITEMS_PER_ORDER
+N_USERS = 2_000
+N_PRODUCTS = 5_000
+DAYS = 365
+CHUNK = 100_000
+STATUSES = ["DELIVERED"] * 80 + ["SHIPPED"] * 8 + ["PROCESSING"] * 4 + ["CONFIRMED"] * 4 + ["CANCELLED"] * 4
+
+
+def seed(engine, today):
+    rng = random.Random(0)
+    raw = engine.raw_connection()
+    cursor = raw.cursor()
+    cursor.executemany(
+        "INSERT INTO users (id, email, hashed_password, business_name, gstin, business_type, is_active, is_verified)"
+        " VALUES (?, ?, 'x', ?, ?, ?, 1, 1)",
+        [(i, f"buyer{i}@example.com", f"Shop {i}", f"37ABCDE{i:04d}F1Z5", "COMPANY" if i % 5 == 0 else "RETAIL_STORE")
+         for i in range(1, N_USERS + 1)],
+    )
+    cursor.execute("INSERT INTO addresses (id, user_id, address_line_1, city, state, postal_code, country, is_default)"
+                   " VALUES (1, 1, '1 Main Road', 'Nellore', 'Andhra Pradesh', '524001', 'India', 1)")
+    cursor.executemany(
+        "INSERT INTO products (id, name, sku, retail_price, company_price, stock_quantity, is_active)"
+        " VALUES (?, ?, ?, 10, 9, ?, 1)",
+        [(i, f"Product {i}", f"SKU{i:05d}", rng.randrange(0, 200)) for i in range(1, N_PRODUCTS + 1)],
+    )
+    start = today - timedelta(days=DAYS)
+    item_id = 0
+    for first in range(1, N_ORDERS + 1, CHUNK // ITEMS_PER_ORDER):
+        orders, items = [], []
+        for order_id in range(first, min(first + CHUNK // ITEMS_PER_ORDER, N_ORDERS + 1)):
+            created = start + timedelta(seconds=order_id * DAYS * 86400 // N_ORDERS)
+            total = 0
+            for _ in range(ITEMS_PER_ORDER):
+                item_id += 1
+                quantity = rng.randrange(1, 20)
+                total += quantity * 9
+                items.append((item_id, order_id, rng.randrange(1, N_PRODUCTS + 1), quantity, 9, quantity * 9,
+                              created.strftime("%Y-%m-%d %H:%M:%S.%f")))
+            orders.append((order_id, f"ORD{order_id}", rng.randrange(1, N_USERS + 1), rng.choice(STATUSES), total,
+                           created.strftime("%Y-%m-%d %H:%M:%S.%f")))
+        cursor.executemany(
+            "INSERT INTO orders (id, order_number, user_id, delivery_address_id, status, total_amount,"
+            " tax_amount, shipping_cost, created_at) VALUES (?, ?, ?, 1, ?, ?, 0, 0, ?)", orders,
+        )
+        cursor.executemany(
+            "INSERT INTO order_items (id, order_id, product_id, quantity, unit_price, total_price, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)", items,
+        )
+        raw.commit()
+    cursor.execute("ANALYZE")
+    raw.close()
+
+
+def live_dashboard(db, start, end):
+    """The same figures aggregated from orders and order_items on every request"""
+    in_window = (Order.created_at >= start, Order.created_at < end)
+    revenue = db.execute(
+        select(day_floor(Order.created_at), User.business_type, func.count(), func.sum(Order.total_amount))
+        .join(User, User.id == Order.user_id)
+        .where(*in_window, Order.status != OrderStatus.CANCELLED)
+        .group_by(day_floor(Order.created_at), User.business_type)
+    ).all()
+    statuses = db.execute(select(Order.status, func.count()).group_by(Order.status)).all()
+    top = db.execute(
+        select(OrderItem.product_id, func.count(distinct(OrderItem.order_id)), func.sum(OrderItem.quantity),
+               func.sum(OrderItem.total_price).label("revenue"))
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(*in_window, Order.status != OrderStatus.CANCELLED)
+        .group_by(OrderItem.product_id)
+        .order_by(func.sum(OrderItem.total_price).desc())
+        .limit(10)
+    ).all()
+    low_stock = db.execute(select(func.count()).where(Product.stock_quantity <= 10)).scalar()
+    return revenue, statuses, top, low_stock
+
+
+def rollup_dashboard(db, start, end):
+    rollups = RollupRepository(db)
+    return (rollups.revenue_by_day(start, end), rollups.order_counts_by_status(),
+            rollups.top_products(start, end, 10), rollups.latest_inventory())
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        started = time.perf_counter()
+        seed(engine, today)
+        print(f"Seeded {N_ORDERS:,} orders / {N_ITEMS:,} items in {time.perf_counter() - started:.0f}s")
+
+        db = sessionmaker(bind=engine)()
+        start, end = today - timedelta(days=29), today + timedelta(days=1)
+
+        started = time.perf_counter()
+        report = RollupService(db).refresh()
+        print(f"Full rollup build ({len(report.days)} days):   {time.perf_counter() - started:8.2f} s")
+
+        # A day of status changes, then an incremental refresh
+        recent = range(N_ORDERS - N_ORDERS // DAYS, N_ORDERS + 1)
+        ids = random.Random(1).sample(recent, min(1_000, len(recent)))
+        OrderRepository(db).bulk_update_status(ids, OrderStatus.SHIPPED, OrderStatus.DELIVERED)
+        started = time.perf_counter()
+        report = RollupService(db).refresh()
+        print(f"Incremental refresh ({len(report.days)} days):  {time.perf_counter() - started:8.2f} s")
+
+        live, (revenue, statuses, _, _) = timed(lambda: live_dashboard(db, start, end), repeat=1)
+        rollup, (rollup_revenue, rollup_statuses, _, _) = timed(lambda: rollup_dashboard(db, start, end))
+        assert len(revenue) == len(rollup_revenue)
+        assert {status.value: count for status, count in statuses} == rollup_statuses
+        print(f"Dashboard, live aggregation:     {live * 1e3:10.1f} ms")
+        print(f"Dashboard, from rollups:         {rollup * 1e3:10.1f} ms  ({live / rollup:.0f}x faster)")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark route planning for a 2,000-drop evening on a single core
+Run this with: python -m benchmarks.bench_routing [n_drops]
+"""
+import random
+import sys
+import time
+from app.services.routing import Drop, RoutePlanner, VehicleSpec
+
+
+def make_drops(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    drops = []
+    for i in range(n):
+        lat = 14.44 + rng.gauss(0, 0.25)
+        lon = 79.98 + rng.gauss(0, 0.25)
+        # Pincodes cover contiguous areas; approximate them with ~5 km grid cells
+        code = 524000 + (int((lat - 13.0) / 0.05) * 37 + int((lon - 78.5) / 0.05)) % 1000
+        drops.append(Drop(
+            order_id=i + 1,
+            postal_code=str(code),
+            latitude=lat,
+            longitude=lon,
+            weight_kg=rng.uniform(2, 80),
+        ))
+    return drops
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    drops = make_drops(n)
+    planner = RoutePlanner(vehicle=VehicleSpec(capacity_kg=1500, max_stops=60))
+
+    start = time.perf_counter()
+    plan = planner.plan(drops)
+    elapsed = time.perf_counter() - start
+
+    print(f"Drops:       {n}")
+    print(f"Routes:      {len(plan.routes)} (unassigned: {len(plan.unassigned)})")
+    print(f"Distance:    {plan.total_distance_km:,.1f} km")
+    print(f"Planning:    {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
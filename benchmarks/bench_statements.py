@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Python-side cost of repository queries: building the
+statement, looking up its compiled form, binding parameters and loading
+rows. Time spent inside the driver's cursor.execute() is measured and
+subtracted, so the figures exclude database time.
+
+"before" re-creates the per-call ``db.query(...)`` construction the
+repositories used; "after" calls the repositories, which execute
+statements built once at module level (or once per model).
+Run this with: python -m benchmarks.bench_statements
+"""
+import time
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker, selectinload
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models.address import Address
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import User, BusinessType
+from app.repositories.address import AddressRepository
+from app.repositories.order import OrderRepository
+from app.repositories.product import ProductRepository
+from app.repositories.user import UserRepository
+
+CALLS = 2_000
+N_PRODUCTS = 200
+
+
+def seed(db):
+    db.execute(insert(User), [{
+        "id": 1, "email": "bench@example.com", "hashed_password": "x", "business_name": "Bench",
+        "gstin": "37ABCDE1234F1Z5", "business_type": BusinessType.COMPANY,
+    }])
+    db.execute(insert(Address), [{
+        "id": 1, "user_id": 1, "address_line_1": "1 Main Road", "city": "Nellore",
+        "state": "Andhra Pradesh", "postal_code": "524001", "is_default": True,
+    }])
+    db.execute(insert(Product), [{
+        "id": i, "name": f"Product {i}", "sku": f"SKU{i:05d}", "retail_price": 10, "company_price": 9,
+        "stock_quantity": i % 20, "category": f"Category {i % 5}",
+    } for i in range(1, N_PRODUCTS + 1)])
+    db.execute(insert(Order), [{
+        "id": i, "order_number": f"ORD{i}", "user_id": 1, "delivery_address_id": 1,
+        "status": OrderStatus.CONFIRMED, "total_amount": 100,
+    } for i in range(1, 21)])
+    db.execute(insert(OrderItem), [{
+        "order_id": o, "product_id": p, "quantity": 1, "unit_price": 9, "total_price": 9,
+    } for o in range(1, 21) for p in range(1, 4)])
+    db.commit()
+
+
+# The previous per-call construction of each query
+BEFORE = {
+    "user_by_id": lambda db, i: db.query(User).filter(User.id == 1).first(),
+    "user_by_email": lambda db, i: db.query(User).filter(User.email == f"user{i}@example.com").first(),
+    "default_address": lambda db, i: (
+        db.query(Address).filter(Address.user_id == 1).filter(Address.is_default == True).first()
+    ),
+    "product_by_sku": lambda db, i: db.query(Product).filter(Product.sku == f"SKU{i % N_PRODUCTS:05d}").first(),
+    "low_stock_products": lambda db, i: (
+        db.query(Product)
+        .filter(Product.stock_quantity <= 5)
+        .filter(Product.stock_quantity > 0)
+        .filter(Product.is_active == True)
+        .offset(0)
+        .limit(10)
+        .all()
+    ),
+    "search_products": lambda db, i: (
+        db.query(Product)
+        .filter(
+            (Product.name.ilike(f"%{i % 50}%")) |
+            (Product.description.ilike(f"%{i % 50}%")) |
+            (Product.sku.ilike(f"%{i % 50}%"))
+        )
+        .filter(Product.is_active == True)
+        .offset(0)
+        .limit(10)
+        .all()
+    ),
+    "user_orders": lambda db, i: (
+        db.query(Order)
+        .options(selectinload(Order.order_items))
+        .filter(Order.user_id == 1)
+        .order_by(Order.created_at.desc())
+        .offset(0)
+        .limit(10)
+        .all()
+    ),
+}
+
+AFTER = {
+    "user_by_id": lambda db, i: UserRepository(db).get_by_id(1),
+    "user_by_email": lambda db, i: UserRepository(db).get_by_email(f"user{i}@example.com"),
+    "default_address": lambda db, i: AddressRepository(db).get_default_address(1),
+    "product_by_sku": lambda db, i: ProductRepository(db).get_by_sku(f"SKU{i % N_PRODUCTS:05d}"),
+    "low_stock_products": lambda db, i: ProductRepository(db).get_low_stock_products(5, limit=10),
+    "search_products": lambda db, i: ProductRepository(db).search_products(str(i % 50), limit=10),
+    "user_orders": lambda db, i: OrderRepository(db).get_user_orders(1, limit=10),
+}
+
+
+class DatabaseTimer:
+    """Total seconds spent in cursor.execute() on an engine"""
+
+    def __init__(self, engine):
+        self.seconds = 0.0
+        event.listen(engine, "before_cursor_execute", self.before)
+        event.listen(engine, "after_cursor_execute", self.after)
+
+    def before(self, conn, cursor, statement, parameters, context, executemany):
+        context._bench_started = time.perf_counter()
+
+    def after(self, conn, cursor, statement, parameters, context, executemany):
+        self.seconds += time.perf_counter() - context._bench_started
+
+
+def overhead(db, timer, fn, repeat=3):
+    """Best per-call Python time in microseconds, over ``repeat`` runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        db.expunge_all()
+        database = timer.seconds
+        start = time.perf_counter()
+        for i in range(CALLS):
+            fn(db, i)
+        total = time.perf_counter() - start
+        best = min(best, total - (timer.seconds - database))
+    return best / CALLS * 1e6
+
+
+def main():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db)
+    timer = DatabaseTimer(engine)
+
+    print(f"{'query':<20} {'before':>10} {'after':>10}   (µs/call, excluding cursor.execute)")
+    for name in BEFORE:
+        before = overhead(db, timer, BEFORE[name])
+        after = overhead(db, timer, AFTER[name])
+        print(f"{name:<20} {before:10.1f} {after:10.1f}   {before / after:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
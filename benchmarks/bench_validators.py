@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark validators on a 20,000-row user import where numbers and
+GSTINs repeat (branches of the same businesses), against the previous
+string-pattern, uncached implementations.
+Run this with: python -m benchmarks.bench_validators
+"""
+import random
+import re
+import time
+from typing import Optional
+import phonenumbers
+from phonenumbers import NumberParseException
+from app.utils.validators import (
+    GST, Phone, gstin_check_character, normalize_phone_number, validate_gstin, validate_many,
+)
+
+ROWS = 20_000
+DISTINCT = 2_000
+
+
+def old_validate_gstin(gstin: str) -> bool:
+    """The previous implementation: string pattern, re-validated on every call"""
+    if not gstin or len(gstin) != 15:
+        return False
+    pattern = r'^[0-9]{2}[A-Z0-9]{10}[0-9]{1}[Z]{1}[A-Z0-9]{1}$'
+    return bool(re.match(pattern, gstin.upper()))
+
+
+def old_extract_state_code(gstin: str) -> Optional[str]:
+    if old_validate_gstin(gstin):
+        return gstin[:2]
+    return None
+
+
+def old_format_phone(phone: str, country_code: str = "IN") -> Optional[str]:
+    """The previous implementation: phonenumbers.parse on every call"""
+    try:
+        parsed_number = phonenumbers.parse(phone, country_code)
+        if phonenumbers.is_valid_number(parsed_number):
+            return phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164)
+    except NumberParseException:
+        pass
+    return None
+
+
+def old_validate_many(records):
+    valid, errors = [], {}
+    for index, record in enumerate(records):
+        phone = old_format_phone(record["phone"])
+        if phone is None or not old_validate_gstin(record["gstin"]):
+            errors[index] = record
+        else:
+            valid.append({**record, "phone": phone, "gstin": record["gstin"].upper()})
+    return valid, errors
+
+
+def make_records():
+    rng = random.Random(42)
+    gstins = []
+    for i in range(DISTINCT):
+        prefix = f"{rng.randint(1, 37):02d}AAPFU{i:04d}F1Z"
+        gstins.append(prefix + gstin_check_character(prefix))
+    phones = [f"9{rng.randint(100000000, 999999999)}" for _ in range(DISTINCT)]
+    return [
+        {"gstin": rng.choice(gstins), "phone": rng.choice(phones), "email": f"user{i}@example.com"}
+        for i in range(ROWS)
+    ]
+
+
+def timed(fn, repeat=3):
+    """Best seconds over ``repeat`` runs, each starting with empty caches"""
+    best = float("inf")
+    for _ in range(repeat):
+        validate_gstin.cache_clear()
+        normalize_phone_number.cache_clear()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    records = make_records()
+    gstins = [record["gstin"] for record in records]
+    phones = [record["phone"] for record in records]
+    cases = [
+        ("GST.extract_state_code", lambda: [old_extract_state_code(g) for g in gstins],
+         lambda: [GST.extract_state_code(g) for g in gstins]),
+        ("Phone.format", lambda: [old_format_phone(p) for p in phones],
+         lambda: [Phone.format(p) for p in phones]),
+        ("validate_many", lambda: old_validate_many(records),
+         lambda: validate_many(records)),
+    ]
+    print(f"{ROWS} rows, {DISTINCT} distinct GSTINs and phone numbers")
+    print(f"{'':<24} {'before':>10} {'after':>10}")
+    for name, before, after in cases:
+        old, new = timed(before), timed(after)
+        print(f"{name:<24} {old * 1e3:8.1f}ms {new * 1e3:8.1f}ms   {old / new:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
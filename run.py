@@ -23,5 +23,8 @@ if __name__ == "__main__":
         port=8000,
         reload=settings.DEBUG,
         log_level=settings.LOG_LEVEL.lower(),
-        access_log=True
+        access_log=True,
+        # Live order streams carry tiny JSON; per-connection deflate
+        # contexts would dominate the memory of idle WebSockets
+        ws_per_message_deflate=False,
     )
\ No newline at end of file
@@ -0,0 +1,66 @@
+import os
+import pytest
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.core.database import Base
+from app.models.address import Address
+from app.models.user import User, BusinessType
+
+
+@pytest.fixture(scope="session")
+def redis_connection():
+    """Live Redis connection; skipped when no server is reachable"""
+    connection = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB,
+                             decode_responses=True, socket_connect_timeout=1, retry=Retry(NoBackoff(), 0))
+    try:
+        connection.ping()
+    except redis.RedisError:
+        pytest.skip("Redis server not available")
+    return connection
+
+
+@pytest.fixture
+def sqlite_engine():
+    """Empty in-memory SQLite database built from the models, usable from any thread"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def add_buyer():
+    """Factory adding a Nellore buyer and its default address, both with id ``user_id``"""
+    def add(db, user_id: int = 1, **fields) -> User:
+        user = User(**{
+            "id": user_id, "email": "buyer@example.com", "phone": "+919876543210", "hashed_password": "x",
+            "business_name": "Shop", "gstin": "37ABCDE1234F1Z5", "business_type": BusinessType.RETAIL_STORE,
+            **fields,
+        })
+        db.add(user)
+        db.add(Address(id=user_id, user_id=user_id, address_line_1="1 Main Road", city="Nellore",
+                       state="Andhra Pradesh", postal_code="524001", is_default=True))
+        return user
+    return add
+
+
+@pytest.fixture(scope="module")
+def pg_engine():
+    """Empty PostgreSQL database from TEST_POSTGRES_URL, rebuilt per module; skipped when unavailable"""
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    try:
+        engine = create_engine(url)
+        Base.metadata.drop_all(bind=engine)
+    except (ImportError, SQLAlchemyError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
@@ -0,0 +1,180 @@
+import pytest
+from decimal import Decimal
+from pydantic import ValidationError
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.user import User, BusinessType
+from app.schemas.cart import CartItemAdd, CartItemUpdate
+from app.services.cart import CartService, price_cart
+from app.services.delivery import delivery_estimator
+from app.services.pricing import PriceBookService, VolumeDiscount
+from app.utils.exceptions import BusinessLogicException
+
+PRICING = PriceBookService(
+    volume_discounts={
+        BusinessType.RETAIL_STORE: [],
+        BusinessType.COMPANY: [VolumeDiscount(min_quantity=10, discount_percentage=Decimal("5"))],
+    },
+    gst_rate=Decimal("18"),
+)
+
+
+@pytest.fixture
+def db_session(sqlite_engine, add_buyer):
+    """In-memory catalog with an intra-state company buyer"""
+    db = sessionmaker(bind=sqlite_engine)()
+    add_buyer(db, business_type=BusinessType.COMPANY)
+    db.add_all([
+        Product(id=1, name="Rice", sku="RICE", retail_price=Decimal("100.00"),
+                company_price=Decimal("90.00"), stock_quantity=50, weight_kg=Decimal("25")),
+        Product(id=2, name="Dal", sku="DAL", retail_price=Decimal("20.00"),
+                company_price=Decimal("18.00"), stock_quantity=5),
+        Product(id=3, name="Old oil", sku="OIL", retail_price=Decimal("5.00"),
+                company_price=Decimal("4.00"), stock_quantity=5, is_active=False),
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def redis_client(redis_connection):
+    from app.core.redis_client import RedisClient
+    client = RedisClient()
+    yield client
+    for key in client.redis_client.scan_iter("cart:*:test-*"):
+        client.delete(key)
+    for key in client.redis_client.scan_iter("cart:*:9001*"):
+        client.delete(key)
+
+
+class TestPriceCart:
+    """Test batched cart pricing"""
+
+    def test_prices_lines_in_one_pass(self, db_session):
+        """Test tier prices, GST and shipping weight for all lines"""
+        user = db_session.get(User, 1)
+        cart = price_cart(db_session, user, {1: 10, 2: 1}, pricing=PRICING)
+        assert cart.is_orderable
+        assert cart.quote.unit_price.tolist() == [8550, 1800]
+        # 855.00 + 18.00 with 9% CGST and 9% SGST; 250kg of rice ships for 50 + 250 * 10
+        assert cart.totals.subtotal == 87300
+        assert cart.totals.cgst == cart.totals.sgst == 7857
+        assert cart.totals.shipping_cost == 255000
+
+    def test_reports_unavailable_and_short_stock(self, db_session):
+        """Test inactive/unknown products and short stock are reported, not raised"""
+        user = db_session.get(User, 1)
+        cart = price_cart(db_session, user, {1: 1, 2: 6, 3: 1, 99: 1}, pricing=PRICING)
+        assert not cart.is_orderable
+        assert cart.unavailable == [3, 99]
+        assert cart.insufficient_stock == {2: 5}
+        assert cart.quote.product_ids.tolist() == [1, 2]
+
+    def test_empty_cart(self, db_session):
+        """Test an empty cart prices to nothing"""
+        cart = price_cart(db_session, db_session.get(User, 1), {}, pricing=PRICING)
+        assert cart.quote is None and not cart.is_orderable
+
+
+class TestCartService:
+    """Test Redis hash carts (requires a Redis server)"""
+
+    def test_add_set_and_remove(self, redis_client):
+        """Test HINCRBY updates drop lines at zero and refresh the TTL"""
+        carts = CartService(redis_client, ttl_seconds=60)
+        key = CartService.guest_key("test-1")
+        assert carts.add_item(key, 1, 2) == 2
+        assert carts.add_item(key, 1, 3) == 5
+        assert carts.set_item(key, 2, 7) == 7
+        assert carts.add_item(key, 1, -5) == 0
+        assert carts.get_items(key) == {2: 7}
+        assert 0 < redis_client.redis_client.ttl(key) <= 60
+        assert carts.remove_item(key, 2)
+        assert carts.get_items(key) == {}
+
+    def test_line_limit(self, redis_client):
+        """Test new lines are rejected once the cart is full"""
+        carts = CartService(redis_client, max_lines=2)
+        key = CartService.guest_key("test-2")
+        carts.add_item(key, 1)
+        carts.add_item(key, 2)
+        with pytest.raises(BusinessLogicException):
+            carts.add_item(key, 3)
+        assert carts.add_item(key, 2) == 2
+
+    def test_merge_on_login(self, redis_client):
+        """Test guest lines are added to the user's cart and the guest cart removed"""
+        carts = CartService(redis_client)
+        guest = CartService.guest_key("test-3")
+        carts.add_item(guest, 1, 2)
+        carts.add_item(guest, 5, 1)
+        carts.add_item(CartService.user_key(9001), 1, 3)
+        assert carts.merge_guest_cart("test-3", 9001) == 2
+        assert carts.get_items(CartService.user_key(9001)) == {1: 5, 5: 1}
+        assert not redis_client.exists(guest)
+
+    def test_merge_respects_line_limit(self, redis_client):
+        """Test a merge still adds to existing lines but drops new ones once the cart is full"""
+        guest = CartService.guest_key("test-4")
+        user_cart = CartService.user_key(9001)
+        for product_id, quantity in {1: 2, 2: 1, 3: 1}.items():
+            CartService(redis_client).add_item(guest, product_id, quantity)
+        carts = CartService(redis_client, max_lines=3)
+        carts.add_item(user_cart, 1, 3)
+        carts.add_item(user_cart, 4, 1)
+        assert carts.merge_guest_cart("test-4", 9001) == 2
+        assert carts.get_items(user_cart) == {1: 5, 2: 1, 4: 1}
+        assert not redis_client.exists(guest)
+
+    def test_checkout_creates_order(self, redis_client, db_session):
+        """Test checkout creates the order, decrements stock and empties the cart"""
+        user = db_session.get(User, 1)
+        carts = CartService(redis_client, pricing=PRICING)
+        key = CartService.user_key(1)
+        carts.add_item(key, 1, 10)
+        try:
+            order = carts.checkout(db_session, user, delivery_address_id=1)
+            # 855.00 + 18% GST + 2550.00 shipping for 250kg
+            assert order.total_amount == Decimal("3558.90")
+            assert db_session.query(OrderItem).filter(OrderItem.order_id == order.id).count() == 1
+            assert db_session.get(Product, 1).stock_quantity == 40
+            # Nellore is local: delivered by the next (or, after the cut-off, second) day's cut-off
+            expected = delivery_estimator.estimate("524001").estimated_delivery
+            assert order.estimated_delivery_date.replace(tzinfo=None) == expected.replace(tzinfo=None)
+            assert carts.get_items(key) == {}
+        finally:
+            carts.clear(key)
+
+    def test_failed_checkout_restores_cart(self, redis_client, db_session):
+        """Test a rejected checkout puts the lines back into the cart"""
+        user = db_session.get(User, 1)
+        carts = CartService(redis_client, pricing=PRICING)
+        key = CartService.user_key(1)
+        carts.add_item(key, 2, 6)
+        try:
+            with pytest.raises(BusinessLogicException):
+                carts.checkout(db_session, user, delivery_address_id=1)
+            assert carts.get_items(key) == {2: 6}
+            assert db_session.query(Order).count() == 0
+        finally:
+            carts.clear(key)
+
+
+class TestCartSchemas:
+    """Test request quantities are bounded"""
+
+    def test_add_quantity_bounds(self):
+        limit = settings.CART_MAX_QUANTITY
+        assert CartItemAdd(product_id=1, quantity=-limit).quantity == -limit
+        for quantity in (limit + 1, -limit - 1, 2**63):
+            with pytest.raises(ValidationError):
+                CartItemAdd(product_id=1, quantity=quantity)
+
+    def test_update_quantity_bounds(self):
+        assert CartItemUpdate(quantity=settings.CART_MAX_QUANTITY).quantity == settings.CART_MAX_QUANTITY
+        for quantity in (-1, settings.CART_MAX_QUANTITY + 1):
+            with pytest.raises(ValidationError):
+                CartItemUpdate(quantity=quantity)
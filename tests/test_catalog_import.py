@@ -0,0 +1,90 @@
+import pytest
+import io
+from decimal import Decimal
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.models.product import Product
+from app.services.catalog_import import CatalogImporter, validate_batch
+
+HEADER = "sku,name,retail_price,company_price,stock_quantity,category,bin_location,supplier_ref\n"
+
+
+@pytest.fixture
+def db_session(sqlite_engine):
+    db = sessionmaker(bind=sqlite_engine)()
+    yield db
+    db.close()
+
+
+class TestCatalogImport:
+    """Test the streaming bulk catalog import"""
+
+    def test_validate_batch_reports_failing_rows(self):
+        """Test batch validation keeps valid rows and indexes errors by position"""
+        rows = [
+            {"sku": "ok1", "name": "Rice", "retail_price": "10.00", "company_price": "9.00"},
+            {"sku": "bad", "name": "Dal", "retail_price": "10.00", "company_price": "12.00"},
+            {"sku": "ok2", "name": "Oil", "retail_price": "x", "company_price": "9.00"},
+            {"sku": "ok3", "name": "Salt", "retail_price": "5.00", "company_price": "4.50"},
+        ]
+        products, positions, errors = validate_batch(rows)
+        assert positions == [0, 3]
+        assert [p.sku for p in products] == ["OK1", "OK3"]
+        assert sorted(errors) == [1, 2]
+        assert errors[2][0]["field"] == "retail_price"
+
+    def test_import_csv_inserts_and_merges_on_sku(self, db_session):
+        """Test rows are inserted, existing SKUs updated and bad rows reported"""
+        db_session.add(Product(name="Old rice", sku="RICE", retail_price=Decimal("8.00"),
+                               company_price=Decimal("7.00"), stock_quantity=1))
+        db_session.commit()
+
+        data = HEADER + (
+            "rice,Rice 25kg,10.00,9.00,40,Grains,A-01-01,S1\n"
+            "dal,Toor Dal,12.50,11.00,,Pulses,,S2\n"
+            "oil,Sunflower Oil,5.00,6.00,3,Oils,,S3\n"
+            "salt,Salt,,2.00,3,,,S4\n"
+        )
+        report = CatalogImporter(db_session, batch_size=2).import_csv(io.StringIO(data))
+
+        assert report.total_rows == 4
+        assert report.loaded_rows == 2
+        assert [(e.row_number, e.sku) for e in report.errors] == [(4, "oil"), (5, "salt")]
+
+        products = {p.sku: p for p in db_session.query(Product).all()}
+        assert set(products) == {"RICE", "DAL"}
+        assert products["RICE"].name == "Rice 25kg"
+        assert products["RICE"].retail_price == Decimal("10.00")
+        assert products["RICE"].stock_quantity == 40
+        assert products["RICE"].bin_location == "A-01-01"
+        assert products["DAL"].stock_quantity == 0
+        assert products["DAL"].is_active is True
+
+    def test_duplicate_skus_last_row_wins(self, db_session):
+        """Test a SKU repeated within a batch is merged once with the last row"""
+        data = HEADER + "tea,Tea,10.00,9.00,1,,,\ntea,Green Tea,20.00,18.00,2,,,\n"
+        report = CatalogImporter(db_session).import_csv(io.StringIO(data))
+        assert report.loaded_rows == 1
+        assert report.duplicate_rows == 1
+        product = db_session.query(Product).filter(Product.sku == "TEA").one()
+        assert product.name == "Green Tea"
+        assert product.stock_quantity == 2
+
+    def test_many_batches_on_postgres(self, pg_engine):
+        """Test every batch finds the temporary staging table when the pool holds several connections"""
+        # Two idle connections: a FIFO pool hands out the other one after each commit
+        first, second = pg_engine.connect(), pg_engine.connect()
+        first.close()
+        second.close()
+        db = sessionmaker(bind=pg_engine)()
+        data = HEADER + "".join(f"sku{i},Product {i},10.00,9.00,{i},Rice,,S{i}\n" for i in range(7))
+        try:
+            report = CatalogImporter(db, batch_size=2).import_csv(io.StringIO(data))
+            assert report.errors == []
+            assert report.loaded_rows == 7
+            assert db.query(Product).count() == 7
+            assert db.execute(text("SELECT to_regclass('product_import_staging')")).scalar() is None
+        finally:
+            db.close()
+            with pg_engine.begin() as conn:
+                conn.execute(text("TRUNCATE products CASCADE"))
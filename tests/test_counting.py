@@ -0,0 +1,122 @@
+import json
+import pytest
+import uuid
+import redis
+from datetime import date, datetime, timezone
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from sqlalchemy import insert, text
+from sqlalchemy.orm import sessionmaker
+from app.models.order import Order, OrderStatus
+from app.models.product import Product
+from app.repositories.counting import CountMode, RowCount, RowCounter
+from app.repositories.product import ProductRepository
+from app.services.partitions import PartitionManager
+from app.utils.response import APIResponse
+
+DOWN = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.2, retry=Retry(NoBackoff(), 0))
+
+
+def add_products(db, count, active_every=1):
+    db.execute(insert(Product), [
+        {"name": f"Product {i}", "sku": f"SKU{uuid.uuid4().hex[:12]}", "retail_price": 10, "company_price": 9,
+         "stock_quantity": i, "is_active": i % active_every == 0}
+        for i in range(count)
+    ])
+    db.commit()
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    session = sessionmaker(bind=sqlite_engine)()
+    add_products(session, 30, active_every=3)
+    yield session
+    session.close()
+
+
+class TestRowCounter:
+    """Test the counting modes on SQLite and Redis"""
+
+    def test_exact_count_with_filter(self, db):
+        products = ProductRepository(db)
+        assert products.count() == 30 and products.count().exact
+        assert products.count(Product.is_active == True) == 10
+
+    def test_estimates_fall_back_to_exact_without_planner_stats(self, db):
+        total = ProductRepository(db).count(Product.is_active == True, mode=CountMode.ESTIMATED)
+        assert (total, total.exact) == (10, True)
+
+    def test_cached_count_is_reused_per_filter(self, db, redis_connection):
+        counter = RowCounter(db, redis_connection, cache_ttl_seconds=5)
+        # Unique filters keep runs from reading each other's cache entries
+        floor = uuid.uuid4().int % 1000 + 1000
+        in_stock = Product.stock_quantity < floor
+        first = counter.count(Product, in_stock, mode=CountMode.CACHED)
+        assert (first, first.exact) == (30, True)
+
+        add_products(db, 5)
+        cached = counter.count(Product, in_stock, mode=CountMode.CACHED)
+        assert (cached, cached.exact) == (30, False)
+        assert counter.count(Product, in_stock, Product.is_active == True, mode=CountMode.CACHED) == 15
+        assert 0 < redis_connection.ttl(counter.cache_key(Product, in_stock)) <= 5
+
+    def test_cached_count_counts_exactly_when_redis_is_down(self, db):
+        total = RowCounter(db, DOWN).count(Product, mode=CountMode.CACHED)
+        assert (total, total.exact) == (30, True)
+
+
+class TestPaginatedResponse:
+    """Test pagination metadata for exact and approximate totals"""
+
+    def test_exact_total(self):
+        meta = json.loads(APIResponse.paginated([], RowCount(25), page=2, per_page=10).body)["meta"]["pagination"]
+        assert meta == {"total": 25, "total_exact": True, "page": 2, "per_page": 10, "total_pages": 3,
+                        "has_next": True, "has_prev": True}
+
+    def test_estimated_total(self):
+        body = APIResponse.paginated([], RowCount(1200000, exact=False), page=3, per_page=50, has_next=False).body
+        meta = json.loads(body)["meta"]["pagination"]
+        assert meta["total"] == 1200000 and meta["total_exact"] is False and meta["has_next"] is False
+
+
+class TestEstimatedCounts:
+    """Test planner estimates against PostgreSQL"""
+
+    @pytest.fixture
+    def pg_db(self, pg_engine):
+        db = sessionmaker(bind=pg_engine)()
+        yield db
+        db.close()
+        with pg_engine.begin() as conn:
+            conn.execute(text("TRUNCATE orders, order_items, addresses, products, users CASCADE"))
+
+    def test_table_estimate_from_reltuples(self, pg_engine, pg_db):
+        add_products(pg_db, 2000, active_every=4)
+        with pg_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE products"))
+        counter = RowCounter(pg_db, estimate_threshold=100)
+        total = counter.count(Product, mode=CountMode.ESTIMATED)
+        assert (total, total.exact) == (2000, False)
+
+        active = counter.count(Product, Product.is_active == True, mode=CountMode.ESTIMATED)
+        assert not active.exact and 400 <= active <= 600
+        # Small results are counted exactly
+        few = counter.count(Product, Product.stock_quantity < 10, mode=CountMode.ESTIMATED)
+        assert (few, few.exact) == (10, True)
+
+    def test_partitioned_table_estimate_sums_partitions(self, pg_engine, pg_db, add_buyer):
+        PartitionManager(pg_engine, months_ahead=0).ensure(
+            datetime(2026, 10, 1, tzinfo=timezone.utc), since=date(2026, 9, 1)
+        )
+        add_buyer(pg_db)
+        pg_db.flush()
+        pg_db.execute(insert(Order), [
+            {"order_number": f"ORD-{i}", "user_id": 1, "delivery_address_id": 1, "status": OrderStatus.DELIVERED,
+             "total_amount": 10, "created_at": datetime(2026, 9 + i % 2, 1 + i % 28, tzinfo=timezone.utc)}
+            for i in range(400)
+        ])
+        pg_db.commit()
+        with pg_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE orders"))
+        total = RowCounter(pg_db, estimate_threshold=100).count(Order, mode=CountMode.ESTIMATED)
+        assert (total, total.exact) == (400, False)
@@ -0,0 +1,152 @@
+import pytest
+import re
+from collections import Counter
+from types import SimpleNamespace
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import User
+from app.repositories.loaders import Loaders
+from app.repositories.order import OrderRepository
+from app.repositories.product import ProductRepository
+from app.utils.dataloader import DataLoader
+
+
+class RecordingSource:
+    """Batch function over a fixed set of records that records each call"""
+
+    def __init__(self, ids):
+        self.records = {id: SimpleNamespace(id=id) for id in ids}
+        self.calls = []
+
+    def __call__(self, keys):
+        self.calls.append(list(keys))
+        return [self.records[key] for key in keys if key in self.records]
+
+
+class TestDataLoader:
+    """Test batching and caching of keyed lookups"""
+
+    def test_deferred_loads_are_fetched_in_one_batch(self):
+        source = RecordingSource(range(10))
+        loader = DataLoader(source)
+        deferred = [loader.load(id) for id in (3, 1, 3, 7)]
+        assert source.calls == []
+        assert [d.value.id for d in deferred] == [3, 1, 3, 7]
+        assert source.calls == [[3, 1, 7]]
+
+    def test_results_and_misses_are_cached(self):
+        source = RecordingSource(range(10))
+        loader = DataLoader(source)
+        assert loader.get(42) is None
+        assert [r and r.id for r in loader.load_many([1, 42, 2])] == [1, None, 2]
+        assert loader.get(1).id == 1
+        assert source.calls == [[42], [1, 2]]
+
+    def test_batches_are_capped(self):
+        source = RecordingSource(range(10))
+        loader = DataLoader(source, max_batch_size=4)
+        loader.load_many(range(10))
+        assert source.calls == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+        assert loader.batches == 3
+
+    def test_primed_and_cleared_keys(self):
+        source = RecordingSource(range(10))
+        loader = DataLoader(source)
+        primed = SimpleNamespace(id=5)
+        loader.load(5)
+        loader.prime(5, primed)
+        assert loader.get(5) is primed and source.calls == []
+        loader.clear(5)
+        assert loader.get(5) is not primed and source.calls == [[5]]
+
+
+@pytest.fixture
+def engine(sqlite_engine, add_buyer):
+    with sessionmaker(bind=sqlite_engine)() as db:
+        for user_id in (1, 2, 3):
+            add_buyer(db, user_id, email=f"buyer{user_id}@example.com", phone=None, gstin=f"37ABCDE123{user_id}F1Z5")
+        for product_id in range(1, 5):
+            db.add(Product(id=product_id, name=f"Product {product_id}", sku=f"SKU{product_id}",
+                           retail_price=10, company_price=9))
+        for order_id in range(1, 13):
+            user_id = order_id % 3 + 1
+            db.add(Order(id=order_id, order_number=f"ORD-{order_id}", user_id=user_id,
+                         delivery_address_id=user_id, status=OrderStatus.CONFIRMED, total_amount=20,
+                         order_items=[
+                             OrderItem(product_id=(order_id + n) % 4 + 1, quantity=1, unit_price=10, total_price=10)
+                             for n in range(2)
+                         ]))
+        db.commit()
+    return sqlite_engine
+
+
+def count_selects(engine):
+    """Counter of SELECTs by the table they read, updated as they run"""
+    selects = Counter()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            selects[re.search(r"\bFROM (\w+)", statement).group(1)] += 1
+
+    return selects
+
+
+class TestLoaders:
+    """Test relationship loading with one query per related table"""
+
+    def serialize(self, orders):
+        return [
+            (order.user.email, order.delivery_address.postal_code,
+             sorted(item.product.sku for item in order.order_items))
+            for order in orders
+        ]
+
+    def test_prime_replaces_per_row_queries(self, engine):
+        with sessionmaker(bind=engine)() as db:
+            expected = self.serialize(db.query(Order).order_by(Order.id).all())
+
+        selects = count_selects(engine)
+        with sessionmaker(bind=engine)() as db:
+            loaders = Loaders(db)
+            orders = OrderRepository(db).get_with_items(list(range(1, 13)))
+            loaders.prime(orders, Order.user, Order.delivery_address)
+            loaders.prime([item for order in orders for item in order.order_items], OrderItem.product)
+            before = sum(selects.values())
+            assert self.serialize(orders) == expected
+            assert sum(selects.values()) == before
+        assert selects == {"orders": 1, "order_items": 1, "users": 1, "addresses": 1, "products": 1}
+
+    def test_known_records_are_not_fetched_again(self, engine):
+        selects = count_selects(engine)
+        with sessionmaker(bind=engine)() as db:
+            loaders = Loaders(db)
+            known = db.get(User, 1)
+            orders = db.query(Order).filter(Order.user_id == 1).all()
+            loaders.prime(orders, Order.user)
+            assert {order.user for order in orders} == {known}
+            loaders.prime(db.query(Order).all(), Order.user)
+        assert selects["users"] == 2
+
+    def test_loader_uses_repository_batches(self, engine):
+        with sessionmaker(bind=engine)() as db:
+            loader = Loaders(db).for_model(Product)
+            assert loader.batch_load.__self__.__class__ is ProductRepository
+            assert [p and p.sku for p in loader.load_many([2, 99, 2, 1])] == ["SKU2", None, "SKU2", "SKU1"]
+            assert loader.batches == 1
+
+    def test_rejects_collections(self, engine):
+        with sessionmaker(bind=engine)() as db:
+            with pytest.raises(ValueError):
+                Loaders(db).prime([], Order.order_items)
+
+
+class TestGetManyByIds:
+    """Test the repository batch lookup used by the loaders"""
+
+    def test_deduplicates_and_skips_unknown_ids(self, engine):
+        with sessionmaker(bind=engine)() as db:
+            products = ProductRepository(db).get_many_by_ids([3, 3, 1, 404])
+            assert sorted(p.id for p in products) == [1, 3]
@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime, timezone
+import numpy as np
+from app.services.delivery import (
+    IST,
+    DeliveryEstimator,
+    DeliveryType,
+    DeliveryZone,
+    build_pincode_table,
+    build_prefix_table,
+)
+from app.utils.exceptions import ValidationException
+
+
+@pytest.fixture(scope="module")
+def estimator():
+    """Estimator over a small coordinate-based table"""
+    table = build_pincode_table(
+        pincodes=np.array([524001, 524001, 524137, 600001, 110001, 795001]),
+        latitudes=np.array([14.44, 14.45, 14.60, 13.08, 28.63, 24.81]),
+        longitudes=np.array([79.98, 79.99, 79.90, 80.27, 77.22, 93.94]),
+        local_radius_km=50,
+    )
+    return DeliveryEstimator(table=table, cutoff_hour=18)
+
+
+class TestDeliveryEstimator:
+    """Test location-based delivery estimates (Requirement 3)"""
+
+    def test_nellore_before_cutoff_is_next_day(self, estimator):
+        """Test Nellore orders before 6 PM IST arrive by 6 PM the next day"""
+        order_time = datetime(2024, 3, 4, 17, 59, tzinfo=IST)
+        estimate = estimator.estimate("524001", order_time)
+        assert estimate.zone == DeliveryZone.LOCAL
+        assert estimate.delivery_type == DeliveryType.EXPRESS
+        assert estimate.estimated_delivery == datetime(2024, 3, 5, 18, 0, tzinfo=IST)
+
+    def test_nellore_after_cutoff_uses_ist(self, estimator):
+        """Test the cut-off is applied in IST even for UTC timestamps"""
+        order_time = datetime(2024, 3, 4, 12, 45, tzinfo=timezone.utc)  # 18:15 IST
+        estimate = estimator.estimate("524137", order_time)
+        assert estimate.zone == DeliveryZone.LOCAL
+        assert estimate.estimated_delivery == datetime(2024, 3, 6, 18, 0, tzinfo=IST)
+
+    def test_outside_nellore_within_ten_days(self, estimator):
+        """Test estimates outside Nellore never exceed 10 days"""
+        order_time = datetime(2024, 3, 4, 23, 0, tzinfo=IST)
+        for code in ("600001", "110001", "795001", "999999"):
+            estimate = estimator.estimate(code, order_time)
+            assert estimate.zone != DeliveryZone.LOCAL
+            assert (estimate.estimated_delivery.date() - order_time.date()).days <= 10
+        assert estimator.estimate("795001", order_time).delivery_type == DeliveryType.EXTENDED
+
+    def test_distances(self, estimator):
+        """Test distances are stored for known pincodes only"""
+        assert estimator.estimate("600001").distance_km == pytest.approx(155, abs=10)
+        assert estimator.estimate("600002").distance_km is None
+
+    def test_batch_matches_single(self, estimator):
+        """Test the batch API agrees with single lookups"""
+        order_time = datetime(2024, 3, 4, 10, 0, tzinfo=IST)
+        codes = ["524001", "600001", "110001", "795001", "524999"]
+        batch = estimator.estimate_many(codes, order_time)
+        assert batch == [estimator.estimate(code, order_time) for code in codes]
+
+    def test_invalid_postal_code(self, estimator):
+        """Test invalid postal codes are rejected"""
+        with pytest.raises(ValidationException):
+            estimator.estimate("5240")
+        with pytest.raises(ValidationException):
+            estimator.estimate_many(["524001", "abc"])
+
+    def test_memory_mapped_table(self, tmp_path):
+        """Test the table round-trips through a memory-mapped file"""
+        path = tmp_path / "pincodes.npy"
+        np.save(path, build_prefix_table())
+        estimator = DeliveryEstimator.from_file(str(path))
+        assert isinstance(estimator.table, np.memmap)
+        assert estimator.estimate("524001").zone == DeliveryZone.LOCAL
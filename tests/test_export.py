@@ -0,0 +1,115 @@
+import pytest
+import csv
+import io
+import json
+import os
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.main import app
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.routers.exports import get_session_factory
+from app.services.export import ExportFormat, stream_export
+from app.utils.dependencies import get_current_user_id
+
+EXPORT_ROWS = int(os.environ.get("EXPORT_TEST_ROWS", 1_000_000))
+
+
+@pytest.fixture
+def session_factory(sqlite_engine, add_buyer):
+    """In-memory database with one user, address, product and order"""
+    factory = sessionmaker(bind=sqlite_engine)
+    db = factory()
+    add_buyer(db, business_name="Shop, Ltd")
+    db.add(Product(id=1, name="Rice", sku="RICE", retail_price=Decimal("10.00"), company_price=Decimal("9.00")))
+    db.add(Order(id=1, order_number="ORD1", user_id=1, delivery_address_id=1, status=OrderStatus.CONFIRMED,
+                 total_amount=Decimal("27.00")))
+    db.add(OrderItem(order_id=1, product_id=1, quantity=3, unit_price=Decimal("9.00"), total_price=Decimal("27.00")))
+    db.commit()
+    db.close()
+    return factory
+
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_USER_IDS", [1])
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    app.dependency_overrides[get_current_user_id] = lambda: "1"
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def current_rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class TestExports:
+    """Test streaming CSV/JSONL exports"""
+
+    def test_orders_csv(self, client):
+        """Test orders export as CSV with GST filing columns"""
+        response = client.get("/api/v1/exports/orders?format=csv")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["business_name"] == "Shop, Ltd"
+        assert rows[0]["gstin"] == "37ABCDE1234F1Z5"
+        assert rows[0]["status"] == "confirmed"
+        assert rows[0]["total_amount"] == "27.00"
+
+    def test_order_items_jsonl(self, client):
+        """Test order items export as JSON lines"""
+        response = client.get("/api/v1/exports/order_items?format=jsonl")
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [{
+            "id": 1, "order_id": 1, "order_number": "ORD1", "product_id": 1, "sku": "RICE",
+            "quantity": 3, "unit_price": "9.00", "total_price": "27.00", "created_at": lines[0]["created_at"],
+        }]
+
+    def test_unknown_dataset(self, client):
+        """Test unknown datasets return 404"""
+        assert client.get("/api/v1/exports/users").status_code == 404
+
+    def test_requires_authentication(self, session_factory):
+        """Test exports require a bearer token"""
+        app.dependency_overrides[get_session_factory] = lambda: session_factory
+        try:
+            assert TestClient(app).get("/api/v1/exports/products").status_code in (401, 403)
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_requires_admin(self, client, monkeypatch):
+        """Test signed-in users outside ADMIN_USER_IDS get 403"""
+        monkeypatch.setattr(settings, "ADMIN_USER_IDS", [2])
+        assert client.get("/api/v1/exports/orders").status_code == 403
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc to sample RSS")
+    def test_million_order_items_bounded_memory(self, session_factory):
+        """Test exporting 1M order items keeps RSS bounded"""
+        db = session_factory()
+        db.execute(text(
+            "WITH RECURSIVE seq(n) AS (SELECT 2 UNION ALL SELECT n + 1 FROM seq WHERE n < :rows) "
+            "INSERT INTO order_items (id, order_id, product_id, quantity, unit_price, total_price, created_at) "
+            "SELECT n, 1, 1, n % 50 + 1, 9.00, 9.00 * (n % 50 + 1), CURRENT_TIMESTAMP FROM seq"
+        ), {"rows": EXPORT_ROWS})
+        db.commit()
+        db.close()
+
+        baseline = peak = current_rss_bytes()
+        lines = 0
+        size = 0
+        for i, chunk in enumerate(stream_export(session_factory, "order_items", ExportFormat.CSV)):
+            lines += chunk.count("\n")
+            size += len(chunk)
+            if i % 50 == 0:
+                peak = max(peak, current_rss_bytes())
+
+        assert lines == EXPORT_ROWS + 1  # header
+        # The full CSV is tens of MB; streaming must not hold it in memory
+        assert peak - baseline < min(size // 2, 64 * 1024 * 1024)
@@ -0,0 +1,287 @@
+import pytest
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+import httpx
+import redis
+from fastapi.testclient import TestClient
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from sqlalchemy import delete, update
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.main import app
+from app.models.gstin_verification import GstinVerification
+from app.routers.gst import get_gst_verifier
+from app.services.gst_verification import CACHE_KEY_PREFIX, GstVerificationClient
+from app.utils.dependencies import get_current_user_id
+from app.utils.exceptions import ExternalServiceException, ValidationException
+from app.utils.validators import gstin_check_character
+from app.workers.stub_server import StubServer, gst_responder
+
+DOWN = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.2, retry=Retry(NoBackoff(), 0))
+
+
+def make_gstin(i: int) -> str:
+    prefix = f"{i % 37 + 1:02d}AAPFU{i:04d}F1Z"
+    return prefix + gstin_check_character(prefix)
+
+
+GSTINS = [make_gstin(i) for i in range(20)]
+
+
+@pytest.fixture
+def live_redis(redis_connection):
+    """Live Redis without cached verifications of the test GSTINs"""
+    keys = [CACHE_KEY_PREFIX + gstin for gstin in GSTINS]
+    redis_connection.delete(*keys)
+    yield redis_connection
+    redis_connection.delete(*keys)
+
+
+@pytest.fixture
+def session_factory(sqlite_engine):
+    return sessionmaker(bind=sqlite_engine)
+
+
+@pytest.fixture
+def pg_session_factory(pg_engine):
+    yield sessionmaker(bind=pg_engine)
+    with pg_engine.begin() as conn:
+        conn.execute(delete(GstinVerification))
+
+
+def run(url, session_factory, redis_connection, call, **kwargs):
+    """Run ``call(verifier)`` on a fresh event loop against the stub at ``url``"""
+    async def main():
+        async with httpx.AsyncClient(timeout=5) as client:
+            verifier = GstVerificationClient(client, session_factory, redis_connection, base_url=url,
+                                             backoff_seconds=0, **kwargs)
+            return await call(verifier)
+    return asyncio.run(main())
+
+
+def stored(session_factory):
+    with session_factory() as db:
+        return {row.gstin: row for row in db.query(GstinVerification)}
+
+
+class TestVerify:
+    """Test single lookups through the cache tiers"""
+
+    def test_fetches_once_then_reads_the_caches(self, session_factory, live_redis):
+        gstin = GSTINS[0]
+        with StubServer(responder=gst_responder()) as stub:
+            details = run(stub.url, session_factory, live_redis, lambda v: v.verify(gstin.lower()))
+            assert details.gstin == gstin and details.active and details.state_code == gstin[:2]
+            assert details.legal_name == f"Business {gstin[2:12]}"
+            assert stub.requests[0]["path"] == f"/commonapi/v1.1/search?action=TP&gstin={gstin}"
+
+            assert run(stub.url, session_factory, live_redis, lambda v: v.verify(gstin)) == details
+            assert len(stub.requests) == 1
+            assert 0 < live_redis.ttl(CACHE_KEY_PREFIX + gstin) <= settings.GST_VERIFICATION_TTL_SECONDS
+
+            # Redis down: served by the database
+            assert run(stub.url, session_factory, DOWN, lambda v: v.verify(gstin)) == details
+            assert len(stub.requests) == 1
+
+            # Redis emptied: the database row is copied back
+            live_redis.delete(CACHE_KEY_PREFIX + gstin)
+            run(stub.url, session_factory, live_redis, lambda v: v.verify(gstin))
+            assert len(stub.requests) == 1 and live_redis.exists(CACHE_KEY_PREFIX + gstin)
+
+        row = stored(session_factory)[gstin]
+        assert row.status == "Active" and row.details["ctb"] == "Proprietorship"
+
+    def test_expired_verifications_are_fetched_again(self, session_factory):
+        gstin = GSTINS[1]
+        with StubServer(responder=gst_responder()) as stub:
+            run(stub.url, session_factory, DOWN, lambda v: v.verify(gstin))
+            with session_factory() as db:
+                db.execute(update(GstinVerification).values(expires_at=datetime.now(timezone.utc) - timedelta(1)))
+                db.commit()
+            run(stub.url, session_factory, DOWN, lambda v: v.verify(gstin))
+            assert len(stub.requests) == 2
+        assert len(stored(session_factory)) == 1
+
+    def test_refreshes_expired_rows_on_postgres(self, pg_session_factory):
+        taxpayers = {GSTINS[0]: {"gstin": GSTINS[0], "lgnm": "Old name", "sts": "Active"}}
+        with StubServer(responder=gst_responder(taxpayers)) as stub:
+            run(stub.url, pg_session_factory, DOWN, lambda v: v.verify_many(GSTINS[:2]))
+            with pg_session_factory() as db:
+                db.execute(update(GstinVerification).values(expires_at=datetime.now(timezone.utc)))
+                db.commit()
+            taxpayers[GSTINS[0]] = {"gstin": GSTINS[0], "lgnm": "New name", "sts": "Cancelled"}
+            result = run(stub.url, pg_session_factory, DOWN, lambda v: v.verify_many(GSTINS[:2]))
+            assert len(stub.requests) == 4
+        assert result.verified[GSTINS[0]].legal_name == "New name"
+        row = stored(pg_session_factory)[GSTINS[0]]
+        assert row.legal_name == "New name" and row.status == "Cancelled"
+        assert row.expires_at > datetime.now(timezone.utc) + timedelta(hours=23)
+
+    def test_not_registered_is_cached_in_redis_only(self, session_factory, live_redis):
+        gstin = GSTINS[2]
+        with StubServer(responder=gst_responder({})) as stub:
+            assert run(stub.url, session_factory, live_redis, lambda v: v.verify(gstin)) is None
+            assert run(stub.url, session_factory, live_redis, lambda v: v.verify(gstin)) is None
+            assert len(stub.requests) == 1
+        assert live_redis.ttl(CACHE_KEY_PREFIX + gstin) <= settings.GST_VERIFICATION_NOT_FOUND_TTL_SECONDS
+        assert stored(session_factory) == {}
+
+    def test_malformed_gstin_is_rejected_locally(self, session_factory):
+        with StubServer(responder=gst_responder()) as stub:
+            for gstin in ("27AAPFU0939F1ZX", "not a gstin"):
+                with pytest.raises(ValidationException):
+                    run(stub.url, session_factory, DOWN, lambda v: v.verify(gstin))
+            assert stub.requests == []
+
+    def test_retries_server_errors(self, session_factory):
+        with StubServer(fail_first=2, responder=gst_responder()) as stub:
+            assert run(stub.url, session_factory, DOWN, lambda v: v.verify(GSTINS[3])).active
+            assert len(stub.requests) == 3
+
+    def test_gives_up_after_max_attempts(self, session_factory):
+        with StubServer(fail_first=10, fail_status=429) as stub:
+            with pytest.raises(ExternalServiceException):
+                run(stub.url, session_factory, DOWN, lambda v: v.verify(GSTINS[3]), max_attempts=2)
+            assert len(stub.requests) == 2
+
+    def test_client_errors_are_not_retried(self, session_factory):
+        with StubServer(fail_first=10, fail_status=403) as stub:
+            with pytest.raises(ExternalServiceException):
+                run(stub.url, session_factory, DOWN, lambda v: v.verify(GSTINS[3]))
+            assert len(stub.requests) == 1
+        assert stored(session_factory) == {}
+
+    def test_other_not_found_errors_are_not_cached(self, session_factory, live_redis):
+        gstin = GSTINS[4]
+        with StubServer(responder=gst_responder()) as stub:
+            for _ in range(2):
+                with pytest.raises(ExternalServiceException):
+                    run(stub.url + "/wrong-prefix", session_factory, live_redis, lambda v: v.verify(gstin))
+            assert len(stub.requests) == 2
+        assert not live_redis.exists(CACHE_KEY_PREFIX + gstin)
+        assert stored(session_factory) == {}
+
+
+class TestVerifyMany:
+    """Test bulk verification, coalescing and bounded concurrency"""
+
+    def test_bulk_results_and_errors(self, session_factory):
+        taxpayers = {gstin: {"gstin": gstin, "lgnm": "Legal", "sts": "Cancelled"} for gstin in GSTINS[:3]}
+        batch = [GSTINS[0], GSTINS[1].lower(), GSTINS[0], GSTINS[2], GSTINS[4], " bad ", "27AAPFU0939F1ZX"]
+        with StubServer(responder=gst_responder(taxpayers)) as stub:
+            result = run(stub.url, session_factory, DOWN, lambda v: v.verify_many(batch))
+            assert sorted(request["path"][-15:] for request in stub.requests) == sorted(GSTINS[:3] + [GSTINS[4]])
+        assert not result.ok
+        assert list(result.verified) == GSTINS[:3]
+        assert not result.verified[GSTINS[0]].active and result.verified[GSTINS[0]].trade_name is None
+        assert result.errors == {
+            GSTINS[4]: "GSTIN not registered",
+            "bad": "Invalid GSTIN format",
+            "27AAPFU0939F1ZX": "Invalid GSTIN check character",
+        }
+        assert set(stored(session_factory)) == set(GSTINS[:3])
+
+    def test_partial_failure_keeps_other_results(self, session_factory):
+        def responder(method, path, body):
+            return (500, {"error": "down"}) if GSTINS[1] in path else gst_responder()(method, path, body)
+
+        with StubServer(responder=responder) as stub:
+            result = run(stub.url, session_factory, DOWN, lambda v: v.verify_many(GSTINS[:3]), max_attempts=1)
+        assert list(result.verified) == [GSTINS[0], GSTINS[2]]
+        assert result.errors == {GSTINS[1]: "HTTP 500"}
+
+    def test_concurrent_lookups_share_requests(self, session_factory):
+        async def call(verifier):
+            return await asyncio.gather(
+                verifier.verify(GSTINS[0]),
+                verifier.verify(GSTINS[0]),
+                verifier.verify_many(GSTINS[:4]),
+                verifier.verify_many(GSTINS[2:6]),
+            )
+
+        with StubServer(delay=0.2, responder=gst_responder()) as stub:
+            first, second, bulk, overlapping = run(stub.url, session_factory, DOWN, call)
+            assert len(stub.requests) == 6
+        assert first == second == bulk.verified[GSTINS[0]]
+        assert bulk.ok and overlapping.ok and overlapping.verified[GSTINS[2]] == bulk.verified[GSTINS[2]]
+        assert set(stored(session_factory)) == set(GSTINS[:6])
+
+    def test_requests_in_flight_are_bounded(self, session_factory):
+        lock, active, peak = threading.Lock(), [0], [0]
+        respond = gst_responder()
+
+        def responder(method, path, body):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return respond(method, path, body)
+
+        with StubServer(responder=responder) as stub:
+            result = run(stub.url, session_factory, DOWN, lambda v: v.verify_many(GSTINS), concurrency=4)
+            assert len(stub.requests) == len(GSTINS)
+        assert result.ok and len(result.verified) == len(GSTINS)
+        assert peak[0] == 4
+
+    def test_bulk_reads_each_tier_once(self, session_factory, live_redis):
+        with StubServer(responder=gst_responder()) as stub:
+            run(stub.url, session_factory, live_redis, lambda v: v.verify_many(GSTINS[:10]))
+            live_redis.delete(*(CACHE_KEY_PREFIX + gstin for gstin in GSTINS[:5]))
+            result = run(stub.url, session_factory, live_redis, lambda v: v.verify_many(GSTINS[:15]))
+            assert len(stub.requests) == 15
+        assert result.ok and list(result.verified) == GSTINS[:15]
+        assert live_redis.exists(*(CACHE_KEY_PREFIX + gstin for gstin in GSTINS[:15])) == 15
+
+
+@pytest.fixture
+def api(session_factory, monkeypatch):
+    """Test client whose requests verify against a GST stub knowing the first three GSTINs"""
+    taxpayers = {
+        gstin: {"gstin": gstin, "lgnm": f"Business {i}", "sts": "Active"} for i, gstin in enumerate(GSTINS[:3])
+    }
+    with StubServer(responder=gst_responder(taxpayers)) as stub:
+        async def verifier():
+            client = GstVerificationClient(session_factory=session_factory, redis_connection=DOWN,
+                                           base_url=stub.url, backoff_seconds=0)
+            yield client
+            await client.aclose()
+
+        app.dependency_overrides[get_gst_verifier] = verifier
+        app.dependency_overrides[get_current_user_id] = lambda: "1"
+        monkeypatch.setattr(settings, "ADMIN_USER_IDS", [1])
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+
+class TestGstinVerificationRoutes:
+    """Test the single and bulk verification endpoints"""
+
+    def test_verify_one(self, api):
+        response = api.get(f"/api/v1/gstin-verifications/{GSTINS[0].lower()}")
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["gstin"] == GSTINS[0] and data["active"] and data["legal_name"] == "Business 0"
+
+    def test_unknown_and_malformed(self, api):
+        assert api.get(f"/api/v1/gstin-verifications/{GSTINS[5]}").status_code == 404
+        wrong = GSTINS[0][:14] + ("A" if GSTINS[0][14] != "A" else "B")
+        assert api.get(f"/api/v1/gstin-verifications/{wrong}").status_code == 422
+
+    def test_verify_many(self, api):
+        response = api.post("/api/v1/gstin-verifications", json={"gstins": GSTINS[:4] + ["bad"]})
+        assert response.status_code == 200
+        body = response.json()
+        assert list(body["data"]["verified"]) == GSTINS[:3]
+        assert body["data"]["errors"] == {"bad": "Invalid GSTIN format", GSTINS[3]: "GSTIN not registered"}
+        assert body["meta"] == {"verified": 3, "failed": 2}
+        assert api.post("/api/v1/gstin-verifications", json={"gstins": []}).status_code == 422
+
+    def test_verify_many_requires_admin(self, api, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_USER_IDS", [2])
+        assert api.post("/api/v1/gstin-verifications", json={"gstins": GSTINS[:1]}).status_code == 403
+        assert api.get(f"/api/v1/gstin-verifications/{GSTINS[0]}").status_code == 200
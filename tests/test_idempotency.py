@@ -0,0 +1,124 @@
+import threading
+import time
+import uuid
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.utils.idempotency import IdempotencyMiddleware, record_key, request_fingerprint
+
+
+def build_app(redis_connection, **kwargs):
+    """App whose order endpoint counts how often it really runs"""
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.post("/api/v1/orders")
+    async def create_order(request: Request):
+        app.state.calls += 1
+        payload = await request.json()
+        if payload.get("slow"):
+            time.sleep(0.3)
+        if payload.get("fail"):
+            raise RuntimeError("boom")
+        return {"order_number": f"ORD{app.state.calls}", "items": payload.get("items")}
+
+    @app.post("/api/v1/other")
+    async def other():
+        app.state.calls += 1
+        return {"calls": app.state.calls}
+
+    app.add_middleware(IdempotencyMiddleware, redis_client=redis_connection, paths=["/api/v1/orders"], **kwargs)
+    return app
+
+
+def key_header():
+    return {"Idempotency-Key": f"test-{uuid.uuid4()}"}
+
+
+class TestIdempotencyHelpers:
+    """Test idempotency key scoping and fingerprints"""
+
+    def test_keys_are_scoped_per_caller(self):
+        """Test the same key from two callers maps to different records"""
+        assert record_key("k1", "Bearer a") != record_key("k1", "Bearer b")
+        assert record_key("k1", None) == "idempotency:anonymous:k1"
+
+    def test_fingerprint_covers_body_and_path(self):
+        """Test fingerprints differ when the body or path differs"""
+        base = request_fingerprint("POST", "/api/v1/orders", b'{"a":1}')
+        assert base == request_fingerprint("POST", "/api/v1/orders", b'{"a":1}')
+        assert base != request_fingerprint("POST", "/api/v1/orders", b'{"a":2}')
+        assert base != request_fingerprint("POST", "/api/v1/payments", b'{"a":1}')
+
+    def test_passes_through_when_redis_is_down(self):
+        """Test requests still run when the idempotency store is unreachable"""
+        down = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.2, retry=Retry(NoBackoff(), 0))
+        app = build_app(down)
+        client = TestClient(app)
+        headers = key_header()
+        assert client.post("/api/v1/orders", json={"items": [1]}, headers=headers).status_code == 200
+        assert client.post("/api/v1/orders", json={"items": [1]}, headers=headers).status_code == 200
+        assert app.state.calls == 2
+
+
+class TestIdempotencyMiddleware:
+    """Test response replay against a live Redis"""
+
+    def test_replays_cached_response(self, redis_connection):
+        """Test a retried POST replays the first response without re-running"""
+        app = build_app(redis_connection)
+        client = TestClient(app)
+        headers = key_header()
+        first = client.post("/api/v1/orders", json={"items": [1, 2]}, headers=headers)
+        second = client.post("/api/v1/orders", json={"items": [1, 2]}, headers=headers)
+        assert app.state.calls == 1
+        assert second.status_code == first.status_code == 200
+        assert second.json() == first.json() == {"order_number": "ORD1", "items": [1, 2]}
+        assert second.headers["idempotent-replayed"] == "true"
+
+    def test_rejects_key_reuse_with_different_body(self, redis_connection):
+        """Test a key reused for a different payload is rejected"""
+        client = TestClient(build_app(redis_connection))
+        headers = key_header()
+        client.post("/api/v1/orders", json={"items": [1]}, headers=headers)
+        assert client.post("/api/v1/orders", json={"items": [2]}, headers=headers).status_code == 422
+
+    def test_concurrent_duplicates_wait_for_first(self, redis_connection):
+        """Test concurrent duplicates wait on the first request and replay it"""
+        app = build_app(redis_connection)
+        client = TestClient(app)
+        headers = key_header()
+        results = []
+
+        def submit():
+            results.append(client.post("/api/v1/orders", json={"items": [1], "slow": True}, headers=headers))
+
+        threads = [threading.Thread(target=submit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert app.state.calls == 1
+        assert {r.json()["order_number"] for r in results} == {"ORD1"}
+
+    def test_server_errors_release_the_key(self, redis_connection):
+        """Test a failed request can be retried with the same key"""
+        app = build_app(redis_connection)
+        client = TestClient(app, raise_server_exceptions=False)
+        headers = key_header()
+        assert client.post("/api/v1/orders", json={"fail": True}, headers=headers).status_code == 500
+        assert client.post("/api/v1/orders", json={"fail": True}, headers=headers).status_code == 500
+        assert app.state.calls == 2
+
+    def test_other_paths_and_keyless_requests_are_untouched(self, redis_connection):
+        """Test only configured paths with a key are deduplicated"""
+        app = build_app(redis_connection)
+        client = TestClient(app)
+        headers = key_header()
+        client.post("/api/v1/other", headers=headers)
+        client.post("/api/v1/other", headers=headers)
+        client.post("/api/v1/orders", json={"items": [1]})
+        client.post("/api/v1/orders", json={"items": [1]})
+        assert app.state.calls == 4
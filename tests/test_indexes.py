@@ -0,0 +1,169 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex
+from app.core.database import Base, run_migrations
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.outbox import OutboxStatus
+from app.models.product import Product
+from app.repositories.address import AddressRepository
+from app.repositories.order import OrderItemRepository, OrderRepository
+from app.repositories.outbox import OutboxRepository
+from app.repositories.product import ProductRepository
+from app.repositories.rollup import RollupRepository
+from app.repositories.user import UserRepository
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+# Every filtered repository read. Left out on purpose: unfiltered listings
+# (get_all, count, get_active_users, get_verified_users, get_by_business_type,
+# get_active_products, get_active_product_responses, order_counts_by_status)
+# read most of their table, and substring searches (search_*,
+# get_addresses_by_city/state) cannot use a b-tree index.
+QUERIES = {
+    "user_by_id": lambda db: UserRepository(db).get_by_id(1),
+    "user_by_email": lambda db: UserRepository(db).get_by_email("buyer@example.com"),
+    "user_by_gstin": lambda db: UserRepository(db).get_by_gstin("37ABCDE1234F1Z5"),
+    "user_by_phone": lambda db: UserRepository(db).get_by_phone("+919876543210"),
+    "user_addresses": lambda db: AddressRepository(db).get_user_addresses(1),
+    "default_address": lambda db: AddressRepository(db).get_default_address(1),
+    "addresses_by_postal_code": lambda db: AddressRepository(db).get_addresses_by_postal_code("524001"),
+    "product_by_sku": lambda db: ProductRepository(db).get_by_sku("SKU1"),
+    "products_by_category": lambda db: ProductRepository(db).get_by_category("Rice"),
+    "in_stock_products": lambda db: ProductRepository(db).get_in_stock_products(),
+    "low_stock_products": lambda db: ProductRepository(db).get_low_stock_products(),
+    "categories": lambda db: ProductRepository(db).get_categories(),
+    "order_by_number": lambda db: OrderRepository(db).get_by_order_number("ORD-1"),
+    "user_orders": lambda db: OrderRepository(db).get_user_orders(1),
+    "orders_by_status": lambda db: OrderRepository(db).get_by_status(OrderStatus.CONFIRMED),
+    "pending_orders": lambda db: OrderRepository(db).get_pending_orders(),
+    "orders_by_date_range": lambda db: OrderRepository(db).get_orders_by_date_range(NOW - timedelta(days=7), NOW),
+    "overdue_orders": lambda db: OrderRepository(db).get_overdue_orders(),
+    "order_weights": lambda db: OrderRepository(db).get_order_weights_by_status(OrderStatus.CONFIRMED, NOW),
+    "user_order_responses": lambda db: OrderRepository(db).get_user_order_responses(1),
+    "user_order_summaries": lambda db: OrderRepository(db).get_user_order_summaries(1),
+    "order_summaries_by_status": lambda db: OrderRepository(db).get_order_summaries_by_status(OrderStatus.CONFIRMED),
+    "order_summaries_by_date_range": lambda db: OrderRepository(db).get_order_summaries_by_date_range(
+        NOW - timedelta(days=7), NOW
+    ),
+    "overdue_order_summaries": lambda db: OrderRepository(db).get_overdue_order_summaries(),
+    "orders_with_items": lambda db: OrderRepository(db).get_with_items([1]),
+    "items_by_order": lambda db: OrderItemRepository(db).get_by_order_id(1),
+    "items_by_product": lambda db: OrderItemRepository(db).get_by_product_id(1),
+    "pick_rows": lambda db: OrderItemRepository(db).get_pick_rows(OrderStatus.CONFIRMED),
+    "outbox_count_by_status": lambda db: OutboxRepository(db).count_by_status(OutboxStatus.PENDING),
+    "revenue_by_day": lambda db: RollupRepository(db).revenue_by_day(NOW - timedelta(days=7), NOW),
+    "revenue_by_hour": lambda db: RollupRepository(db).revenue_by_hour(NOW - timedelta(days=1), NOW),
+    "top_products": lambda db: RollupRepository(db).top_products(NOW - timedelta(days=7), NOW),
+    "latest_inventory": lambda db: RollupRepository(db).latest_inventory(),
+}
+
+# Listings whose ORDER BY the index must return pre-sorted. Summaries
+# re-sort their one page after grouping; only the paging query counts.
+# overdue_order_summaries is left out: without statistics SQLite probes
+# ix_orders_status_created_at per active status and sorts instead of reading
+# the partial index (test_overdue_sweep checks that plan after ANALYZE)
+SORTED_BY_INDEX = {
+    "user_addresses", "user_orders", "user_order_responses", "orders_by_status", "pending_orders", "orders_by_date_range",
+    "user_order_summaries", "order_summaries_by_status", "order_summaries_by_date_range",
+}
+
+
+@pytest.fixture(scope="module")
+def engine(add_buyer):
+    """In-memory database built by the migrations, with one row of each kind"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    run_migrations(engine)
+    with sessionmaker(bind=engine)() as db:
+        add_buyer(db)
+        db.add(Product(id=1, name="Rice", sku="SKU1", category="Rice", retail_price=10, company_price=9,
+                       stock_quantity=5))
+        db.add(Order(id=1, order_number="ORD-1", user_id=1, delivery_address_id=1, status=OrderStatus.CONFIRMED,
+                     total_amount=10, estimated_delivery_date=NOW - timedelta(days=1), created_at=NOW,
+                     order_items=[OrderItem(product_id=1, quantity=1, unit_price=10, total_price=10)]))
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+def query_plans(engine, call):
+    """EXPLAIN QUERY PLAN lines for each SELECT ``call`` runs"""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    try:
+        with sessionmaker(bind=engine)() as db:
+            call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+            plans.append([row[-1] for row in rows])
+    return plans
+
+
+def assert_matches_models(engine):
+    """Check every model table has the model's columns, in order, and indexes"""
+    inspector = inspect(engine)
+    with engine.connect() as conn:
+        for table in Base.metadata.sorted_tables:
+            assert [column["name"] for column in inspector.get_columns(table.name)] == list(table.columns.keys())
+            expected = set()
+            for index in table.indexes:
+                compiled = CreateIndex(index).compile(dialect=engine.dialect)
+                if index._ddl_if is None or index._ddl_if._should_execute(None, index, None, compiler=compiled):
+                    expected.add(index.name)
+            # Read from sqlite_master: reflection skips expression indexes
+            migrated = set(conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table "
+                     "AND name NOT LIKE 'sqlite_autoindex%'"),
+                {"table": table.name},
+            ).scalars())
+            assert migrated == expected, table.name
+
+
+class TestMigrations:
+    """Test that the migrations build the schema the models describe"""
+
+    def test_schema_matches_models(self, engine):
+        assert_matches_models(engine)
+
+    def test_upgrades_a_baseline_database(self):
+        """Test a database built before migrations is brought up to the models"""
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        # The baseline revision builds exactly what create_all did back then
+        run_migrations(engine, "5c0d8e7a41f3")
+        assert "bin_location" not in {column["name"] for column in inspect(engine).get_columns("products")}
+        run_migrations(engine)
+        assert_matches_models(engine)
+        with sessionmaker(bind=engine)() as db:
+            assert ProductRepository(db).get_all() == []
+        engine.dispose()
+
+
+class TestQueryIndexes:
+    """Test via EXPLAIN that each repository query is served by an index"""
+
+    @pytest.mark.parametrize("name", sorted(QUERIES))
+    def test_query_uses_index(self, engine, name):
+        plans = query_plans(engine, QUERIES[name])
+        assert plans, f"{name} ran no SELECT"
+        for plan in plans:
+            # Subqueries are scanned as materialized rows, not tables
+            subqueries = {line.split()[-1] for line in plan if line.startswith(("CO-ROUTINE", "MATERIALIZE"))}
+            full_scans = [
+                line for line in plan
+                if line.startswith("SCAN") and "USING" not in line and line.split()[1] not in subqueries
+            ]
+            assert not full_scans, f"{name}: {plan}"
+            if name in SORTED_BY_INDEX:
+                paging = plan[:plan.index(f"SCAN {subqueries.pop()}")] if subqueries else plan
+                assert not any("TEMP B-TREE FOR ORDER BY" in line for line in paging), f"{name}: {plan}"
@@ -0,0 +1,146 @@
+import pytest
+import asyncio
+import threading
+from decimal import Decimal
+import httpx
+from sqlalchemy.orm import sessionmaker
+from app.models.order import Order, OrderStatus
+from app.models.outbox import NotificationChannel, OutboxMessage, OutboxStatus
+from app.repositories.order import OrderRepository
+from app.repositories.outbox import OutboxRepository
+from app.workers.notifications import HttpSender, NotificationWorker
+from app.workers.stub_server import StubServer
+
+
+@pytest.fixture
+def session_factory(sqlite_engine, add_buyer):
+    """In-memory database with one user, address and pending order"""
+    factory = sessionmaker(bind=sqlite_engine)
+    db = factory()
+    add_buyer(db)
+    db.add(Order(id=1, order_number="ORD1", user_id=1, delivery_address_id=1, status=OrderStatus.PENDING,
+                 total_amount=Decimal("100.00")))
+    db.commit()
+    db.close()
+    return factory
+
+
+def queue_messages(factory, count):
+    db = factory()
+    order = db.get(Order, 1)
+    for _ in range(count):
+        OutboxRepository(db).add_order_notifications(order, "order.placed")
+    db.commit()
+    db.close()
+
+
+def run_worker(factory, url, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(timeout=5) as client:
+            sender = HttpSender(client, url)
+            worker = NotificationWorker(
+                factory, {NotificationChannel.EMAIL: sender, NotificationChannel.SMS: sender},
+                backoff_seconds=0, lease_seconds=60, **kwargs,
+            )
+            return await worker.run_once()
+    return asyncio.run(run())
+
+
+def messages(factory):
+    db = factory()
+    try:
+        return db.query(OutboxMessage).order_by(OutboxMessage.id).all()
+    finally:
+        db.close()
+
+
+class TestOutbox:
+    """Test outbox writes happen with the order change"""
+
+    def test_status_change_queues_email_and_sms(self, session_factory):
+        """Test update_status writes notifications in the same commit"""
+        db = session_factory()
+        OrderRepository(db).update_status(1, OrderStatus.CONFIRMED)
+        queued = db.query(OutboxMessage).all()
+        assert {m.channel for m in queued} == {NotificationChannel.EMAIL, NotificationChannel.SMS}
+        assert {m.recipient for m in queued} == {"buyer@example.com", "+919876543210"}
+        assert queued[0].payload["status"] == "confirmed"
+        assert queued[0].payload["previous_status"] == "pending"
+        assert queued[0].topic == "order.status_changed"
+
+        OrderRepository(db).update_status(1, OrderStatus.CONFIRMED)
+        assert db.query(OutboxMessage).count() == 2
+        db.close()
+
+    def test_claim_leases_messages(self, session_factory):
+        """Test claimed messages are hidden from other workers until the lease ends"""
+        queue_messages(session_factory, 2)
+        db = session_factory()
+        repo = OutboxRepository(db)
+        assert len(repo.claim_batch(limit=3, lease_seconds=60)) == 3
+        assert repo.claim_batch(limit=10, lease_seconds=60) != []
+        assert repo.claim_batch(limit=10, lease_seconds=60) == []
+        db.close()
+
+
+class TestNotificationWorker:
+    """Test the outbox worker against a local HTTP stub"""
+
+    def test_delivers_batch(self, session_factory):
+        """Test every message is posted once and marked sent"""
+        queue_messages(session_factory, 5)
+        with StubServer() as stub:
+            assert run_worker(session_factory, stub.url) == 10
+        assert len(stub.requests) == 10
+        assert stub.requests[0]["body"]["to"] in ("buyer@example.com", "+919876543210")
+        assert stub.requests[0]["headers"]["Idempotency-Key"].startswith("outbox-")
+        assert all(m.status == OutboxStatus.SENT and m.attempts == 1 for m in messages(session_factory))
+
+    def test_retries_with_backoff(self, session_factory):
+        """Test transient failures are rescheduled and later delivered"""
+        queue_messages(session_factory, 1)
+        with StubServer(fail_first=2) as stub:
+            run_worker(session_factory, stub.url)
+            failed = messages(session_factory)
+            assert all(m.status == OutboxStatus.PENDING and m.attempts == 1 for m in failed)
+            assert all(m.last_error == "HTTP 503" for m in failed)
+            run_worker(session_factory, stub.url)
+        assert all(m.status == OutboxStatus.SENT and m.attempts == 2 for m in messages(session_factory))
+
+    def test_client_errors_are_not_retried(self, session_factory):
+        """Test a 4xx response fails the message on the first attempt"""
+        queue_messages(session_factory, 1)
+        with StubServer(fail_first=2, fail_status=400) as stub:
+            run_worker(session_factory, stub.url)
+        assert all(m.status == OutboxStatus.FAILED and m.attempts == 1 for m in messages(session_factory))
+        assert "HTTP 400" in messages(session_factory)[0].last_error
+
+    def test_gives_up_after_max_attempts(self, session_factory):
+        """Test transient failures stop being retried after max attempts"""
+        queue_messages(session_factory, 1)
+        with StubServer(fail_first=100) as stub:
+            run_worker(session_factory, stub.url, max_attempts=2)
+            run_worker(session_factory, stub.url, max_attempts=2)
+            assert run_worker(session_factory, stub.url, max_attempts=2) == 0
+        assert all(m.status == OutboxStatus.FAILED and m.attempts == 2 for m in messages(session_factory))
+
+    def test_concurrency_limit(self, session_factory):
+        """Test no more than ``concurrency`` requests are in flight"""
+        queue_messages(session_factory, 10)
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def responder(method, path, body):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            threading.Event().wait(0.05)
+            with lock:
+                in_flight -= 1
+            return 200, {"ok": True}
+
+        with StubServer(responder=responder) as stub:
+            assert run_worker(session_factory, stub.url, concurrency=3) == 20
+        assert peak == 3
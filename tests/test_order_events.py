@@ -0,0 +1,169 @@
+import pytest
+import asyncio
+import json
+from decimal import Decimal
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import ClientDisconnect
+from starlette.websockets import WebSocketDisconnect
+from app.core.security import create_access_token
+from app.models.order import Order, OrderStatus
+from app.repositories.order import OrderRepository
+from app.routers.order_events import get_order_event_hub, order_events, router
+from app.services.order_events import OrderEventHub, Subscription, publish_order_event, sse_stream
+from app.utils.exceptions import ExternalServiceException
+
+
+def unreachable():
+    raise ConnectionError("no redis in tests")
+
+
+def make_hub(**kwargs):
+    return OrderEventHub(connection_factory=unreachable, **kwargs)
+
+
+def event(user_id=1, order_number="ORD1", status="shipped"):
+    return {"order_id": 1, "order_number": order_number, "user_id": user_id, "status": status}
+
+
+class TestOrderEventHub:
+    """Test local fan-out of order events"""
+
+    def test_dispatch_routes_by_user_and_order(self):
+        async def run():
+            hub = make_hub()
+            mine = hub.subscribe(1)
+            filtered = hub.subscribe(1, ["ORD2"])
+            other = hub.subscribe(2)
+            delivered = hub.dispatch(event())
+            return delivered, len(mine.pending), len(filtered.pending), len(other.pending)
+
+        assert asyncio.run(run()) == (1, 1, 0, 0)
+
+    def test_slow_client_keeps_latest_events(self):
+        async def run():
+            subscription = Subscription(1, queue_size=2)
+            for status in ("confirmed", "processing", "shipped"):
+                subscription.offer(event(status=status))
+            return subscription.dropped, [(await subscription.get())["status"] for _ in range(2)]
+
+        assert asyncio.run(run()) == (1, ["processing", "shipped"])
+
+    def test_connection_cap_and_unsubscribe(self):
+        async def run():
+            hub = make_hub(max_connections=2)
+            first = hub.subscribe(1)
+            hub.subscribe(1)
+            with pytest.raises(ExternalServiceException):
+                hub.subscribe(3)
+            hub.unsubscribe(first)
+            hub.unsubscribe(first)
+            hub.subscribe(3)
+            return hub.connection_count
+
+        assert asyncio.run(run()) == 2
+
+    def test_sse_stream_format(self):
+        async def run():
+            hub = make_hub()
+            stream = sse_stream(hub, 1, heartbeat=0.01)
+            chunks = [await stream.__anext__(), await stream.__anext__()]
+            hub.dispatch(event())
+            chunks.append(await stream.__anext__())
+            await stream.aclose()
+            return chunks, hub.connection_count
+
+        chunks, remaining = asyncio.run(run())
+        assert chunks[0].startswith("retry:")
+        assert chunks[1] == ": keep-alive\n\n"
+        assert chunks[2].startswith("event: order_status\ndata: ")
+        assert json.loads(chunks[2].split("data: ")[1])["status"] == "shipped"
+        assert remaining == 0
+
+    def test_publish_fails_open(self):
+        class Down:
+            def pipeline(self, transaction=True):
+                raise ConnectionError("down")
+
+        assert publish_order_event(event(), Down()) is False
+
+
+class TestOrderEventRoutes:
+    """Test the WebSocket and SSE endpoints"""
+
+    @pytest.fixture
+    def client(self):
+        hub = make_hub()
+        app = FastAPI()
+        app.include_router(router, prefix="/orders")
+        app.dependency_overrides[get_order_event_hub] = lambda: hub
+        with TestClient(app) as client:
+            yield client, hub
+
+    def test_websocket_pushes_events(self, client):
+        client, hub = client
+        token = create_access_token(subject=1)
+        with client.websocket_connect(f"/orders/ws?token={token}") as ws:
+            assert ws.portal.call(hub.dispatch, event()) == 1
+            message = ws.receive_json()
+        assert message["type"] == "order_status"
+        assert message["data"]["order_number"] == "ORD1"
+
+    def test_websocket_rejects_bad_token(self, client):
+        client, _ = client
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect("/orders/ws?token=bogus"):
+                pass
+        assert exc.value.code == 1008
+
+    def test_sse_requires_authentication(self, client):
+        client, _ = client
+        assert client.get("/orders/events").status_code == 401
+
+    def test_sse_rejects_when_full(self, client):
+        client, hub = client
+        hub.max_connections = 0
+        token = create_access_token(subject=1)
+        assert client.get(f"/orders/events?token={token}").status_code == 503
+
+    def test_sse_client_gone_before_streaming_holds_no_slot(self):
+        """Test a disconnect while sending the response start leaves no subscription behind"""
+        async def run():
+            hub = make_hub()
+            response = await order_events(order_number=None, user_id=1, hub=hub)
+
+            async def send(message):
+                raise OSError("client went away")
+
+            async def receive():
+                return {"type": "http.disconnect"}
+
+            scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+            with pytest.raises(ClientDisconnect):
+                await response(scope, receive, send)
+            return hub.connection_count
+
+        assert asyncio.run(run()) == 0
+
+
+class TestStatusChangePublishing:
+    """Test that committed status changes are published"""
+
+    def test_update_status_publishes_changes_only(self, monkeypatch, sqlite_engine, add_buyer):
+        published = []
+        monkeypatch.setattr("app.repositories.order.publish_order_event", published.append)
+        db = sessionmaker(bind=sqlite_engine)()
+        add_buyer(db)
+        db.add(Order(id=1, order_number="ORD1", user_id=1, delivery_address_id=1, status=OrderStatus.PENDING,
+                     total_amount=Decimal("100.00")))
+        db.commit()
+
+        repo = OrderRepository(db)
+        repo.update_status(1, OrderStatus.CONFIRMED)
+        repo.update_status(1, OrderStatus.CONFIRMED)
+
+        assert len(published) == 1
+        assert published[0]["status"] == "confirmed"
+        assert published[0]["previous_status"] == "pending"
+        assert published[0]["user_id"] == 1
@@ -0,0 +1,126 @@
+import pytest
+import random
+from decimal import Decimal, ROUND_HALF_UP, ROUND_CEILING
+from app.services.order_totals import OrderTotalsCalculator
+from app.utils.exceptions import ValidationException
+from app.utils.money import to_paise
+
+CENT = Decimal("0.01")
+INTRA_STATE_GSTIN = "37ABCDE1234F1Z5"
+INTER_STATE_GSTIN = "29ABCDE1234F1Z5"
+
+
+def reference_totals(lines, interstate, base=Decimal("50"), per_kg=Decimal("10"), free_at=Decimal("5000")):
+    """Per-item Decimal reference; lines are (unit_price, qty, gst_rate, weight_kg)"""
+    subtotal = cgst = sgst = igst = Decimal("0")
+    weight = Decimal("0")
+    for unit_price, qty, rate, weight_kg in lines:
+        line = unit_price * qty
+        subtotal += line
+        weight += weight_kg * qty
+        if interstate:
+            igst += (line * rate / 100).quantize(CENT, ROUND_HALF_UP)
+        else:
+            half = (line * rate / 200).quantize(CENT, ROUND_HALF_UP)
+            cgst += half
+            sgst += half
+    shipping = Decimal("0") if subtotal >= free_at else base + per_kg * weight.to_integral_value(ROUND_CEILING)
+    return {
+        "subtotal": subtotal,
+        "tax_amount": cgst + sgst + igst,
+        "igst": igst,
+        "shipping_cost": shipping,
+        "total_amount": subtotal + cgst + sgst + igst + shipping,
+    }
+
+
+def random_lines(rng, n):
+    return [
+        (
+            Decimal(rng.randint(1, 250_000)) / 100,
+            rng.randint(1, 40),
+            rng.choice([Decimal("0"), Decimal("5"), Decimal("12"), Decimal("18"), Decimal("28")]),
+            Decimal(rng.randint(0, 25_000)) / 1000,
+        )
+        for _ in range(n)
+    ]
+
+
+def calculate(calc, lines, gstin):
+    return calc.calculate(
+        unit_price=[to_paise(u) for u, _, _, _ in lines],
+        quantities=[q for _, q, _, _ in lines],
+        buyer_gstin=gstin,
+        gst_bps=[int(r * 100) for _, _, r, _ in lines],
+        weight_grams=[int(w * 1000) for _, _, _, w in lines],
+    )
+
+
+class TestOrderTotalsCalculator:
+    """Test the vectorized totals engine against a Decimal reference"""
+
+    @pytest.fixture
+    def calc(self):
+        return OrderTotalsCalculator(
+            home_state_code="37",
+            shipping_base_cost=Decimal("50"),
+            shipping_cost_per_kg=Decimal("10"),
+            free_shipping_threshold=Decimal("5000"),
+            round_to_rupee=False,
+        )
+
+    @pytest.mark.parametrize("gstin,interstate", [(INTRA_STATE_GSTIN, False), (INTER_STATE_GSTIN, True)])
+    def test_matches_reference(self, calc, gstin, interstate):
+        """Test large random orders match the Decimal reference exactly"""
+        rng = random.Random(7)
+        for n in (1, 3, 300, 1000):
+            lines = random_lines(rng, n)
+            totals = calculate(calc, lines, gstin)
+            expected = reference_totals(lines, interstate)
+            fields = totals.as_order_fields()
+            assert totals.is_interstate is interstate
+            assert fields["tax_amount"] == expected["tax_amount"]
+            assert fields["shipping_cost"] == expected["shipping_cost"]
+            assert fields["total_amount"] == expected["total_amount"]
+
+    def test_intra_state_splits_cgst_sgst(self, calc):
+        """Test home-state buyers are charged CGST + SGST"""
+        totals = calc.calculate([10_001], [1], INTRA_STATE_GSTIN, gst_bps=[1800])
+        assert totals.igst == 0
+        assert totals.cgst == totals.sgst == 900
+
+    def test_small_order_shipping(self, calc):
+        """Test shipping is charged below the free threshold by rounded-up weight"""
+        totals = calc.calculate([10_000], [2], INTER_STATE_GSTIN, gst_bps=[0], weight_grams=[1_200])
+        assert totals.shipping_cost == to_paise("50") + to_paise("10") * 3
+
+    def test_round_to_rupee(self):
+        """Test optional round-off to the nearest rupee"""
+        calc = OrderTotalsCalculator(home_state_code="37", round_to_rupee=True, free_shipping_threshold=Decimal("0"))
+        totals = calc.calculate([10_051], [1], INTER_STATE_GSTIN, gst_bps=[0])
+        assert totals.round_off == 49
+        assert totals.total_amount == 10_100
+
+    def test_invalid_gstin(self, calc):
+        """Test an invalid buyer GSTIN is rejected"""
+        with pytest.raises(ValidationException):
+            calc.calculate([100], [1], "NOT-A-GSTIN")
+
+    def test_calculate_many_matches_single(self, calc):
+        """Test the multi-order path agrees with per-order calculation"""
+        rng = random.Random(11)
+        orders = [random_lines(rng, rng.randint(1, 50)) for _ in range(20)]
+        interstate = [i % 2 == 0 for i in range(len(orders))]
+        index, unit, qty, bps, grams = [], [], [], [], []
+        for i, lines in enumerate(orders):
+            for u, q, r, w in lines:
+                index.append(i)
+                unit.append(to_paise(u))
+                qty.append(q)
+                bps.append(int(r * 100))
+                grams.append(int(w * 1000))
+        batch = calc.calculate_many(index, unit, qty, interstate, gst_bps=bps, weight_grams=grams)
+        for i, lines in enumerate(orders):
+            single = calculate(calc, lines, INTER_STATE_GSTIN if interstate[i] else INTRA_STATE_GSTIN)
+            assert batch["total_amount"][i] == single.total_amount
+            assert batch["igst"][i] == single.igst
@@ -0,0 +1,146 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from app.models.job_state import JobState
+from app.models.order import Order, OrderStatus
+from app.models.outbox import OutboxMessage
+from app.repositories.order import OrderRepository
+from app.services.overdue_sweep import SWEEP_JOB, OverdueSweeper
+from app.utils.leader_lock import LeaderLock
+from app.workers.overdue_sweep import OverdueSweepScheduler
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+DOWN = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.2, retry=Retry(NoBackoff(), 0))
+
+
+@pytest.fixture
+def engine(sqlite_engine, add_buyer):
+    db = sessionmaker(bind=sqlite_engine)()
+    add_buyer(db)
+    db.commit()
+    db.close()
+    return sqlite_engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def add_orders(db, *specs):
+    """Add orders from ``(status, hours relative to NOW)`` pairs"""
+    start = db.query(Order).count()
+    for i, (status, hours) in enumerate(specs, start=start + 1):
+        db.add(Order(id=i, order_number=f"ORD{i}", user_id=1, delivery_address_id=1, status=status,
+                     total_amount=Decimal("100.00"), estimated_delivery_date=NOW + timedelta(hours=hours)))
+    db.commit()
+
+
+def flagged(db):
+    return sorted(order.order_number for order in db.query(Order).filter(Order.overdue_at.isnot(None)))
+
+
+class TestOverdueSweeper:
+    """Test the incremental overdue-order sweep"""
+
+    def test_flags_active_overdue_orders_and_queues_alerts(self, db):
+        add_orders(db, (OrderStatus.SHIPPED, -5), (OrderStatus.CONFIRMED, -1), (OrderStatus.DELIVERED, -3),
+                   (OrderStatus.PENDING, -3), (OrderStatus.PROCESSING, 2))
+
+        report = OverdueSweeper(db).sweep(now=NOW)
+
+        assert report.flagged == 2
+        assert flagged(db) == ["ORD1", "ORD2"]
+        alerts = db.query(OutboxMessage).filter(OutboxMessage.topic == "order.overdue").all()
+        assert sorted({alert.aggregate_id for alert in alerts}) == [1, 2]
+        assert len(alerts) == 4  # email and SMS per order
+
+    def test_runs_flag_each_order_once(self, db):
+        add_orders(db, (OrderStatus.SHIPPED, -5), (OrderStatus.SHIPPED, 1))
+        sweeper = OverdueSweeper(db)
+        assert sweeper.sweep(now=NOW).flagged == 1
+
+        state = db.get(JobState, SWEEP_JOB)
+        assert (state.watermark.replace(tzinfo=timezone.utc), state.last_id) == (NOW - timedelta(hours=5), 1)
+        assert sweeper.sweep(now=NOW).flagged == 0
+
+        later = NOW + timedelta(hours=2)
+        report = sweeper.sweep(now=later)
+        assert report.flagged == 1
+        assert report.last_id == 2
+        assert flagged(db) == ["ORD1", "ORD2"]
+
+    def test_flags_orders_behind_the_last_position(self, db):
+        add_orders(db, (OrderStatus.SHIPPED, -1), (OrderStatus.PENDING, -5), (OrderStatus.SHIPPED, 3))
+        assert OverdueSweeper(db).sweep(now=NOW).flagged == 1
+
+        # Confirmed late, and a delivery date moved back: both behind the last run's position
+        db.get(Order, 2).status = OrderStatus.CONFIRMED
+        db.get(Order, 3).estimated_delivery_date = NOW - timedelta(hours=10)
+        db.commit()
+        assert OverdueSweeper(db).sweep(now=NOW).flagged == 2
+        assert flagged(db) == ["ORD1", "ORD2", "ORD3"]
+
+    def test_batches(self, db):
+        add_orders(db, *[(OrderStatus.SHIPPED, -hours) for hours in range(1, 8)])
+        assert OverdueSweeper(db, batch_size=3, max_batches=2).sweep(now=NOW).flagged == 6
+
+        report = OverdueSweeper(db, batch_size=3).sweep(now=NOW)
+        assert (report.flagged, report.batches) == (1, 1)
+        assert len(flagged(db)) == 7
+
+    def test_stops_when_leadership_is_lost(self, db):
+        add_orders(db, *[(OrderStatus.SHIPPED, -hours) for hours in range(1, 8)])
+        report = OverdueSweeper(db, batch_size=3).sweep(now=NOW, on_batch=lambda: False)
+        assert (report.flagged, report.batches) == (3, 1)
+
+    def test_queries_use_partial_index(self, engine, db):
+        add_orders(db, (OrderStatus.SHIPPED, -5))
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().startswith("SELECT") and "FROM orders" in statement:
+                statements.append((statement, parameters))
+
+        OverdueSweeper(db).sweep(now=NOW)
+        OrderRepository(db).get_overdue_orders()
+        event.remove(engine, "before_cursor_execute", capture)
+
+        assert len(statements) >= 2
+        with engine.connect() as conn:
+            # Without statistics SQLite prefers probing ix_orders_status_created_at
+            conn.exec_driver_sql("ANALYZE")
+            for statement, parameters in statements[:2]:
+                plan = " ".join(row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+                assert "ix_orders_active_estimated_delivery" in plan
+
+
+class TestOverdueSweepScheduler:
+    """Test leader election around the sweep"""
+
+    def test_skips_run_when_redis_is_down(self, engine):
+        scheduler = OverdueSweepScheduler(sessionmaker(bind=engine), lock=LeaderLock("test", 10, DOWN))
+        assert scheduler.run_once() is None
+
+    def test_only_one_leader(self, redis_connection):
+        name = f"test-{uuid.uuid4().hex}"
+        first = LeaderLock(name, 10, redis_connection)
+        second = LeaderLock(name, 10, redis_connection)
+        assert first.acquire()
+        assert first.acquire()
+        assert not second.acquire()
+        assert not second.renew()
+        second.release()
+        assert first.holder() == first.token
+        first.release()
+        assert second.acquire()
+        second.release()
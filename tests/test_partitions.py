@@ -0,0 +1,135 @@
+import pytest
+from datetime import date, datetime, timezone
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.repositories.order import OrderRepository
+from app.services.partitions import MonthPartition, PartitionManager
+
+NOW = datetime(2026, 11, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def ddl(table, dialect):
+    statements = [str(CreateTable(table).compile(dialect=dialect))]
+    for index in table.indexes:
+        compiled = CreateIndex(index).compile(dialect=dialect)
+        if index._ddl_if is None or index._ddl_if._should_execute(None, index, None, compiler=compiled):
+            statements.append(str(compiled))
+    return "\n".join(statements)
+
+
+class TestPartitionedModels:
+    """Test the DDL emitted for the partitioned tables"""
+
+    def test_postgresql_tables_are_range_partitioned(self):
+        orders = ddl(Order.__table__, postgresql.dialect())
+        assert "PARTITION BY RANGE (created_at)" in orders
+        assert "PRIMARY KEY (id, created_at)" in orders
+        assert "UNIQUE INDEX ix_orders_order_number_created_at ON orders (order_number, created_at)" in orders
+        assert "ix_orders_order_number ON" not in orders
+
+        items = ddl(OrderItem.__table__, postgresql.dialect())
+        assert "PARTITION BY RANGE (created_at)" in items
+        assert "REFERENCES orders" not in items
+        assert "REFERENCES products" in items
+
+    def test_other_databases_get_ordinary_tables(self):
+        orders = ddl(Order.__table__, sqlite.dialect())
+        assert "PARTITION" not in orders
+        assert "PRIMARY KEY (id)" in orders
+        assert "UNIQUE INDEX ix_orders_order_number ON orders (order_number)" in orders
+        assert "REFERENCES orders (id)" in ddl(OrderItem.__table__, sqlite.dialect())
+
+    def test_orm_identity_and_relationship_unchanged(self):
+        assert [column.name for column in inspect(Order).primary_key] == ["id"]
+        assert OrderItem.order.property.mapper.class_ is Order
+
+
+class TestPartitionManager:
+    """Test partition planning"""
+
+    def test_month_partition_bounds(self):
+        partition = MonthPartition("orders", date(2026, 12, 1))
+        assert partition.name == "orders_p202612"
+        assert partition.end == datetime(2027, 1, 1, tzinfo=timezone.utc)
+        assert partition.create_sql() == (
+            'CREATE TABLE IF NOT EXISTS "orders_p202612" PARTITION OF "orders" '
+            "FOR VALUES FROM ('2026-12-01T00:00:00+00:00') TO ('2027-01-01T00:00:00+00:00')"
+        )
+        assert MonthPartition.from_name("orders", "orders_p202612") == partition
+        assert MonthPartition.from_name("orders", "order_items_p202612") is None
+
+    def test_plans_months_ahead_for_every_table(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        manager = PartitionManager(engine, months_ahead=2)
+        planned = manager.planned(NOW, since=date(2026, 10, 20))
+        assert [p.name for p in planned] == [
+            "orders_p202610", "order_items_p202610",
+            "orders_p202611", "order_items_p202611",
+            "orders_p202612", "order_items_p202612",
+            "orders_p202701", "order_items_p202701",
+        ]
+
+    def test_noop_without_partitioning(self, sqlite_engine):
+        manager = PartitionManager(sqlite_engine)
+        assert manager.ensure(NOW) == []
+        assert manager.detach(date(2026, 1, 1)) == []
+        assert manager.detach_older_than(12, NOW) == []
+
+
+class TestPartitionPruning:
+    """Test pruning and detaching against PostgreSQL"""
+
+    @pytest.fixture
+    def orders(self, pg_engine, add_buyer):
+        manager = PartitionManager(pg_engine, months_ahead=1)
+        manager.ensure(NOW, since=date(2026, 8, 1))
+        db = sessionmaker(bind=pg_engine)()
+        add_buyer(db)
+        db.add(Product(id=1, name="Product", sku="SKU1", retail_price=10, company_price=9))
+        for month in (8, 9, 10, 11):
+            created = datetime(2026, month, 10, tzinfo=timezone.utc)
+            order = Order(order_number=f"ORD-2026{month:02d}10", user_id=1, delivery_address_id=1,
+                          status=OrderStatus.DELIVERED, total_amount=10, created_at=created)
+            order.order_items.append(OrderItem(product_id=1, quantity=1, unit_price=10, total_price=10,
+                                               created_at=created))
+            db.add(order)
+        db.commit()
+        yield db
+        db.close()
+        with pg_engine.begin() as conn:
+            conn.execute(text("TRUNCATE orders, order_items, addresses, products, users CASCADE"))
+
+    def test_date_range_query_scans_one_partition(self, pg_engine, orders):
+        statements = []
+
+        @event.listens_for(pg_engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().startswith("SELECT") and "FROM orders" in statement:
+                statements.append((statement, parameters))
+
+        found = OrderRepository(orders).get_orders_by_date_range(
+            datetime(2026, 9, 1, tzinfo=timezone.utc), datetime(2026, 9, 30, tzinfo=timezone.utc),
+        )
+        event.remove(pg_engine, "before_cursor_execute", capture)
+        assert [order.order_number for order in found] == ["ORD-20260910"]
+
+        statement, parameters = statements[0]
+        with pg_engine.connect() as conn:
+            plan = "\n".join(conn.exec_driver_sql("EXPLAIN " + statement, parameters).scalars())
+        assert "orders_p202609" in plan
+        assert "orders_p202608" not in plan and "orders_p202610" not in plan
+
+    def test_detach_moves_month_out_of_parent(self, pg_engine, orders):
+        manager = PartitionManager(pg_engine, months_ahead=1)
+        assert manager.detach_older_than(1, NOW) == [
+            "order_items_p202608", "orders_p202608", "order_items_p202609", "orders_p202609",
+        ]
+        with pg_engine.begin() as conn:
+            assert conn.execute(text("SELECT count(*) FROM orders")).scalar() == 2
+            assert conn.execute(text("SELECT count(*) FROM orders_p202608")).scalar() == 1
+            conn.execute(text("DROP TABLE orders_p202608, orders_p202609, order_items_p202608, order_items_p202609"))
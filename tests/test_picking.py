@@ -0,0 +1,73 @@
+import pytest
+from decimal import Decimal
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import BusinessType
+from app.services.picking import WavePlanner
+
+
+@pytest.fixture
+def db_session(sqlite_engine, add_buyer):
+    """In-memory database with three products and four orders"""
+    session = sessionmaker(bind=sqlite_engine)()
+    user = add_buyer(session, business_type=BusinessType.COMPANY)
+    products = [
+        Product(name="Rice", sku="RICE", retail_price=Decimal("10"), company_price=Decimal("9"), bin_location="B-02"),
+        Product(name="Dal", sku="DAL", retail_price=Decimal("10"), company_price=Decimal("9"), bin_location="A-07"),
+        Product(name="Salt", sku="SALT", retail_price=Decimal("10"), company_price=Decimal("9")),
+    ]
+    session.add_all(products)
+    session.flush()
+    lines = {
+        OrderStatus.PROCESSING: [[(0, 2), (1, 1)], [(0, 3), (2, 4)], [(1, 5)]],
+        OrderStatus.CONFIRMED: [[(0, 100)]],
+    }
+    n = 0
+    for status, orders in lines.items():
+        for items in orders:
+            n += 1
+            order = Order(order_number=f"ORD{n}", user_id=user.id, delivery_address_id=user.id,
+                          status=status, total_amount=Decimal("10"))
+            order.order_items = [
+                OrderItem(product_id=products[p].id, quantity=q, unit_price=Decimal("9"), total_price=Decimal("9") * q)
+                for p, q in items
+            ]
+            session.add(order)
+    session.commit()
+    session.info["engine"] = sqlite_engine
+    yield session
+    session.close()
+
+
+class TestWavePlanner:
+    """Test wave pick-list generation"""
+
+    def test_single_wave_aggregates_by_product(self, db_session):
+        """Test quantities are summed across orders and sorted by bin"""
+        waves = WavePlanner(db_session).generate_waves()
+        assert len(waves) == 1
+        wave = waves[0]
+        assert wave.order_ids == [1, 2, 3]
+        assert [(p.sku, p.quantity, p.order_count) for p in wave.pick_list] == [
+            ("DAL", 6, 2),
+            ("RICE", 5, 2),
+            ("SALT", 4, 1),
+        ]
+        assert wave.total_units == 15
+        assert [(l.sku, l.quantity) for l in wave.pack_lists[2]] == [("RICE", 3), ("SALT", 4)]
+
+    def test_wave_size_splits_orders(self, db_session):
+        """Test orders are split into waves of bounded size"""
+        waves = WavePlanner(db_session, wave_size=2).generate_waves()
+        assert [w.order_ids for w in waves] == [[1, 2], [3]]
+        assert [(p.sku, p.quantity) for p in waves[1].pick_list] == [("DAL", 5)]
+
+    def test_single_query(self, db_session):
+        """Test all waves are built from one SQL statement"""
+        statements = []
+        event.listen(db_session.info["engine"], "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+        WavePlanner(db_session, wave_size=1).generate_waves()
+        assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
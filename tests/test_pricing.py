@@ -0,0 +1,95 @@
+import pytest
+from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
+from sqlalchemy.orm import sessionmaker
+from app.models.product import Product
+from app.models.user import BusinessType
+from app.services.pricing import PriceBookService, VolumeDiscount
+from app.utils.exceptions import NotFoundException, ValidationException
+
+
+class _User:
+    def __init__(self, business_type):
+        self.business_type = business_type
+
+
+@pytest.fixture
+def service():
+    """Price book service over a small in-memory catalog"""
+    svc = PriceBookService(
+        volume_discounts={
+            BusinessType.RETAIL_STORE: [],
+            BusinessType.COMPANY: [
+                VolumeDiscount(min_quantity=10, discount_percentage=Decimal("5")),
+                VolumeDiscount(min_quantity=100, discount_percentage=Decimal("10")),
+            ],
+        },
+        gst_rate=Decimal("18"),
+    )
+    svc.load_arrays(
+        product_ids=np.array([30, 10, 20]),
+        retail_price=np.array([10_000, 2_599, 99_999]),
+        company_price=np.array([8_000, 1_999, 80_001]),
+    )
+    return svc
+
+
+def reference_total(unit_paise: int, discount: Decimal, qty: int) -> Decimal:
+    """Decimal reference for a single priced line"""
+    unit = (Decimal(unit_paise) / 100 * (100 - discount) / 100).quantize(Decimal("0.01"), ROUND_HALF_UP)
+    line = unit * qty
+    return line + (line * Decimal("0.18")).quantize(Decimal("0.01"), ROUND_HALF_UP)
+
+
+class TestPriceBookService:
+    """Test tier-aware price resolution"""
+
+    def test_retail_uses_retail_price(self, service):
+        """Test retail stores get retail prices without volume tiers"""
+        quote = service.resolve_prices(_User(BusinessType.RETAIL_STORE), [10, 30], [1, 500])
+        assert quote.unit_price.tolist() == [2_599, 10_000]
+        assert quote.tier_index.tolist() == [0, 0]
+
+    def test_company_volume_tiers(self, service):
+        """Test company lines move into volume tiers by quantity"""
+        quote = service.resolve_prices(_User(BusinessType.COMPANY), [20, 20, 20], [9, 10, 100])
+        assert quote.tier_index.tolist() == [0, 1, 2]
+        assert quote.unit_price.tolist() == [80_001, 76_001, 72_001]
+
+    def test_matches_decimal_reference(self, service):
+        """Test vectorized totals equal a per-item Decimal calculation"""
+        ids, qty = [10, 20, 30, 10], [3, 12, 150, 99]
+        prices = {10: 1_999, 20: 80_001, 30: 8_000}
+        discounts = [Decimal("0"), Decimal("5"), Decimal("10"), Decimal("5")]
+        quote = service.resolve_prices(_User(BusinessType.COMPANY), ids, qty)
+        expected = sum(
+            reference_total(prices[pid], d, q) for pid, q, d in zip(ids, qty, discounts)
+        )
+        assert quote.total == expected
+        assert quote.to_lines()[0]["unit_price"] == Decimal("19.99")
+
+    def test_unknown_product(self, service):
+        """Test unknown products are rejected"""
+        with pytest.raises(NotFoundException):
+            service.resolve_prices(_User(BusinessType.COMPANY), [10, 999], [1, 1])
+
+    def test_invalid_quantity(self, service):
+        """Test non-positive quantities are rejected"""
+        with pytest.raises(ValidationException):
+            service.resolve_prices(_User(BusinessType.COMPANY), [10], [0])
+
+    def test_refresh_from_database(self, sqlite_engine):
+        """Test price books are built from active products only"""
+        db = sessionmaker(bind=sqlite_engine)()
+        db.add_all([
+            Product(name="A", sku="A1", retail_price=Decimal("12.50"), company_price=Decimal("10.00")),
+            Product(name="B", sku="B1", retail_price=Decimal("5.00"), company_price=Decimal("4.00"), is_active=False),
+        ])
+        db.commit()
+
+        svc = PriceBookService(gst_rate=Decimal("0"))
+        svc.refresh(db)
+        book = svc.get_book(BusinessType.RETAIL_STORE)
+        assert len(book) == 1
+        assert svc.resolve_prices(_User(BusinessType.RETAIL_STORE), [1], [2]).total == Decimal("25.00")
+        db.close()
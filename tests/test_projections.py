@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy.orm import sessionmaker
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.repositories.order import ORDER_ITEM_RESPONSE, ORDER_RESPONSE, OrderRepository
+from app.repositories.product import PRODUCT_RESPONSE, ProductRepository
+from app.schemas.order import OrderItemResponse, OrderResponse
+from app.schemas.product import ProductResponse
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(sqlite_engine, add_buyer):
+    session = sessionmaker(bind=sqlite_engine)()
+    add_buyer(session)
+    for i in range(1, 6):
+        session.add(Product(id=i, name=f"Product {i}", sku=f"SKU{i}", retail_price=Decimal("10.50"),
+                            company_price=Decimal("9.25"), stock_quantity=i, weight_kg=Decimal("1.250"),
+                            is_active=i != 3, created_at=NOW))
+    for i in range(1, 5):
+        session.add(Order(id=i, order_number=f"ORD-{i}", user_id=1, delivery_address_id=1,
+                          status=OrderStatus.CONFIRMED, total_amount=Decimal("21.00"), notes=f"Order {i}",
+                          created_at=NOW - timedelta(days=i),
+                          order_items=[
+                              OrderItem(product_id=p, quantity=1, unit_price=Decimal("10.50"),
+                                        total_price=Decimal("10.50"), created_at=NOW)
+                              for p in range(1, i % 3 + 1)
+                          ]))
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestProjection:
+    """Test responses built from column tuples"""
+
+    def test_columns_follow_schema_fields(self):
+        assert PRODUCT_RESPONSE.fields == tuple(ProductResponse.model_fields)
+        assert "order_items" not in ORDER_RESPONSE.fields
+        assert ORDER_ITEM_RESPONSE.columns[0] is getattr(OrderItem, ORDER_ITEM_RESPONSE.fields[0])
+
+    def test_build_does_not_validate(self):
+        row = [None] * len(ORDER_ITEM_RESPONSE.fields)
+        item = ORDER_ITEM_RESPONSE.build(row)
+        assert isinstance(item, OrderItemResponse) and item.id is None
+
+    def test_product_responses_match_validated_orm_objects(self, db):
+        repo = ProductRepository(db)
+        expected = [ProductResponse.model_validate(p) for p in repo.get_active_products()]
+        responses = repo.get_active_product_responses()
+        assert [p.id for p in responses] == [1, 2, 4, 5]
+        assert PRODUCT_RESPONSE.dump(responses) == PRODUCT_RESPONSE.dump(expected)
+        assert PRODUCT_RESPONSE.dump_json(responses) == PRODUCT_RESPONSE.dump_json(expected)
+        assert [p.id for p in repo.get_active_product_responses(skip=1, limit=2)] == [2, 4]
+
+    def test_order_responses_match_validated_orm_objects(self, db):
+        repo = OrderRepository(db)
+        expected = [OrderResponse.model_validate(o) for o in repo.get_user_orders(1)]
+        db.expunge_all()
+        responses = repo.get_user_order_responses(1)
+        assert [o.order_number for o in responses] == ["ORD-1", "ORD-2", "ORD-3", "ORD-4"]
+        assert [len(o.order_items) for o in responses] == [1, 2, 0, 1]
+        dump = ORDER_RESPONSE.dump(responses)
+        assert dump == ORDER_RESPONSE.dump(expected)
+        assert dump[0]["total_amount"] == "21.00" and dump[0]["order_items"][0]["unit_price"] == "10.50"
+
+    def test_order_responses_without_orders(self, db):
+        assert OrderRepository(db).get_user_order_responses(2) == []
+        assert OrderRepository(db).get_user_order_responses(1, skip=10) == []
@@ -0,0 +1,119 @@
+import pytest
+import uuid
+import redis
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from app.main import http_exception_handler
+from app.utils.exceptions import RateLimitException
+from app.utils.rate_limit import LocalLimiter, RateLimit, RateLimited, RateLimiter
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+DOWN = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.2, retry=Retry(NoBackoff(), 0))
+
+
+def build_app(limiter, **limits):
+    app = FastAPI()
+    app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+
+    @app.get("/gst/{gstin}", dependencies=[Depends(RateLimited(limiter=limiter, **limits))])
+    def lookup(gstin: str):
+        return {"gstin": gstin}
+
+    return app
+
+
+class TestRateLimit:
+    """Test limit parsing and the in-process GCRA"""
+
+    def test_parse(self):
+        """Test rate specs parse into emission interval and tolerance"""
+        limit = RateLimit.parse("300/minute")
+        assert (limit.rate, limit.period) == (300, 60)
+        assert limit.emission_interval_us == 200_000
+        assert limit.tolerance_us == 60_000_000
+        assert RateLimit.parse("5/seconds").period == 1
+        with pytest.raises(ValueError):
+            RateLimit.parse("fast")
+
+    def test_local_burst_then_reject(self):
+        """Test a full burst is allowed and the next request is rejected"""
+        local = LocalLimiter()
+        limits = [("k", RateLimit(rate=5, period=60))]
+        assert all(local.check(limits).allowed for _ in range(5))
+        result = local.check(limits)
+        assert not result.allowed
+        assert 11 < result.retry_after <= 12
+
+    def test_local_burst_limit_is_exact(self, monkeypatch):
+        """Test the request at exactly the burst limit does not depend on float rounding"""
+        monkeypatch.setattr("app.utils.rate_limit.time.monotonic", lambda: 4189.9236314546815)
+        local = LocalLimiter()
+        limits = [("k", RateLimit(rate=1, period=60))]
+        assert local.check(limits).allowed
+        assert local.check(limits).retry_after == 60
+
+    def test_local_rejection_charges_nothing(self):
+        """Test a request rejected by one limit is not charged to the others"""
+        local = LocalLimiter()
+        tight = ("tight", RateLimit(rate=1, period=60))
+        loose = ("loose", RateLimit(rate=2, period=60))
+        assert local.check([tight, loose]).allowed
+        assert not local.check([tight, loose]).allowed
+        assert local.check([loose]).allowed
+
+    def test_refund_restores_budget(self):
+        """Test refunding a charge lets the next request through"""
+        local = LocalLimiter()
+        limits = [("k", RateLimit(rate=1, period=60))]
+        assert local.check(limits).allowed
+        local.refund(limits)
+        assert local.check(limits).allowed
+
+    def test_local_evicts_least_recent_keys(self):
+        """Test local state stays bounded"""
+        local = LocalLimiter(max_keys=2)
+        for key in "abc":
+            local.check([(key, RateLimit(rate=1, period=60))])
+        assert list(local._tats) == ["b", "c"]
+
+    def test_dependency_returns_429_with_retry_after(self):
+        """Test the route dependency sheds floods locally when Redis is down"""
+        limiter = RateLimiter(redis_connection=DOWN)
+        client = TestClient(build_app(limiter, per_user=RateLimit(rate=2, period=60)))
+        assert client.get("/gst/37ABCDE1234F1Z5").status_code == 200
+        assert client.get("/gst/37ABCDE1234F1Z5").status_code == 200
+        response = client.get("/gst/37ABCDE1234F1Z5")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "30"
+        assert response.json()["error"]["message"] == "Rate limit exceeded"
+
+    def test_per_gstin_limit(self):
+        """Test the GSTIN limit is shared across callers of the same GSTIN only"""
+        limiter = RateLimiter(redis_connection=DOWN)
+        client = TestClient(build_app(limiter, per_user=RateLimit(rate=100, period=60),
+                                      per_gstin=RateLimit(rate=1, period=60)))
+        assert client.get("/gst/37ABCDE1234F1Z5").status_code == 200
+        assert client.get("/gst/37abcde1234f1z5").status_code == 429
+        assert client.get("/gst/29ABCDE1234F1Z5").status_code == 200
+
+
+class TestRedisRateLimiter:
+    """Test the Lua GCRA against a live Redis"""
+
+    def test_burst_and_atomic_multi_key(self, redis_connection):
+        """Test limits are charged together and denials charge nothing"""
+        limiter = RateLimiter(redis_connection=redis_connection, local=False, prefix=f"test-{uuid.uuid4()}")
+        user = (limiter.key("user", 1), RateLimit(rate=3, period=60))
+        route = (limiter.key("route", "GET:/x"), RateLimit(rate=10, period=60))
+        results = [limiter.check([user, route]) for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[0].remaining == 2
+        assert 19 < results[3].retry_after <= 20
+        # The denied request was not charged to the route limit
+        assert limiter.check([route]).remaining == 6
+        with pytest.raises(RateLimitException):
+            limiter.hit([user])
+        for key, _ in (user, route):
+            redis_connection.delete(key)
@@ -0,0 +1,113 @@
+import pytest
+import uuid
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.core.replicas import ROUTE_KEY, ReplicaPool, RoutingSession, WriteWindow, replica_reads
+from app.models.product import Product
+from app.repositories.product import ProductRepository
+
+DOWN = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.2, retry=Retry(NoBackoff(), 0))
+
+
+def database(name):
+    """A separate in-memory database whose one product is called ``name``"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Product(id=1, name=name, sku="SKU1", retail_price=10, company_price=9, stock_quantity=10))
+        db.commit()
+    return engine
+
+
+@pytest.fixture
+def primary():
+    return database("primary")
+
+
+def session_factory(primary, *replicas, lag_probe=None, write_window=None, check_interval=60.0):
+    options = {"lag_probe": lag_probe} if lag_probe else {}
+    pool = ReplicaPool(replicas, max_lag_seconds=5.0, check_interval=check_interval, **options)
+    return sessionmaker(bind=primary, class_=RoutingSession, replicas=pool, write_window=write_window)
+
+
+class TestRoutingSession:
+    """Test which engine serves each query"""
+
+    def test_repository_reads_use_replica(self, primary):
+        db = session_factory(primary, database("replica"))()
+        products = ProductRepository(db)
+        assert products.get_by_id(1).name == "replica"
+        assert products.exists(1) and products.count() == 1
+        # Queries outside a repository read stay on the primary
+        assert db.execute(select(Product.name)).scalar() == "primary"
+
+    def test_writes_and_later_reads_use_primary(self, primary):
+        db = session_factory(primary, database("replica"))()
+        products = ProductRepository(db)
+        # update() reads the row it changes from the primary
+        assert products.update(1, {"stock_quantity": 5}).name == "primary"
+        db.expunge_all()
+        assert products.get_by_id(1).name == "primary"
+
+    def test_locking_reads_use_primary(self, primary):
+        db = session_factory(primary, database("replica"))()
+        with replica_reads(db):
+            assert db.execute(select(Product.name).with_for_update()).scalar() == "primary"
+            assert db.execute(select(Product.name)).scalar() == "replica"
+
+    def test_no_replicas_uses_primary(self, primary):
+        db = session_factory(primary)()
+        assert ProductRepository(db).get_by_id(1).name == "primary"
+
+    def test_round_robin_between_replicas(self, primary):
+        factory = session_factory(primary, database("first"), database("second"))
+        names = {ProductRepository(factory()).get_by_id(1).name for _ in range(4)}
+        assert names == {"first", "second"}
+
+
+class TestReplicaHealth:
+    """Test health and lag checks"""
+
+    def test_lagging_replica_skipped_until_it_catches_up(self, primary):
+        lag = [30.0]
+        factory = session_factory(primary, database("replica"), lag_probe=lambda conn: lag[0], check_interval=0)
+        assert ProductRepository(factory()).get_by_id(1).name == "primary"
+        lag[0] = 1.0
+        assert ProductRepository(factory()).get_by_id(1).name == "replica"
+
+    def test_unreachable_replica_reported(self, primary):
+        broken = create_engine("sqlite:////nonexistent/replica.db")
+        factory = session_factory(primary, broken)
+        db = factory()
+        assert ProductRepository(db).get_by_id(1).name == "primary"
+        [state] = db.replicas.status()
+        assert state["healthy"] is False and "unable to open" in state["error"]
+
+
+class TestReadYourWrites:
+    """Test that a user's reads follow their own recent writes"""
+
+    def test_recent_writer_reads_primary(self, primary, redis_connection):
+        window = WriteWindow(10.0, redis_connection)
+        factory = session_factory(primary, database("replica"), write_window=window)
+        writer, other = f"user-{uuid.uuid4().hex}", f"user-{uuid.uuid4().hex}"
+
+        db = factory(info={ROUTE_KEY: writer})
+        ProductRepository(db).update_stock(1, 5)
+        db.close()
+        # Forget the process-local copy: another app process only sees Redis
+        window._local.clear()
+
+        assert ProductRepository(factory(info={ROUTE_KEY: writer})).get_by_id(1).name == "primary"
+        assert ProductRepository(factory(info={ROUTE_KEY: other})).get_by_id(1).name == "replica"
+
+    def test_reads_primary_when_redis_is_down(self, primary):
+        factory = session_factory(primary, database("replica"), write_window=WriteWindow(10.0, DOWN))
+        assert ProductRepository(factory(info={ROUTE_KEY: "1"})).get_by_id(1).name == "primary"
+        # Anonymous reads do not depend on the window
+        assert ProductRepository(factory()).get_by_id(1).name == "replica"
@@ -1,12 +1,14 @@
 import pytest
 from decimal import Decimal
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine.interfaces import CacheStats
 from sqlalchemy.orm import sessionmaker
 from app.core.database import Base
 from app.models.user import User, BusinessType
 from app.models.address import Address
 from app.models.product import Product
 from app.models.order import Order, OrderItem, OrderStatus
+from app.models.outbox import OutboxMessage
 from app.repositories.user import UserRepository
 from app.repositories.address import AddressRepository
 from app.repositories.product import ProductRepository
@@ -126,6 +128,27 @@ class TestUserRepository:
         assert retail_users[0].business_type == BusinessType.RETAIL_STORE
         assert company_users[0].business_type == BusinessType.COMPANY
 
+    def test_search_users(self, db_session, sample_user_data):
+        """Test searching users by business name or email"""
+        user_repo = UserRepository(db_session)
+        user = user_repo.create(sample_user_data)
+
+        assert user_repo.search_users("test bus") == [user]
+        assert user_repo.search_users("@EXAMPLE") == [user]
+        assert user_repo.search_users("missing") == []
+        assert user_repo.search_users("test", skip=1) == []
+
+    def test_generic_lookups(self, db_session, sample_user_data):
+        """Test the field and id lookups shared by all repositories"""
+        user_repo = UserRepository(db_session)
+        user = user_repo.create(sample_user_data)
+
+        assert user_repo.get_by_field("gstin", sample_user_data["gstin"]) == user
+        assert user_repo.get_many_by_field("business_name", "Test Business", limit=1) == [user]
+        assert user_repo.get_many_by_field("business_name", "Test Business", skip=1) == []
+        assert user_repo.exists(user.id) and not user_repo.exists(user.id + 1)
+        assert user_repo.get_all() == [user]
+
 
 class TestProductRepository:
     """Test ProductRepository functionality"""
@@ -231,6 +254,27 @@ class TestAddressRepository:
         assert len(addresses) == 3
         assert addresses[0].is_default is True  # Default address should be first
 
+    def test_set_default_address(self, db_session, sample_user_data):
+        """Test moving the default flag to another address"""
+        user = UserRepository(db_session).create(sample_user_data)
+        address_repo = AddressRepository(db_session)
+        first, second = [
+            address_repo.create({
+                "user_id": user.id,
+                "address_line_1": f"Address {i+1}",
+                "city": "Nellore",
+                "state": "Andhra Pradesh",
+                "postal_code": "524001",
+                "is_default": i == 0
+            })
+            for i in range(2)
+        ]
+
+        assert address_repo.set_default_address(user.id, second.id) == second
+        assert first.is_default is False
+        assert address_repo.get_default_address(user.id) == second
+        assert address_repo.get_addresses_by_city("nell") == [first, second]
+
 
 class TestOrderRepository:
     """Test OrderRepository functionality"""
@@ -309,4 +353,124 @@ class TestOrderRepository:
         # Update to delivered should set actual delivery date
         delivered_order = order_repo.update_status(order.id, OrderStatus.DELIVERED)
         assert delivered_order.status == OrderStatus.DELIVERED
-        assert delivered_order.actual_delivery_date is not None
\ No newline at end of file
+        assert delivered_order.actual_delivery_date is not None
+
+    def test_order_summaries_paginate_orders(self, db_session, sample_user_data, sample_product_data):
+        """Test summaries aggregate items in SQL and LIMIT applies to orders"""
+        user = UserRepository(db_session).create(sample_user_data)
+        product = ProductRepository(db_session).create(sample_product_data)
+        address = AddressRepository(db_session).create({
+            "user_id": user.id,
+            "address_line_1": "123 Main Street",
+            "city": "Nellore",
+            "state": "Andhra Pradesh",
+            "postal_code": "524001"
+        })
+
+        order_repo = OrderRepository(db_session)
+        for i in range(3):
+            order = order_repo.create({
+                "order_number": f"ORD00{i}",
+                "user_id": user.id,
+                "delivery_address_id": address.id,
+                "status": OrderStatus.CONFIRMED,
+                "total_amount": Decimal("200.00")
+            })
+            for quantity in range(1, 6):
+                db_session.add(OrderItem(
+                    order_id=order.id,
+                    product_id=product.id,
+                    quantity=quantity,
+                    unit_price=Decimal("80.00"),
+                    total_price=Decimal("80.00") * quantity
+                ))
+        db_session.commit()
+
+        summaries = order_repo.get_user_order_summaries(user.id, limit=2)
+        assert len(summaries) == 2
+        assert all(s.item_count == 5 and s.unit_count == 15 for s in summaries)
+        assert summaries[0].items_total == Decimal("1200.00")
+
+        by_status = order_repo.get_order_summaries_by_status(OrderStatus.CONFIRMED, skip=2)
+        assert len(by_status) == 1
+
+        orders = order_repo.get_user_orders(user.id, limit=2)
+        assert len(orders) == 2
+        assert len(orders[0].order_items) == 5
+
+    def test_bulk_update_status(self, db_session, sample_user_data, monkeypatch):
+        """Test set-based status changes skip orders in other statuses and queue events"""
+        published = []
+        monkeypatch.setattr("app.repositories.order.publish_order_events", published.extend)
+        user = UserRepository(db_session).create(sample_user_data)
+        address = AddressRepository(db_session).create({
+            "user_id": user.id,
+            "address_line_1": "123 Main Street",
+            "city": "Nellore",
+            "state": "Andhra Pradesh",
+            "postal_code": "524001"
+        })
+        order_repo = OrderRepository(db_session)
+        for i, status in enumerate([OrderStatus.SHIPPED, OrderStatus.SHIPPED, OrderStatus.PROCESSING], start=1):
+            order_repo.create({
+                "id": i,
+                "order_number": f"ORD00{i}",
+                "user_id": user.id,
+                "delivery_address_id": address.id,
+                "status": status,
+                "total_amount": Decimal("200.00")
+            })
+
+        result = order_repo.bulk_update_status([2, 1, 3, 99, 1], OrderStatus.SHIPPED, OrderStatus.DELIVERED)
+        assert result.updated_ids == [2, 1]
+        assert result.skipped_ids == [3, 99]
+
+        delivered = db_session.query(Order).filter(Order.status == OrderStatus.DELIVERED).all()
+        assert sorted(order.id for order in delivered) == [1, 2]
+        assert all(order.actual_delivery_date is not None for order in delivered)
+        assert order_repo.get_by_id(3).status == OrderStatus.PROCESSING
+
+        messages = db_session.query(OutboxMessage).filter(OutboxMessage.topic == "order.status_changed").all()
+        assert len(messages) == 4
+        assert messages[0].payload["previous_status"] == "shipped"
+        assert messages[0].payload["business_name"] == sample_user_data["business_name"]
+        assert sorted(event["order_id"] for event in published) == [1, 2]
+        assert all(event["status"] == "delivered" for event in published)
+
+        # Already moved: nothing left to change
+        assert order_repo.bulk_update_status([1, 2], OrderStatus.SHIPPED, OrderStatus.DELIVERED).updated_ids == []
+
+        with pytest.raises(ValueError):
+            order_repo.bulk_update_status([3], OrderStatus.PROCESSING, OrderStatus.DELIVERED)
+
+
+class TestStatementReuse:
+    """Test that repository queries reuse their compiled SQL across calls"""
+
+    CALLS = {
+        "get_by_id": lambda db, i: UserRepository(db).get_by_id(i),
+        "get_by_email": lambda db, i: UserRepository(db).get_by_email(f"user{i}@example.com"),
+        "search_users": lambda db, i: UserRepository(db).search_users(f"shop {i}", skip=i, limit=i + 1),
+        "get_default_address": lambda db, i: AddressRepository(db).get_default_address(i),
+        "search_products": lambda db, i: ProductRepository(db).search_products(f"rice {i}", limit=i),
+        "get_low_stock_products": lambda db, i: ProductRepository(db).get_low_stock_products(i),
+        "get_user_orders": lambda db, i: OrderRepository(db).get_user_orders(i, limit=i),
+        "get_with_items": lambda db, i: OrderRepository(db).get_with_items(list(range(i))),
+        "get_pick_rows": lambda db, i: OrderItemRepository(db).get_pick_rows(OrderStatus.CONFIRMED, [i]),
+    }
+
+    @pytest.mark.parametrize("name", sorted(CALLS))
+    def test_second_call_hits_compiled_cache(self, db_session, name):
+        cache = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            cache.append(context.cache_hit)
+
+        call = self.CALLS[name]
+        call(db_session, 1)
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            call(db_session, 2)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert cache and all(hit is CacheStats.CACHE_HIT for hit in cache), cache
@@ -0,0 +1,158 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import create_access_token
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import BusinessType
+from app.repositories.order import OrderRepository
+from app.repositories.rollup import RollupRepository
+from app.routers.dashboard import router
+from app.services.rollups import RollupService
+
+TODAY = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+@pytest.fixture
+def engine(sqlite_engine, add_buyer):
+    db = sessionmaker(bind=sqlite_engine)()
+    for user_id, business_type in ((1, BusinessType.RETAIL_STORE), (2, BusinessType.COMPANY)):
+        add_buyer(db, user_id, email=f"buyer{user_id}@example.com", phone=None, business_name=f"Shop {user_id}",
+                  gstin=f"37ABCDE123{user_id}F1Z5", business_type=business_type)
+    for product_id, stock in ((1, 100), (2, 5), (3, 0)):
+        db.add(Product(id=product_id, name=f"Product {product_id}", sku=f"SKU{product_id}",
+                       retail_price=10, company_price=9, stock_quantity=stock))
+    # (user, days ago, hour, status, [(product, quantity, price)])
+    orders = [
+        (1, 2, 9, OrderStatus.DELIVERED, [(1, 10, Decimal("10.00")), (2, 1, Decimal("50.00"))]),
+        (2, 2, 9, OrderStatus.SHIPPED, [(1, 5, Decimal("9.00"))]),
+        (2, 2, 15, OrderStatus.CANCELLED, [(2, 100, Decimal("50.00"))]),
+        (1, 1, 11, OrderStatus.CONFIRMED, [(2, 2, Decimal("50.00"))]),
+    ]
+    for order_id, (user_id, days_ago, hour, status, items) in enumerate(orders, start=1):
+        created = TODAY - timedelta(days=days_ago) + timedelta(hours=hour, minutes=order_id)
+        total = sum(quantity * price for _, quantity, price in items)
+        db.add(Order(id=order_id, order_number=f"ORD{order_id}", user_id=user_id, delivery_address_id=1,
+                     status=status, total_amount=total, created_at=created))
+        for product_id, quantity, price in items:
+            db.add(OrderItem(order_id=order_id, product_id=product_id, quantity=quantity,
+                             unit_price=price, total_price=quantity * price))
+    db.commit()
+    db.close()
+    return sqlite_engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def window():
+    return TODAY - timedelta(days=7), TODAY + timedelta(days=1)
+
+
+class TestRollupService:
+    """Test incremental maintenance of the dashboard rollups"""
+
+    def test_rollups_match_live_aggregation(self, db):
+        report = RollupService(db).refresh()
+        assert report.days == [TODAY - timedelta(days=2), TODAY - timedelta(days=1)]
+
+        rollups = RollupRepository(db)
+        revenue = rollups.revenue_by_day(*window())
+        assert [(row["bucket_start"].day, row["business_type"], row["orders"], row["revenue"]) for row in revenue] == [
+            ((TODAY - timedelta(days=2)).day, "company", 1, Decimal("45.00")),
+            ((TODAY - timedelta(days=2)).day, "retail_store", 1, Decimal("150.00")),
+            ((TODAY - timedelta(days=1)).day, "retail_store", 1, Decimal("100.00")),
+        ]
+        live = dict(db.execute(select(Order.status, func.count()).group_by(Order.status)).all())
+        assert rollups.order_counts_by_status() == {status.value: count for status, count in live.items()}
+
+        top = rollups.top_products(*window())
+        assert [(row["sku"], row["units"], row["revenue"]) for row in top] == [
+            ("SKU2", 3, Decimal("150.00")), ("SKU1", 15, Decimal("145.00")),
+        ]
+        hourly = rollups.revenue_by_hour(*window())
+        assert [row["bucket_start"].hour for row in hourly] == [9, 9, 11]
+
+        inventory = rollups.latest_inventory()
+        assert (inventory.active_products, inventory.low_stock, inventory.out_of_stock) == (3, 2, 1)
+
+    def test_refresh_rebuilds_only_changed_days(self, db):
+        service = RollupService(db)
+        service.refresh()
+        assert service.refresh().days == []
+
+        OrderRepository(db).update_status(4, OrderStatus.CANCELLED)
+        report = service.refresh()
+        assert report.days == [TODAY - timedelta(days=1)]
+
+        rollups = RollupRepository(db)
+        assert rollups.order_counts_by_status() == {"delivered": 1, "shipped": 1, "cancelled": 2}
+        assert [row["orders"] for row in rollups.revenue_by_day(*window())] == [1, 1]
+        assert [row["units"] for row in rollups.top_products(*window())] == [15, 1]
+
+    def test_changed_orders_found_through_index(self, engine, db):
+        RollupService(db).refresh()
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "coalesce(orders.updated_at, orders.created_at)" in statement:
+                statements.append((statement, parameters))
+
+        RollupService(db).refresh()
+        event.remove(engine, "before_cursor_execute", capture)
+
+        statement, parameters = statements[0]
+        with engine.connect() as conn:
+            plan = " ".join(row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+        assert "ix_orders_changed_at" in plan
+
+
+class TestDashboardRoutes:
+    """Test the dashboard API"""
+
+    def test_dashboard_reads_rollups(self, engine, monkeypatch):
+        factory = sessionmaker(bind=engine)
+        db = factory()
+        RollupService(db).refresh()
+        db.close()
+
+        app = FastAPI()
+        app.include_router(router, prefix="/dashboard")
+
+        def override_get_db():
+            session = factory()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token(subject=1)}"}
+        monkeypatch.setattr(settings, "ADMIN_USER_IDS", [1])
+
+        body = client.get("/dashboard?days=7&top=1", headers=headers).json()
+        assert body["data"]["orders_by_status"]["cancelled"] == 1
+        assert len(body["data"]["revenue_by_day"]) == 3
+        assert [product["sku"] for product in body["data"]["top_products"]] == ["SKU2"]
+        assert body["data"]["inventory"]["low_stock"] == 2
+        assert body["meta"]["as_of"] is not None
+
+        assert len(client.get("/dashboard/hourly?hours=72", headers=headers).json()["data"]) == 3
+        assert client.get("/dashboard").status_code in (401, 403)
+
+        # Signed in, but not an admin
+        other = {"Authorization": f"Bearer {create_access_token(subject=2)}"}
+        assert client.get("/dashboard", headers=other).status_code == 403
+        assert client.get("/dashboard/hourly", headers=other).status_code == 403
@@ -0,0 +1,124 @@
+import pytest
+import random
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import numpy as np
+from sqlalchemy.orm import sessionmaker
+from app.models.address import Address
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.services.delivery import DeliveryEstimator, build_pincode_table, build_prefix_table
+from app.services.routing import (
+    Drop,
+    RoutePlanner,
+    VehicleSpec,
+    distance_matrix,
+    nearest_neighbour_tour,
+    tour_length,
+    two_opt,
+)
+
+
+def random_drops(n, seed=1):
+    rng = random.Random(seed)
+    return [
+        Drop(
+            order_id=i + 1,
+            postal_code=str(524001 + rng.randint(0, 30)),
+            latitude=14.44 + rng.uniform(-0.3, 0.3),
+            longitude=79.98 + rng.uniform(-0.3, 0.3),
+            weight_kg=rng.uniform(5, 60),
+        )
+        for i in range(n)
+    ]
+
+
+class TestRoutePlanner:
+    """Test route batching for the local fleet"""
+
+    def test_distance_matrix_symmetric(self):
+        """Test the vectorized distance matrix is symmetric with zero diagonal"""
+        dist = distance_matrix(np.array([14.44, 13.08, 17.38]), np.array([79.98, 80.27, 78.48]))
+        assert np.allclose(dist, dist.T)
+        assert np.allclose(np.diag(dist), 0)
+        assert dist[0, 1] == pytest.approx(155, abs=10)
+
+    def test_two_opt_does_not_lengthen_tour(self):
+        """Test 2-opt keeps the depot first and never worsens the tour"""
+        rng = np.random.default_rng(3)
+        pts = rng.uniform(0, 1, size=(40, 2))
+        dist = distance_matrix(pts[:, 0], pts[:, 1])
+        greedy = nearest_neighbour_tour(dist)
+        improved = two_opt(greedy, dist)
+        assert improved[0] == 0
+        assert sorted(improved.tolist()) == list(range(40))
+        assert tour_length(improved, dist) <= tour_length(greedy, dist) + 1e-9
+
+    def test_plan_respects_capacity(self):
+        """Test every drop is routed once and no vehicle is overloaded"""
+        drops = random_drops(300)
+        planner = RoutePlanner(vehicle=VehicleSpec(capacity_kg=500, max_stops=25))
+        plan = planner.plan(drops)
+        routed = [oid for route in plan.routes for oid in route.order_ids]
+        assert sorted(routed) == [d.order_id for d in drops]
+        assert not plan.unassigned
+        for route in plan.routes:
+            assert route.weight_kg <= 500
+            assert len(route.drops) <= 25
+
+    def test_unroutable_drops(self):
+        """Test overweight drops, missing coordinates and fleet limits are reported"""
+        drops = random_drops(10)
+        drops[0].weight_kg = 5000
+        drops[1].latitude = float("nan")
+        plan = RoutePlanner(vehicle=VehicleSpec(capacity_kg=100, max_stops=3), max_vehicles=1).plan(drops)
+        assert len(plan.routes) == 1
+        assert {1, 2} <= {d.order_id for d in plan.unassigned}
+        assert len(plan.unassigned) + len(plan.routes[0].drops) == 10
+
+    def test_out_of_zone_drops_are_not_routed(self):
+        """Test drops outside the local zone are reported rather than planned"""
+        drops = random_drops(10)
+        drops[0].postal_code = "500001"
+        drops[1].postal_code = "110001"
+        plan = RoutePlanner(estimator=DeliveryEstimator(table=build_prefix_table())).plan(drops)
+        assert [d.order_id for d in plan.out_of_zone] == [1, 2]
+        assert not plan.unassigned
+        assert sorted(oid for route in plan.routes for oid in route.order_ids) == list(range(3, 11))
+
+    def test_plan_confirmed_orders_from_database(self, sqlite_engine, add_buyer):
+        """Test the day's local drops are loaded with order weights aggregated in SQL"""
+        db = sessionmaker(bind=sqlite_engine)()
+        user = add_buyer(db)
+        product = Product(name="Rice", sku="RICE25", retail_price=Decimal("1200"), company_price=Decimal("1100"),
+                          weight_kg=Decimal("25.000"))
+        hyderabad = Address(user_id=user.id, address_line_1="2 Station Road", city="Hyderabad", state="Telangana",
+                            postal_code="500001")
+        db.add_all([product, hyderabad])
+        db.flush()
+        nellore = db.get(Address, user.id)
+        # Due 20 Oct 12:00 IST unless noted otherwise
+        due = datetime(2026, 10, 20, 6, 30, tzinfo=timezone.utc)
+        orders = [
+            (OrderStatus.CONFIRMED, nellore, due),
+            (OrderStatus.CONFIRMED, nellore, datetime(2026, 10, 18, 6, 30, tzinfo=timezone.utc)),  # late
+            (OrderStatus.PENDING, nellore, due),
+            (OrderStatus.CONFIRMED, nellore, datetime(2026, 10, 20, 18, 30, tzinfo=timezone.utc)),  # 21 Oct IST
+            (OrderStatus.CONFIRMED, hyderabad, due),
+        ]
+        for n, (status, address, estimated) in enumerate(orders):
+            order = Order(order_number=f"ORD{n}", user_id=user.id, delivery_address_id=address.id,
+                          status=status, total_amount=Decimal("1200"), estimated_delivery_date=estimated)
+            order.order_items = [OrderItem(product_id=product.id, quantity=n + 1, unit_price=Decimal("1200"),
+                                           total_price=Decimal("1200") * (n + 1))]
+            db.add(order)
+        db.commit()
+
+        estimator = DeliveryEstimator(table=build_pincode_table(
+            np.array([524001, 500001]), np.array([14.45, 17.38]), np.array([79.99, 78.48])
+        ))
+        plan = RoutePlanner(estimator=estimator).plan_for_status(db, delivery_date=date(2026, 10, 20))
+        assert len(plan.routes) == 1
+        assert sorted(d.weight_kg for d in plan.routes[0].drops) == [25.0, 50.0]
+        assert [d.postal_code for d in plan.out_of_zone] == ["500001"]
+        db.close()
@@ -0,0 +1,94 @@
+import pytest
+from app.utils.validators import (
+    GST,
+    Phone,
+    gstin_check_character,
+    normalize_phone_number,
+    validate_email,
+    validate_gstin,
+    validate_many,
+    validate_pan,
+    validate_password_strength,
+    validate_phone_number,
+    validate_pincode,
+)
+
+# Registered GSTINs with valid check characters
+VALID_GSTINS = ["27AAPFU0939F1ZV", "29AAGCB7383J1Z4", "33AAACH7409R1Z8", "24AAACC1206D1ZM"]
+
+
+class TestGSTIN:
+    """Test GSTIN format and check character validation"""
+
+    @pytest.mark.parametrize("gstin", VALID_GSTINS)
+    def test_check_character(self, gstin):
+        assert gstin_check_character(gstin) == gstin[14]
+        assert validate_gstin(gstin, checksum=True)
+        assert validate_gstin(gstin.lower(), checksum=True)
+
+    def test_wrong_check_character_is_well_formed(self):
+        assert validate_gstin("27AAPFU0939F1ZX")
+        assert not validate_gstin("27AAPFU0939F1ZX", checksum=True)
+        assert not GST.validate("27AAPFU0939F1ZX", checksum=True)
+
+    @pytest.mark.parametrize("gstin", ["", None, "27AAPFU0939F1Z", "27AAPFU0939F1YV", "2XAAPFU0939F1ZV",
+                                       "27AAPFU0939F1ZV\n"])
+    def test_malformed(self, gstin):
+        assert not validate_gstin(gstin)
+
+    def test_extract_parts(self):
+        assert GST.extract_pan("27AAPFU0939F1ZV") == "AAPFU0939F"
+        assert GST.extract_state_code("37ABCDE1234F1Z5") == "37"
+        assert GST.extract_state_code("not a gstin") is None
+
+
+class TestContactDetails:
+    """Test phone, email, PAN, pincode and password validation"""
+
+    def test_phone_normalization(self):
+        assert normalize_phone_number("98765 43210") == "+919876543210"
+        assert Phone.format("+91 98765-43210") == "+919876543210"
+        assert validate_phone_number("+919876543210")
+        assert not validate_phone_number("12345")
+        assert not Phone.validate("not a number")
+        assert Phone.format("not a number") is None
+
+    def test_phone_parsing_is_cached(self):
+        normalize_phone_number.cache_clear()
+        for _ in range(3):
+            Phone.format("9876543210")
+            Phone.validate("9876543210")
+        assert normalize_phone_number.cache_info().misses == 1
+
+    def test_other_fields(self):
+        assert validate_pan("aapfu0939f") and not validate_pan("AAPF10939F")
+        assert validate_pincode("524001") and not validate_pincode("52400") and not validate_pincode("52400a")
+        assert validate_email("buyer@example.com") and not validate_email("buyer@example")
+        assert validate_password_strength("Str0ng!pass") == (True, [])
+        valid, errors = validate_password_strength("weak")
+        assert not valid and len(errors) == 4
+
+
+class TestValidateMany:
+    """Test batch validation for bulk imports"""
+
+    def test_normalizes_valid_records_and_reports_errors_by_index(self):
+        result = validate_many([
+            {"gstin": " 27aapfu0939f1zv ", "phone": "98765 43210", "email": "a@example.com", "business_name": "A"},
+            {"gstin": "27AAPFU0939F1ZX", "phone": "12345", "email": "b@example.com"},
+            {"gstin": "29AAGCB7383J1Z4", "phone": None, "postal_code": "524001"},
+            {"gstin": "bad", "postal_code": "5240"},
+        ])
+        assert not result.ok
+        assert result.valid == [
+            {"gstin": "27AAPFU0939F1ZV", "phone": "+919876543210", "email": "a@example.com", "business_name": "A"},
+            {"gstin": "29AAGCB7383J1Z4", "phone": None, "postal_code": "524001"},
+        ]
+        assert result.errors == {
+            1: {"gstin": "Invalid GSTIN check character", "phone": "Invalid phone number"},
+            3: {"gstin": "Invalid GSTIN format", "postal_code": "Invalid pincode"},
+        }
+
+    def test_checksum_can_be_skipped(self):
+        assert validate_many([{"gstin": "37ABCDE1234F1Z5"}], checksum=False).ok
+        assert not validate_many([{"gstin": "37ABCDE1234F1Z5"}]).ok